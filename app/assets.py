@@ -0,0 +1,140 @@
+# app/assets.py
+# Servicio de los assets estáticos generados por construir_assets.py:
+# nombres con huella (cache inmutable), variantes .br/.gz precomprimidas,
+# variantes AVIF/WebP de imágenes y ETag para el HTML de la página principal.
+
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import re
+from typing import Dict, Optional
+
+import anyio
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+
+logger = logging.getLogger(__name__)
+
+DIRECTORIO_STATIC = "static"
+DIRECTORIO_DIST = "dist"  # Relativo a static/
+ARCHIVO_MANIFIESTO = os.path.join(DIRECTORIO_STATIC, DIRECTORIO_DIST, "manifest.json")
+
+# Nombre con huella: fondo.3fa9c01b2e.jpg
+PATRON_HUELLA = re.compile(r"\.[0-9a-f]{10}\.[A-Za-z0-9]+$")
+
+CACHE_INMUTABLE = "public, max-age=31536000, immutable"
+CACHE_REVALIDAR = "no-cache"
+
+# Orden de preferencia de las variantes precomprimidas y de imagen
+CODIFICACIONES = (("br", ".br"), ("gzip", ".gz"))
+FORMATOS_IMAGEN = (("image/avif", ".avif"), ("image/webp", ".webp"))
+EXTENSIONES_IMAGEN = (".jpg", ".jpeg", ".png")
+
+# Python 3.9 no conoce estos tipos y FileResponse los serviría como text/plain
+mimetypes.add_type("image/avif", ".avif")
+mimetypes.add_type("image/webp", ".webp")
+
+_manifiesto: Optional[Dict[str, str]] = None
+
+def cargar_manifiesto(ruta: str = ARCHIVO_MANIFIESTO) -> Dict[str, str]:
+    """Carga el manifiesto {nombre original: nombre con huella}; vacío si no se han construido los assets"""
+    global _manifiesto
+    try:
+        with open(ruta, encoding="utf-8") as f:
+            _manifiesto = json.load(f).get("archivos", {})
+        logger.info(f"📦 Manifiesto de assets cargado: {len(_manifiesto)} archivos")
+    except FileNotFoundError:
+        _manifiesto = {}
+        logger.warning("⚠️ Sin manifiesto de assets, se sirven los originales (ejecuta construir_assets.py)")
+    except Exception as e:
+        _manifiesto = {}
+        logger.error(f"❌ Error leyendo manifiesto de assets: {e}")
+    return _manifiesto
+
+def asset(nombre: str) -> str:
+    """URL pública de un asset: la versión con huella si existe en el manifiesto, si no el original"""
+    manifiesto = _manifiesto if _manifiesto is not None else cargar_manifiesto()
+    return f"/static/{manifiesto.get(nombre, nombre)}"
+
+def acepta(encabezado: str, valor: str) -> bool:
+    """True si el header Accept/Accept-Encoding incluye el valor con q > 0"""
+    for parte in encabezado.lower().split(","):
+        token, _, parametros = parte.partition(";")
+        if token.strip() != valor:
+            continue
+        calidad = parametros.replace(" ", "")
+        if calidad.startswith("q="):
+            try:
+                return float(calidad[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+class StaticFilesCacheados(StaticFiles):
+    """StaticFiles que sirve variantes precomprimidas y de imagen, con Cache-Control según la huella"""
+
+    async def get_response(self, path: str, scope) -> Response:
+        encabezados = {
+            clave.decode("latin-1").lower(): valor.decode("latin-1")
+            for clave, valor in scope.get("headers", [])
+        }
+        response = await self._respuesta_variante(path, scope, encabezados)
+        if response is None:
+            response = await super().get_response(path, scope)
+            if path.lower().endswith(EXTENSIONES_IMAGEN):
+                response.headers["Vary"] = "Accept"
+            elif os.path.splitext(path)[1] in (".css", ".js", ".html", ".json", ".svg"):
+                response.headers["Vary"] = "Accept-Encoding"
+
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = CACHE_INMUTABLE if PATRON_HUELLA.search(path) else CACHE_REVALIDAR
+        return response
+
+    async def _respuesta_variante(self, path: str, scope, encabezados: Dict[str, str]) -> Optional[Response]:
+        """Busca una variante aceptada por el cliente (fondo.avif para fondo.jpg, merlin.css.br para merlin.css)"""
+        if path.lower().endswith(EXTENSIONES_IMAGEN):
+            aceptados = encabezados.get("accept", "")
+            base = os.path.splitext(path)[0]
+            for tipo, extension in FORMATOS_IMAGEN:
+                if acepta(aceptados, tipo) and await self._existe(base + extension):
+                    response = await super().get_response(base + extension, scope)
+                    response.headers["Vary"] = "Accept"
+                    return response
+            return None
+
+        aceptados = encabezados.get("accept-encoding", "")
+        for codificacion, extension in CODIFICACIONES:
+            if acepta(aceptados, codificacion) and await self._existe(path + extension):
+                response = await super().get_response(path + extension, scope)
+                tipo = self._tipo_original(path)
+                if tipo:
+                    response.headers["Content-Type"] = tipo
+                if response.status_code == 200:
+                    response.headers["Content-Encoding"] = codificacion
+                response.headers["Vary"] = "Accept-Encoding"
+                return response
+        return None
+
+    async def _existe(self, path: str) -> bool:
+        _, stat_resultado = await anyio.to_thread.run_sync(self.lookup_path, path)
+        return stat_resultado is not None
+
+    @staticmethod
+    def _tipo_original(path: str) -> Optional[str]:
+        tipo, _ = mimetypes.guess_type(path)
+        if tipo and (tipo.startswith("text/") or tipo in ("application/javascript", "application/json")):
+            return f"{tipo}; charset=utf-8"
+        return tipo
+
+def respuesta_con_etag(request, response: Response) -> Response:
+    """Agrega ETag al HTML ya renderizado y responde 304 si el cliente tiene la misma versión"""
+    etag = '"' + hashlib.sha256(response.body).hexdigest()[:16] + '"'
+    cache = {"ETag": etag, "Cache-Control": CACHE_REVALIDAR}
+    etags_cliente = request.headers.get("if-none-match", "")
+    if etag in [e.strip().removeprefix("W/") for e in etags_cliente.split(",")] or etags_cliente.strip() == "*":
+        return Response(status_code=304, headers=cache)
+    response.headers.update(cache)
+    return response
@@ -0,0 +1,97 @@
+# app/cache_consulta.py
+# Cache de respuestas completas de /consulta. La clave es un hash de
+# (query_type, consulta normalizada, empresa normalizada, versión de los datos);
+# el timestamp se regenera en cada acierto y el ETag permite responder 304.
+
+import hashlib
+import logging
+import os
+import re
+import unicodedata
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from starlette.responses import Response
+
+from app.respuestas import respuesta_json, serializar
+from config.version_datos import version_datos
+from scrapers.cache_ttl import CacheTTL
+
+logger = logging.getLogger(__name__)
+
+# TTL por tipo de consulta (segundos). Las de proyecto dependen de scraping en vivo del SEIA
+TTL_POR_TIPO = {
+    "general": int(os.getenv("CACHE_CONSULTA_TTL_GENERAL", str(6 * 3600))),
+    "legal": int(os.getenv("CACHE_CONSULTA_TTL_LEGAL", str(6 * 3600))),
+    "proyecto": int(os.getenv("CACHE_CONSULTA_TTL_PROYECTO", str(15 * 60))),
+}
+
+cache_consultas = CacheTTL(
+    ttl_segundos=TTL_POR_TIPO["general"],
+    max_entradas=int(os.getenv("CACHE_CONSULTA_MAX_ENTRADAS", "512")),
+)
+
+# Campos que cambian en cada respuesta y no forman parte del contenido cacheado
+CAMPOS_VOLATILES = ("timestamp",)
+
+def normalizar_texto(texto: str) -> str:
+    """Minúsculas, espacios colapsados y sin signos de pregunta/exclamación en los extremos"""
+    texto = unicodedata.normalize("NFKC", texto or "").casefold()
+    texto = re.sub(r"\s+", " ", texto)
+    return texto.strip(" ¿?¡!.")
+
+def clave_consulta(query_type: str, query: str, company_name: str, version_catalogo: str = "",
+                   corregir: bool = True) -> str:
+    """
+    Clave de cache de la consulta; incluye la versión de los datos para invalidar al actualizarlos,
+    en las legales la huella del catálogo normativo (cada worker lo recarga por su cuenta) y si se
+    pidió corregir el nombre de la empresa (con y sin corrección se busca un titular distinto).
+    """
+    partes = (query_type, normalizar_texto(query), normalizar_texto(company_name), version_datos(), version_catalogo,
+              "corregir" if corregir else "")
+    return hashlib.sha256("\x1f".join(partes).encode("utf-8")).hexdigest()
+
+def _etag(etag_contenido: str, campos: Any) -> str:
+    """ETag débil: el cuerpo cambia en el timestamp pero el contenido es el mismo"""
+    if campos:
+        seleccion = ",".join(sorted(campos)) if isinstance(campos, (list, tuple, set)) else str(campos)
+        etag_contenido = hashlib.sha256(f"{etag_contenido}|{seleccion}".encode("utf-8")).hexdigest()[:16]
+    return f'W/"{etag_contenido}"'
+
+def coincide_etag(request, etag: str) -> bool:
+    """Indica si el ETag está en If-None-Match del cliente"""
+    etags_cliente = request.headers.get("if-none-match", "")
+    return etag in [e.strip() for e in etags_cliente.split(",")] or etags_cliente.strip() == "*"
+
+def _responder(request, entrada: Dict, campos: Any, estado_cache: str) -> Response:
+    campos = request.query_params.get("fields") or campos
+    etag = _etag(entrada["etag"], campos)
+    encabezados = {"ETag": etag, "X-Cache": estado_cache}
+    if coincide_etag(request, etag):
+        return Response(status_code=304, headers=encabezados)
+    datos = dict(entrada["datos"], timestamp=datetime.now().isoformat())
+    return respuesta_json(request, datos, campos=campos, encabezados=encabezados)
+
+def responder_desde_cache(request, clave: str, campos: Any = None) -> Optional[Response]:
+    """Respuesta (200 o 304) si la consulta está en cache, None si hay que procesarla"""
+    entrada = cache_consultas.obtener(clave)
+    if entrada is None:
+        return None
+    return _responder(request, entrada, campos, "HIT")
+
+def guardar_y_responder(request, clave: str, query_type: str, datos: Dict, campos: Any = None,
+                        cachear: bool = True) -> Response:
+    """Guarda una respuesta exitosa en cache (salvo cachear=False) y la retorna con su ETag"""
+    contenido = {k: v for k, v in datos.items() if k not in CAMPOS_VOLATILES}
+    entrada = {
+        "datos": contenido,
+        "etag": hashlib.sha256(serializar(contenido)).hexdigest()[:16],
+    }
+    if datos.get("success") and cachear:
+        cache_consultas.guardar(clave, entrada, TTL_POR_TIPO.get(query_type, cache_consultas.ttl_segundos))
+    return _responder(request, entrada, campos, "MISS")
+
+def invalidar_cache_consultas() -> None:
+    """Vacía la cache de este proceso (los demás workers se invalidan con marcar_datos_actualizados)"""
+    cache_consultas.invalidar()
+    logger.info("🧹 Cache de consultas invalidada")
@@ -0,0 +1,185 @@
+# app/lote_consultas.py
+# Consulta por lotes de empresas (POST /consulta/batch): cada empresa se busca con el scraper por titular
+# en un pool compartido por todos los lotes del worker, respetando el límite de tasa del SEIA, y su
+# resultado se emite como una línea NDJSON apenas está listo. Los resultados quedan en SQLite bajo un
+# lote_id, así un lote interrumpido se reanuda sin repetir las empresas ya consultadas; las que fallaron
+# sin una respuesta definitiva del SEIA (timeout, error de red) se vuelven a consultar al reanudar.
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional
+
+from app.respuestas import serializar
+
+logger = logging.getLogger(__name__)
+
+MAX_EMPRESAS_LOTE = int(os.getenv("LOTE_MAX_EMPRESAS", "500"))
+# Presupuesto de concurrencia del worker: lo comparten todos los lotes en curso
+CONCURRENCIA_LOTES = int(os.getenv("LOTE_CONCURRENCIA", "4"))
+MAX_PROYECTOS_POR_EMPRESA = 30
+RETENCION_DIAS = int(os.getenv("LOTE_RETENCION_DIAS", "7"))
+RUTA_LOTES = os.getenv("LOTES_DB_RUTA", os.path.join("data", "lotes.sqlite"))
+
+CAMPOS_PROYECTO = ("id_proyecto", "nombre", "tipo", "estado", "region", "fecha", "titular",
+                   "link_expediente", "score_relevancia")
+
+ejecutor_lotes = ThreadPoolExecutor(max_workers=max(1, CONCURRENCIA_LOTES), thread_name_prefix="lote")
+
+class AlmacenLotes:
+    """Lotes y resultados por empresa en SQLite (data/lotes.sqlite)"""
+
+    def __init__(self, ruta: str = RUTA_LOTES):
+        self.ruta = ruta
+        self._lock = threading.Lock()
+        self._inicializada = False
+
+    @contextmanager
+    def _conectar(self):
+        """Conexión de corta duración: sqlite3 no se comparte entre hilos ni procesos"""
+        if not self._inicializada:
+            os.makedirs(os.path.dirname(self.ruta) or '.', exist_ok=True)
+        conexion = sqlite3.connect(self.ruta, timeout=10)
+        try:
+            if not self._inicializada:
+                with self._lock:
+                    conexion.execute("CREATE TABLE IF NOT EXISTS lotes (id TEXT PRIMARY KEY, creado TEXT, empresas TEXT)")
+                    conexion.execute(
+                        "CREATE TABLE IF NOT EXISTS resultados_lote (lote_id TEXT, indice INTEGER, "
+                        "resultado TEXT, PRIMARY KEY (lote_id, indice))"
+                    )
+                    self._inicializada = True
+            with conexion:
+                yield conexion
+        finally:
+            conexion.close()
+
+    def crear(self, empresas: List[str]) -> str:
+        """Registra un lote nuevo y descarta los que superaron la retención"""
+        lote_id = uuid.uuid4().hex
+        limite = (datetime.now() - timedelta(days=RETENCION_DIAS)).isoformat()
+        with self._conectar() as conexion:
+            vencidos = [fila[0] for fila in conexion.execute("SELECT id FROM lotes WHERE creado < ?", (limite,))]
+            for vencido in vencidos:
+                conexion.execute("DELETE FROM resultados_lote WHERE lote_id = ?", (vencido,))
+                conexion.execute("DELETE FROM lotes WHERE id = ?", (vencido,))
+            conexion.execute("INSERT INTO lotes VALUES (?, ?, ?)",
+                             (lote_id, datetime.now().isoformat(), json.dumps(empresas, ensure_ascii=False)))
+        return lote_id
+
+    def empresas(self, lote_id: str) -> Optional[List[str]]:
+        with self._conectar() as conexion:
+            fila = conexion.execute("SELECT empresas FROM lotes WHERE id = ?", (lote_id,)).fetchone()
+        return json.loads(fila[0]) if fila else None
+
+    def resultados(self, lote_id: str) -> Dict[int, Dict]:
+        with self._conectar() as conexion:
+            filas = conexion.execute(
+                "SELECT indice, resultado FROM resultados_lote WHERE lote_id = ?", (lote_id,)
+            ).fetchall()
+        return {indice: json.loads(resultado) for indice, resultado in filas}
+
+    def guardar_resultado(self, lote_id: str, indice: int, resultado: Dict) -> None:
+        with self._conectar() as conexion:
+            conexion.execute("INSERT OR REPLACE INTO resultados_lote VALUES (?, ?, ?)",
+                             (lote_id, indice, serializar(resultado).decode("utf-8")))
+
+almacen_lotes = AlmacenLotes()
+
+def leer_empresas(valor) -> List[str]:
+    """Lista de nombres o RUTs sin vacíos. Acepta lista o texto con una empresa por línea"""
+    if isinstance(valor, str):
+        valor = valor.splitlines()
+    if not isinstance(valor, list):
+        raise ValueError("empresas debe ser una lista de nombres o RUTs")
+    empresas = [str(empresa).strip() for empresa in valor if str(empresa).strip()]
+    if not empresas:
+        raise ValueError("La lista de empresas está vacía")
+    if len(empresas) > MAX_EMPRESAS_LOTE:
+        raise ValueError(f"Máximo {MAX_EMPRESAS_LOTE} empresas por lote")
+    return empresas
+
+def consultar_empresa(empresa: str) -> Dict:
+    """Busca los proyectos de una empresa con el scraper por titular (en un hilo del pool)"""
+    from scrapers.seia_titular import buscar_proyectos_por_titular
+
+    inicio = time.perf_counter()
+    try:
+        resultado = buscar_proyectos_por_titular(empresa, respetar_limite=True)
+    except Exception as e:
+        logger.error(f"❌ Error consultando '{empresa}' en lote: {e}")
+        resultado = {"success": False, "error": str(e)[:200]}
+
+    respuesta = {"empresa": empresa, "success": bool(resultado.get("success"))}
+    # Sin proyectos confirmado por el SEIA es un resultado definitivo; un error de consulta no
+    respuesta["completa"] = respuesta["success"] or bool(resultado.get("busqueda_completa")
+                                                         or resultado.get("cache_negativa"))
+    if respuesta["success"]:
+        proyectos = resultado.get("data", {}).get("lista_proyectos", [])
+        respuesta["proyectos_encontrados"] = len(proyectos)
+        respuesta["lista_proyectos"] = [
+            {campo: proyecto.get(campo) for campo in CAMPOS_PROYECTO if proyecto.get(campo) is not None}
+            for proyecto in proyectos[:MAX_PROYECTOS_POR_EMPRESA]
+        ]
+    else:
+        respuesta["error"] = resultado.get("error", "Sin resultados")
+    respuesta["duracion_ms"] = round((time.perf_counter() - inicio) * 1000)
+    return respuesta
+
+def _reintentar(resultado: Dict) -> bool:
+    """Resultado guardado con error y sin respuesta definitiva: se vuelve a consultar al reanudar"""
+    return bool(resultado.get("error")) and not resultado.get("completa")
+
+def _procesar(lote_id: str, indice: int, empresa: str) -> Dict:
+    """Consulta y guarda de inmediato: si el cliente se desconecta el resultado igual queda en el lote"""
+    resultado = dict(consultar_empresa(empresa), indice=indice)
+    try:
+        almacen_lotes.guardar_resultado(lote_id, indice, resultado)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"⚠️ No se pudo guardar el resultado {indice} del lote {lote_id}: {e}")
+    return resultado
+
+def _linea(datos: Dict) -> bytes:
+    return serializar(datos) + b"\n"
+
+async def transmitir_lote(lote_id: str, empresas: List[str]) -> AsyncIterator[bytes]:
+    """Líneas NDJSON: encabezado, resultados guardados (reanudación), resultados nuevos y resumen final"""
+    inicio = time.perf_counter()
+    previos = {indice: resultado for indice, resultado in almacen_lotes.resultados(lote_id).items()
+               if not _reintentar(resultado)}
+    yield _linea({"lote_id": lote_id, "total": len(empresas), "completados": len(previos)})
+
+    for indice in sorted(previos):
+        yield _linea(dict(previos[indice], reanudado=True))
+
+    loop = asyncio.get_running_loop()
+    tareas = [
+        loop.run_in_executor(ejecutor_lotes, _procesar, lote_id, indice, empresa)
+        for indice, empresa in enumerate(empresas) if indice not in previos
+    ]
+    exitosos = sum(1 for r in previos.values() if r.get("success"))
+    try:
+        for siguiente in asyncio.as_completed(tareas):
+            resultado = await siguiente
+            exitosos += resultado["success"]
+            yield _linea(resultado)
+    finally:
+        # Cliente desconectado: las empresas que aún no empiezan no ocupan el pool compartido
+        for tarea in tareas:
+            tarea.cancel()
+
+    yield _linea({
+        "fin": True,
+        "lote_id": lote_id,
+        "total": len(empresas),
+        "exitosos": exitosos,
+        "duracion_ms": round((time.perf_counter() - inicio) * 1000),
+    })
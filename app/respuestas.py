@@ -0,0 +1,100 @@
+# app/respuestas.py
+# Capa de respuestas JSON de la API: serialización con orjson (fallback a json),
+# proyección de campos con fields= y compresión gzip/brotli según Accept-Encoding.
+
+import gzip
+import json
+import logging
+import os
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Optional, Set
+
+from starlette.responses import Response
+
+from app.assets import acepta
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    ORJSON_DISPONIBLE = True
+except ImportError:
+    ORJSON_DISPONIBLE = False
+    logger.warning("⚠️ orjson no disponible, usando json estándar")
+
+try:
+    import brotli
+    BROTLI_DISPONIBLE = True
+except ImportError:
+    BROTLI_DISPONIBLE = False
+
+# Bajo este tamaño la compresión cuesta más CPU de lo que ahorra en la red
+UMBRAL_COMPRESION = int(os.getenv("RESPUESTA_UMBRAL_COMPRESION", "1024"))
+NIVEL_GZIP = 6
+CALIDAD_BROTLI = 4  # Calidades altas son para assets precomprimidos, no para respuestas en línea
+
+# Campos que se conservan siempre, aunque no estén en fields=, para detectar errores
+CAMPOS_SIEMPRE = {"success", "error"}
+
+def _por_defecto(valor: Any) -> Any:
+    """Tipos que json/orjson no serializan solos (sets, Decimal, objetos de modelos)"""
+    if isinstance(valor, (set, frozenset)):
+        return list(valor)
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    return str(valor)
+
+def serializar(datos: Any) -> bytes:
+    """Serializa a JSON UTF-8 con orjson si está disponible"""
+    if ORJSON_DISPONIBLE:
+        return orjson.dumps(datos, default=_por_defecto, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(datos, ensure_ascii=False, separators=(",", ":"), default=_por_defecto).encode("utf-8")
+
+def leer_campos(valor: Any) -> Optional[Set[str]]:
+    """Normaliza fields= (lista o texto separado por comas) a un set; None si no se pidió proyección"""
+    if not valor:
+        return None
+    if isinstance(valor, str):
+        valor = valor.split(",")
+    campos = {str(campo).strip() for campo in valor if str(campo).strip()}
+    return campos or None
+
+def proyectar(datos: Any, campos: Optional[Iterable[str]]) -> Any:
+    """Aplica fields= a las claves de primer nivel de la respuesta.
+
+    'lista_proyectos,empresa_info' deja solo esas claves; '-respuesta,-referencias'
+    quita esas y deja el resto. 'success' y 'error' se conservan siempre.
+    """
+    if not campos or not isinstance(datos, dict):
+        return datos
+    excluidos = {campo[1:] for campo in campos if campo.startswith("-")}
+    incluidos = {campo for campo in campos if not campo.startswith("-")}
+    return {
+        clave: valor for clave, valor in datos.items()
+        if clave in CAMPOS_SIEMPRE or ((not incluidos or clave in incluidos) and clave not in excluidos)
+    }
+
+def comprimir(cuerpo: bytes, accept_encoding: str):
+    """Retorna (cuerpo, codificación) con la mejor codificación aceptada, o el cuerpo original bajo el umbral"""
+    if len(cuerpo) < UMBRAL_COMPRESION:
+        return cuerpo, None
+    if BROTLI_DISPONIBLE and acepta(accept_encoding, "br"):
+        return brotli.compress(cuerpo, quality=CALIDAD_BROTLI), "br"
+    if acepta(accept_encoding, "gzip"):
+        return gzip.compress(cuerpo, compresslevel=NIVEL_GZIP), "gzip"
+    return cuerpo, None
+
+def respuesta_json(request, datos: Any, status_code: int = 200, campos: Any = None,
+                   encabezados: Optional[Dict[str, str]] = None) -> Response:
+    """Respuesta JSON proyectada, serializada y comprimida según el cliente.
+
+    fields= se lee de la query string o, si no viene, del argumento campos (por ejemplo del body).
+    """
+    seleccion = leer_campos(request.query_params.get("fields") or campos)
+    cuerpo = serializar(proyectar(datos, seleccion))
+    cuerpo, codificacion = comprimir(cuerpo, request.headers.get("accept-encoding", ""))
+
+    encabezados = dict(encabezados or {}, Vary="Accept-Encoding")
+    if codificacion:
+        encabezados["Content-Encoding"] = codificacion
+    return Response(cuerpo, status_code=status_code, media_type="application/json", headers=encabezados)
@@ -0,0 +1,31 @@
+# app/tiempos.py
+# Tiempos por etapa de cada request, expuestos en el header Server-Timing.
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+# Etapas medidas en el request actual: [(nombre, milisegundos)]
+_etapas: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("etapas_request", default=None)
+
+def iniciar_medicion() -> List[Tuple[str, float]]:
+    """Inicia la medición del request actual y retorna la lista donde se acumulan las etapas"""
+    etapas: List[Tuple[str, float]] = []
+    _etapas.set(etapas)
+    return etapas
+
+@contextmanager
+def medir_etapa(nombre: str):
+    """Mide la duración del bloque como una etapa del request (no hace nada fuera de un request)"""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        etapas = _etapas.get()
+        if etapas is not None:
+            etapas.append((nombre, (time.perf_counter() - inicio) * 1000))
+
+def formatear_server_timing(etapas: List[Tuple[str, float]]) -> str:
+    """Formato del header: 'empresa;dur=812.4, respuesta;dur=1.2, total;dur=815.0'"""
+    return ", ".join(f"{nombre};dur={duracion:.1f}" for nombre, duracion in etapas)
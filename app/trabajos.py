@@ -0,0 +1,251 @@
+# app/trabajos.py
+# Cola de trabajos durable en SQLite para scrapes de detalle que tardan decenas de segundos.
+# El request encola y responde 202 con un job_id; un proceso consumidor aparte (python -m app.trabajos,
+# lanzado por gunicorn) toma los trabajos de la cola compartida para que el scraping no compita con
+# los requests, y GET /jobs/{id} entrega el estado y el resultado.
+# Los trabajos que quedaron en proceso cuando un consumidor murió se retoman tras TIMEOUT_TRABAJO.
+
+import hashlib
+import json
+import logging
+import os
+import signal
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+from app.respuestas import serializar
+
+logger = logging.getLogger(__name__)
+
+RUTA_TRABAJOS = os.getenv("TRABAJOS_DB_RUTA", os.path.join("data", "trabajos.sqlite"))
+# Hilos consumidores dentro de cada worker web (0: solo el proceso consumidor toma trabajos)
+HILOS_POR_WORKER = int(os.getenv("TRABAJOS_HILOS", "0"))
+HILOS_CONSUMIDOR = int(os.getenv("TRABAJOS_HILOS_CONSUMIDOR", "2"))
+TTL_RESULTADO = int(os.getenv("TRABAJOS_TTL_RESULTADO", str(3600)))
+TIMEOUT_TRABAJO = int(os.getenv("TRABAJOS_TIMEOUT", "300"))
+MAX_INTENTOS = int(os.getenv("TRABAJOS_MAX_INTENTOS", "3"))
+ESPERA_SIN_TRABAJOS = 1.0  # segundos entre consultas a la cola vacía
+
+PENDIENTE, EN_PROCESO, COMPLETADO, ERROR = "pendiente", "en_proceso", "completado", "error"
+
+# tipo de trabajo -> función(**parametros) que retorna el resultado serializable
+_manejadores: Dict[str, Callable[..., Dict]] = {}
+
+def registrar_manejador(tipo: str, funcion: Callable[..., Dict]) -> None:
+    _manejadores[tipo] = funcion
+
+class ColaTrabajos:
+    """Cola en SQLite compartida por todos los workers del servidor"""
+
+    def __init__(self, ruta: str = RUTA_TRABAJOS):
+        self.ruta = ruta
+        self._lock = threading.Lock()
+        self._inicializada = False
+
+    @contextmanager
+    def _conectar(self):
+        """Conexión de corta duración en modo autocommit; las transacciones se abren explícitamente"""
+        if not self._inicializada:
+            os.makedirs(os.path.dirname(self.ruta) or '.', exist_ok=True)
+        conexion = sqlite3.connect(self.ruta, timeout=10, isolation_level=None)
+        try:
+            if not self._inicializada:
+                with self._lock:
+                    conexion.execute("PRAGMA journal_mode=WAL")
+                    conexion.execute(
+                        "CREATE TABLE IF NOT EXISTS trabajos (id TEXT PRIMARY KEY, tipo TEXT, parametros TEXT, "
+                        "huella TEXT, estado TEXT, resultado TEXT, error TEXT, intentos INTEGER DEFAULT 0, "
+                        "creado REAL, iniciado REAL, terminado REAL)"
+                    )
+                    conexion.execute("CREATE INDEX IF NOT EXISTS ix_trabajos_estado ON trabajos (estado, creado)")
+                    conexion.execute("CREATE INDEX IF NOT EXISTS ix_trabajos_huella ON trabajos (huella)")
+                    self._inicializada = True
+            yield conexion
+        finally:
+            conexion.close()
+
+    def encolar(self, tipo: str, parametros: Dict) -> Dict:
+        """Encola el trabajo, o retorna el mismo trabajo si ya está en curso o con resultado vigente"""
+        if tipo not in _manejadores:
+            raise ValueError(f"Tipo de trabajo desconocido: {tipo}")
+        texto = json.dumps(parametros, sort_keys=True, ensure_ascii=False)
+        huella = hashlib.sha256(f"{tipo}|{texto}".encode("utf-8")).hexdigest()
+        ahora = time.time()
+
+        with self._conectar() as conexion:
+            conexion.execute("BEGIN IMMEDIATE")
+            try:
+                fila = conexion.execute(
+                    "SELECT id, estado FROM trabajos WHERE huella = ? AND "
+                    "(estado IN (?, ?) OR (estado = ? AND terminado > ?)) ORDER BY creado DESC LIMIT 1",
+                    (huella, PENDIENTE, EN_PROCESO, COMPLETADO, ahora - TTL_RESULTADO)
+                ).fetchone()
+                if fila:
+                    conexion.execute("COMMIT")
+                    return {"job_id": fila[0], "estado": fila[1]}
+                trabajo_id = uuid.uuid4().hex
+                conexion.execute(
+                    "INSERT INTO trabajos (id, tipo, parametros, huella, estado, creado) VALUES (?, ?, ?, ?, ?, ?)",
+                    (trabajo_id, tipo, texto, huella, PENDIENTE, ahora)
+                )
+                conexion.execute("COMMIT")
+            except BaseException:
+                conexion.execute("ROLLBACK")
+                raise
+        logger.info(f"📥 Trabajo {tipo} encolado: {trabajo_id}")
+        return {"job_id": trabajo_id, "estado": PENDIENTE}
+
+    def tomar(self) -> Optional[Dict]:
+        """Reserva el trabajo pendiente más antiguo (o uno abandonado en proceso) para este hilo"""
+        ahora = time.time()
+        with self._conectar() as conexion:
+            conexion.execute("BEGIN IMMEDIATE")
+            try:
+                fila = conexion.execute(
+                    "SELECT id, tipo, parametros, intentos FROM trabajos WHERE estado = ? "
+                    "OR (estado = ? AND iniciado < ? AND intentos < ?) ORDER BY creado LIMIT 1",
+                    (PENDIENTE, EN_PROCESO, ahora - TIMEOUT_TRABAJO, MAX_INTENTOS)
+                ).fetchone()
+                if fila:
+                    conexion.execute(
+                        "UPDATE trabajos SET estado = ?, iniciado = ?, intentos = intentos + 1 WHERE id = ?",
+                        (EN_PROCESO, ahora, fila[0])
+                    )
+                conexion.execute("COMMIT")
+            except BaseException:
+                conexion.execute("ROLLBACK")
+                raise
+        if not fila:
+            return None
+        return {"id": fila[0], "tipo": fila[1], "parametros": json.loads(fila[2]), "intentos": fila[3] + 1}
+
+    def completar(self, trabajo_id: str, resultado: Dict) -> None:
+        with self._conectar() as conexion:
+            conexion.execute(
+                "UPDATE trabajos SET estado = ?, resultado = ?, error = NULL, terminado = ? WHERE id = ?",
+                (COMPLETADO, serializar(resultado).decode("utf-8"), time.time(), trabajo_id)
+            )
+
+    def fallar(self, trabajo_id: str, error: str, intentos: int, reintentar: bool = True) -> None:
+        """Vuelve a la cola si el error es transitorio y quedan intentos; si no, queda en error"""
+        estado = PENDIENTE if reintentar and intentos < MAX_INTENTOS else ERROR
+        with self._conectar() as conexion:
+            conexion.execute(
+                "UPDATE trabajos SET estado = ?, error = ?, terminado = ? WHERE id = ?",
+                (estado, error[:500], time.time(), trabajo_id)
+            )
+
+    def obtener(self, trabajo_id: str) -> Optional[Dict]:
+        with self._conectar() as conexion:
+            fila = conexion.execute(
+                "SELECT id, tipo, estado, resultado, error, intentos, creado, iniciado, terminado "
+                "FROM trabajos WHERE id = ?", (trabajo_id,)
+            ).fetchone()
+        if not fila:
+            return None
+        trabajo = {"job_id": fila[0], "tipo": fila[1], "estado": fila[2], "intentos": fila[5],
+                   "creado": fila[6], "iniciado": fila[7], "terminado": fila[8]}
+        if fila[2] == PENDIENTE:
+            trabajo["posicion"] = self._posicion(fila[6])
+        if fila[3] is not None:
+            trabajo["resultado"] = json.loads(fila[3])
+        if fila[4]:
+            trabajo["error"] = fila[4]
+        return trabajo
+
+    def _posicion(self, creado: float) -> int:
+        with self._conectar() as conexion:
+            return conexion.execute(
+                "SELECT COUNT(*) FROM trabajos WHERE estado = ? AND creado < ?", (PENDIENTE, creado)
+            ).fetchone()[0] + 1
+
+    def purgar(self) -> int:
+        """Elimina los trabajos terminados cuyo resultado superó TTL_RESULTADO"""
+        with self._conectar() as conexion:
+            # Abandonados en proceso sin intentos restantes (el worker murió en cada intento)
+            conexion.execute(
+                "UPDATE trabajos SET estado = ?, error = ?, terminado = ? "
+                "WHERE estado = ? AND iniciado < ? AND intentos >= ?",
+                (ERROR, "Trabajo abandonado", time.time(), EN_PROCESO, time.time() - TIMEOUT_TRABAJO, MAX_INTENTOS)
+            )
+            cursor = conexion.execute(
+                "DELETE FROM trabajos WHERE estado IN (?, ?) AND terminado < ?",
+                (COMPLETADO, ERROR, time.time() - TTL_RESULTADO)
+            )
+            return cursor.rowcount
+
+    def estadisticas(self) -> Dict[str, int]:
+        with self._conectar() as conexion:
+            return dict(conexion.execute("SELECT estado, COUNT(*) FROM trabajos GROUP BY estado").fetchall())
+
+cola_trabajos = ColaTrabajos()
+
+def _es_transitorio(error: Exception) -> bool:
+    """Un 4xx (salvo 408 y 429) es un error de la solicitud: reintentarlo da el mismo resultado"""
+    estado = getattr(error, "status_code", None)
+    return not (isinstance(estado, int) and 400 <= estado < 500 and estado not in (408, 429))
+
+def ejecutar_trabajo(cola: ColaTrabajos, trabajo: Dict) -> None:
+    """Ejecuta un trabajo tomado y guarda su resultado o su error"""
+    inicio = time.perf_counter()
+    try:
+        resultado = _manejadores[trabajo["tipo"]](**trabajo["parametros"])
+    except Exception as e:
+        # HTTPException trae el mensaje en detail
+        error = str(getattr(e, "detail", "") or e)
+        reintentar = _es_transitorio(e)
+        logger.warning(f"⚠️ Trabajo {trabajo['id']} falló (intento {trabajo['intentos']}/{MAX_INTENTOS}"
+                       f"{'' if reintentar else ', sin reintento'}): {error}")
+        cola.fallar(trabajo["id"], error, trabajo["intentos"], reintentar)
+        return
+    cola.completar(trabajo["id"], resultado)
+    logger.info(f"✅ Trabajo {trabajo['tipo']} {trabajo['id']} en {time.perf_counter() - inicio:.1f}s")
+
+def _bucle_trabajos(cola: ColaTrabajos, detener: threading.Event) -> None:
+    ultima_purga = 0.0
+    while not detener.is_set():
+        try:
+            if time.monotonic() - ultima_purga > 600:
+                cola.purgar()
+                ultima_purga = time.monotonic()
+            trabajo = cola.tomar()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Cola de trabajos no disponible: {e}")
+            trabajo = None
+        if trabajo is None:
+            detener.wait(ESPERA_SIN_TRABAJOS)
+            continue
+        ejecutar_trabajo(cola, trabajo)
+
+def iniciar_hilos_trabajos(hilos: int = HILOS_POR_WORKER, cola: ColaTrabajos = cola_trabajos) -> threading.Event:
+    """Inicia los hilos consumidores del worker; el evento retornado los detiene"""
+    detener = threading.Event()
+    for numero in range(max(0, hilos)):
+        threading.Thread(target=_bucle_trabajos, args=(cola, detener),
+                         name=f"trabajos-{numero}", daemon=True).start()
+    if hilos:
+        logger.info(f"🧵 {hilos} hilos de trabajos en segundo plano")
+    return detener
+
+def consumir(hilos: int = HILOS_CONSUMIDOR) -> None:
+    """Proceso consumidor: registra los manejadores de la aplicación y procesa la cola hasta SIGTERM"""
+    logging.basicConfig(level=logging.INFO)
+    import main  # noqa: F401 - registra los manejadores de trabajos
+
+    detener = iniciar_hilos_trabajos(max(1, hilos))
+    signal.signal(signal.SIGTERM, lambda *_: detener.set())
+    try:
+        while not detener.wait(1):
+            pass
+    except KeyboardInterrupt:
+        detener.set()
+    logger.info("👋 Consumidor de trabajos detenido")
+
+if __name__ == "__main__":
+    # Con -m este módulo es __main__: los manejadores se registran en app.trabajos
+    from app.trabajos import consumir as consumir_cola
+    consumir_cola()
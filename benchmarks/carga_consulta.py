@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Prueba de carga de /consulta y /seleccionar_proyecto.
+
+Genera una mezcla de consultas general / legal / proyecto (con el flujo de dos pasos
+consulta -> seleccionar_proyecto) en lazo cerrado (N usuarios concurrentes) o en lazo
+abierto (llegadas de Poisson a una tasa fija), y reporta p50/p95/p99, throughput,
+tasa de errores y tiempos por etapa (header Server-Timing) en un archivo JSON.
+
+Ejemplos:
+    # Contra un servidor ya levantado, 16 usuarios durante 60 s
+    python benchmarks/carga_consulta.py --url http://127.0.0.1:8000 --concurrencia 16 --duracion 60
+
+    # Levanta gunicorn (gunicorn_config.py) con 4 workers y el simulador upstream, lazo abierto a 20 req/s
+    python benchmarks/carga_consulta.py --gunicorn --workers-gunicorn 4 --simulador --tasa 20 --salida r4.json
+
+    # Comparar con una ejecución anterior
+    python benchmarks/carga_consulta.py --gunicorn --simulador --comparar r4.json
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CONSULTAS_GENERALES = [
+    "¿Qué permisos ambientales necesito para una planta de tratamiento de aguas?",
+    "Obligaciones de una empresa minera en materia de residuos",
+    "¿Cuándo un proyecto debe ingresar al SEIA?",
+    "Normativa sobre emisiones de ruido en zonas urbanas",
+    "Requisitos para extraer agua de un pozo",
+]
+CONSULTAS_LEGALES = [
+    "ley 19300 bases generales del medio ambiente",
+    "reglamento del sistema de evaluación de impacto ambiental",
+    "código de aguas derechos de aprovechamiento",
+    "norma de emisión de ruidos decreto 38",
+    "ley marco de cambio climático",
+    "responsabilidad extendida del productor reciclaje",
+]
+EMPRESAS = [
+    "Codelco", "Enel", "Colbún", "Acciona", "Minera Candelaria", "Aguas Andinas",
+    "AES Andes", "Engie", "Anglo American", "Arauco",
+]
+
+MEZCLA_POR_DEFECTO = "general=0.3,legal=0.4,proyecto=0.3"
+
+# --- Cliente HTTP (una conexión keep-alive por hilo) ---
+
+class ClienteHTTP:
+    def __init__(self, url_base: str, timeout: float):
+        url = urlparse(url_base)
+        self.host = url.hostname
+        self.puerto = url.port or (443 if url.scheme == 'https' else 80)
+        self.https = url.scheme == 'https'
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _conexion(self):
+        conexion = getattr(self._local, 'conexion', None)
+        if conexion is None:
+            clase = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            conexion = clase(self.host, self.puerto, timeout=self.timeout)
+            self._local.conexion = conexion
+        return conexion
+
+    def post_json(self, ruta: str, datos: Dict) -> Tuple[int, Dict, Dict[str, str]]:
+        """Retorna (código, cuerpo JSON, headers). Código 0 si falló la conexión"""
+        cuerpo = json.dumps(datos).encode('utf-8')
+        for intento in range(2):
+            conexion = self._conexion()
+            try:
+                conexion.request('POST', ruta, body=cuerpo, headers={'Content-Type': 'application/json'})
+                respuesta = conexion.getresponse()
+                contenido = respuesta.read()
+                headers = {k.lower(): v for k, v in respuesta.getheaders()}
+                try:
+                    datos_respuesta = json.loads(contenido) if contenido else {}
+                except ValueError:
+                    datos_respuesta = {}
+                return respuesta.status, datos_respuesta, headers
+            except (http.client.HTTPException, OSError):
+                # Conexión keep-alive cerrada por el servidor: se reintenta una vez con una nueva
+                conexion.close()
+                self._local.conexion = None
+                if intento == 1:
+                    return 0, {}, {}
+        return 0, {}, {}
+
+def parsear_server_timing(header: str) -> Dict[str, float]:
+    """'empresa;dur=812.4, total;dur=815.0' -> {'empresa': 812.4, 'total': 815.0}"""
+    etapas = {}
+    for parte in (header or '').split(','):
+        nombre, _, resto = parte.strip().partition(';')
+        if nombre and 'dur=' in resto:
+            try:
+                etapas[nombre] = float(resto.split('dur=')[1].split(';')[0])
+            except ValueError:
+                pass
+    return etapas
+
+# --- Registro de resultados ---
+
+class Registro:
+    def __init__(self):
+        self.muestras: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def agregar(self, operacion: str, latencia_ms: float, codigo: int, ok: bool, etapas: Dict[str, float]):
+        with self._lock:
+            self.muestras.append({'operacion': operacion, 'latencia_ms': latencia_ms,
+                                  'codigo': codigo, 'ok': ok, 'etapas': etapas})
+
+def percentil(valores: List[float], p: float) -> float:
+    """Percentil con interpolación lineal sobre valores ordenados"""
+    if not valores:
+        return 0.0
+    if len(valores) == 1:
+        return valores[0]
+    posicion = (len(valores) - 1) * p / 100.0
+    inferior = int(posicion)
+    superior = min(inferior + 1, len(valores) - 1)
+    return valores[inferior] + (valores[superior] - valores[inferior]) * (posicion - inferior)
+
+def resumir_latencias(valores: List[float]) -> Dict[str, float]:
+    ordenados = sorted(valores)
+    return {
+        'p50': round(percentil(ordenados, 50), 1),
+        'p95': round(percentil(ordenados, 95), 1),
+        'p99': round(percentil(ordenados, 99), 1),
+        'media': round(sum(ordenados) / len(ordenados), 1) if ordenados else 0.0,
+        'max': round(ordenados[-1], 1) if ordenados else 0.0,
+    }
+
+def generar_reporte(registro: Registro, duracion: float, configuracion: Dict) -> Dict:
+    por_operacion: Dict[str, Dict] = {}
+    codigos: Dict[str, int] = {}
+
+    operaciones = sorted({m['operacion'] for m in registro.muestras})
+    for operacion in operaciones:
+        muestras = [m for m in registro.muestras if m['operacion'] == operacion]
+        errores = sum(1 for m in muestras if not m['ok'])
+
+        etapas: Dict[str, List[float]] = {}
+        for m in muestras:
+            for etapa, dur in m['etapas'].items():
+                etapas.setdefault(etapa, []).append(dur)
+
+        por_operacion[operacion] = {
+            'solicitudes': len(muestras),
+            'errores': errores,
+            'tasa_error': round(errores / len(muestras), 4),
+            'throughput_rps': round(len(muestras) / duracion, 2) if duracion else 0.0,
+            'latencia_ms': resumir_latencias([m['latencia_ms'] for m in muestras]),
+            'etapas_servidor_ms': {e: resumir_latencias(v) for e, v in sorted(etapas.items())},
+        }
+
+    solicitudes = [m for m in registro.muestras if not m['operacion'].startswith('flujo_')]
+    for m in solicitudes:
+        codigos[str(m['codigo'])] = codigos.get(str(m['codigo']), 0) + 1
+    errores = sum(1 for m in solicitudes if not m['ok'])
+
+    return {
+        'configuracion': configuracion,
+        'duracion_segundos': round(duracion, 2),
+        'solicitudes': len(solicitudes),
+        'errores': errores,
+        'tasa_error': round(errores / len(solicitudes), 4) if solicitudes else 0.0,
+        'throughput_rps': round(len(solicitudes) / duracion, 2) if duracion else 0.0,
+        'latencia_ms': resumir_latencias([m['latencia_ms'] for m in solicitudes]),
+        'codigos': codigos,
+        'operaciones': por_operacion,
+    }
+
+# --- Generación de carga ---
+
+class GeneradorCarga:
+    def __init__(self, cliente: ClienteHTTP, registro: Registro, mezcla: Dict[str, float],
+                 prob_seleccion: float, semilla: Optional[int]):
+        self.cliente = cliente
+        self.registro = registro
+        self.tipos = list(mezcla.keys())
+        self.pesos = list(mezcla.values())
+        self.prob_seleccion = prob_seleccion
+        self._rng = random.Random(semilla)
+        self._rng_lock = threading.Lock()
+
+    def _elegir(self):
+        with self._rng_lock:
+            tipo = self._rng.choices(self.tipos, weights=self.pesos)[0]
+            consulta = self._rng.choice(CONSULTAS_LEGALES if tipo == 'legal' else CONSULTAS_GENERALES)
+            empresa = self._rng.choice(EMPRESAS)
+            seleccionar = self._rng.random() < self.prob_seleccion
+            semilla_proyecto = self._rng.random()
+        return tipo, consulta, empresa, seleccionar, semilla_proyecto
+
+    def _solicitud(self, operacion: str, ruta: str, datos: Dict, inicio: Optional[float] = None) -> Dict:
+        """Ejecuta y registra una solicitud. 'inicio' permite medir desde la llegada programada (lazo abierto)"""
+        inicio = inicio if inicio is not None else time.perf_counter()
+        codigo, cuerpo, headers = self.cliente.post_json(ruta, datos)
+        latencia_ms = (time.perf_counter() - inicio) * 1000
+        ok = codigo == 200 and cuerpo.get('success', False) is not False
+        self.registro.agregar(operacion, latencia_ms, codigo, ok, parsear_server_timing(headers.get('server-timing')))
+        return cuerpo if ok else {}
+
+    def ejecutar_flujo(self, llegada: Optional[float] = None):
+        tipo, consulta, empresa, seleccionar, semilla_proyecto = self._elegir()
+        inicio = llegada if llegada is not None else time.perf_counter()
+
+        if tipo != 'proyecto':
+            self._solicitud(f"consulta_{tipo}", '/consulta', {'query': consulta, 'query_type': tipo}, inicio)
+            return
+
+        cuerpo = self._solicitud('consulta_proyecto', '/consulta',
+                                 {'query': '', 'query_type': 'proyecto', 'company_name': empresa}, inicio)
+        proyectos = cuerpo.get('lista_proyectos') or []
+        if cuerpo.get('requiere_seleccion') and proyectos and seleccionar:
+            # Se elige con sesgo hacia los primeros del ranking, como un usuario real
+            indice = min(int(semilla_proyecto ** 2 * len(proyectos)), len(proyectos) - 1)
+            seleccion = self._solicitud('seleccionar_proyecto', '/seleccionar_proyecto', {
+                'empresa_nombre': empresa, 'proyecto_id': proyectos[indice]['id'],
+                'query': '', 'query_type': 'proyecto'
+            })
+            latencia_flujo = (time.perf_counter() - inicio) * 1000
+            self.registro.agregar('flujo_proyecto_con_seleccion', latencia_flujo, 200, bool(seleccion), {})
+
+    def lazo_cerrado(self, concurrencia: int, duracion: float):
+        """N usuarios que envían la siguiente consulta apenas reciben la anterior"""
+        fin = time.perf_counter() + duracion
+
+        def usuario():
+            while time.perf_counter() < fin:
+                self.ejecutar_flujo()
+
+        hilos = [threading.Thread(target=usuario, daemon=True) for _ in range(concurrencia)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+    def lazo_abierto(self, tasa: float, duracion: float, max_en_vuelo: int):
+        """
+        Llegadas de Poisson a 'tasa' flujos/s, independientes de las respuestas.
+        La latencia se mide desde la llegada programada, así la espera en cola también cuenta.
+        """
+        with self._rng_lock:
+            rng = random.Random(self._rng.random())
+        inicio = time.perf_counter()
+        siguiente = inicio
+
+        with ThreadPoolExecutor(max_workers=max_en_vuelo) as pool:
+            while siguiente < inicio + duracion:
+                espera = siguiente - time.perf_counter()
+                if espera > 0:
+                    time.sleep(espera)
+                pool.submit(self.ejecutar_flujo, siguiente)
+                siguiente += rng.expovariate(tasa)
+
+# --- Procesos auxiliares (gunicorn y simulador) ---
+
+def esperar_servidor(url: str, timeout: float = 60.0) -> bool:
+    url_parseada = urlparse(url)
+    limite = time.time() + timeout
+    while time.time() < limite:
+        try:
+            conexion = http.client.HTTPConnection(url_parseada.hostname, url_parseada.port or 80, timeout=2)
+            conexion.request('GET', '/health')
+            if conexion.getresponse().status < 500:
+                return True
+        except OSError:
+            pass
+        time.sleep(0.5)
+    return False
+
+def lanzar_gunicorn(puerto: int, workers: Optional[int], entorno_extra: Dict[str, str]) -> subprocess.Popen:
+    entorno = dict(os.environ, PORT=str(puerto), **entorno_extra)
+    if workers:
+        entorno['WEB_CONCURRENCY'] = str(workers)
+    return subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn_config.py', 'main:app'],
+        cwd=RAIZ, env=entorno, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+def lanzar_simulador(puerto: int, latencias: List[str]) -> subprocess.Popen:
+    comando = [sys.executable, os.path.join(RAIZ, 'simulador', 'servidor_upstream.py'), '--puerto', str(puerto)]
+    for latencia in latencias:
+        comando += ['--latencia', latencia]
+    return subprocess.Popen(comando, cwd=RAIZ, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+# --- CLI ---
+
+def parsear_mezcla(texto: str) -> Dict[str, float]:
+    mezcla = {}
+    for parte in texto.split(','):
+        tipo, _, peso = parte.partition('=')
+        tipo = tipo.strip()
+        if tipo not in ('general', 'legal', 'proyecto'):
+            raise ValueError(f"Tipo de consulta desconocido en la mezcla: {tipo}")
+        mezcla[tipo] = float(peso)
+    return mezcla
+
+def imprimir_reporte(reporte: Dict):
+    print("\n📊 RESULTADOS")
+    print(f"⏱️ {reporte['duracion_segundos']}s | {reporte['solicitudes']} solicitudes | "
+          f"{reporte['throughput_rps']} req/s | errores {reporte['tasa_error']:.2%}")
+    lat = reporte['latencia_ms']
+    print(f"📈 Global: p50 {lat['p50']} ms | p95 {lat['p95']} ms | p99 {lat['p99']} ms")
+    for operacion, datos in reporte['operaciones'].items():
+        lat = datos['latencia_ms']
+        print(f"  • {operacion:30s} n={datos['solicitudes']:5d}  p50 {lat['p50']:8.1f}  p95 {lat['p95']:8.1f}  "
+              f"p99 {lat['p99']:8.1f}  errores {datos['tasa_error']:.2%}")
+        for etapa, lat_etapa in datos['etapas_servidor_ms'].items():
+            print(f"      - {etapa:24s} p50 {lat_etapa['p50']:8.1f}  p95 {lat_etapa['p95']:8.1f}")
+
+def imprimir_comparacion(actual: Dict, base: Dict):
+    print("\n🔁 COMPARACIÓN CON LA EJECUCIÓN BASE (p95)")
+    for operacion, datos in actual['operaciones'].items():
+        anterior = base.get('operaciones', {}).get(operacion)
+        if not anterior:
+            continue
+        p95_base = anterior['latencia_ms']['p95']
+        p95_actual = datos['latencia_ms']['p95']
+        variacion = (p95_actual - p95_base) / p95_base if p95_base else 0.0
+        marca = "🔺" if variacion > 0.1 else "🔻" if variacion < -0.1 else "▫️"
+        print(f"  {marca} {operacion:30s} {p95_base:8.1f} -> {p95_actual:8.1f} ms ({variacion:+.1%})")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Prueba de carga de /consulta y /seleccionar_proyecto")
+    parser.add_argument('--url', default='http://127.0.0.1:8000', help="URL del servidor bajo prueba")
+    parser.add_argument('--duracion', type=float, default=30.0, help="Segundos de medición")
+    parser.add_argument('--calentamiento', type=float, default=5.0, help="Segundos de carga previa no medida")
+    parser.add_argument('--concurrencia', type=int, default=8, help="Usuarios concurrentes (lazo cerrado)")
+    parser.add_argument('--tasa', type=float, help="Flujos por segundo (lazo abierto); reemplaza --concurrencia")
+    parser.add_argument('--max-en-vuelo', type=int, default=256, help="Máximo de flujos simultáneos en lazo abierto")
+    parser.add_argument('--mezcla', default=MEZCLA_POR_DEFECTO, help="Pesos por tipo, ej. general=0.3,legal=0.4,proyecto=0.3")
+    parser.add_argument('--prob-seleccion', type=float, default=0.7,
+                        help="Fracción de búsquedas de proyecto que continúan con /seleccionar_proyecto")
+    parser.add_argument('--timeout', type=float, default=120.0, help="Timeout por solicitud (igual al de gunicorn)")
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--salida', default='resultado_carga.json', help="Archivo JSON de resultados")
+    parser.add_argument('--comparar', help="JSON de una ejecución anterior para comparar")
+    parser.add_argument('--gunicorn', action='store_true', help="Levantar main:app con gunicorn_config.py")
+    parser.add_argument('--workers-gunicorn', type=int, help="Workers de gunicorn (WEB_CONCURRENCY)")
+    parser.add_argument('--puerto', type=int, default=8010, help="Puerto de gunicorn cuando se usa --gunicorn")
+    parser.add_argument('--simulador', action='store_true', help="Levantar el simulador upstream y apuntar la app a él")
+    parser.add_argument('--puerto-simulador', type=int, default=8900)
+    parser.add_argument('--latencia-simulador', action='append', default=[],
+                        help="Latencias del simulador, ej. seia=lognormal:600:0.5 (repetible)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    mezcla = parsear_mezcla(args.mezcla)
+    procesos: List[subprocess.Popen] = []
+
+    try:
+        entorno_app = {}
+        if args.simulador:
+            procesos.append(lanzar_simulador(args.puerto_simulador, args.latencia_simulador))
+            entorno_app['UPSTREAM_SIMULADOR_URL'] = f"http://127.0.0.1:{args.puerto_simulador}"
+            print(f"🧪 Simulador upstream en {entorno_app['UPSTREAM_SIMULADOR_URL']}")
+
+        url = args.url
+        if args.gunicorn:
+            url = f"http://127.0.0.1:{args.puerto}"
+            procesos.append(lanzar_gunicorn(args.puerto, args.workers_gunicorn, entorno_app))
+            print(f"🚀 gunicorn (gunicorn_config.py) en {url} con {args.workers_gunicorn or 'los'} workers")
+
+        if not esperar_servidor(url):
+            print(f"❌ El servidor {url} no respondió")
+            sys.exit(1)
+
+        cliente = ClienteHTTP(url, args.timeout)
+        modo = f"lazo abierto {args.tasa} flujos/s" if args.tasa else f"lazo cerrado {args.concurrencia} usuarios"
+        print(f"🎯 {url} | {modo} | mezcla {mezcla} | {args.duracion}s")
+
+        if args.calentamiento > 0:
+            print(f"🔥 Calentamiento {args.calentamiento}s...")
+            calentamiento = GeneradorCarga(cliente, Registro(), mezcla, args.prob_seleccion, args.semilla + 1)
+            calentamiento.lazo_cerrado(min(args.concurrencia, 4), args.calentamiento)
+
+        registro = Registro()
+        generador = GeneradorCarga(cliente, registro, mezcla, args.prob_seleccion, args.semilla)
+        inicio = time.perf_counter()
+        if args.tasa:
+            generador.lazo_abierto(args.tasa, args.duracion, args.max_en_vuelo)
+        else:
+            generador.lazo_cerrado(args.concurrencia, args.duracion)
+        duracion = time.perf_counter() - inicio
+
+        configuracion = {
+            'url': url, 'modo': 'abierto' if args.tasa else 'cerrado', 'tasa': args.tasa,
+            'concurrencia': None if args.tasa else args.concurrencia, 'mezcla': mezcla,
+            'prob_seleccion': args.prob_seleccion, 'duracion': args.duracion,
+            'workers_gunicorn': args.workers_gunicorn, 'simulador': args.simulador,
+            'latencia_simulador': args.latencia_simulador, 'semilla': args.semilla,
+        }
+        reporte = generar_reporte(registro, duracion, configuracion)
+        imprimir_reporte(reporte)
+
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(reporte, archivo, ensure_ascii=False, indent=2)
+        print(f"\n📝 Resultados guardados en {args.salida}")
+
+        if args.comparar:
+            with open(args.comparar, encoding='utf-8') as archivo:
+                imprimir_comparacion(reporte, json.load(archivo))
+    finally:
+        for proceso in reversed(procesos):
+            proceso.terminate()
+            try:
+                proceso.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                proceso.kill()
+
+if __name__ == '__main__':
+    main()
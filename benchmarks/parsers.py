@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks de los extractores HTML sobre un corpus de páginas guardadas.
+
+Extractores medidos (parseo con BeautifulSoup incluido, tal como se usan en producción):
+    seia_titular.extraer_proyectos     SEIATitularScraper._extraer_proyectos_de_tabla
+    seia_titular.detalles_proyecto     SEIATitularScraper.obtener_detalles_proyecto
+    seia_detalle.informacion_titular   SEIAProjectDetailScraper._extraer_informacion_titular
+    seia_detalle.documentos            SEIAProjectDetailScraper._extraer_documentos
+    bcn.extraer_resultados             BCNScraper._extraer_resultados
+    bcn.detalle_norma                  BCNScraper.obtener_detalle_norma
+
+El corpus se genera con las plantillas del simulador (de páginas pequeñas a varios MB) y se
+complementa con capturas reales en benchmarks/corpus/<tipo>/*.html (tipo: seia_busqueda,
+seia_expediente, bcn_listado, bcn_norma).
+
+Por cada caso se registra tiempo por página (mediana y mínimo), asignaciones (tracemalloc)
+y RSS máximo del proceso. Cada extractor corre en su propio proceso para que el RSS sea atribuible.
+
+Uso:
+    python benchmarks/parsers.py --guardar-base                 # registra la línea base de esta máquina
+    python benchmarks/parsers.py --umbral 0.15                  # falla (exit 1) si algo empeora más de 15%
+    python benchmarks/parsers.py --ci                           # además falla si no hay línea base
+    python benchmarks/parsers.py --solo bcn --repeticiones 20
+
+La línea base de referencia está versionada en benchmarks/linea_base_parsers.json; al cambiar de
+máquina de CI se regenera con --guardar-base y se versiona de nuevo.
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from typing import Callable, Dict, List, Tuple
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+DIRECTORIO_CORPUS = os.path.join(RAIZ, 'benchmarks', 'corpus')
+LINEA_BASE_POR_DEFECTO = os.path.join(RAIZ, 'benchmarks', 'linea_base_parsers.json')
+
+# Tamaños del corpus sintético: (etiqueta, filas/repeticiones)
+TAMANOS = {
+    'seia_busqueda': [('10_filas', 10), ('200_filas', 200), ('5000_filas', 5000)],
+    'seia_expediente': [('basico', 3), ('descripcion_larga', 2000), ('multi_mb', 20000)],
+    'bcn_listado': [('10_filas', 10), ('500_filas', 500), ('5000_filas', 5000)],
+    'bcn_norma': [('5_articulos', 5), ('500_articulos', 500), ('10000_articulos', 10000)],
+}
+
+# --- Corpus ---
+
+def generar_corpus() -> Dict[str, List[Tuple[str, bytes]]]:
+    """Retorna {tipo: [(nombre, html)]} con las páginas sintéticas y las capturas guardadas"""
+    from simulador.servidor_upstream import (
+        Plantillas, ConfigSimulador, pagina_seia_con_filas, pagina_seia_expediente,
+        pagina_bcn_con_filas, pagina_bcn_norma
+    )
+
+    plantillas = Plantillas()
+    corpus: Dict[str, List[Tuple[str, bytes]]] = {tipo: [] for tipo in TAMANOS}
+
+    for etiqueta, n in TAMANOS['seia_busqueda']:
+        corpus['seia_busqueda'].append((etiqueta, pagina_seia_con_filas(plantillas, 'Codelco', n)))
+    for etiqueta, n in TAMANOS['seia_expediente']:
+        config = ConfigSimulador({}, repeticiones_descripcion=n, max_documentos=max(3, n // 10))
+        corpus['seia_expediente'].append((etiqueta, pagina_seia_expediente(plantillas, {'id_expediente': '2160000001'}, config)))
+    for etiqueta, n in TAMANOS['bcn_listado']:
+        corpus['bcn_listado'].append((etiqueta, pagina_bcn_con_filas(plantillas, 'medio ambiente', n)))
+    for etiqueta, n in TAMANOS['bcn_norma']:
+        config = ConfigSimulador({}, articulos_norma=n)
+        corpus['bcn_norma'].append((etiqueta, pagina_bcn_norma(plantillas, {'idNorma': '30667'}, config)))
+
+    # Capturas reales (opcionales)
+    for tipo in corpus:
+        for ruta in sorted(glob.glob(os.path.join(DIRECTORIO_CORPUS, tipo, '*.html'))):
+            with open(ruta, 'rb') as archivo:
+                corpus[tipo].append((f"captura_{os.path.splitext(os.path.basename(ruta))[0]}", archivo.read()))
+
+    return corpus
+
+# --- Extractores ---
+
+class _RespuestaGuardada:
+    """Respuesta HTTP con el contenido de una página del corpus (para extractores que hacen GET)"""
+    status_code = 200
+
+    def __init__(self, contenido: bytes):
+        self.content = contenido
+        self.text = contenido.decode('utf-8', errors='replace')
+
+    def raise_for_status(self):
+        pass
+
+def _con_pagina(scraper, contenido: bytes):
+    """Hace que scraper.session.get retorne la página del corpus en vez de ir a la red"""
+    respuesta = _RespuestaGuardada(contenido)
+    scraper.session.get = lambda *args, **kwargs: respuesta
+    return scraper
+
+def _seia_titular_extraer_proyectos(html: bytes):
+    from bs4 import BeautifulSoup
+    from scrapers.seia_titular import SEIATitularScraper
+    soup = BeautifulSoup(html, 'html.parser')
+    tabla = soup.find('table', class_='tabla_datos') or soup.find('table')
+    return SEIATitularScraper()._extraer_proyectos_de_tabla(tabla, 'Codelco')
+
+def _seia_titular_detalles(html: bytes):
+    from scrapers.seia_titular import SEIATitularScraper
+    scraper = _con_pagina(SEIATitularScraper(), html)
+    return scraper.obtener_detalles_proyecto({'nombre': 'Proyecto', 'link_expediente': 'http://corpus/expediente'})
+
+def _seia_detalle_titular(html: bytes):
+    from bs4 import BeautifulSoup
+    from scrapers.seia_project_detail_scraper import SEIAProjectDetailScraper
+    return SEIAProjectDetailScraper()._extraer_informacion_titular(BeautifulSoup(html, 'html.parser'))
+
+def _seia_detalle_documentos(html: bytes):
+    from bs4 import BeautifulSoup
+    from scrapers.seia_project_detail_scraper import SEIAProjectDetailScraper
+    return SEIAProjectDetailScraper()._extraer_documentos(BeautifulSoup(html, 'html.parser'))
+
+def _bcn_extraer_resultados(html: bytes):
+    from bs4 import BeautifulSoup
+    from scrapers.bcn_legal import BCNScraper
+    return BCNScraper()._extraer_resultados(BeautifulSoup(html, 'html.parser'), 'medio ambiente')
+
+def _bcn_detalle_norma(html: bytes):
+    from scrapers.bcn_legal import BCNScraper
+    scraper = _con_pagina(BCNScraper(), html)
+    return scraper.obtener_detalle_norma('http://corpus/norma')
+
+# nombre -> (tipo de página del corpus, función)
+EXTRACTORES: Dict[str, Tuple[str, Callable]] = {
+    'seia_titular.extraer_proyectos': ('seia_busqueda', _seia_titular_extraer_proyectos),
+    'seia_titular.detalles_proyecto': ('seia_expediente', _seia_titular_detalles),
+    'seia_detalle.informacion_titular': ('seia_expediente', _seia_detalle_titular),
+    'seia_detalle.documentos': ('seia_expediente', _seia_detalle_documentos),
+    'bcn.extraer_resultados': ('bcn_listado', _bcn_extraer_resultados),
+    'bcn.detalle_norma': ('bcn_norma', _bcn_detalle_norma),
+}
+
+# --- Medición ---
+
+def _rss_maximo_kb() -> int:
+    try:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS reporta bytes, Linux kilobytes
+        return rss // 1024 if sys.platform == 'darwin' else rss
+    except ImportError:
+        return 0
+
+def medir_extractor(nombre: str, paginas: List[Tuple[str, bytes]], repeticiones: int) -> Dict[str, Dict]:
+    """Mide un extractor sobre cada página. Se ejecuta en un proceso dedicado"""
+    import logging
+    logging.disable(logging.CRITICAL)
+
+    _, funcion = EXTRACTORES[nombre]
+    resultados = {}
+
+    for etiqueta, html in paginas:
+        funcion(html)  # calentamiento (imports, caches)
+
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            funcion(html)
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+
+        tracemalloc.start()
+        funcion(html)
+        asignado, pico = tracemalloc.get_traced_memory()
+        bloques = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+        tracemalloc.stop()
+
+        mediana = statistics.median(tiempos)
+        resultados[etiqueta] = {
+            'bytes_pagina': len(html),
+            'ms_mediana': round(mediana, 3),
+            'ms_minimo': round(min(tiempos), 3),
+            'mb_por_segundo': round(len(html) / 1e6 / (mediana / 1000), 2) if mediana else 0.0,
+            'pico_asignado_kb': round(pico / 1024, 1),
+            'bloques_vivos': bloques,
+            # El corpus va de menor a mayor tamaño, así el máximo acumulado corresponde a esta página
+            'rss_maximo_proceso_kb': _rss_maximo_kb(),
+        }
+
+    return resultados
+
+def ejecutar(repeticiones: int, filtro: str = '') -> Dict:
+    corpus = generar_corpus()
+    reporte = {
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'repeticiones': repeticiones,
+        'extractores': {},
+    }
+
+    contexto = multiprocessing.get_context('spawn')
+    for nombre, (tipo, _) in EXTRACTORES.items():
+        if filtro and filtro not in nombre:
+            continue
+        print(f"⏱️ {nombre} ({len(corpus[tipo])} páginas)...")
+        with ProcessPoolExecutor(max_workers=1, mp_context=contexto) as proceso:
+            resultados = proceso.submit(medir_extractor, nombre, corpus[tipo], repeticiones).result()
+        reporte['extractores'][nombre] = resultados
+        for etiqueta, datos in resultados.items():
+            print(f"   • {etiqueta:22s} {datos['bytes_pagina'] / 1024:9.1f} KB  {datos['ms_mediana']:9.2f} ms  "
+                  f"{datos['mb_por_segundo']:6.2f} MB/s  pico {datos['pico_asignado_kb']:9.1f} KB  "
+                  f"RSS {datos['rss_maximo_proceso_kb'] / 1024:.0f} MB")
+    return reporte
+
+def comparar(reporte: Dict, base: Dict, umbral: float) -> List[str]:
+    """Retorna las regresiones (tiempo o memoria) mayores al umbral respecto de la línea base"""
+    regresiones = []
+    for nombre, paginas in reporte['extractores'].items():
+        for etiqueta, actual in paginas.items():
+            anterior = base.get('extractores', {}).get(nombre, {}).get(etiqueta)
+            if not anterior:
+                continue
+            for metrica in ('ms_mediana', 'pico_asignado_kb'):
+                if anterior[metrica] and actual[metrica] > anterior[metrica] * (1 + umbral):
+                    variacion = actual[metrica] / anterior[metrica] - 1
+                    regresiones.append(f"{nombre} [{etiqueta}] {metrica}: {anterior[metrica]} -> {actual[metrica]} ({variacion:+.1%})")
+    return regresiones
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmarks de los extractores HTML")
+    parser.add_argument('--repeticiones', type=int, default=10, help="Mediciones por página")
+    parser.add_argument('--solo', default='', help="Filtrar extractores por nombre (ej. 'bcn')")
+    parser.add_argument('--base', default=LINEA_BASE_POR_DEFECTO, help="Archivo JSON de línea base")
+    parser.add_argument('--guardar-base', action='store_true', help="Guardar los resultados como nueva línea base")
+    parser.add_argument('--umbral', type=float, default=0.20, help="Regresión tolerada (0.20 = 20%%)")
+    parser.add_argument('--salida', help="Guardar también el reporte de esta ejecución")
+    parser.add_argument('--ci', action='store_true', default=bool(os.getenv('CI')),
+                        help="Modo CI (por defecto si CI está definida): sin línea base falla en vez de advertir")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    print("🚀 BENCHMARK DE EXTRACTORES HTML")
+    print("=" * 60)
+    reporte = ejecutar(args.repeticiones, args.solo)
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(reporte, archivo, ensure_ascii=False, indent=2)
+
+    if args.guardar_base:
+        with open(args.base, 'w', encoding='utf-8') as archivo:
+            json.dump(reporte, archivo, ensure_ascii=False, indent=2)
+        print(f"\n📝 Línea base guardada en {args.base}")
+        return
+
+    if not os.path.exists(args.base):
+        if args.ci:
+            print(f"\n❌ No hay línea base en {args.base}: el gate no puede comparar (ejecuta con --guardar-base)")
+            sys.exit(1)
+        print(f"\n⚠️ No hay línea base en {args.base}; ejecuta con --guardar-base")
+        return
+
+    with open(args.base, encoding='utf-8') as archivo:
+        base = json.load(archivo)
+    regresiones = comparar(reporte, base, args.umbral)
+
+    print("\n" + "=" * 60)
+    if regresiones:
+        print(f"❌ {len(regresiones)} regresiones sobre {args.umbral:.0%}:")
+        for regresion in regresiones:
+            print(f"   • {regresion}")
+        sys.exit(1)
+    print(f"✅ Sin regresiones sobre {args.umbral:.0%} respecto de la línea base")
+
+if __name__ == '__main__':
+    main()
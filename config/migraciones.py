@@ -0,0 +1,51 @@
+# config/migraciones.py
+# Migraciones idempotentes del esquema: columnas e índices que create_all() no agrega a tablas ya existentes.
+
+import logging
+
+from sqlalchemy import inspect, text
+
+logger = logging.getLogger(__name__)
+
+# (tabla, columna, tipo SQL). Coinciden con las columnas agregadas a models/models.py
+COLUMNAS = [
+    ("proyectos_seia", "latitud", "DOUBLE PRECISION"),
+    ("proyectos_seia", "longitud", "DOUBLE PRECISION"),
+    ("proyectos_seia", "coordenadas_originales", "TEXT"),
+]
+
+# (nombre del índice, tabla, columnas). Coinciden con los index=True de models/models.py
+INDICES = [
+    ("ix_proyectos_seia_id_empresa", "proyectos_seia", "id_empresa"),
+    ("ix_proyectos_seia_estado", "proyectos_seia", "estado"),
+    ("ix_proyectos_seia_region", "proyectos_seia", "region"),
+    ("ix_sanciones_snifa_id_empresa", "sanciones_snifa", "id_empresa"),
+    ("ix_empresas_alias_id_empresa", "empresas_alias", "id_empresa"),
+]
+
+def aplicar_migraciones(engine=None):
+    """
+    Crea las columnas e índices que falten en bases creadas con versiones anteriores del esquema.
+    Las columnas se comparan con el inspector (SQLite no soporta ADD COLUMN IF NOT EXISTS) y los
+    índices usan CREATE INDEX IF NOT EXISTS, por lo que puede ejecutarse siempre.
+    """
+    if engine is None:
+        from config.database import obtener_engine
+        engine = obtener_engine()
+
+    inspector = inspect(engine)
+    existentes = {
+        tabla: {columna["name"] for columna in inspector.get_columns(tabla)}
+        for tabla in {tabla for tabla, _, _ in COLUMNAS} if inspector.has_table(tabla)
+    }
+
+    with engine.begin() as conexion:
+        for tabla, columna, tipo in COLUMNAS:
+            if tabla in existentes and columna not in existentes[tabla]:
+                conexion.execute(text(f"ALTER TABLE {tabla} ADD COLUMN {columna} {tipo}"))
+                logger.info(f"➕ Columna agregada: {tabla}.{columna}")
+        for nombre, tabla, columnas in INDICES:
+            conexion.execute(text(f"CREATE INDEX IF NOT EXISTS {nombre} ON {tabla} ({columnas})"))
+
+    logger.info(f"✅ Migraciones aplicadas: {len(INDICES)} índices verificados")
+    return len(INDICES)
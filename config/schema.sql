@@ -9,6 +9,17 @@ CREATE TABLE IF NOT EXISTS empresas (
     fecha_actualizacion TIMESTAMP WITH TIME ZONE DEFAULT a.m.
 );
 
+-- Tabla de alias de empresas: nombres normalizados que resuelven a una empresa canónica
+CREATE TABLE IF NOT EXISTS empresas_alias (
+    id SERIAL PRIMARY KEY,
+    id_empresa INTEGER NOT NULL REFERENCES empresas(id),
+    alias VARCHAR(255) NOT NULL,
+    alias_normalizado VARCHAR(255) UNIQUE NOT NULL,
+    fuente VARCHAR(50),
+    fecha_actualizacion TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS ix_empresas_alias_id_empresa ON empresas_alias (id_empresa);
+
 -- Tabla para los proyectos del Servicio de Evaluación de Impacto Ambiental (SEIA)
 CREATE TABLE IF NOT EXISTS proyectos_seia (
     id SERIAL PRIMARY KEY,
@@ -21,8 +32,14 @@ CREATE TABLE IF NOT EXISTS proyectos_seia (
     estado VARCHAR(50),
     fecha_presentacion DATE,
     link_expediente TEXT,
+    latitud DOUBLE PRECISION,
+    longitud DOUBLE PRECISION,
+    coordenadas_originales TEXT,
     fecha_actualizacion TIMESTAMP WITH TIME ZONE DEFAULT a.m.
 );
+CREATE INDEX IF NOT EXISTS ix_proyectos_seia_id_empresa ON proyectos_seia (id_empresa);
+CREATE INDEX IF NOT EXISTS ix_proyectos_seia_estado ON proyectos_seia (estado);
+CREATE INDEX IF NOT EXISTS ix_proyectos_seia_region ON proyectos_seia (region);
 
 -- Tabla para las sanciones del Sistema Nacional de Información de Fiscalización Ambiental (SNIFA)
 CREATE TABLE IF NOT EXISTS sanciones_snifa (
@@ -36,6 +53,19 @@ CREATE TABLE IF NOT EXISTS sanciones_snifa (
     link_expediente TEXT,
     fecha_actualizacion TIMESTAMP WITH TIME ZONE DEFAULT a.m.
 );
+CREATE INDEX IF NOT EXISTS ix_sanciones_snifa_id_empresa ON sanciones_snifa (id_empresa);
+
+-- Resumen materializado por empresa (conteos JSON), recalculado después de cada sincronización
+CREATE TABLE IF NOT EXISTS resumen_empresas (
+    id_empresa INTEGER PRIMARY KEY REFERENCES empresas(id),
+    total_proyectos INTEGER NOT NULL DEFAULT 0,
+    total_sanciones INTEGER NOT NULL DEFAULT 0,
+    proyectos_por_estado JSON,
+    proyectos_por_region JSON,
+    proyectos_por_tipologia JSON,
+    sanciones_por_categoria JSON,
+    fecha_actualizacion TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
 
 -- Tabla para las normativas de la Biblioteca del Congreso Nacional (BCN)
 CREATE TABLE IF NOT EXISTS normativas_bcn (
@@ -0,0 +1,21 @@
+# config/upstream.py
+# URLs base de los sitios consultados (SEIA, BCN, SNIFA).
+# Se pueden apuntar al simulador local (simulador/servidor_upstream.py) para medir sin depender de los sitios reales.
+
+import os
+
+# Si está definida, todos los upstream apuntan al simulador (ej. "http://127.0.0.1:8900")
+UPSTREAM_SIMULADOR_URL = os.getenv("UPSTREAM_SIMULADOR_URL", "").rstrip("/")
+
+def _url_base(variable: str, por_defecto: str) -> str:
+    """URL de la variable de entorno, o del simulador, o la URL real"""
+    return (os.getenv(variable) or UPSTREAM_SIMULADOR_URL or por_defecto).rstrip("/")
+
+SEIA_BASE_URL = _url_base("SEIA_BASE_URL", "https://seia.sea.gob.cl")
+BCN_BASE_URL = _url_base("BCN_BASE_URL", "https://www.bcn.cl")
+SNIFA_BASE_URL = _url_base("SNIFA_BASE_URL", "https://snifa.sma.gob.cl")
+
+# Rutas usadas por los scrapers
+SEIA_BUSQUEDA_URL = f"{SEIA_BASE_URL}/busqueda/buscarProyectoAction.php"
+BCN_LISTADO_URL = f"{BCN_BASE_URL}/leychile/consulta/listado_n_sel"
+SNIFA_RESULTADO_URL = f"{SNIFA_BASE_URL}/RegistroPublico/Resultado"
@@ -0,0 +1,61 @@
+# config/version_datos.py - Versión de los datos subyacentes, compartida entre procesos
+"""
+Cada ámbito de datos (seia, snifa, bcn, registro...) tiene un archivo marcador en
+DIRECTORIO_VERSIONES. Quien actualiza los datos (la sincronización, el registro de
+empresas) toca el marcador; las caches incluyen version_datos() en sus claves, así
+una actualización en cualquier proceso invalida las caches de todos los workers.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+DIRECTORIO_VERSIONES = os.getenv('MERLIN_DIR_VERSIONES', os.path.join('data', 'versiones'))
+
+# Cada cuánto se vuelven a leer los marcadores (evita un stat por request)
+INTERVALO_REVISION = float(os.getenv('VERSION_DATOS_INTERVALO', '2'))
+
+_lock = threading.Lock()
+_ultima_revision = 0.0
+_versiones: Dict[str, int] = {}
+
+def _ruta_marcador(ambito: str) -> str:
+    return os.path.join(DIRECTORIO_VERSIONES, f'{ambito}.version')
+
+def marcar_datos_actualizados(ambito: str) -> None:
+    """Registra que los datos del ámbito cambiaron (invalida las caches que dependen de él)"""
+    global _ultima_revision
+    os.makedirs(DIRECTORIO_VERSIONES, exist_ok=True)
+    ruta = _ruta_marcador(ambito)
+    with open(ruta, 'w', encoding='utf-8') as marcador:
+        marcador.write(str(time.time()))
+    with _lock:
+        _ultima_revision = 0.0  # Forzar relectura en este proceso
+
+def _leer_versiones() -> Dict[str, int]:
+    versiones = {}
+    try:
+        for nombre in os.listdir(DIRECTORIO_VERSIONES):
+            if nombre.endswith('.version'):
+                versiones[nombre[:-len('.version')]] = os.stat(os.path.join(DIRECTORIO_VERSIONES, nombre)).st_mtime_ns
+    except FileNotFoundError:
+        pass
+    return versiones
+
+def versiones_datos() -> Dict[str, int]:
+    """Versión (mtime del marcador) de cada ámbito conocido"""
+    global _ultima_revision, _versiones
+    ahora = time.monotonic()
+    with _lock:
+        if ahora - _ultima_revision >= INTERVALO_REVISION:
+            _versiones = _leer_versiones()
+            _ultima_revision = ahora
+        return dict(_versiones)
+
+def version_datos(ambito: Optional[str] = None) -> str:
+    """Versión compacta de un ámbito, o de todos si no se indica, para usar en claves de cache"""
+    versiones = versiones_datos()
+    if ambito is not None:
+        return str(versiones.get(ambito, 0))
+    return '-'.join(f'{nombre}:{valor}' for nombre, valor in sorted(versiones.items())) or '0'
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Construcción de los assets estáticos de MERLIN
+
+Minifica el CSS/JS de static/, agrega una huella del contenido al nombre,
+genera variantes precomprimidas (.gz y .br si está instalado brotli) y
+variantes AVIF/WebP de las imágenes (si está instalado Pillow). Todo queda
+en static/dist/ junto a un manifest.json que usa app.assets para resolver
+las URLs en los templates.
+
+Uso:
+    python construir_assets.py
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.assets import ARCHIVO_MANIFIESTO, DIRECTORIO_DIST, DIRECTORIO_STATIC
+
+try:
+    import brotli
+    BROTLI_DISPONIBLE = True
+except ImportError:
+    BROTLI_DISPONIBLE = False
+
+try:
+    from PIL import Image
+    PILLOW_DISPONIBLE = True
+except ImportError:
+    PILLOW_DISPONIBLE = False
+
+# Assets a construir, relativos a static/
+ASSETS_TEXTO = ["css/merlin.css", "js/merlin.js"]
+ASSETS_IMAGEN = ["fondo.jpg"]
+
+CALIDAD_WEBP = 80
+CALIDAD_AVIF = 60
+LONGITUD_HUELLA = 10
+TAMANO_MINIMO_COMPRESION = 1024  # Bajo esto la variante comprimida no compensa
+
+def minificar_css(texto: str) -> str:
+    """Quita comentarios y espacios sobrantes del CSS.
+
+    Los espacios junto a ':' solo se quitan dentro de las declaraciones: en un selector
+    ".x :hover" (descendiente) no equivale a ".x:hover".
+    """
+    texto = re.sub(r"/\*.*?\*/", "", texto, flags=re.S)
+    texto = re.sub(r"\s+", " ", texto)
+    texto = re.sub(r"\s*([{};,>])\s*", r"\1", texto)
+    # Los bloques sin llaves internas son declaraciones (también dentro de @media)
+    texto = re.sub(r"\{([^{}]*)\}", lambda m: "{" + re.sub(r"\s*:\s*", ":", m.group(1)) + "}", texto)
+    texto = texto.replace(";}", "}")
+    return texto.strip() + "\n"
+
+def minificar_js(texto: str) -> str:
+    """Minificación conservadora del JS: quita indentación, líneas vacías y comentarios de línea completa.
+
+    El contenido de los template literals (`...`) multilínea se conserva tal cual.
+    """
+    lineas = []
+    en_template = False
+    for linea in texto.splitlines():
+        if en_template:
+            lineas.append(linea)
+        else:
+            limpia = linea.strip()
+            if limpia and not limpia.startswith("//"):
+                lineas.append(limpia)
+        if linea.replace("\\`", "").count("`") % 2 == 1:
+            en_template = not en_template
+    return "\n".join(lineas) + "\n"
+
+MINIFICADORES = {".css": minificar_css, ".js": minificar_js}
+
+def huella(contenido: bytes) -> str:
+    return hashlib.sha256(contenido).hexdigest()[:LONGITUD_HUELLA]
+
+def nombre_con_huella(nombre: str, contenido: bytes) -> str:
+    """css/merlin.css -> css/merlin.3fa9c01b2e.css"""
+    base, extension = os.path.splitext(nombre)
+    return f"{base}.{huella(contenido)}{extension}"
+
+def escribir(ruta_relativa: str, contenido: bytes) -> str:
+    ruta = os.path.join(DIRECTORIO_STATIC, DIRECTORIO_DIST, ruta_relativa)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with open(ruta, "wb") as f:
+        f.write(contenido)
+    return ruta
+
+def precomprimir(ruta_relativa: str, contenido: bytes) -> dict:
+    """Escribe las variantes .gz y .br junto al archivo y retorna sus tamaños"""
+    tamanos = {}
+    if len(contenido) < TAMANO_MINIMO_COMPRESION:
+        return tamanos
+    comprimido = gzip.compress(contenido, compresslevel=9, mtime=0)
+    escribir(ruta_relativa + ".gz", comprimido)
+    tamanos["gzip"] = len(comprimido)
+    if BROTLI_DISPONIBLE:
+        comprimido = brotli.compress(contenido, quality=11)
+        escribir(ruta_relativa + ".br", comprimido)
+        tamanos["br"] = len(comprimido)
+    return tamanos
+
+def construir_texto(nombre: str) -> dict:
+    """Minifica, agrega huella y precomprime un asset CSS/JS"""
+    with open(os.path.join(DIRECTORIO_STATIC, nombre), encoding="utf-8") as f:
+        original = f.read()
+    minificador = MINIFICADORES.get(os.path.splitext(nombre)[1], lambda texto: texto)
+    contenido = minificador(original).encode("utf-8")
+
+    destino = nombre_con_huella(nombre, contenido)
+    escribir(destino, contenido)
+    tamanos = {"original": len(original.encode("utf-8")), "minificado": len(contenido)}
+    tamanos.update(precomprimir(destino, contenido))
+    return {"destino": destino, "tamanos": tamanos}
+
+def construir_imagen(nombre: str) -> dict:
+    """Copia la imagen con huella y genera sus variantes AVIF/WebP con el mismo nombre base"""
+    with open(os.path.join(DIRECTORIO_STATIC, nombre), "rb") as f:
+        contenido = f.read()
+    destino = nombre_con_huella(nombre, contenido)
+    escribir(destino, contenido)
+    tamanos = {"original": len(contenido)}
+
+    if not PILLOW_DISPONIBLE:
+        return {"destino": destino, "tamanos": tamanos}
+
+    base = os.path.splitext(destino)[0]
+    with Image.open(os.path.join(DIRECTORIO_STATIC, nombre)) as imagen:
+        imagen = imagen.convert("RGB")
+        for formato, extension, calidad in (("WEBP", ".webp", CALIDAD_WEBP), ("AVIF", ".avif", CALIDAD_AVIF)):
+            ruta = os.path.join(DIRECTORIO_STATIC, DIRECTORIO_DIST, base + extension)
+            try:
+                imagen.save(ruta, formato, quality=calidad)
+            except (KeyError, OSError) as e:
+                # AVIF requiere Pillow >= 11.3 o el plugin pillow-avif-plugin
+                print(f"   ⚠️ {nombre}: sin variante {formato} ({e})")
+                continue
+            tamano = os.path.getsize(ruta)
+            if tamano >= len(contenido):
+                # Una variante más pesada que el original no se sirve
+                os.remove(ruta)
+                continue
+            tamanos[formato.lower()] = tamano
+    return {"destino": destino, "tamanos": tamanos}
+
+def construir_assets() -> dict:
+    """Reconstruye static/dist/ completo y escribe el manifiesto"""
+    shutil.rmtree(os.path.join(DIRECTORIO_STATIC, DIRECTORIO_DIST), ignore_errors=True)
+
+    archivos = {}
+    detalle = {}
+    for nombre in ASSETS_TEXTO:
+        resultado = construir_texto(nombre)
+        archivos[nombre] = f"{DIRECTORIO_DIST}/{resultado['destino']}"
+        detalle[nombre] = resultado["tamanos"]
+    for nombre in ASSETS_IMAGEN:
+        resultado = construir_imagen(nombre)
+        archivos[nombre] = f"{DIRECTORIO_DIST}/{resultado['destino']}"
+        detalle[nombre] = resultado["tamanos"]
+
+    manifiesto = {"archivos": archivos, "tamanos": detalle}
+    with open(ARCHIVO_MANIFIESTO, "w", encoding="utf-8") as f:
+        json.dump(manifiesto, f, indent=2, ensure_ascii=False)
+    return manifiesto
+
+if __name__ == "__main__":
+    print("📦 CONSTRUCCIÓN DE ASSETS ESTÁTICOS")
+    print("=" * 60)
+    if not BROTLI_DISPONIBLE:
+        print("⚠️ brotli no instalado, solo se generan variantes .gz")
+    if not PILLOW_DISPONIBLE:
+        print("⚠️ Pillow no instalado, sin variantes AVIF/WebP de imágenes")
+
+    manifiesto = construir_assets()
+    for nombre, destino in manifiesto["archivos"].items():
+        tamanos = ", ".join(f"{clave} {valor / 1024:.1f} KB" for clave, valor in manifiesto["tamanos"][nombre].items())
+        print(f"✅ {nombre} -> {destino} ({tamanos})")
+    print(f"📄 Manifiesto: {ARCHIVO_MANIFIESTO}")
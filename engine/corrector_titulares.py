@@ -0,0 +1,102 @@
+# engine/corrector_titulares.py
+# Corrección ortográfica de palabras de nombres de titulares con borrado simétrico (SymSpell):
+# cada palabra conocida se registra bajo todas sus variantes con hasta DISTANCIA_MAXIMA letras
+# borradas (una en palabras cortas), así una consulta solo genera los borrados de la palabra escrita y los busca en el
+# diccionario, sin recorrer el vocabulario. Los candidatos se verifican con la distancia de
+# Damerau-Levenshtein (transposiciones adyacentes) y se ordenan por distancia y frecuencia.
+
+import os
+from typing import Dict, List, Set, Tuple
+
+DISTANCIA_MAXIMA = int(os.getenv("CORRECTOR_DISTANCIA_MAXIMA", "2"))
+# Solo se indexan los borrados del prefijo: reduce el diccionario sin perder candidatos cercanos
+LARGO_PREFIJO = 7
+# Palabras más cortas no se corrigen ("sa", "de", siglas)
+LARGO_MINIMO = 4
+
+def distancia_edicion(a: str, b: str, maxima: int) -> int:
+    """Distancia de Damerau-Levenshtein restringida (OSA); retorna maxima + 1 si la supera"""
+    if abs(len(a) - len(b)) > maxima:
+        return maxima + 1
+    anterior2: List[int] = []
+    anterior = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        actual = [i] + [0] * len(b)
+        minimo_fila = i
+        for j in range(1, len(b) + 1):
+            costo = 0 if a[i - 1] == b[j - 1] else 1
+            valor = min(anterior[j] + 1, actual[j - 1] + 1, anterior[j - 1] + costo)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                valor = min(valor, anterior2[j - 2] + 1)
+            actual[j] = valor
+            minimo_fila = min(minimo_fila, valor)
+        if minimo_fila > maxima:
+            return maxima + 1
+        anterior2, anterior = anterior, actual
+    return anterior[-1] if anterior[-1] <= maxima else maxima + 1
+
+def _borrados(palabra: str, distancia: int) -> Set[str]:
+    """La palabra (recortada al prefijo) y todas sus variantes con hasta 'distancia' letras menos"""
+    palabra = palabra[:LARGO_PREFIJO]
+    resultado = {palabra}
+    frontera = {palabra}
+    for _ in range(distancia):
+        siguiente = set()
+        for texto in frontera:
+            if len(texto) <= 1:
+                continue
+            for i in range(len(texto)):
+                siguiente.add(texto[:i] + texto[i + 1:])
+        siguiente -= resultado
+        resultado |= siguiente
+        frontera = siguiente
+    return resultado
+
+def distancia_para(palabra: str, distancia_maxima: int = DISTANCIA_MAXIMA) -> int:
+    """Palabras cortas admiten menos errores: 'enap' no debe corregirse a 'enel'"""
+    return min(distancia_maxima, 1 if len(palabra) < 7 else 2)
+
+class CorrectorSymSpell:
+    """Diccionario de borrados -> palabras; admite agregar palabras mientras se consulta"""
+
+    def __init__(self, distancia_maxima: int = DISTANCIA_MAXIMA):
+        self.distancia_maxima = distancia_maxima
+        self.frecuencias: Dict[str, int] = {}
+        self._borrados: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.frecuencias)
+
+    def __contains__(self, palabra: str) -> bool:
+        return palabra in self.frecuencias
+
+    def agregar(self, palabra: str, frecuencia: int = 1) -> None:
+        if len(palabra) < LARGO_MINIMO:
+            return
+        if palabra in self.frecuencias:
+            self.frecuencias[palabra] += frecuencia
+            return
+        self.frecuencias[palabra] = frecuencia
+        # Cada palabra se registra con los borrados de su propia distancia admitida (las cortas, uno)
+        for borrado in _borrados(palabra, distancia_para(palabra, self.distancia_maxima)):
+            self._borrados.setdefault(borrado, []).append(palabra)
+
+    def candidatos(self, palabra: str, limite: int = 3) -> List[Tuple[str, int, int]]:
+        """(palabra conocida, distancia, frecuencia) ordenados; la propia palabra si es conocida"""
+        if palabra in self.frecuencias:
+            return [(palabra, 0, self.frecuencias[palabra])]
+        if len(palabra) < LARGO_MINIMO:
+            return []
+        maxima = distancia_para(palabra, self.distancia_maxima)
+        vistos: Set[str] = set()
+        encontrados = []
+        for borrado in _borrados(palabra, maxima):
+            for conocida in self._borrados.get(borrado, ()):
+                if conocida in vistos:
+                    continue
+                vistos.add(conocida)
+                distancia = distancia_edicion(palabra, conocida, maxima)
+                if distancia <= min(maxima, distancia_para(conocida, self.distancia_maxima)):
+                    encontrados.append((conocida, distancia, self.frecuencias[conocida]))
+        encontrados.sort(key=lambda c: (c[1], -c[2], c[0]))
+        return encontrados[:limite]
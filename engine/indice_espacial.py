@@ -0,0 +1,195 @@
+# engine/indice_espacial.py
+# Índice espacial en memoria (árbol R empaquetado con STR) sobre los proyectos SEIA georreferenciados.
+# Responde "proyectos cerca de aquí" (k más cercanos, radio o bbox) en milisegundos, con SQLite o PostgreSQL.
+
+import heapq
+import logging
+import math
+import os
+import threading
+import time
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+RADIO_TIERRA_KM = 6371.0088
+CAPACIDAD_NODO = int(os.getenv("INDICE_ESPACIAL_CAPACIDAD_NODO", "16"))
+MAX_RESULTADOS = 200
+
+# Nodo: (min_lat, min_lng, max_lat, max_lng, hijos, es_hoja). En las hojas los hijos son los puntos.
+Nodo = Tuple[float, float, float, float, list, bool]
+
+def distancia_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Distancia de gran círculo (haversine) en kilómetros"""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dlat, dlng = p2 - p1, math.radians(lng2 - lng1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dlng / 2) ** 2
+    return 2 * RADIO_TIERRA_KM * math.asin(min(1.0, math.sqrt(a)))
+
+def _distancia_a_caja(lat: float, lng: float, nodo: Nodo) -> float:
+    """Distancia del punto al rectángulo del nodo (0 si está dentro); cota inferior para la búsqueda"""
+    lat_c = min(max(lat, nodo[0]), nodo[2])
+    lng_c = min(max(lng, nodo[1]), nodo[3])
+    return distancia_km(lat, lng, lat_c, lng_c)
+
+def _caja(elementos: Sequence, hoja: bool) -> Nodo:
+    """Nodo que envuelve puntos (hoja) o nodos hijos"""
+    if hoja:
+        lats = [p['lat'] for p in elementos]
+        lngs = [p['lng'] for p in elementos]
+        return (min(lats), min(lngs), max(lats), max(lngs), list(elementos), True)
+    return (min(n[0] for n in elementos), min(n[1] for n in elementos),
+            max(n[2] for n in elementos), max(n[3] for n in elementos), list(elementos), False)
+
+def _normalizar(texto: Optional[str]) -> str:
+    """Minúsculas sin tildes para comparar estado y tipo"""
+    texto = unicodedata.normalize('NFKD', (texto or '').casefold())
+    return ''.join(c for c in texto if not unicodedata.combining(c)).strip()
+
+def _filtro(estado: Optional[str] = None, tipo: Optional[str] = None):
+    """Predicado de estado/tipo (coincidencia parcial sin tildes, ej. 'aprob' -> 'Aprobado')"""
+    estado_n, tipo_n = _normalizar(estado), _normalizar(tipo)
+    if not estado_n and not tipo_n:
+        return None
+    return lambda p: ((not estado_n or estado_n in p['_estado']) and
+                      (not tipo_n or tipo_n in p['_tipo']))
+
+class IndiceEspacial:
+    """Árbol R estático construido con Sort-Tile-Recursive: se reconstruye completo cuando cambian los datos"""
+
+    def __init__(self, puntos: Iterable[Dict], capacidad: int = CAPACIDAD_NODO, version: str = ''):
+        self.capacidad = max(2, capacidad)
+        self.version = version
+        self.puntos = []
+        for punto in puntos:
+            if punto.get('lat') is None or punto.get('lng') is None:
+                continue
+            punto = dict(punto, _estado=_normalizar(punto.get('estado')), _tipo=_normalizar(punto.get('tipo')))
+            self.puntos.append(punto)
+        self._por_id = {p['id']: p for p in self.puntos if p.get('id') is not None}
+        self.raiz: Optional[Nodo] = self._construir()
+
+    def __len__(self) -> int:
+        return len(self.puntos)
+
+    def _empaquetar(self, elementos: List, hoja: bool) -> List[Nodo]:
+        """Un nivel STR: franjas por longitud y, dentro de cada franja, grupos por latitud"""
+        centro_lat = (lambda p: p['lat']) if hoja else (lambda n: (n[0] + n[2]) / 2)
+        centro_lng = (lambda p: p['lng']) if hoja else (lambda n: (n[1] + n[3]) / 2)
+        hojas = math.ceil(len(elementos) / self.capacidad)
+        franjas = math.ceil(math.sqrt(hojas))
+        por_franja = franjas * self.capacidad
+
+        nodos = []
+        elementos = sorted(elementos, key=centro_lng)
+        for inicio in range(0, len(elementos), por_franja):
+            franja = sorted(elementos[inicio:inicio + por_franja], key=centro_lat)
+            for desde in range(0, len(franja), self.capacidad):
+                nodos.append(_caja(franja[desde:desde + self.capacidad], hoja))
+        return nodos
+
+    def _construir(self) -> Optional[Nodo]:
+        if not self.puntos:
+            return None
+        nivel = self._empaquetar(self.puntos, hoja=True)
+        while len(nivel) > 1:
+            nivel = self._empaquetar(nivel, hoja=False)
+        return nivel[0]
+
+    def en_bbox(self, bbox: Sequence[float], estado: Optional[str] = None, tipo: Optional[str] = None,
+                limite: Optional[int] = MAX_RESULTADOS) -> List[Dict]:
+        """Proyectos dentro de bbox (min_lat, min_lng, max_lat, max_lng); limite=None los retorna todos"""
+        min_lat, min_lng, max_lat, max_lng = bbox
+        limite = len(self.puntos) if limite is None else limite
+        aceptar = _filtro(estado, tipo)
+        resultados: List[Dict] = []
+        pendientes = [self.raiz] if self.raiz else []
+        while pendientes and len(resultados) < limite:
+            nodo = pendientes.pop()
+            if nodo[0] > max_lat or nodo[2] < min_lat or nodo[1] > max_lng or nodo[3] < min_lng:
+                continue
+            if not nodo[5]:
+                pendientes.extend(nodo[4])
+                continue
+            for p in nodo[4]:
+                if (min_lat <= p['lat'] <= max_lat and min_lng <= p['lng'] <= max_lng
+                        and (aceptar is None or aceptar(p))):
+                    resultados.append(p)
+        return [_publico(p) for p in resultados[:limite]]
+
+    def cercanos(self, lat: float, lng: float, k: int = 10, radio_km: Optional[float] = None,
+                 estado: Optional[str] = None, tipo: Optional[str] = None,
+                 excluir_id: Optional[int] = None) -> List[Dict]:
+        """k proyectos más cercanos (opcionalmente dentro de radio_km), por búsqueda best-first"""
+        k = max(1, min(k, MAX_RESULTADOS))
+        aceptar = _filtro(estado, tipo)
+        resultados: List[Dict] = []
+        if self.raiz is None:
+            return resultados
+
+        # Cola por distancia mínima: nodos por su caja, puntos por su distancia exacta
+        contador = 0
+        cola = [(0.0, contador, self.raiz, False)]
+        while cola and len(resultados) < k:
+            distancia, _, elemento, es_punto = heapq.heappop(cola)
+            if radio_km is not None and distancia > radio_km:
+                break
+            if es_punto:
+                resultados.append(dict(_publico(elemento), distancia_km=round(distancia, 3)))
+                continue
+            for hijo in elemento[4]:
+                contador += 1
+                if elemento[5]:
+                    if hijo.get('id') == excluir_id or (aceptar is not None and not aceptar(hijo)):
+                        continue
+                    heapq.heappush(cola, (distancia_km(lat, lng, hijo['lat'], hijo['lng']), contador, hijo, True))
+                else:
+                    heapq.heappush(cola, (_distancia_a_caja(lat, lng, hijo), contador, hijo, False))
+        return resultados
+
+    def buscar_id(self, id_proyecto: int) -> Optional[Dict]:
+        punto = self._por_id.get(id_proyecto)
+        return _publico(punto) if punto else None
+
+def _publico(punto: Dict) -> Dict:
+    """Punto sin los campos internos de filtrado"""
+    return {clave: valor for clave, valor in punto.items() if not clave.startswith('_')}
+
+def cargar_puntos_desde_db() -> List[Dict]:
+    """Proyectos con latitud/longitud, con el nombre del titular"""
+    from config.database import sesion_db
+    from models.models import Empresa, ProyectoSEIA
+
+    with sesion_db() as db:
+        filas = (db.query(ProyectoSEIA.id, ProyectoSEIA.codigo_expediente, ProyectoSEIA.nombre,
+                          ProyectoSEIA.tipo, ProyectoSEIA.estado, ProyectoSEIA.region,
+                          ProyectoSEIA.link_expediente, ProyectoSEIA.latitud, ProyectoSEIA.longitud,
+                          Empresa.nombre)
+                 .outerjoin(Empresa, Empresa.id == ProyectoSEIA.id_empresa)
+                 .filter(ProyectoSEIA.latitud.isnot(None), ProyectoSEIA.longitud.isnot(None))
+                 .all())
+    return [
+        {'id': id_, 'codigo_expediente': codigo, 'nombre': nombre, 'tipo': tipo, 'estado': estado,
+         'region': region, 'link_expediente': link, 'lat': lat, 'lng': lng, 'titular': titular}
+        for id_, codigo, nombre, tipo, estado, region, link, lat, lng, titular in filas
+    ]
+
+_indice: Optional[IndiceEspacial] = None
+_lock = threading.Lock()
+
+def obtener_indice() -> IndiceEspacial:
+    """Índice del proceso; se reconstruye cuando una sincronización cambia la versión de datos SEIA"""
+    global _indice
+    from config.version_datos import version_datos
+
+    version = version_datos('seia')
+    if _indice is not None and _indice.version == version:
+        return _indice
+    with _lock:
+        if _indice is None or _indice.version != version:
+            inicio = time.perf_counter()
+            _indice = IndiceEspacial(cargar_puntos_desde_db(), version=version)
+            logger.info(f"🗺️ Índice espacial: {len(_indice)} proyectos en "
+                        f"{(time.perf_counter() - inicio) * 1000:.0f} ms (versión {version})")
+    return _indice
@@ -0,0 +1,300 @@
+# engine/indice_titulares.py
+# Índice de prefijos de titulares conocidos para GET /autocomplete: un arreglo ordenado de nombres
+# normalizados (Empresa.nombre y alias, incluidos los titulares registrados desde el scraping) donde
+# cada consulta es un bisect. Se construye en el master antes del fork (preload_app) y cada worker
+# lo lee sin bloqueo; las empresas y alias nuevos se agregan de forma incremental por id.
+# El corrector de tipeo (SymSpell) es mucho más pesado: cada worker lo construye en segundo plano
+# después del fork, solo con las MAX_PALABRAS_CORRECTOR palabras más frecuentes.
+
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from engine.corrector_titulares import LARGO_MINIMO, CorrectorSymSpell
+from scrapers.similitud_titular import normalizar_titular
+
+logger = logging.getLogger(__name__)
+
+MIN_CARACTERES = 2
+MAX_SUGERENCIAS = 20
+# Claves revisadas como máximo por consulta: acota la latencia de prefijos muy cortos
+MAX_ESCANEO = int(os.getenv("AUTOCOMPLETAR_MAX_ESCANEO", "2000"))
+# Cada cuánto un worker busca empresas y alias nuevos aunque no haya sincronizaciones
+INTERVALO_ACTUALIZACION = int(os.getenv("AUTOCOMPLETAR_INTERVALO", "300"))
+
+MAX_CORRECCIONES = 5
+# Candidatos por palabra que se combinan al corregir un nombre completo
+CANDIDATOS_POR_PALABRA = 3
+MAX_PALABRAS_CORREGIBLES = 6
+# Tope del vocabulario del corrector: sus borrados ocupan ~15 claves por palabra
+MAX_PALABRAS_CORRECTOR = int(os.getenv("CORRECTOR_MAX_PALABRAS", "30000"))
+
+# Fila: (id_empresa, nombre canónico, texto indexado, total de proyectos)
+Fila = Tuple[int, str, str, int]
+
+def _claves(texto: str) -> List[Tuple[str, bool]]:
+    """Nombre normalizado y sus sufijos desde cada palabra ('enel generacion' -> 'generacion')"""
+    normalizado = normalizar_titular(texto)
+    if not normalizado:
+        return []
+    palabras = normalizado.split()
+    return [(normalizado, False)] + [(' '.join(palabras[i:]), True) for i in range(1, len(palabras))
+                                     if len(palabras[i]) >= MIN_CARACTERES]
+
+class IndiceTitulares:
+    """Arreglo ordenado de claves con referencias paralelas; las actualizaciones crean arreglos nuevos"""
+
+    def __init__(self, filas: Iterable[Fila] = (), version: str = ''):
+        self.version = version
+        self.actualizado = time.monotonic()
+        self.max_id_empresa = 0
+        self.max_id_alias = 0
+        self.empresas: Dict[int, Tuple[str, int]] = {}
+        # Textos indexados (nombre o alias) con su empresa; las referencias apuntan a esta lista
+        self.textos: List[Tuple[int, str]] = []
+        # (claves, referencias): se reemplaza la tupla completa, así un lector nunca ve un estado intermedio
+        self._datos: Tuple[List[str], List[Tuple[int, bool]]] = ([], [])
+        # Frecuencia de cada palabra de titulares (1 + proyectos); el corrector se arma bajo demanda
+        self.frecuencias_palabras: Dict[str, int] = {}
+        self._corrector: Optional[CorrectorSymSpell] = None
+        self._lock_corrector = threading.Lock()
+        self._construyendo_corrector = threading.Event()
+        self.agregar(filas)
+
+    def __len__(self) -> int:
+        return len(self.empresas)
+
+    @property
+    def total_claves(self) -> int:
+        return len(self._datos[0])
+
+    def agregar(self, filas: Iterable[Fila]) -> int:
+        """Mezcla filas nuevas en el arreglo ordenado. Retorna cuántas claves agregó"""
+        nuevas = []
+        for id_empresa, nombre, texto, total in filas:
+            self.empresas[id_empresa] = (nombre, total or 0)
+            posicion = len(self.textos)
+            self.textos.append((id_empresa, texto))
+            for clave, es_sufijo in _claves(texto):
+                nuevas.append((clave, (posicion, es_sufijo)))
+                if not es_sufijo:
+                    for palabra in clave.split():
+                        self._contar_palabra(palabra, 1 + (total or 0))
+        if not nuevas:
+            return 0
+        nuevas.sort(key=lambda par: par[0])
+        claves, referencias = self._datos
+        mezcla = list(heapq.merge(zip(claves, referencias), nuevas, key=lambda par: par[0]))
+        self._datos = ([c for c, _ in mezcla], [r for _, r in mezcla])
+        self.actualizado = time.monotonic()
+        return len(nuevas)
+
+    def _contar_palabra(self, palabra: str, frecuencia: int) -> None:
+        if len(palabra) < LARGO_MINIMO:
+            return
+        self.frecuencias_palabras[palabra] = self.frecuencias_palabras.get(palabra, 0) + frecuencia
+        corrector = self._corrector
+        # Con el corrector ya armado, las palabras nuevas entran mientras quede espacio
+        if corrector is not None and (palabra in corrector or len(corrector) < MAX_PALABRAS_CORRECTOR):
+            corrector.agregar(palabra, frecuencia)
+
+    @property
+    def corrector(self) -> CorrectorSymSpell:
+        """Corrector de tipeo; lo construye en este hilo si aún no existe"""
+        return self.preparar_corrector()
+
+    def preparar_corrector(self) -> CorrectorSymSpell:
+        """Construye el corrector con las MAX_PALABRAS_CORRECTOR palabras más frecuentes"""
+        with self._lock_corrector:
+            if self._corrector is None:
+                inicio = time.perf_counter()
+                corrector = CorrectorSymSpell()
+                # Copia de las frecuencias: el hilo de actualización puede seguir agregando palabras
+                palabras = heapq.nlargest(MAX_PALABRAS_CORRECTOR, list(self.frecuencias_palabras.items()),
+                                          key=lambda par: par[1])
+                for palabra, frecuencia in palabras:
+                    corrector.agregar(palabra, frecuencia)
+                self._corrector = corrector
+                logger.info(f"✏️ Corrector de titulares: {len(corrector)} de {len(self.frecuencias_palabras)} "
+                            f"palabras en {(time.perf_counter() - inicio) * 1000:.0f} ms")
+            return self._corrector
+
+    def preparar_corrector_en_segundo_plano(self) -> None:
+        """Arma el corrector en un hilo; mientras tanto corregir() no sugiere nada"""
+        if self._corrector is not None or self._construyendo_corrector.is_set():
+            return
+        self._construyendo_corrector.set()
+
+        def construir():
+            try:
+                self.preparar_corrector()
+            except Exception as e:
+                logger.warning(f"⚠️ No se pudo construir el corrector de titulares: {e}")
+            finally:
+                self._construyendo_corrector.clear()
+
+        threading.Thread(target=construir, name="corrector-titulares", daemon=True).start()
+
+    def buscar(self, consulta: str, limite: int = 10) -> List[Dict]:
+        """Titulares cuyo nombre (o una palabra interna) empieza con la consulta, los más relevantes primero"""
+        prefijo = normalizar_titular(consulta)
+        if len(prefijo) < MIN_CARACTERES:
+            return []
+        limite = max(1, min(limite, MAX_SUGERENCIAS))
+        claves, referencias = self._datos
+
+        mejores: Dict[int, Tuple[bool, int]] = {}
+        inicio = bisect_left(claves, prefijo)
+        for indice in range(inicio, min(len(claves), inicio + MAX_ESCANEO)):
+            if not claves[indice].startswith(prefijo):
+                break
+            posicion, es_sufijo = referencias[indice]
+            id_empresa = self.textos[posicion][0]
+            previa = mejores.get(id_empresa)
+            # Se prefiere la coincidencia al inicio del nombre sobre una palabra interna
+            if previa is None or (previa[0] and not es_sufijo):
+                mejores[id_empresa] = (es_sufijo, posicion)
+
+        def relevancia(item):
+            id_empresa, (es_sufijo, _) = item
+            nombre, total = self.empresas[id_empresa]
+            return (es_sufijo, -total, len(nombre), nombre)
+
+        sugerencias = []
+        for id_empresa, (es_sufijo, posicion) in sorted(mejores.items(), key=relevancia)[:limite]:
+            nombre, total = self.empresas[id_empresa]
+            sugerencia = {'titular': nombre, 'empresa_id': id_empresa, 'proyectos': total}
+            texto = self.textos[posicion][1]
+            if texto != nombre:
+                sugerencia['coincide'] = texto
+            sugerencias.append(sugerencia)
+        return sugerencias
+
+    def titular_exacto(self, normalizado: str) -> Optional[str]:
+        """Nombre canónico del titular cuyo nombre o alias normalizado es exactamente el indicado"""
+        claves, referencias = self._datos
+        indice = bisect_left(claves, normalizado)
+        while indice < len(claves) and claves[indice] == normalizado:
+            posicion, es_sufijo = referencias[indice]
+            if not es_sufijo:
+                return self.empresas[self.textos[posicion][0]][0]
+            indice += 1
+        return None
+
+    def corregir(self, consulta: str, limite: int = MAX_CORRECCIONES) -> List[Dict]:
+        """
+        Nombres corregidos palabra por palabra, los que corresponden a un titular conocido primero.
+        Retorna [] si el nombre ya es conocido, no hay palabras que corregir o el corrector aún se construye.
+        """
+        normalizado = normalizar_titular(consulta)
+        palabras = normalizado.split()
+        if not palabras or len(palabras) > MAX_PALABRAS_CORREGIBLES or self.titular_exacto(normalizado):
+            return []
+        corrector = self._corrector
+        if corrector is None:
+            self.preparar_corrector_en_segundo_plano()
+            return []
+
+        opciones = []
+        for palabra in palabras:
+            if palabra in self.frecuencias_palabras:
+                # Conocida aunque haya quedado fuera del vocabulario del corrector
+                opciones.append([(palabra, 0, self.frecuencias_palabras[palabra])])
+                continue
+            candidatos = corrector.candidatos(palabra, CANDIDATOS_POR_PALABRA)
+            # Palabras desconocidas sin candidatos (o demasiado cortas) se mantienen
+            opciones.append(candidatos or [(palabra, 0, 0)])
+        if all(len(o) == 1 and o[0][0] == p for o, p in zip(opciones, palabras)):
+            return []
+
+        sugerencias = []
+        for combinacion in itertools.product(*opciones):
+            texto = ' '.join(c[0] for c in combinacion)
+            if texto == normalizado:
+                continue
+            titular = self.titular_exacto(texto)
+            sugerencias.append({
+                'texto': texto,
+                'distancia': sum(c[1] for c in combinacion),
+                'titular': titular,
+                '_frecuencia': sum(c[2] for c in combinacion),
+            })
+        sugerencias.sort(key=lambda s: (s['titular'] is None, s['distancia'], -s['_frecuencia'], s['texto']))
+        return [{k: v for k, v in s.items() if not k.startswith('_')} for s in sugerencias[:limite]]
+
+def cargar_filas_desde_db(desde_empresa: int = 0, desde_alias: int = 0) -> Tuple[List[Fila], int, int]:
+    """Empresas y alias con id mayor al indicado. Retorna (filas, max id empresa, max id alias)"""
+    from config.database import sesion_db
+    from models.models import AliasEmpresa, Empresa, ResumenEmpresa
+
+    with sesion_db() as db:
+        empresas = (db.query(Empresa.id, Empresa.nombre, ResumenEmpresa.total_proyectos)
+                    .outerjoin(ResumenEmpresa, ResumenEmpresa.id_empresa == Empresa.id)
+                    .filter(Empresa.id > desde_empresa).all())
+        alias = (db.query(AliasEmpresa.id, AliasEmpresa.id_empresa, Empresa.nombre, AliasEmpresa.alias,
+                          ResumenEmpresa.total_proyectos)
+                 .join(Empresa, Empresa.id == AliasEmpresa.id_empresa)
+                 .outerjoin(ResumenEmpresa, ResumenEmpresa.id_empresa == Empresa.id)
+                 .filter(AliasEmpresa.id > desde_alias).all())
+
+    filas = [(id_, nombre, nombre, total) for id_, nombre, total in empresas]
+    filas += [(id_empresa, nombre, texto, total) for _, id_empresa, nombre, texto, total in alias
+              if normalizar_titular(texto) != normalizar_titular(nombre)]
+    return (filas,
+            max([desde_empresa] + [fila[0] for fila in empresas]),
+            max([desde_alias] + [fila[0] for fila in alias]))
+
+_indice: Optional[IndiceTitulares] = None
+_lock = threading.Lock()
+_actualizando = threading.Event()
+
+def _version() -> str:
+    from config.version_datos import version_datos
+    return f"{version_datos('seia')}-{version_datos('snifa')}"
+
+def construir_indice_titulares() -> IndiceTitulares:
+    """Construye el índice completo (al importar la aplicación, antes del fork de los workers)"""
+    global _indice
+    inicio = time.perf_counter()
+    version = _version()
+    filas, max_empresa, max_alias = cargar_filas_desde_db()
+    indice = IndiceTitulares(filas, version=version)
+    indice.max_id_empresa, indice.max_id_alias = max_empresa, max_alias
+    with _lock:
+        _indice = indice
+    logger.info(f"🔤 Índice de titulares: {len(indice)} empresas, {indice.total_claves} claves en "
+                f"{(time.perf_counter() - inicio) * 1000:.0f} ms")
+    return indice
+
+def _actualizar(indice: IndiceTitulares, version: str) -> None:
+    """Agrega al índice las empresas y alias registrados desde la última actualización"""
+    try:
+        filas, max_empresa, max_alias = cargar_filas_desde_db(indice.max_id_empresa, indice.max_id_alias)
+        with _lock:
+            agregadas = indice.agregar(filas)
+            indice.max_id_empresa, indice.max_id_alias = max_empresa, max_alias
+        if agregadas:
+            logger.info(f"🔤 Índice de titulares: {agregadas} claves nuevas (versión {version})")
+    except Exception as e:
+        logger.warning(f"⚠️ No se pudo actualizar el índice de titulares: {e}")
+    finally:
+        # También tras un error: se reintenta en el próximo intervalo, no en cada request
+        indice.version, indice.actualizado = version, time.monotonic()
+        _actualizando.clear()
+
+def obtener_indice_titulares() -> IndiceTitulares:
+    """Índice del proceso. Si cambió la versión de datos o pasó el intervalo se actualiza en segundo plano"""
+    indice = _indice
+    if indice is None:
+        return construir_indice_titulares()
+    version = _version()
+    vencido = time.monotonic() - indice.actualizado > INTERVALO_ACTUALIZACION
+    if (version != indice.version or vencido) and not _actualizando.is_set():
+        _actualizando.set()
+        threading.Thread(target=_actualizar, args=(indice, version), name="indice-titulares", daemon=True).start()
+    return indice
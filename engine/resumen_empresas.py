@@ -0,0 +1,81 @@
+# engine/resumen_empresas.py
+# Resumen de cumplimiento por empresa, materializado en la tabla resumen_empresas.
+
+import datetime
+import logging
+from typing import Dict, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models.models import ProyectoSEIA, SancionSNIFA, ResumenEmpresa
+
+logger = logging.getLogger(__name__)
+
+SIN_DATO = "Sin información"
+
+def _conteo_por(db: Session, columna, id_empresa: int) -> Dict[str, int]:
+    """Cuenta las filas de la empresa agrupadas por la columna indicada (usa el índice de id_empresa)"""
+    modelo = columna.class_
+    filas = (
+        db.query(columna, func.count(modelo.id))
+        .filter(modelo.id_empresa == id_empresa)
+        .group_by(columna)
+        .all()
+    )
+    conteo: Dict[str, int] = {}
+    for valor, cantidad in filas:
+        clave = (valor or "").strip() or SIN_DATO
+        conteo[clave] = conteo.get(clave, 0) + cantidad
+    return conteo
+
+def actualizar_resumen_empresa(db: Session, id_empresa: int) -> ResumenEmpresa:
+    """
+    Recalcula el resumen de una sola empresa (actualización incremental tras su sincronización).
+    No hace commit.
+    """
+    por_estado = _conteo_por(db, ProyectoSEIA.estado, id_empresa)
+    por_region = _conteo_por(db, ProyectoSEIA.region, id_empresa)
+    por_tipologia = _conteo_por(db, ProyectoSEIA.tipologia, id_empresa)
+    por_categoria = _conteo_por(db, SancionSNIFA.categoria, id_empresa)
+
+    resumen = db.get(ResumenEmpresa, id_empresa)
+    if resumen is None:
+        resumen = ResumenEmpresa(id_empresa=id_empresa)
+        db.add(resumen)
+
+    resumen.total_proyectos = sum(por_estado.values())
+    resumen.total_sanciones = sum(por_categoria.values())
+    resumen.proyectos_por_estado = por_estado
+    resumen.proyectos_por_region = por_region
+    resumen.proyectos_por_tipologia = por_tipologia
+    resumen.sanciones_por_categoria = por_categoria
+    resumen.fecha_actualizacion = datetime.datetime.now(datetime.timezone.utc)
+
+    db.flush()
+    logger.info(
+        f"📊 Resumen empresa {id_empresa}: {resumen.total_proyectos} proyectos, "
+        f"{resumen.total_sanciones} sanciones"
+    )
+    return resumen
+
+def obtener_resumen_empresa(db: Session, nombre_o_rut: str) -> Optional[Dict]:
+    """Retorna el resumen de cumplimiento de una empresa (lectura de una sola fila), o None"""
+    from scrapers.registro_empresas import resolver_empresa
+
+    empresa = resolver_empresa(db, nombre_o_rut)
+    if not empresa or not empresa.resumen:
+        return None
+
+    resumen = empresa.resumen
+    return {
+        "empresa": empresa.nombre,
+        "rut": empresa.rut,
+        "total_proyectos": resumen.total_proyectos,
+        "total_sanciones": resumen.total_sanciones,
+        "proyectos_por_estado": resumen.proyectos_por_estado or {},
+        "proyectos_por_region": resumen.proyectos_por_region or {},
+        "proyectos_por_tipologia": resumen.proyectos_por_tipologia or {},
+        "sanciones_por_categoria": resumen.sanciones_por_categoria or {},
+        "fecha_actualizacion": resumen.fecha_actualizacion.isoformat() if resumen.fecha_actualizacion else None,
+    }
@@ -0,0 +1,135 @@
+# engine/teselas.py
+# Teselas GeoJSON del catálogo de proyectos SEIA (/tiles/{z}/{x}/{y}) con agrupación en el servidor.
+# Cada tesela se genera desde el índice espacial y queda en cache por (versión de datos, z, x, y, filtros),
+# de modo que una sincronización que cambia los datos invalida todas las teselas.
+
+import hashlib
+import logging
+import math
+import os
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from scrapers.cache_ttl import CacheTTL
+
+logger = logging.getLogger(__name__)
+
+TAMANO_TESELA = 256
+ZOOM_MAXIMO = 20
+# Desde este zoom se envía cada proyecto por separado
+ZOOM_SIN_AGRUPAR = int(os.getenv("TESELAS_ZOOM_SIN_AGRUPAR", "13"))
+# Lado en píxeles de la celda de agrupación; divisor de 256 para que las celdas no crucen teselas
+CELDA_PX = int(os.getenv("TESELAS_CELDA_PX", "64"))
+# Zoom hasta el que se precalculan las teselas de Chile al arrancar cada worker
+ZOOM_PRECALCULO = int(os.getenv("TESELAS_ZOOM_PRECALCULO", "6"))
+BBOX_CHILE = (-56.5, -110.0, -17.0, -66.0)
+
+cache_teselas = CacheTTL(
+    ttl_segundos=int(os.getenv("TESELAS_TTL", str(24 * 3600))),
+    max_entradas=int(os.getenv("TESELAS_MAX_ENTRADAS", "4096")),
+)
+
+def tesela_valida(z: int, x: int, y: int) -> bool:
+    return 0 <= z <= ZOOM_MAXIMO and 0 <= x < 2 ** z and 0 <= y < 2 ** z
+
+def limites_tesela(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """(min_lat, min_lng, max_lat, max_lng) de la tesela en Web Mercator (esquema XYZ de Google Maps)"""
+    n = 2 ** z
+    lat_norte = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+    lat_sur = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 1) / n))))
+    return (lat_sur, x / n * 360.0 - 180.0, lat_norte, (x + 1) / n * 360.0 - 180.0)
+
+def a_pixeles(lat: float, lng: float, z: int) -> Tuple[float, float]:
+    """Coordenadas de píxel globales del punto en el zoom z"""
+    escala = TAMANO_TESELA * 2 ** z
+    lat = max(min(lat, 85.05112878), -85.05112878)
+    seno = math.sin(math.radians(lat))
+    return ((lng + 180.0) / 360.0 * escala,
+            (0.5 - math.log((1 + seno) / (1 - seno)) / (4 * math.pi)) * escala)
+
+def teselas_en_bbox(bbox: Tuple[float, float, float, float], z: int) -> Iterator[Tuple[int, int]]:
+    """(x, y) de las teselas del zoom z que cubren el bbox"""
+    min_lat, min_lng, max_lat, max_lng = bbox
+    x0, y0 = (int(v // TAMANO_TESELA) for v in a_pixeles(max_lat, min_lng, z))
+    x1, y1 = (int(v // TAMANO_TESELA) for v in a_pixeles(min_lat, max_lng, z))
+    ultimo = 2 ** z - 1
+    for x in range(max(0, x0), min(ultimo, x1) + 1):
+        for y in range(max(0, y0), min(ultimo, y1) + 1):
+            yield x, y
+
+def _punto(lat: float, lng: float, propiedades: Dict) -> Dict:
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [round(lng, 5), round(lat, 5)]},
+        "properties": propiedades,
+    }
+
+def _propiedades_proyecto(proyecto: Dict) -> Dict:
+    return {clave: proyecto.get(clave) for clave in ("id", "nombre", "estado", "tipo", "titular")}
+
+def generar_tesela(indice, z: int, x: int, y: int, estado: Optional[str] = None,
+                   tipo: Optional[str] = None) -> Dict:
+    """
+    FeatureCollection de la tesela. Bajo ZOOM_SIN_AGRUPAR los proyectos se agrupan en una grilla
+    de CELDA_PX alineada a la grilla global de píxeles: cada grupo es un punto en el centroide con
+    'cantidad' y los grupos de un solo proyecto se envían como el proyecto.
+    """
+    proyectos = indice.en_bbox(limites_tesela(z, x, y), estado=estado, tipo=tipo, limite=None)
+
+    if z >= ZOOM_SIN_AGRUPAR:
+        features = [_punto(p['lat'], p['lng'], _propiedades_proyecto(p)) for p in proyectos]
+    else:
+        celdas: Dict[Tuple[int, int], List[Dict]] = {}
+        for p in proyectos:
+            px, py = a_pixeles(p['lat'], p['lng'], z)
+            celdas.setdefault((int(px // CELDA_PX), int(py // CELDA_PX)), []).append(p)
+
+        features = []
+        for grupo in celdas.values():
+            if len(grupo) == 1:
+                features.append(_punto(grupo[0]['lat'], grupo[0]['lng'], _propiedades_proyecto(grupo[0])))
+                continue
+            features.append(_punto(
+                sum(p['lat'] for p in grupo) / len(grupo),
+                sum(p['lng'] for p in grupo) / len(grupo),
+                {"cluster": True, "cantidad": len(grupo)},
+            ))
+
+    return {"type": "FeatureCollection", "features": features, "proyectos": len(proyectos)}
+
+def obtener_tesela(z: int, x: int, y: int, estado: Optional[str] = None,
+                   tipo: Optional[str] = None) -> Dict:
+    """Tesela desde la cache ({'datos', 'etag'}), generándola si no está para la versión actual de los datos"""
+    from engine.indice_espacial import obtener_indice
+
+    indice = obtener_indice()
+    clave = (indice.version, z, x, y, estado or "", tipo or "")
+    entrada = cache_teselas.obtener(clave)
+    if entrada is None:
+        datos = generar_tesela(indice, z, x, y, estado, tipo)
+        etag = hashlib.sha256(repr(clave).encode("utf-8")).hexdigest()[:16]
+        entrada = {"datos": datos, "etag": f'W/"{etag}"'}
+        cache_teselas.guardar(clave, entrada)
+    return entrada
+
+def precalcular_teselas(zoom_max: int = ZOOM_PRECALCULO) -> int:
+    """Genera las teselas de Chile hasta zoom_max (sin filtros). Retorna cuántas generó"""
+    total = 0
+    for z in range(zoom_max + 1):
+        for x, y in teselas_en_bbox(BBOX_CHILE, z):
+            obtener_tesela(z, x, y)
+            total += 1
+    logger.info(f"🧩 Teselas precalculadas: {total} (zoom 0-{zoom_max})")
+    return total
+
+def precalcular_en_segundo_plano(zoom_max: int = ZOOM_PRECALCULO) -> threading.Thread:
+    """Precalcula en un hilo para no retrasar el arranque; sin base de datos solo se registra el aviso"""
+    def _tarea():
+        try:
+            precalcular_teselas(zoom_max)
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudieron precalcular las teselas: {e}")
+
+    hilo = threading.Thread(target=_tarea, name="teselas", daemon=True)
+    hilo.start()
+    return hilo
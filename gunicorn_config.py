@@ -4,7 +4,8 @@ import multiprocessing
 
 # Configuración del servidor
 bind = f"0.0.0.0:{os.getenv('PORT', 8000)}"
-workers = min(2, multiprocessing.cpu_count())
+# WEB_CONCURRENCY permite dimensionar los workers (por ejemplo desde benchmarks/carga_consulta.py)
+workers = int(os.getenv('WEB_CONCURRENCY', min(2, multiprocessing.cpu_count())))
 worker_class = "uvicorn.workers.UvicornWorker"
 worker_connections = 1000
 max_requests = 1000
@@ -35,14 +36,31 @@ limit_request_field_size = 8190
 def post_fork(server, worker):
     """Configuración después de fork del worker"""
     server.log.info("Worker spawned (pid: %s)", worker.pid)
+    
+    # Cada worker crea su propio engine/pool de base de datos (nunca comparte sockets con el master)
+    try:
+        from config.database import reiniciar_engine
+        reiniciar_engine()
+    except ImportError:
+        pass
 
 def pre_fork(server, worker):
     """Configuración antes de fork del worker"""
     server.log.info("Worker about to be forked (pid: %s)", worker.pid)
 
+# Proceso consumidor de la cola de trabajos (app/trabajos.py): el scraping en segundo plano no corre
+# dentro de los workers web. TRABAJOS_PROCESO=0 lo desactiva (por ejemplo, con un consumidor aparte).
+consumidor_trabajos = None
+
 def when_ready(server):
     """Callback cuando el servidor está listo"""
+    global consumidor_trabajos
     server.log.info("MERLIN server is ready. Listening on: %s", server.address)
+    if os.getenv('TRABAJOS_PROCESO', '1') != '0':
+        import subprocess
+        import sys
+        consumidor_trabajos = subprocess.Popen([sys.executable, '-m', 'app.trabajos'])
+        server.log.info("Job consumer started (pid: %s)", consumidor_trabajos.pid)
 
 def worker_int(worker):
     """Callback cuando worker recibe SIGINT"""
@@ -54,4 +72,10 @@ def pre_exec(server):
 
 def on_exit(server):
     """Callback al salir"""
-    server.log.info("MERLIN server is shutting down.") 
\ No newline at end of file
+    server.log.info("MERLIN server is shutting down.")
+    if consumidor_trabajos is not None and consumidor_trabajos.poll() is None:
+        consumidor_trabajos.terminate()
+        try:
+            consumidor_trabajos.wait(timeout=graceful_timeout)
+        except Exception:
+            consumidor_trabajos.kill() 
\ No newline at end of file
@@ -1,14 +1,20 @@
 # main.py - MERLIN Completo con SEIA y Google Maps
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
+import asyncio
+import hmac
 import os
 import sys
 import json
 import logging
+import time
 from typing import Dict, Optional, Any
 from datetime import datetime
+from app.tiempos import iniciar_medicion, medir_etapa, formatear_server_timing
+from app.assets import StaticFilesCacheados, asset, cargar_manifiesto, respuesta_con_etag
+from app.respuestas import respuesta_json
+from app.cache_consulta import cache_consultas, clave_consulta, responder_desde_cache, guardar_y_responder, coincide_etag
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
@@ -23,8 +29,10 @@ app = FastAPI(
 
 # Configuración
 try:
-    app.mount("/static", StaticFiles(directory="static"), name="static")
+    app.mount("/static", StaticFilesCacheados(directory="static"), name="static")
     templates = Jinja2Templates(directory="templates")
+    cargar_manifiesto()
+    templates.env.globals["asset"] = asset
     logger.info("✅ Configuración básica OK")
 except Exception as e:
     logger.error(f"⚠️ Error en configuración: {e}")
@@ -32,6 +40,16 @@ except Exception as e:
 
 logger.info("🚀 MERLIN Completo v3.0 - Con SEIA y Google Maps")
 
+@app.middleware("http")
+async def agregar_server_timing(request: Request, call_next):
+    """Agrega el header Server-Timing con el tiempo total y el de cada etapa medida"""
+    etapas = iniciar_medicion()
+    inicio = time.perf_counter()
+    response = await call_next(request)
+    etapas.append(("total", (time.perf_counter() - inicio) * 1000))
+    response.headers["Server-Timing"] = formatear_server_timing(etapas)
+    return response
+
 # Importación segura del scraper SEIA
 def importar_scraper_seia():
     """Importar scraper SEIA de forma segura"""
@@ -71,6 +89,15 @@ def importar_scraper_bcn():
             logger.warning(f"⚠️ No se pudo importar scraper BCN original: {e2}")
             return None
 
+def catalogo_normativo_vigente() -> Optional[Dict]:
+    """Versión y huella del catálogo normativo que usa este worker (None si no está disponible)"""
+    try:
+        from scrapers.catalogo_normativo import obtener_catalogo
+        catalogo = obtener_catalogo()
+        return {"version": catalogo.version, "huella": catalogo.huella}
+    except Exception:
+        return None
+
 # Función de scraper SEIA fallback
 def obtener_informacion_seia_fallback(nombre_empresa: str) -> Dict:
     """Función fallback cuando no se puede importar el scraper"""
@@ -105,6 +132,14 @@ scraper_seia = importar_scraper_seia()
 scraper_titular = importar_scraper_titular()
 scraper_bcn = importar_scraper_bcn()
 
+# Índice de autocompletado: con preload_app se construye en el master y los workers lo heredan;
+# el corrector de tipeo lo arma cada worker en segundo plano al iniciar (lifespan)
+try:
+    from engine.indice_titulares import construir_indice_titulares
+    construir_indice_titulares()
+except Exception as e:
+    logger.warning(f"⚠️ Índice de titulares no disponible al iniciar: {e}")
+
 def generar_respuesta_legal_completa(query: str, query_type: str = "general", empresa_info: Optional[Dict] = None) -> str:
     """Genera respuestas legales completas con contexto de empresa si está disponible"""
     try:
@@ -357,6 +392,33 @@ Su consulta sobre "{query}" se relaciona con **{tema}**.
 
 *Para acceder a la normativa completa, visite: https://www.bcn.cl/leychile/consulta/listado_n_sel?agr=2*"""
 
+# Con una única corrección que corresponde a un titular conocido, se busca directamente ese titular
+APLICAR_CORRECCIONES = os.getenv("CORRECTOR_APLICAR", "true").lower() in ("1", "true", "yes")
+
+def corregir_nombre_empresa(nombre_empresa: str, aplicar: bool = True) -> Optional[Dict]:
+    """Correcciones de tipeo del nombre contra los titulares conocidos, antes de consultar el SEIA"""
+    try:
+        from engine.indice_titulares import obtener_indice_titulares
+        sugerencias = obtener_indice_titulares().corregir(nombre_empresa)
+    except Exception as e:
+        logger.warning(f"⚠️ Corrector de titulares no disponible: {e}")
+        return None
+    if not sugerencias:
+        return None
+    
+    mejor = sugerencias[0]
+    # Solo se aplica si no hay otro titular conocido igual de cercano
+    ambigua = len(sugerencias) > 1 and sugerencias[1]['titular'] and sugerencias[1]['distancia'] == mejor['distancia']
+    aplicada = bool(aplicar and APLICAR_CORRECCIONES and mejor['titular'] and not ambigua)
+    if aplicada:
+        logger.info(f"✏️ Nombre corregido: '{nombre_empresa}' -> '{mejor['titular']}'")
+    return {
+        'original': nombre_empresa,
+        'aplicada': aplicada,
+        'busqueda': mejor['titular'] if aplicada else nombre_empresa,
+        'sugerencias': sugerencias,
+    }
+
 def procesar_informacion_empresa(nombre_empresa: str, query_type: str) -> Optional[Dict]:
     """Procesa información de empresa usando scraper por titular o SEIA"""
     try:
@@ -378,6 +440,12 @@ def procesar_informacion_empresa(nombre_empresa: str, query_type: str) -> Option
                     # Si hay proyectos, siempre devolver para selección (incluso si es uno solo)
                     if len(lista_proyectos) > 0:
                         logger.info(f"✅ Encontrados {len(lista_proyectos)} proyectos para selección")
+                        # Mientras el usuario elige, se precarga el detalle de los mejor rankeados
+                        try:
+                            from scrapers.seia_titular import precargar_detalles
+                            precargar_detalles(lista_proyectos)
+                        except Exception as e:
+                            logger.warning(f"⚠️ Precarga de detalles no disponible: {e}")
                         return {
                             'success': True,
                             'requiere_seleccion': True,
@@ -415,12 +483,16 @@ def procesar_informacion_empresa(nombre_empresa: str, query_type: str) -> Option
                                     'ubicacion_proyecto': proyecto.get('ubicacion_detallada', proyecto.get('region', '')),
                                     'comuna': proyecto.get('comuna', ''),
                                     'provincia': proyecto.get('provincia', ''),
-                                    'coordenadas': ''
+                                    'coordenadas': proyecto.get('coordenadas', '')
                                 }
                             },
                             'modo': 'titular_unico'
                         }
                 
+                if result_titular and result_titular.get('cache_negativa'):
+                    # Ya confirmado sin proyectos: el scraper SEIA tampoco encontraría nada
+                    return obtener_informacion_seia_fallback(nombre_empresa)
+                
                 logger.info("⚠️ Scraper por titular no encontró resultados, probando scraper SEIA")
                 
             except Exception as e:
@@ -471,6 +543,26 @@ def extraer_informacion_ubicacion(empresa_info: Dict) -> Optional[Dict]:
             'fuente': 'Sistema SEIA'
         }
         
+        # Coordenadas del expediente (UTM/geográficas en cualquier datum) convertidas a WGS84
+        from scrapers.coordenadas import coordenadas_desde_texto, formatear_coordenadas
+        punto = ubicacion.get('punto') or coordenadas_desde_texto(ubicacion_info['coordenadas'])
+        if punto:
+            ubicacion_info['punto'] = punto
+            ubicacion_info['coordenadas'] = formatear_coordenadas(punto)
+        
+        # Si no hay, coordenadas resueltas en el servidor (nomenclátor de comunas/regiones y cache de direcciones)
+        if not punto:
+            try:
+                from scrapers.geocodificacion import geocodificar
+                with medir_etapa("geocodificacion"):
+                    ubicacion_info['punto'] = geocodificar(
+                        direccion=ubicacion_info['direccion'],
+                        comuna=ubicacion_info['comuna'],
+                        region=ubicacion_info['region']
+                    )
+            except ImportError:
+                logger.warning("⚠️ Geocodificación local no disponible")
+        
         # Filtrar campos vacíos
         ubicacion_filtrada = {k: v for k, v in ubicacion_info.items() if v}
         
@@ -486,7 +578,7 @@ async def render_form(request: Request):
     """Renderizar interfaz principal"""
     try:
         if templates:
-            return templates.TemplateResponse("index.html", {"request": request})
+            return respuesta_con_etag(request, templates.TemplateResponse("index.html", {"request": request}))
         else:
             return HTMLResponse("""
             <html>
@@ -535,22 +627,40 @@ async def consulta_completa(request: Request):
         if query and len(query) > 2000:
             raise HTTPException(status_code=400, detail="Consulta demasiado larga (máximo 2000 caracteres)")
         
+        # Respuesta completa desde cache si la misma consulta ya se procesó con los datos actuales
+        catalogo_normativo = catalogo_normativo_vigente() if query_type == "legal" else None
+        corregir = data.get("corregir", True) is not False
+        clave_cache = clave_consulta(query_type, query, company_name,
+                                     catalogo_normativo["huella"] if catalogo_normativo else "", corregir)
+        en_cache = responder_desde_cache(request, clave_cache, data.get("fields"))
+        if en_cache is not None:
+            logger.info(f"⚡ Consulta desde cache: {query_type} - {company_name[:50] if company_name else 'N/A'}")
+            return en_cache
+        
         logger.info(f"Procesando consulta: {query_type} - {company_name[:50] if company_name else 'N/A'}")
         
         # Procesar información de empresa si es necesario
         empresa_info = None
+        correccion = None
+        nombre_busqueda = company_name
         if query_type == "proyecto" and company_name:
-            empresa_info = procesar_informacion_empresa(company_name, query_type)
+            with medir_etapa("correccion"):
+                correccion = corregir_nombre_empresa(company_name, aplicar=corregir)
+            if correccion:
+                nombre_busqueda = correccion['busqueda']
+            with medir_etapa("empresa"):
+                empresa_info = procesar_informacion_empresa(nombre_busqueda, query_type)
             if empresa_info:
                 logger.info("✅ Información de empresa obtenida")
                 
                 # Verificar si requiere selección de proyecto
                 if empresa_info.get('requiere_seleccion'):
                     lista_proyectos = empresa_info.get('lista_proyectos', [])
-                    return JSONResponse({
+                    return guardar_y_responder(request, clave_cache, query_type, {
                         "success": True,
                         "requiere_seleccion": True,
-                        "empresa_buscada": company_name,
+                        "empresa_buscada": nombre_busqueda,
+                        "correccion_titular": correccion,
                         "proyectos_encontrados": len(lista_proyectos),
                         "lista_proyectos": [{
                             "id": p.get('id_proyecto'),
@@ -562,10 +672,10 @@ async def consulta_completa(request: Request):
                             "inversion": p.get('inversion', 'No especificada'),
                             "score": p.get('score_relevancia', 0)
                         } for p in lista_proyectos],
-                        "mensaje": f"Se encontraron {len(lista_proyectos)} proyectos para '{company_name}'. Selecciona el proyecto específico:",
+                        "mensaje": f"Se encontraron {len(lista_proyectos)} proyectos para '{nombre_busqueda}'. Selecciona el proyecto específico:",
                         "stats": empresa_info.get('stats', {}),
                         "timestamp": datetime.now().isoformat()
-                    })
+                    }, campos=data.get("fields"))
                     
             else:
                 logger.warning("⚠️ No se pudo obtener información de empresa")
@@ -575,7 +685,8 @@ async def consulta_completa(request: Request):
             # Para proyectos sin consulta, generar respuesta básica
             query = f"Información del proyecto de {company_name}"
         
-        respuesta = generar_respuesta_legal_completa(query, query_type, empresa_info)
+        with medir_etapa("respuesta"):
+            respuesta = generar_respuesta_legal_completa(query, query_type, empresa_info)
         
         # Preparar respuesta base
         response_data = {
@@ -607,6 +718,11 @@ async def consulta_completa(request: Request):
             ]
         }
         
+        if correccion:
+            response_data["correccion_titular"] = correccion
+        if catalogo_normativo:
+            response_data["version_catalogo"] = catalogo_normativo["version"]
+        
         # Agregar información de empresa si está disponible
         if empresa_info and empresa_info.get('success') and empresa_info.get('data'):
             data_empresa = empresa_info['data']
@@ -637,18 +753,172 @@ async def consulta_completa(request: Request):
         # Log de respuesta exitosa
         logger.info(f"✅ Consulta procesada exitosamente - Tipo: {query_type}")
         
-        return JSONResponse(response_data)
+        # Sin datos reales de la empresa (SEIA caído, datos DEMO del fallback) no se cachea: se reintenta
+        cachear = query_type != "proyecto" or bool(empresa_info and empresa_info.get('success')
+                                                   and empresa_info.get('modo') != 'fallback')
+        return guardar_y_responder(request, clave_cache, query_type, response_data, data.get("fields"), cachear)
         
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error crítico en consulta_completa: {str(e)}")
-        return JSONResponse({
+        return respuesta_json(request, {
             "success": False,
             "error": f"Error interno del servidor: {str(e)[:200]}",
             "timestamp": datetime.now().isoformat()
         }, status_code=500)
 
+@app.post("/consulta/batch")
+async def consulta_lote(request: Request):
+    """Consulta por lotes de empresas (nombres o RUTs) con resultados en streaming NDJSON.
+    
+    Body: {"empresas": [...]} para un lote nuevo o {"lote_id": "..."} para reanudar uno interrumpido.
+    """
+    from app.lote_consultas import almacen_lotes, leer_empresas, transmitir_lote
+    try:
+        data = await request.json()
+    except Exception:
+        raise HTTPException(status_code=400, detail="Formato de datos inválido")
+    
+    try:
+        lote_id = str(data.get("lote_id", "")).strip()
+        if lote_id:
+            empresas = almacen_lotes.empresas(lote_id)
+            if empresas is None:
+                return respuesta_json(request, {"success": False, "error": f"Lote {lote_id} no encontrado o vencido"}, status_code=404)
+        else:
+            empresas = leer_empresas(data.get("empresas"))
+            lote_id = almacen_lotes.crear(empresas)
+    except ValueError as e:
+        return respuesta_json(request, {"success": False, "error": str(e)}, status_code=400)
+    
+    logger.info(f"📦 Lote {lote_id}: {len(empresas)} empresas")
+    return StreamingResponse(
+        transmitir_lote(lote_id, empresas),
+        media_type="application/x-ndjson",
+        headers={"X-Lote-Id": lote_id, "Cache-Control": "no-store"}
+    )
+
+def procesar_seleccion_proyecto(empresa_nombre: str, proyecto_id: int, query: str, query_type: str) -> Dict:
+    """Detalle del proyecto seleccionado y respuesta legal (usado por /seleccionar_proyecto y por la cola de trabajos)"""
+    logger.info(f"Seleccionando proyecto {proyecto_id} para empresa: {empresa_nombre}")
+    
+    # Obtener proyecto específico
+    try:
+        from config.database import sesion_db
+        from scrapers.seia_titular import obtener_proyecto_seleccionado
+        # Una sola sesión para resolver y registrar el titular
+        with medir_etapa("seleccion"), sesion_db() as db:
+            resultado = obtener_proyecto_seleccionado(empresa_nombre, proyecto_id, db=db)
+        
+        if not resultado.get('success'):
+            raise HTTPException(status_code=404, detail=f"No se encontró el proyecto: {resultado.get('error', 'Error desconocido')}")
+        
+        proyecto_data = resultado.get('data', {})
+        
+    except HTTPException:
+        raise
+    except ImportError:
+        raise HTTPException(status_code=500, detail="Scraper por titular no disponible")
+    except Exception as e:
+        logger.error(f"Error al obtener proyecto seleccionado: {e}")
+        raise HTTPException(status_code=500, detail=f"Error al obtener proyecto: {str(e)}")
+    
+    # Estructurar información de empresa
+    empresa_info = {
+        'success': True,
+        'data': {
+            'codigo_expediente': proyecto_data.get('link_expediente', '').split('=')[-1] if proyecto_data.get('link_expediente') else 'N/A',
+            'nombre': proyecto_data.get('nombre', ''),
+            'estado': proyecto_data.get('estado', ''),
+            'region': proyecto_data.get('region', ''),
+            'tipo': proyecto_data.get('tipo', ''),
+            'fecha_presentacion': proyecto_data.get('fecha', ''),
+            'inversion': proyecto_data.get('inversion', ''),
+            'link_expediente': proyecto_data.get('link_expediente', ''),
+            'titular': {
+                'nombre': proyecto_data.get('titular', empresa_nombre),
+                'nombre_fantasia': proyecto_data.get('titular', empresa_nombre),
+                'razon_social': proyecto_data.get('razon_social_completa', ''),
+                'rut': proyecto_data.get('rut', ''),
+                'direccion': proyecto_data.get('direccion_titular', ''),
+                'telefono': proyecto_data.get('telefono', ''),
+                'email': proyecto_data.get('email', '')
+            },
+            'ubicacion': {
+                'region': proyecto_data.get('region', ''),
+                'ubicacion_proyecto': proyecto_data.get('ubicacion_detallada', proyecto_data.get('region', '')),
+                'comuna': proyecto_data.get('comuna', ''),
+                'provincia': proyecto_data.get('provincia', ''),
+                'coordenadas': proyecto_data.get('coordenadas', '')
+            }
+        },
+        'modo': 'titular_seleccionado'
+    }
+    
+    # Generar respuesta legal
+    with medir_etapa("respuesta"):
+        respuesta = generar_respuesta_legal_completa(query or f"Información del proyecto {proyecto_data.get('nombre', 'seleccionado')}", query_type, empresa_info)
+    
+    # Preparar respuesta
+    response_data = {
+        "success": True,
+        "respuesta": respuesta,
+        "query_type": query_type,
+        "proyecto_seleccionado": True,
+        "timestamp": datetime.now().isoformat(),
+        "referencias": [
+            {
+                "title": "Sistema de Evaluación de Impacto Ambiental (SEIA)",
+                "description": "Portal oficial del SEIA - Información de proyectos ambientales",
+                "url": "https://seia.sea.gob.cl/"
+            },
+            {
+                "title": "Expediente SEIA del Proyecto",
+                "description": f"Información detallada del proyecto: {proyecto_data.get('nombre', 'N/A')}",
+                "url": proyecto_data.get('link_expediente', 'https://seia.sea.gob.cl/')
+            }
+        ]
+    }
+    
+    # Agregar información de empresa
+    data_empresa = empresa_info['data']
+    titular = data_empresa.get('titular', {})
+    
+    response_data["empresa_info"] = {
+        "nombre": titular.get('nombre', empresa_nombre),
+        "nombre_fantasia": titular.get('nombre_fantasia', ''),
+        "razon_social": titular.get('razon_social', ''),
+        "rut": titular.get('rut', ''),
+        "direccion": titular.get('direccion', ''),
+        "telefono": titular.get('telefono', ''),
+        "email": titular.get('email', ''),
+        "region": data_empresa.get('ubicacion', {}).get('region', ''),
+        "codigo_expediente": data_empresa.get('codigo_expediente', ''),
+        "estado_proyecto": data_empresa.get('estado', ''),
+        "link_seia": data_empresa.get('link_expediente', ''),
+        "tipo": query_type,
+        "fuente": "SEIA (proyecto seleccionado)",
+        "proyecto_nombre": proyecto_data.get('nombre', ''),
+        "proyecto_id": proyecto_id
+    }
+    
+    # Agregar información de ubicación para Google Maps
+    ubicacion_info = extraer_informacion_ubicacion(empresa_info)
+    if ubicacion_info:
+        response_data["ubicacion"] = ubicacion_info
+        logger.info("✅ Información de ubicación incluida")
+    
+    logger.info(f"✅ Proyecto {proyecto_id} seleccionado exitosamente")
+    
+    return response_data
+
+try:
+    from app.trabajos import registrar_manejador
+    registrar_manejador("seleccion_proyecto", procesar_seleccion_proyecto)
+except ImportError as e:
+    logger.warning(f"⚠️ Cola de trabajos no disponible: {e}")
+
 @app.post("/seleccionar_proyecto")
 async def seleccionar_proyecto(request: Request):
     """Endpoint para seleccionar un proyecto específico de la lista"""
@@ -678,122 +948,164 @@ async def seleccionar_proyecto(request: Request):
         except (ValueError, TypeError):
             raise HTTPException(status_code=400, detail="ID de proyecto debe ser un número")
         
-        logger.info(f"Seleccionando proyecto {proyecto_id} para empresa: {empresa_nombre}")
+        # Con "async": true el scraping del detalle corre en la cola de trabajos (GET /jobs/{id})
+        if data.get("async"):
+            from app.trabajos import cola_trabajos
+            trabajo = cola_trabajos.encolar("seleccion_proyecto", {
+                "empresa_nombre": empresa_nombre,
+                "proyecto_id": proyecto_id,
+                "query": query,
+                "query_type": query_type
+            })
+            return respuesta_json(request, dict(trabajo, success=True, url=f"/jobs/{trabajo['job_id']}"), status_code=202)
         
-        # Obtener proyecto específico
-        try:
-            from scrapers.seia_titular import obtener_proyecto_seleccionado
-            resultado = obtener_proyecto_seleccionado(empresa_nombre, proyecto_id)
-            
-            if not resultado.get('success'):
-                raise HTTPException(status_code=404, detail=f"No se encontró el proyecto: {resultado.get('error', 'Error desconocido')}")
-            
-            proyecto_data = resultado.get('data', {})
-            
-        except ImportError:
-            raise HTTPException(status_code=500, detail="Scraper por titular no disponible")
-        except Exception as e:
-            logger.error(f"Error al obtener proyecto seleccionado: {e}")
-            raise HTTPException(status_code=500, detail=f"Error al obtener proyecto: {str(e)}")
-        
-        # Estructurar información de empresa
-        empresa_info = {
-            'success': True,
-            'data': {
-                'codigo_expediente': proyecto_data.get('link_expediente', '').split('=')[-1] if proyecto_data.get('link_expediente') else 'N/A',
-                'nombre': proyecto_data.get('nombre', ''),
-                'estado': proyecto_data.get('estado', ''),
-                'region': proyecto_data.get('region', ''),
-                'tipo': proyecto_data.get('tipo', ''),
-                'fecha_presentacion': proyecto_data.get('fecha', ''),
-                'inversion': proyecto_data.get('inversion', ''),
-                'link_expediente': proyecto_data.get('link_expediente', ''),
-                'titular': {
-                    'nombre': proyecto_data.get('titular', empresa_nombre),
-                    'nombre_fantasia': proyecto_data.get('titular', empresa_nombre),
-                    'razon_social': proyecto_data.get('razon_social_completa', ''),
-                    'rut': proyecto_data.get('rut', ''),
-                    'direccion': proyecto_data.get('direccion_titular', ''),
-                    'telefono': proyecto_data.get('telefono', ''),
-                    'email': proyecto_data.get('email', '')
-                },
-                'ubicacion': {
-                    'region': proyecto_data.get('region', ''),
-                    'ubicacion_proyecto': proyecto_data.get('ubicacion_detallada', proyecto_data.get('region', '')),
-                    'comuna': proyecto_data.get('comuna', ''),
-                    'provincia': proyecto_data.get('provincia', ''),
-                    'coordenadas': ''
-                }
-            },
-            'modo': 'titular_seleccionado'
-        }
+        response_data = procesar_seleccion_proyecto(empresa_nombre, proyecto_id, query, query_type)
+        return respuesta_json(request, response_data, campos=data.get("fields"))
         
-        # Generar respuesta legal
-        respuesta = generar_respuesta_legal_completa(query or f"Información del proyecto {proyecto_data.get('nombre', 'seleccionado')}", query_type, empresa_info)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error crítico en seleccionar_proyecto: {str(e)}")
+        return respuesta_json(request, {
+            "success": False,
+            "error": f"Error interno del servidor: {str(e)[:200]}",
+            "timestamp": datetime.now().isoformat()
+        }, status_code=500)
+
+@app.get("/jobs/{job_id}")
+async def estado_trabajo(request: Request, job_id: str):
+    """Estado de un trabajo encolado y, si terminó, su resultado"""
+    from app.trabajos import cola_trabajos
+    trabajo = cola_trabajos.obtener(job_id)
+    if trabajo is None:
+        return respuesta_json(request, {"success": False, "error": "Trabajo no encontrado o vencido"}, status_code=404)
+    # Mientras no termine, el cliente vuelve a consultar
+    encabezados = {"Cache-Control": "no-store"}
+    if trabajo["estado"] in ("pendiente", "en_proceso"):
+        encabezados["Retry-After"] = "2"
+    return respuesta_json(request, dict(trabajo, success=True), encabezados=encabezados)
+
+@app.get("/proyectos/cercanos")
+async def proyectos_cercanos(request: Request, lat: Optional[float] = None, lng: Optional[float] = None,
+                             proyecto_id: Optional[int] = None, k: int = 10, radio_km: Optional[float] = None,
+                             bbox: Optional[str] = None, estado: Optional[str] = None, tipo: Optional[str] = None):
+    """Proyectos SEIA cercanos a un punto o a otro proyecto (k más cercanos, radio) o dentro de un bbox"""
+    try:
+        from engine.indice_espacial import obtener_indice
+        with medir_etapa("indice_espacial"):
+            indice = obtener_indice()
         
-        # Preparar respuesta
-        response_data = {
+        if bbox:
+            try:
+                limites = [float(valor) for valor in bbox.split(",")]
+                assert len(limites) == 4
+            except (ValueError, AssertionError):
+                return respuesta_json(request, {"success": False, "error": "bbox debe ser min_lat,min_lng,max_lat,max_lng"}, status_code=400)
+            with medir_etapa("busqueda_espacial"):
+                proyectos = indice.en_bbox(limites, estado=estado, tipo=tipo)
+            centro = None
+        else:
+            if proyecto_id is not None:
+                origen = indice.buscar_id(proyecto_id)
+                if not origen:
+                    return respuesta_json(request, {"success": False, "error": "Proyecto sin coordenadas o inexistente"}, status_code=404)
+                lat, lng = origen['lat'], origen['lng']
+            if lat is None or lng is None:
+                return respuesta_json(request, {"success": False, "error": "Indique lat y lng, proyecto_id o bbox"}, status_code=400)
+            with medir_etapa("busqueda_espacial"):
+                proyectos = indice.cercanos(lat, lng, k=k, radio_km=radio_km, estado=estado,
+                                            tipo=tipo, excluir_id=proyecto_id)
+            centro = {"lat": lat, "lng": lng}
+        
+        return respuesta_json(request, {
             "success": True,
-            "respuesta": respuesta,
-            "query_type": query_type,
-            "proyecto_seleccionado": True,
-            "timestamp": datetime.now().isoformat(),
-            "referencias": [
-                {
-                    "title": "Sistema de Evaluación de Impacto Ambiental (SEIA)",
-                    "description": "Portal oficial del SEIA - Información de proyectos ambientales",
-                    "url": "https://seia.sea.gob.cl/"
-                },
-                {
-                    "title": "Expediente SEIA del Proyecto",
-                    "description": f"Información detallada del proyecto: {proyecto_data.get('nombre', 'N/A')}",
-                    "url": proyecto_data.get('link_expediente', 'https://seia.sea.gob.cl/')
-                }
-            ]
-        }
+            "centro": centro,
+            "total": len(proyectos),
+            "proyectos": proyectos,
+            "indice": {"proyectos": len(indice), "version": indice.version},
+            "timestamp": datetime.now().isoformat()
+        })
         
-        # Agregar información de empresa
-        data_empresa = empresa_info['data']
-        titular = data_empresa.get('titular', {})
-        
-        response_data["empresa_info"] = {
-            "nombre": titular.get('nombre', empresa_nombre),
-            "nombre_fantasia": titular.get('nombre_fantasia', ''),
-            "razon_social": titular.get('razon_social', ''),
-            "rut": titular.get('rut', ''),
-            "direccion": titular.get('direccion', ''),
-            "telefono": titular.get('telefono', ''),
-            "email": titular.get('email', ''),
-            "region": data_empresa.get('ubicacion', {}).get('region', ''),
-            "codigo_expediente": data_empresa.get('codigo_expediente', ''),
-            "estado_proyecto": data_empresa.get('estado', ''),
-            "link_seia": data_empresa.get('link_expediente', ''),
-            "tipo": query_type,
-            "fuente": "SEIA (proyecto seleccionado)",
-            "proyecto_nombre": proyecto_data.get('nombre', ''),
-            "proyecto_id": proyecto_id
-        }
+    except Exception as e:
+        logger.error(f"Error en proyectos_cercanos: {e}")
+        return respuesta_json(request, {
+            "success": False,
+            "error": f"Error interno del servidor: {str(e)[:200]}",
+            "timestamp": datetime.now().isoformat()
+        }, status_code=500)
+
+@app.get("/autocomplete")
+async def autocompletar_titular(request: Request, q: str = "", limite: int = 10):
+    """Titulares conocidos que empiezan con q (nombre o alias), para elegir uno exacto antes de consultar"""
+    try:
+        from engine.indice_titulares import obtener_indice_titulares
+        with medir_etapa("autocompletar"):
+            indice = obtener_indice_titulares()
+            sugerencias = indice.buscar(q, limite=limite)
         
-        # Agregar información de ubicación para Google Maps
-        ubicacion_info = extraer_informacion_ubicacion(empresa_info)
-        if ubicacion_info:
-            response_data["ubicacion"] = ubicacion_info
-            logger.info("✅ Información de ubicación incluida")
+        return respuesta_json(request, {
+            "success": True,
+            "q": q,
+            "sugerencias": sugerencias,
+        }, encabezados={"Cache-Control": "public, max-age=60"})
         
-        logger.info(f"✅ Proyecto {proyecto_id} seleccionado exitosamente")
+    except Exception as e:
+        logger.error(f"Error en autocompletar_titular: {e}")
+        return respuesta_json(request, {
+            "success": False,
+            "error": f"Índice de titulares no disponible: {str(e)[:200]}",
+            "sugerencias": []
+        }, status_code=503)
+
+@app.get("/tiles/{z}/{x}/{y}")
+async def tesela_proyectos(request: Request, z: int, x: int, y: int,
+                           estado: Optional[str] = None, tipo: Optional[str] = None):
+    """Tesela GeoJSON del catálogo de proyectos, agrupada en el servidor según el zoom"""
+    try:
+        from engine.teselas import tesela_valida, obtener_tesela
+        if not tesela_valida(z, x, y):
+            return respuesta_json(request, {"success": False, "error": "Tesela fuera de rango"}, status_code=400)
         
-        return JSONResponse(response_data)
+        with medir_etapa("tesela"):
+            entrada = obtener_tesela(z, x, y, estado, tipo)
+        
+        encabezados = {"ETag": entrada["etag"], "Cache-Control": "public, max-age=300"}
+        if coincide_etag(request, entrada["etag"]):
+            return Response(status_code=304, headers=encabezados)
+        return respuesta_json(request, entrada["datos"], encabezados=encabezados)
         
-    except HTTPException:
-        raise
     except Exception as e:
-        logger.error(f"Error crítico en seleccionar_proyecto: {str(e)}")
-        return JSONResponse({
+        logger.error(f"Error en tesela_proyectos: {e}")
+        return respuesta_json(request, {
             "success": False,
-            "error": f"Error interno del servidor: {str(e)[:200]}",
-            "timestamp": datetime.now().isoformat()
+            "error": f"Error interno del servidor: {str(e)[:200]}"
         }, status_code=500)
 
+# Token para los endpoints de administración; sin definir quedan deshabilitados
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+@app.post("/admin/catalogo/recargar")
+async def recargar_catalogo_normativo(request: Request):
+    """Recarga el catálogo normativo de este worker (los demás lo recargan al ver el archivo modificado)"""
+    if not ADMIN_TOKEN:
+        return respuesta_json(request, {"success": False, "error": "Endpoint de administración deshabilitado (ADMIN_TOKEN)"},
+                              status_code=404)
+    token = request.headers.get("x-admin-token") or request.headers.get("authorization", "").removeprefix("Bearer ")
+    if not hmac.compare_digest(token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8")):
+        return respuesta_json(request, {"success": False, "error": "Token de administración inválido"}, status_code=403)
+    
+    from scrapers.catalogo_normativo import estado_catalogo, recargar_catalogo
+    try:
+        # Se construye en un hilo: el event loop sigue atendiendo consultas con el catálogo anterior
+        await asyncio.to_thread(recargar_catalogo)
+    except Exception as e:
+        return respuesta_json(request, {
+            "success": False,
+            "error": f"Catálogo inválido, se mantiene el anterior: {str(e)[:200]}",
+            "catalogo": estado_catalogo()
+        }, status_code=422)
+    return respuesta_json(request, {"success": True, "catalogo": estado_catalogo()})
+
 @app.get("/health")
 async def health_check():
     """Health check completo y robusto"""
@@ -837,6 +1149,27 @@ async def health_check():
                 health_status["components"]["beautifulsoup"] = "no disponible"
             
             health_status["components"]["logging"] = "activo"
+            health_status["components"]["cache_consultas"] = cache_consultas.estadisticas()
+            try:
+                from scrapers.titulares_sin_proyectos import titulares_sin_proyectos
+                health_status["components"]["cache_negativa"] = titulares_sin_proyectos.estadisticas()
+            except Exception as e:
+                health_status["components"]["cache_negativa"] = f"no disponible: {e}"
+            try:
+                from scrapers.seia_titular import cache_detalles
+                health_status["components"]["precarga_detalles"] = cache_detalles.estadisticas()
+            except Exception as e:
+                health_status["components"]["precarga_detalles"] = f"no disponible: {e}"
+            try:
+                from scrapers.catalogo_normativo import estado_catalogo
+                health_status["components"]["catalogo_normativo"] = estado_catalogo()
+            except Exception as e:
+                health_status["components"]["catalogo_normativo"] = f"no disponible: {e}"
+            try:
+                from app.trabajos import cola_trabajos
+                health_status["components"]["cola_trabajos"] = cola_trabajos.estadisticas()
+            except Exception as e:
+                health_status["components"]["cola_trabajos"] = f"no disponible: {e}"
             
             # Verificar si algún componente crítico falla
             componentes_criticos = ["scraper_seia", "respuesta_legal"]
@@ -944,6 +1277,10 @@ async def diagnostico_completo():
             "endpoints": {
                 "/": "Interfaz principal",
                 "/consulta": "Endpoint principal de consultas",
+                "/consulta/batch": "Consulta por lotes de empresas (NDJSON)",
+                "/jobs/{id}": "Estado y resultado de trabajos en segundo plano",
+                "/proyectos/cercanos": "Proyectos SEIA cercanos (k, radio o bbox)",
+                "/tiles/{z}/{x}/{y}": "Teselas GeoJSON del catálogo de proyectos",
                 "/health": "Estado del sistema",
                 "/test": "Tests automáticos",
                 "/diagnostico": "Este diagnóstico"
@@ -964,9 +1301,27 @@ async def lifespan(app: FastAPI):
     logger.info(f"📊 Scraper SEIA: {'Disponible' if scraper_seia else 'Modo fallback'}")
     logger.info(f"🎯 Scraper Titular: {'Disponible' if scraper_titular else 'No disponible'}")
     logger.info(f"🎨 Templates: {'Disponible' if templates else 'No disponible'}")
+    try:
+        from engine.teselas import precalcular_en_segundo_plano
+        precalcular_en_segundo_plano()
+    except ImportError as e:
+        logger.warning(f"⚠️ Teselas del catálogo no disponibles: {e}")
+    try:
+        from engine.indice_titulares import obtener_indice_titulares
+        obtener_indice_titulares().preparar_corrector_en_segundo_plano()
+    except Exception as e:
+        logger.warning(f"⚠️ Corrector de titulares no disponible: {e}")
+    detener_trabajos = None
+    try:
+        from app.trabajos import iniciar_hilos_trabajos
+        detener_trabajos = iniciar_hilos_trabajos()
+    except ImportError as e:
+        logger.warning(f"⚠️ Cola de trabajos no disponible: {e}")
     logger.info("✅ MERLIN listo para consultas")
     yield
     # Shutdown
+    if detener_trabajos:
+        detener_trabajos.set()
     logger.info("👋 MERLIN cerrando...")
 
 # Aplicar lifespan al app
@@ -1,6 +1,7 @@
 # models/models.py
-from sqlalchemy import Column, Integer, String, Date, Text, TIMESTAMP, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, Text, TIMESTAMP, ForeignKey, JSON, Float
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from config.database import Base
 
 class Empresa(Base):
@@ -9,27 +10,47 @@ class Empresa(Base):
     id = Column(Integer, primary_key=True, index=True)
     rut = Column(String(12), unique=True, index=True)
     nombre = Column(String(255), nullable=False, index=True)
-    fecha_actualizacion = Column(TIMESTAMP(timezone=True), server_default='NOW()', onupdate='NOW()')
+    fecha_actualizacion = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relaciones
     proyectos = relationship("ProyectoSEIA", back_populates="titular")
     sanciones = relationship("SancionSNIFA", back_populates="infractor")
+    aliases = relationship("AliasEmpresa", back_populates="empresa")
+    resumen = relationship("ResumenEmpresa", back_populates="empresa", uselist=False)
+
+class AliasEmpresa(Base):
+    __tablename__ = "empresas_alias"
+
+    id = Column(Integer, primary_key=True, index=True)
+    id_empresa = Column(Integer, ForeignKey("empresas.id"), nullable=False, index=True)
+
+    alias = Column(String(255), nullable=False)
+    # Nombre normalizado (sin tildes ni sufijos legales) para resolver en una sola búsqueda indexada
+    alias_normalizado = Column(String(255), unique=True, nullable=False, index=True)
+    fuente = Column(String(50))
+    fecha_actualizacion = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    empresa = relationship("Empresa", back_populates="aliases")
 
 class ProyectoSEIA(Base):
     __tablename__ = "proyectos_seia"
 
     id = Column(Integer, primary_key=True, index=True)
-    id_empresa = Column(Integer, ForeignKey("empresas.id"))
+    id_empresa = Column(Integer, ForeignKey("empresas.id"), index=True)
 
     codigo_expediente = Column(Text, unique=True, nullable=False, index=True)
     nombre = Column(Text, nullable=False)
     tipo = Column(Text)
-    region = Column(Text)
+    region = Column(Text, index=True)
     tipologia = Column(Text)
-    estado = Column(Text)
+    estado = Column(Text, index=True)
     link_expediente = Column(Text)
     fecha_presentacion = Column(Date)
-    fecha_actualizacion = Column(TIMESTAMP(timezone=True), server_default='NOW()', onupdate='NOW()')
+    # Ubicación en WGS84 convertida desde las coordenadas del expediente (scrapers/coordenadas.py)
+    latitud = Column(Float)
+    longitud = Column(Float)
+    coordenadas_originales = Column(Text)
+    fecha_actualizacion = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
 
     titular = relationship("Empresa", back_populates="proyectos")
 
@@ -37,7 +58,7 @@ class SancionSNIFA(Base):
     __tablename__ = "sanciones_snifa"
 
     id = Column(Integer, primary_key=True, index=True)
-    id_empresa = Column(Integer, ForeignKey("empresas.id"))
+    id_empresa = Column(Integer, ForeignKey("empresas.id"), index=True)
 
     expediente = Column(Text, unique=True, nullable=False, index=True)
     nombre_infractor = Column(Text)
@@ -46,6 +67,23 @@ class SancionSNIFA(Base):
     region = Column(Text)
     estado = Column(Text)
     link_expediente = Column(Text)
-    fecha_actualizacion = Column(TIMESTAMP(timezone=True), server_default='NOW()', onupdate='NOW()')
+    fecha_actualizacion = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
 
     infractor = relationship("Empresa", back_populates="sanciones")
+
+class ResumenEmpresa(Base):
+    """Resumen materializado por empresa: se recalcula después de cada sincronización"""
+    __tablename__ = "resumen_empresas"
+
+    id_empresa = Column(Integer, ForeignKey("empresas.id"), primary_key=True)
+
+    total_proyectos = Column(Integer, nullable=False, default=0)
+    total_sanciones = Column(Integer, nullable=False, default=0)
+    # Conteos {valor: cantidad}
+    proyectos_por_estado = Column(JSON)
+    proyectos_por_region = Column(JSON)
+    proyectos_por_tipologia = Column(JSON)
+    sanciones_por_categoria = Column(JSON)
+    fecha_actualizacion = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    empresa = relationship("Empresa", back_populates="resumen")
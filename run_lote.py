@@ -0,0 +1,192 @@
+# run_lote.py - Revisión masiva de empresas sin pasar por la API (uso nocturno, cron)
+"""
+Lee un CSV de empresas y, en un pool de procesos, busca sus proyectos por titular en el SEIA,
+obtiene el detalle de los más relevantes y sincroniza sus sanciones SNIFA. Cada empresa queda
+como una línea NDJSON con sus tiempos por etapa; al reiniciar con la misma salida se omiten las
+empresas ya completas. Con salida .parquet (requiere pyarrow) el avance se guarda en <salida>.ndjson
+y el Parquet se escribe al terminar.
+
+    python run_lote.py empresas.csv --salida revision.ndjson --procesos 4
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Set
+
+PROCESOS_POR_DEFECTO = 4
+DETALLES_POR_DEFECTO = 3
+COLUMNAS_EMPRESA = ('empresa', 'nombre', 'titular', 'razon_social', 'rut')
+
+def leer_csv_empresas(ruta: str) -> List[str]:
+    """Empresas del CSV: la columna empresa/nombre/titular/rut si hay encabezado, si no la primera"""
+    with open(ruta, encoding='utf-8-sig', newline='') as archivo:
+        filas = [fila for fila in csv.reader(archivo) if fila and any(c.strip() for c in fila)]
+    if not filas:
+        return []
+
+    encabezado = [c.strip().lower() for c in filas[0]]
+    columna = next((encabezado.index(c) for c in COLUMNAS_EMPRESA if c in encabezado), None)
+    if columna is None:
+        columna = 0
+    else:
+        filas = filas[1:]
+    empresas = (fila[columna].strip() for fila in filas if len(fila) > columna)
+    return list(dict.fromkeys(e for e in empresas if e and not e.startswith('#')))
+
+def empresas_completas(ruta_avance: str) -> Set[str]:
+    """Empresas ya procesadas sin errores según el archivo de avance (las incompletas se reintentan)"""
+    completas = set()
+    if not os.path.exists(ruta_avance):
+        return completas
+    with open(ruta_avance, encoding='utf-8') as archivo:
+        for linea in archivo:
+            try:
+                registro = json.loads(linea)
+            except json.JSONDecodeError:
+                continue  # Última línea cortada por una interrupción
+            if registro.get('completa'):
+                completas.add(registro['empresa'])
+    return completas
+
+def _iniciar_proceso(turnos, lock):
+    """Initializer del pool: límite de tasa compartido y logs solo de advertencias"""
+    import logging
+    from scrapers.limite_tasa import usar_limitador_compartido
+
+    logging.basicConfig(level=logging.WARNING)
+    usar_limitador_compartido(turnos, lock)
+
+def procesar_empresa(empresa: str, detalles: int, snifa: bool) -> Dict:
+    """Búsqueda por titular, detalle de los primeros proyectos y sincronización SNIFA de una empresa"""
+    from scrapers.seia_titular import SEIATitularScraper
+
+    registro = {'empresa': empresa, 'completa': True, 'errores': [], 'tiempos_ms': {}}
+    inicio = time.perf_counter()
+    scraper = SEIATitularScraper(respetar_limite=True)
+
+    etapa = time.perf_counter()
+    busqueda = scraper.buscar_por_titular(empresa)
+    registro['tiempos_ms']['busqueda'] = round((time.perf_counter() - etapa) * 1000)
+    proyectos = busqueda.get('data', {}).get('lista_proyectos', []) if busqueda.get('success') else []
+    registro['proyectos_encontrados'] = len(proyectos)
+    if not busqueda.get('success'):
+        error = busqueda.get('error', 'Búsqueda sin resultados')
+        registro['errores'].append(error)
+        # Solo un "0 proyectos" confirmado por el SEIA es un resultado; un error de red o de parseo se reintenta
+        registro['completa'] = bool(busqueda.get('busqueda_completa'))
+
+    etapa = time.perf_counter()
+    registro['proyectos'] = [scraper.obtener_detalles_proyecto(p) for p in proyectos[:detalles]]
+    fallidos = [p for p in registro['proyectos'] if p.get('error_detalles')]
+    if fallidos:
+        # Sin el detalle de algún expediente la empresa queda incompleta y se reintenta al reiniciar
+        registro['completa'] = False
+        registro['errores'] += [f"Detalle {p.get('nombre', 'N/A')}: {p['error_detalles'][:200]}" for p in fallidos]
+    registro['proyectos'] += proyectos[detalles:]
+    registro['tiempos_ms']['detalles'] = round((time.perf_counter() - etapa) * 1000)
+
+    if snifa:
+        from config.database import sesion_db
+        from scrapers.snifa_scraper import sincronizar_sanciones_por_empresa
+
+        etapa = time.perf_counter()
+        try:
+            with sesion_db() as db:
+                registro['sanciones'] = sincronizar_sanciones_por_empresa(db, empresa)
+        except Exception as e:
+            registro['completa'] = False
+            registro['errores'].append(f"SNIFA: {str(e)[:200]}")
+        registro['tiempos_ms']['snifa'] = round((time.perf_counter() - etapa) * 1000)
+
+    registro['tiempos_ms']['total'] = round((time.perf_counter() - inicio) * 1000)
+    return registro
+
+def escribir_parquet(ruta_avance: str, ruta_parquet: str) -> None:
+    """Convierte el avance NDJSON a Parquet; los proyectos quedan como JSON en una columna"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    filas = []
+    with open(ruta_avance, encoding='utf-8') as archivo:
+        for linea in archivo:
+            try:
+                r = json.loads(linea)
+            except json.JSONDecodeError:
+                continue
+            filas.append({
+                'empresa': r['empresa'],
+                'completa': r.get('completa', False),
+                'proyectos_encontrados': r.get('proyectos_encontrados', 0),
+                'sanciones_insertadas': (r.get('sanciones') or {}).get('insertados', 0),
+                'busqueda_ms': r['tiempos_ms'].get('busqueda'),
+                'detalles_ms': r['tiempos_ms'].get('detalles'),
+                'snifa_ms': r['tiempos_ms'].get('snifa'),
+                'total_ms': r['tiempos_ms'].get('total'),
+                'errores': '; '.join(r.get('errores', [])),
+                'proyectos_json': json.dumps(r.get('proyectos', []), ensure_ascii=False),
+            })
+    # Si una empresa se reintentó, queda su último registro
+    filas = list({f['empresa']: f for f in filas}.values())
+    pq.write_table(pa.Table.from_pylist(filas), ruta_parquet)
+    print(f"📝 Parquet escrito en {ruta_parquet} ({len(filas)} empresas)")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Revisión masiva de empresas (SEIA por titular + SNIFA) sin la API")
+    parser.add_argument("csv", help="CSV con una columna empresa/nombre/titular/rut (o una empresa por línea)")
+    parser.add_argument("--salida", default="revision_empresas.ndjson", help="Archivo .ndjson o .parquet")
+    parser.add_argument("--procesos", type=int, default=PROCESOS_POR_DEFECTO, help="Procesos en paralelo")
+    parser.add_argument("--detalles", type=int, default=DETALLES_POR_DEFECTO,
+                        help="Proyectos por empresa con detalle del expediente")
+    parser.add_argument("--sin-snifa", action="store_true", help="No sincronizar sanciones SNIFA")
+    return parser.parse_args()
+
+def main() -> int:
+    args = parse_args()
+    parquet = args.salida.endswith('.parquet')
+    ruta_avance = f"{args.salida}.ndjson" if parquet else args.salida
+
+    empresas = leer_csv_empresas(args.csv)
+    completas = empresas_completas(ruta_avance)
+    pendientes = [e for e in empresas if e not in completas]
+    print(f"🚀 {len(empresas)} empresas, {len(completas & set(empresas))} ya completas, "
+          f"{len(pendientes)} pendientes con {args.procesos} procesos")
+
+    if not args.sin_snifa:
+        from config.database import init_db
+        init_db()
+
+    inicio = time.monotonic()
+    fallidas = 0
+    with multiprocessing.Manager() as manager:
+        turnos, lock = manager.dict(), manager.Lock()
+        with ProcessPoolExecutor(max_workers=max(1, args.procesos), initializer=_iniciar_proceso,
+                                 initargs=(turnos, lock)) as pool, \
+                open(ruta_avance, 'a', encoding='utf-8') as salida:
+            futuros = {pool.submit(procesar_empresa, e, args.detalles, not args.sin_snifa): e for e in pendientes}
+            for n, futuro in enumerate(as_completed(futuros), 1):
+                empresa = futuros[futuro]
+                try:
+                    registro = futuro.result()
+                except Exception as e:
+                    registro = {'empresa': empresa, 'completa': False, 'errores': [str(e)[:200]], 'tiempos_ms': {}}
+                fallidas += not registro['completa']
+                # Una línea por empresa y flush inmediato: el archivo es el punto de reinicio
+                salida.write(json.dumps(registro, ensure_ascii=False, default=str) + "\n")
+                salida.flush()
+                estado = "✅" if registro['completa'] else "❌"
+                print(f"{estado} [{n}/{len(pendientes)}] {empresa}: {registro.get('proyectos_encontrados', 0)} proyectos "
+                      f"({registro['tiempos_ms'].get('total', 0)} ms)")
+
+    if parquet:
+        escribir_parquet(ruta_avance, args.salida)
+
+    print(f"🏁 Revisión finalizada en {time.monotonic() - inicio:.1f}s: {fallidas} empresas con errores")
+    return 1 if fallidas else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,42 +1,71 @@
 # run_scraper.py - VERSIÓN FINAL PARA CREAR TABLAS
-from config.database import SessionLocal
-from scrapers.seia_scraper import sincronizar_proyectos_por_empresa
+import argparse
+
 # Importamos la función para inicializar la DB
 from config.database import init_db
-# Importamos el scraper de SNIFA (aunque aún no tenga lógica, para que no dé error)
-from scrapers.snifa_scraper import sincronizar_sanciones_por_empresa
+from scrapers.orquestador_sync import (
+    cargar_empresas_desde_archivo, cargar_empresas_desde_db, sincronizar_empresas,
+    georreferenciar_proyectos, WORKERS_POR_DEFECTO, REINTENTOS_POR_DEFECTO
+)
+
+# Empresas usadas cuando no se indica archivo ni --desde-db
+EMPRESAS_INICIALES = [
+    "ACCIONA",
+    "ENEL",
+    "COLBUN",
+    "CODELCO"
+]
 
-def poblar_datos_iniciales():
+def poblar_datos_iniciales(empresas=None, workers=WORKERS_POR_DEFECTO,
+                           reintentos=REINTENTOS_POR_DEFECTO, archivo_resumen=None):
     """
     Función principal para ejecutar los scrapers y llenar la base de datos.
     """
     print("Iniciando proceso de poblado de la base de datos...")
-    
-    db = SessionLocal()
-    
-    empresas_a_monitorear = [
-        "ACCIONA",
-        "ENEL",
-        "COLBUN",
-        "CODELCO"
-    ]
-
-    try:
-        for empresa in empresas_a_monitorear:
-            print(f"\n--- Procesando empresa: {empresa} ---")
-            sincronizar_proyectos_por_empresa(db, empresa)
-            sincronizar_sanciones_por_empresa(db, empresa)
-    finally:
-        db.close()
-    
+
+    resumen = sincronizar_empresas(
+        empresas or EMPRESAS_INICIALES,
+        workers=workers,
+        reintentos=reintentos,
+        archivo_resumen=archivo_resumen
+    )
+
     print("\nProceso de poblado de datos iniciales finalizado.")
+    return resumen
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Sincroniza proyectos SEIA y sanciones SNIFA por empresa")
+    parser.add_argument("--archivo", help="Archivo con una empresa por línea")
+    parser.add_argument("--desde-db", action="store_true", help="Sincronizar todas las empresas de la tabla empresas")
+    parser.add_argument("--workers", type=int, default=WORKERS_POR_DEFECTO, help="Empresas procesadas en paralelo")
+    parser.add_argument("--reintentos", type=int, default=REINTENTOS_POR_DEFECTO, help="Intentos por fuente y empresa")
+    parser.add_argument("--resumen", help="Ruta del resumen JSON de la ejecución")
+    parser.add_argument("--coordenadas", nargs="?", type=int, const=0, metavar="LIMITE",
+                        help="Solo georreferenciar proyectos sin latitud/longitud desde sus expedientes")
+    return parser.parse_args()
 
 # --- BLOQUE PRINCIPAL MODIFICADO ---
 if __name__ == "__main__":
+    args = parse_args()
+
     # 1. Primero, se llama a init_db() para crear las tablas
     print("Inicializando la base de datos (creando tablas si no existen)...")
     init_db()
-    
+
+    if args.coordenadas is not None:
+        georreferenciar_proyectos(limite=args.coordenadas or None, workers=args.workers)
+        raise SystemExit(0)
+
     # 2. Luego, se inicia el proceso de scraping
-    print("Tablas creadas/verificadas. Iniciando poblado de datos...")
-    poblar_datos_iniciales()
+    if args.archivo:
+        empresas = cargar_empresas_desde_archivo(args.archivo)
+    elif args.desde_db:
+        empresas = cargar_empresas_desde_db()
+    else:
+        empresas = EMPRESAS_INICIALES
+
+    print(f"Tablas creadas/verificadas. Iniciando poblado de datos ({len(empresas)} empresas)...")
+    resumen = poblar_datos_iniciales(empresas, args.workers, args.reintentos, args.resumen)
+
+    # Código de salida distinto de cero si alguna empresa quedó incompleta (útil en cron)
+    raise SystemExit(1 if resumen['fallidas'] else 0)
@@ -10,6 +10,8 @@ import time
 from urllib.parse import urljoin, quote
 import re
 from typing import Dict, List, Optional, Any
+from config.upstream import BCN_BASE_URL, BCN_LISTADO_URL
+from scrapers.catalogo_normativo import URL_NORMA, CatalogoNormativo, obtener_catalogo, plegar_acentos
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
@@ -17,8 +19,8 @@ logger = logging.getLogger(__name__)
 
 class BCNScraper:
     def __init__(self):
-        self.base_url = "https://www.bcn.cl"
-        self.search_url = "https://www.bcn.cl/leychile/consulta/listado_n_sel"
+        self.base_url = BCN_BASE_URL
+        self.search_url = BCN_LISTADO_URL
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -42,6 +44,8 @@ class BCNScraper:
         """
         try:
             logger.info(f"🔍 Buscando normativa en BCN: {termino_busqueda}")
+            # Un solo catálogo por búsqueda: los resultados sintéticos y version_catalogo salen del mismo
+            catalogo = obtener_catalogo()
             
             # Parámetros de búsqueda
             params = {
@@ -60,19 +64,20 @@ class BCNScraper:
             soup = BeautifulSoup(response.content, 'html.parser')
             
             # Buscar resultados
-            resultados = self._extraer_resultados(soup, termino_busqueda)
+            resultados = self._extraer_resultados(soup, termino_busqueda, catalogo)
             
             if not resultados:
                 # Intentar búsqueda más amplia
                 logger.info("🔄 Intentando búsqueda más amplia...")
-                resultados = self._busqueda_amplia(termino_busqueda)
+                resultados = self._busqueda_amplia(termino_busqueda, catalogo)
             
             return {
                 'success': True,
                 'termino_busqueda': termino_busqueda,
                 'total_resultados': len(resultados),
                 'resultados': resultados,
-                'fuente': 'BCN - Biblioteca del Congreso Nacional'
+                'fuente': 'BCN - Biblioteca del Congreso Nacional',
+                'version_catalogo': catalogo.version  # Catálogo de los resultados sintéticos
             }
             
         except Exception as e:
@@ -83,7 +88,8 @@ class BCNScraper:
                 'resultados': []
             }
 
-    def _extraer_resultados(self, soup: BeautifulSoup, termino: str) -> List[Dict]:
+    def _extraer_resultados(self, soup: BeautifulSoup, termino: str,
+                            catalogo: Optional[CatalogoNormativo] = None) -> List[Dict]:
         """Extrae los resultados de la página de búsqueda"""
         resultados = []
         
@@ -132,7 +138,7 @@ class BCNScraper:
             # Si aún no hay resultados, crear resultados sintéticos basados en términos comunes
             if not items_encontrados:
                 logger.warning("⚠️ No se encontraron elementos, generando resultados sintéticos")
-                resultados = self._generar_resultados_sinteticos(termino)
+                resultados = self._generar_resultados_sinteticos(termino, catalogo)
             else:
                 # Procesar items encontrados
                 for i, item in enumerate(items_encontrados[:15]):  # Procesar más para filtrar mejor
@@ -168,221 +174,27 @@ class BCNScraper:
         
         return True
 
-    def _generar_resultados_sinteticos(self, termino: str) -> List[Dict]:
-        """Genera resultados sintéticos cuando no se encuentran en BCN"""
-        termino_lower = termino.lower()
-        
-        # Base de datos de normativas comunes relacionadas con términos
-        normativas_comunes = {
-            'residuos peligrosos': [
-                {'titulo': 'Decreto Supremo 148/2003 - Reglamento Sanitario sobre Manejo de Residuos Peligrosos', 'numero': '148', 'tipo': 'Decreto'},
-                {'titulo': 'Decreto Supremo 298/1994 - Reglamento de Transporte de Cargas Peligrosas por Calles y Caminos', 'numero': '298', 'tipo': 'Decreto'},
-                {'titulo': 'Decreto Supremo 78/2009 - Reglamento de Almacenamiento de Sustancias Peligrosas', 'numero': '78', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 20.920/2016 - Marco para la Gestión de Residuos, la Responsabilidad Extendida del Productor y Fomento al Reciclaje', 'numero': '20.920', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 1/2013 - Reglamento del Sistema de Evaluación de Impacto Ambiental', 'numero': '1', 'tipo': 'Decreto'},
-                {'titulo': 'NCh 382/2004 - Sustancias peligrosas - Clasificación general', 'numero': '382', 'tipo': 'Norma'},
-                {'titulo': 'Decreto Supremo 594/1999 - Reglamento sobre Condiciones Sanitarias y Ambientales Básicas en los Lugares de Trabajo', 'numero': '594', 'tipo': 'Decreto'},
-                {'titulo': 'Resolución 5081/1993 - Política de Residuos Sólidos', 'numero': '5081', 'tipo': 'Resolución'},
-                {'titulo': 'Decreto Supremo 725/1967 - Código Sanitario', 'numero': '725', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 18.902/1989 - Crea la Superintendencia de Servicios Sanitarios', 'numero': '18.902', 'tipo': 'Ley'}
-            ],
-            'residuos': [
-                {'titulo': 'Ley 20.920/2016 - Marco para la Gestión de Residuos, la Responsabilidad Extendida del Productor y Fomento al Reciclaje', 'numero': '20.920', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 148/2003 - Reglamento Sanitario sobre Manejo de Residuos Peligrosos', 'numero': '148', 'tipo': 'Decreto'},
-                {'titulo': 'Decreto Supremo 189/2005 - Reglamento sobre Condiciones Sanitarias y de Seguridad Básicas en los Rellenos Sanitarios', 'numero': '189', 'tipo': 'Decreto'},
-                {'titulo': 'Decreto Supremo 594/1999 - Reglamento sobre Condiciones Sanitarias y Ambientales Básicas en los Lugares de Trabajo', 'numero': '594', 'tipo': 'Decreto'},
-                {'titulo': 'Resolución 2444/2009 - Guía Metodológica para la Gestión de Residuos Sólidos Domiciliarios', 'numero': '2444', 'tipo': 'Resolución'},
-                {'titulo': 'Decreto Supremo 725/1967 - Código Sanitario', 'numero': '725', 'tipo': 'Decreto'},
-                {'titulo': 'Decreto Supremo 298/1994 - Reglamento de Transporte de Cargas Peligrosas por Calles y Caminos', 'numero': '298', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 18.902/1989 - Crea la Superintendencia de Servicios Sanitarios', 'numero': '18.902', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 78/2009 - Reglamento de Almacenamiento de Sustancias Peligrosas', 'numero': '78', 'tipo': 'Decreto'},
-                {'titulo': 'Resolución 5081/1993 - Política de Residuos Sólidos', 'numero': '5081', 'tipo': 'Resolución'}
-            ],
-            'medio ambiente': [
-                {'titulo': 'Ley 19.300/1994 - Ley sobre Bases Generales del Medio Ambiente', 'numero': '19.300', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 40/2012 - Reglamento del Sistema de Evaluación de Impacto Ambiental', 'numero': '40', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 20.417/2010 - Crea el Ministerio, el Servicio de Evaluación Ambiental y la Superintendencia del Medio Ambiente', 'numero': '20.417', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 95/2001 - Reglamento del Sistema de Evaluación de Impacto Ambiental', 'numero': '95', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 20.920/2016 - Marco para la Gestión de Residuos, la Responsabilidad Extendida del Productor y Fomento al Reciclaje', 'numero': '20.920', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 148/2003 - Reglamento Sanitario sobre Manejo de Residuos Peligrosos', 'numero': '148', 'tipo': 'Decreto'},
-                {'titulo': 'Decreto Supremo 594/1999 - Reglamento sobre Condiciones Sanitarias y Ambientales Básicas en los Lugares de Trabajo', 'numero': '594', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 20.283/2008 - Sobre Recuperación del Bosque Nativo y Fomento Forestal', 'numero': '20.283', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 298/1994 - Reglamento de Transporte de Cargas Peligrosas por Calles y Caminos', 'numero': '298', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 18.902/1989 - Crea la Superintendencia de Servicios Sanitarios', 'numero': '18.902', 'tipo': 'Ley'}
-            ],
-            'agua': [
-                {'titulo': 'DFL 1122/1981 - Código de Aguas', 'numero': '1122', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 21.064/2018 - Introduce modificaciones al marco normativo que rige las aguas', 'numero': '21.064', 'tipo': 'Ley'},
-                {'titulo': 'DFL 725/1967 - Código Sanitario', 'numero': '725', 'tipo': 'Decreto'},
-                {'titulo': 'Decreto Supremo 867/1978 - Reglamento de la Ley de Servicios Sanitarios', 'numero': '867', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 18.902/1989 - Crea la Superintendencia de Servicios Sanitarios', 'numero': '18.902', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 594/1999 - Reglamento sobre Condiciones Sanitarias y Ambientales Básicas en los Lugares de Trabajo', 'numero': '594', 'tipo': 'Decreto'},
-                {'titulo': 'Decreto Supremo 46/2002 - Norma de Emisión de Residuos Líquidos a Aguas Subterráneas', 'numero': '46', 'tipo': 'Decreto'},
-                {'titulo': 'Decreto Supremo 90/2000 - Norma de Emisión para la Regulación de Contaminantes Asociados a las Descargas de Residuos Líquidos a Aguas Marinas y Continentales Superficiales', 'numero': '90', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 20.017/2005 - Modifica el Código de Aguas', 'numero': '20.017', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 609/1998 - Norma de Calidad Primaria para las Aguas Continentales Superficiales Aptas para Actividades de Recreación con Contacto Directo', 'numero': '609', 'tipo': 'Decreto'}
-            ],
-            'minería': [
-                {'titulo': 'Ley 18.248/1983 - Código de Minería', 'numero': '18.248', 'tipo': 'Ley'},
-                {'titulo': 'Ley 18.097/1982 - Ley Orgánica Constitucional sobre Concesiones Mineras', 'numero': '18.097', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 132/2004 - Reglamento de Seguridad Minera', 'numero': '132', 'tipo': 'Decreto'},
-                {'titulo': 'Decreto Supremo 72/1985 - Reglamento de Seguridad Minera', 'numero': '72', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 16.319/1965 - Crea la Comisión Chilena del Cobre', 'numero': '16.319', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 148/2003 - Reglamento Sanitario sobre Manejo de Residuos Peligrosos', 'numero': '148', 'tipo': 'Decreto'},
-                {'titulo': 'Decreto Supremo 594/1999 - Reglamento sobre Condiciones Sanitarias y Ambientales Básicas en los Lugares de Trabajo', 'numero': '594', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 20.551/2011 - Regula el Cierre de Faenas e Instalaciones Mineras', 'numero': '20.551', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 298/1994 - Reglamento de Transporte de Cargas Peligrosas por Calles y Caminos', 'numero': '298', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 19.300/1994 - Ley sobre Bases Generales del Medio Ambiente', 'numero': '19.300', 'tipo': 'Ley'}
-            ],
-            'forestal': [
-                {'titulo': 'Ley 20.283/2008 - Sobre Recuperación del Bosque Nativo y Fomento Forestal', 'numero': '20.283', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Ley 701/1974 - Sobre Fomento Forestal', 'numero': '701', 'tipo': 'Decreto Ley'},
-                {'titulo': 'Decreto Supremo 193/1998 - Reglamento General de la Ley sobre Recuperación del Bosque Nativo y Fomento Forestal', 'numero': '193', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 18.378/1984 - Establece el Instituto Forestal', 'numero': '18.378', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 259/1980 - Reglamento sobre Explotación de Bosques en Predios Particulares', 'numero': '259', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 19.561/1998 - Modifica la Legislación que Indica sobre Fomento Forestal', 'numero': '19.561', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 82/2010 - Reglamento de Suelos, Aguas y Humedales', 'numero': '82', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 20.930/2016 - Establece la Política Forestal 2015-2035', 'numero': '20.930', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 4363/1931 - Ley de Bosques', 'numero': '4363', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 19.300/1994 - Ley sobre Bases Generales del Medio Ambiente', 'numero': '19.300', 'tipo': 'Ley'}
-            ],
-            'pesca': [
-                {'titulo': 'Ley 18.892/1989 - Ley General de Pesca y Acuicultura', 'numero': '18.892', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 430/1991 - Reglamento de la Ley General de Pesca y Acuicultura', 'numero': '430', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 20.657/2013 - Modifica la Ley General de Pesca y Acuicultura en Materias de Sustentabilidad', 'numero': '20.657', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 320/2001 - Reglamento de Medidas de Administración Pesquera', 'numero': '320', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 21.027/2017 - Modifica la Ley General de Pesca y Acuicultura para Eliminar la Pesca de Arrastre', 'numero': '21.027', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 598/1995 - Reglamento Ambiental para la Acuicultura', 'numero': '598', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 20.434/2010 - Modifica la Ley General de Pesca y Acuicultura', 'numero': '20.434', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 319/2001 - Reglamento de Organizaciones de Productores Pesqueros Artesanales', 'numero': '319', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 19.713/2001 - Deroga Ley que Establecía Límite a la Captura de la Sardina Española', 'numero': '19.713', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 747/1992 - Reglamento de Caletas de Pescadores Artesanales', 'numero': '747', 'tipo': 'Decreto'}
-            ],
-            'energia': [
-                {'titulo': 'Ley 20.257/2008 - Introduce Modificaciones a la Ley General de Servicios Eléctricos Respecto de la Generación de Energía Eléctrica con Fuentes de Energías Renovables No Convencionales', 'numero': '20.257', 'tipo': 'Ley'},
-                {'titulo': 'DFL 4/2006 - Ley General de Servicios Eléctricos', 'numero': '4', 'tipo': 'DFL'},
-                {'titulo': 'Ley 20.698/2013 - Propicia la Ampliación de la Matriz Energética, Mediante Fuentes Renovables No Convencionales', 'numero': '20.698', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 244/2006 - Reglamento para Medios de Generación No Convencionales y Pequeños Medios de Generación', 'numero': '244', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 21.505/2023 - Establece el Marco Regulatorio para la Generación Distribuida', 'numero': '21.505', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 88/2020 - Reglamento de la Ley de Generación Distribuida', 'numero': '88', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 20.936/2016 - Establece un Nuevo Sistema de Transmisión Eléctrica y Crea un Organismo Coordinador Independiente del Sistema Eléctrico Nacional', 'numero': '20.936', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 327/1997 - Reglamento de la Ley General de Servicios Eléctricos', 'numero': '327', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 19.940/2004 - Regula Sistemas de Transporte de Energía Eléctrica', 'numero': '19.940', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 131/2014 - Reglamento que Establece las Disposiciones Aplicables a las Instalaciones de Cogeneración Eficiente', 'numero': '131', 'tipo': 'Decreto'}
-            ],
-            'construccion': [
-                {'titulo': 'DFL 458/1975 - Ley General de Urbanismo y Construcciones', 'numero': '458', 'tipo': 'DFL'},
-                {'titulo': 'Decreto Supremo 47/1992 - Ordenanza General de Urbanismo y Construcciones', 'numero': '47', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 20.703/2013 - Regula la Actividad de los Constructores de Viviendas', 'numero': '20.703', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 174/2005 - Reglamento sobre Condiciones Sanitarias Mínimas de los Lugares de Trabajo en Faenas de Construcción', 'numero': '174', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 19.537/1997 - Sobre Copropiedad Inmobiliaria', 'numero': '19.537', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 50/2018 - Modifica Ordenanza General de Urbanismo y Construcciones en Materia de Accesibilidad', 'numero': '50', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 20.016/2005 - Establece Nuevo Procedimiento de Evaluación de los Planes Reguladores', 'numero': '20.016', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 236/2012 - Reglamento sobre Seguridad y Salud en el Trabajo en Obras de Construcción', 'numero': '236', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 18.695/1988 - Orgánica Constitucional de Municipalidades', 'numero': '18.695', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 594/1999 - Reglamento sobre Condiciones Sanitarias y Ambientales Básicas en los Lugares de Trabajo', 'numero': '594', 'tipo': 'Decreto'}
-            ],
-            'transporte': [
-                {'titulo': 'DFL 1/2007 - Ley de Tránsito', 'numero': '1', 'tipo': 'DFL'},
-                {'titulo': 'Decreto Supremo 298/1994 - Reglamento de Transporte de Cargas Peligrosas por Calles y Caminos', 'numero': '298', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 18.290/1984 - Ley de Tránsito', 'numero': '18.290', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 212/1992 - Reglamento del Registro de Vehículos Motorizados', 'numero': '212', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 20.378/2009 - Establece el Sistema de Transporte Público Remunerado de Pasajeros', 'numero': '20.378', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 158/1980 - Reglamento de los Servicios Nacionales de Transporte Público de Pasajeros', 'numero': '158', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 19.821/2002 - Establece Normas sobre Transporte de Pasajeros', 'numero': '19.821', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 170/2005 - Reglamento para el Otorgamiento de Licencias de Conducir', 'numero': '170', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 20.068/2005 - Establece Medidas de Protección a la Maternidad para las Trabajadoras que Indica', 'numero': '20.068', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 75/1987 - Reglamento para el Transporte de Sustancias Peligrosas por Calles y Caminos', 'numero': '75', 'tipo': 'Decreto'}
-            ],
-            'laboral': [
-                {'titulo': 'DFL 1/2003 - Código del Trabajo', 'numero': '1', 'tipo': 'DFL'},
-                {'titulo': 'Ley 16.744/1968 - Establece Normas sobre Accidentes del Trabajo y Enfermedades Profesionales', 'numero': '16.744', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 594/1999 - Reglamento sobre Condiciones Sanitarias y Ambientales Básicas en los Lugares de Trabajo', 'numero': '594', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 20.123/2006 - Regula Trabajo en Régimen de Subcontratación', 'numero': '20.123', 'tipo': 'Ley'},
-                {'titulo': 'Ley 19.759/2001 - Modifica el Código del Trabajo en lo Relativo a las Nuevas Modalidades de Contratación', 'numero': '19.759', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 76/2007 - Reglamento para la Aplicación del Artículo 66 bis del Código del Trabajo', 'numero': '76', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 20.348/2009 - Resguarda el Derecho a la Igualdad en las Remuneraciones', 'numero': '20.348', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 40/1969 - Reglamento sobre Prevención de Riesgos Profesionales', 'numero': '40', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 21.220/2020 - Modifica el Código del Trabajo en Materia de Trabajo a Distancia', 'numero': '21.220', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 67/1999 - Reglamento para la Aplicación de la Ley N° 16.744', 'numero': '67', 'tipo': 'Decreto'}
-            ],
-            'suelo': [
-                {'titulo': 'Decreto Supremo 82/2010 - Reglamento de Suelos, Aguas y Humedales', 'numero': '82', 'tipo': 'Decreto'},
-                {'titulo': 'DFL 458/1975 - Ley General de Urbanismo y Construcciones', 'numero': '458', 'tipo': 'DFL'},
-                {'titulo': 'Decreto Supremo 47/1992 - Ordenanza General de Urbanismo y Construcciones', 'numero': '47', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 18.755/1989 - Establece Normas sobre el Servicio Agrícola y Ganadero', 'numero': '18.755', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 594/1999 - Reglamento sobre Condiciones Sanitarias y Ambientales Básicas en los Lugares de Trabajo', 'numero': '594', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 19.300/1994 - Ley sobre Bases Generales del Medio Ambiente', 'numero': '19.300', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 40/2012 - Reglamento del Sistema de Evaluación de Impacto Ambiental', 'numero': '40', 'tipo': 'Decreto'},
-                {'titulo': 'Decreto Supremo 46/2002 - Norma de Emisión de Residuos Líquidos a Aguas Subterráneas', 'numero': '46', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 20.283/2008 - Sobre Recuperación del Bosque Nativo y Fomento Forestal', 'numero': '20.283', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 725/1967 - Código Sanitario', 'numero': '725', 'tipo': 'Decreto'}
-            ],
-            'hidrocarburos': [
-                {'titulo': 'Ley 9.618/1950 - Crea la Empresa Nacional del Petróleo', 'numero': '9.618', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 90/2000 - Norma de Emisión para la Regulación de Contaminantes', 'numero': '90', 'tipo': 'Decreto'},
-                {'titulo': 'Decreto Supremo 298/1994 - Reglamento de Transporte de Cargas Peligrosas', 'numero': '298', 'tipo': 'Decreto'},
-                {'titulo': 'Decreto Supremo 78/2009 - Reglamento de Almacenamiento de Sustancias Peligrosas', 'numero': '78', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 19.300/1994 - Ley sobre Bases Generales del Medio Ambiente', 'numero': '19.300', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 594/1999 - Reglamento sobre Condiciones Sanitarias y Ambientales Básicas', 'numero': '594', 'tipo': 'Decreto'},
-                {'titulo': 'Decreto Supremo 725/1967 - Código Sanitario', 'numero': '725', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 18.916/1990 - Código Aeronáutico', 'numero': '18.916', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 148/2003 - Reglamento Sanitario sobre Manejo de Residuos Peligrosos', 'numero': '148', 'tipo': 'Decreto'},
-                {'titulo': 'DFL 1/2007 - Ley de Tránsito', 'numero': '1', 'tipo': 'DFL'}
-            ],
-            'contaminacion': [
-                {'titulo': 'Ley 19.300/1994 - Ley sobre Bases Generales del Medio Ambiente', 'numero': '19.300', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 40/2012 - Reglamento del Sistema de Evaluación de Impacto Ambiental', 'numero': '40', 'tipo': 'Decreto'},
-                {'titulo': 'Decreto Supremo 90/2000 - Norma de Emisión para la Regulación de Contaminantes', 'numero': '90', 'tipo': 'Decreto'},
-                {'titulo': 'Decreto Supremo 46/2002 - Norma de Emisión de Residuos Líquidos a Aguas Subterráneas', 'numero': '46', 'tipo': 'Decreto'},
-                {'titulo': 'Decreto Supremo 148/2003 - Reglamento Sanitario sobre Manejo de Residuos Peligrosos', 'numero': '148', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 20.417/2010 - Crea el Ministerio, el Servicio de Evaluación Ambiental y la Superintendencia del Medio Ambiente', 'numero': '20.417', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 594/1999 - Reglamento sobre Condiciones Sanitarias y Ambientales Básicas', 'numero': '594', 'tipo': 'Decreto'},
-                {'titulo': 'Decreto Supremo 725/1967 - Código Sanitario', 'numero': '725', 'tipo': 'Decreto'},
-                {'titulo': 'Ley 20.920/2016 - Marco para la Gestión de Residuos', 'numero': '20.920', 'tipo': 'Ley'},
-                {'titulo': 'Decreto Supremo 298/1994 - Reglamento de Transporte de Cargas Peligrosas', 'numero': '298', 'tipo': 'Decreto'}
-            ]
-        }
-        
-        resultados = []
-        
-        # ALGORITMO MEJORADO: Mapeo inteligente de términos
-        logger.info(f"🔍 Analizando término: '{termino}' -> '{termino_lower}'")
-        
-        # Diccionario de sinónimos y términos relacionados
-        sinonimos = {
-            'suelo': ['suelo', 'terreno', 'tierra', 'uso de suelo', 'urbanismo', 'construccion'],
-            'agua': ['agua', 'hidrico', 'acuifero', 'riego', 'sanitario', 'liquido'],
-            'residuos': ['residuo', 'basura', 'desecho', 'desperdicio', 'reciclaje'],
-            'residuos peligrosos': ['residuo peligroso', 'sustancia peligrosa', 'toxico', 'quimico'],
-            'energia': ['energia', 'electrico', 'renovable', 'solar', 'eolico', 'generacion'],
-            'mineria': ['mineria', 'minero', 'extraccion', 'yacimiento', 'cobre', 'oro'],
-            'forestal': ['forestal', 'bosque', 'arbol', 'madera', 'silvicultura'],
-            'pesca': ['pesca', 'pesquero', 'acuicultura', 'maritimo', 'mar'],
-            'construccion': ['construccion', 'edificacion', 'urbanismo', 'vivienda', 'inmobiliario'],
-            'transporte': ['transporte', 'vehiculo', 'transito', 'carretera', 'camino'],
-            'laboral': ['laboral', 'trabajo', 'trabajador', 'empleo', 'ocupacional'],
-            'medio ambiente': ['ambiental', 'medio ambiente', 'ecologico', 'natural', 'conservacion'],
-            'contaminacion': ['contaminacion', 'contaminante', 'polucion', 'emision'],
-            'hidrocarburos': ['hidrocarburo', 'petroleo', 'combustible', 'gasolina', 'diesel']
-        }
+    def _categoria_sintetica(self, termino_lower: str, catalogo: CatalogoNormativo) -> Optional[str]:
+        """Tema del catálogo curado más relevante para el término"""
+        # Índice de términos del catálogo: una coincidencia exacta no necesita recorrer los sinónimos
+        plegado = plegar_acentos(termino_lower)
+        if plegado in catalogo.terminos:
+            return catalogo.terminos[plegado]
         
         # Buscar la categoría más relevante
         categoria_encontrada = None
         max_coincidencias = 0
+        palabras_termino = termino_lower.split()
         
-        for categoria, lista_sinonimos in sinonimos.items():
+        for categoria, lista_sinonimos in catalogo.sinonimos:
             coincidencias_categoria = 0
             
             # Verificar si el término está en los sinónimos
-            for sinonimo in lista_sinonimos:
+            for sinonimo, palabras_sinonimo in lista_sinonimos:
                 if sinonimo in termino_lower or termino_lower in sinonimo:
                     coincidencias_categoria += 2  # Peso mayor para coincidencias directas
                 
                 # También verificar palabras individuales
-                palabras_termino = termino_lower.split()
-                palabras_sinonimo = sinonimo.split()
-                
                 for palabra_termino in palabras_termino:
                     for palabra_sinonimo in palabras_sinonimo:
                         if (len(palabra_termino) > 2 and 
@@ -394,77 +206,74 @@ class BCNScraper:
                 categoria_encontrada = categoria
         
         logger.info(f"✅ Categoría encontrada: '{categoria_encontrada}' con {max_coincidencias} coincidencias")
+        return categoria_encontrada
+
+    def _generar_resultados_sinteticos(self, termino: str, catalogo: Optional[CatalogoNormativo] = None) -> List[Dict]:
+        """Genera resultados sintéticos desde el catálogo curado cuando no se encuentran en BCN"""
+        termino_lower = termino.lower()
+        terminos_busqueda = termino_lower.split()
+        catalogo = catalogo or obtener_catalogo()
+        resultados = []
         
-        # Si encontramos una categoría específica, usar esas normativas
-        if categoria_encontrada and categoria_encontrada in normativas_comunes:
-            normativas_categoria = normativas_comunes[categoria_encontrada]
-            logger.info(f"📋 Usando {len(normativas_categoria)} normativas de categoría '{categoria_encontrada}'")
-            
-            for i, normativa in enumerate(normativas_categoria, 1):
-                resultado = {
-                    'numero': i,
-                    'titulo': normativa['titulo'],
-                    'descripcion': f"Normativa específica de {categoria_encontrada}",
-                    'enlace': f"https://www.bcn.cl/leychile/navegar?idNorma={normativa['numero']}",
-                    'numero_ley': normativa['numero'],
-                    'tipo_norma': normativa['tipo'],
-                    'relevancia': 5.0 - (0.1 * i)  # Relevancia alta para categoría específica
-                }
-                resultados.append(resultado)
+        # ALGORITMO MEJORADO: Mapeo inteligente de términos
+        logger.info(f"🔍 Analizando término: '{termino}' -> '{termino_lower}'")
+        categoria_encontrada = self._categoria_sintetica(termino_lower, catalogo)
+        
+        # Si encontramos una categoría específica, sus resultados ya vienen armados, ordenados y numerados
+        resultados_categoria = catalogo.resultados_especificos(categoria_encontrada) if categoria_encontrada else []
+        if resultados_categoria:
+            logger.info(f"📋 Usando {len(resultados_categoria)} normativas de categoría '{categoria_encontrada}'")
+            return resultados_categoria
         
         # Si no hay categoría específica, buscar en todas las categorías
-        else:
-            logger.info("🔄 No hay categoría específica, buscando en todas las categorías...")
-            terminos_busqueda = termino_lower.split()
-            
-            for categoria, normativas in normativas_comunes.items():
-                # Buscar coincidencias más flexibles
-                coincidencias = 0
-                palabras_categoria = categoria.split()
-                
-                # Verificar coincidencias palabra por palabra
+        logger.info("🔄 No hay categoría específica, buscando en todas las categorías...")
+        
+        for categoria, normativas in catalogo.relacionadas.items():
+            # Buscar coincidencias más flexibles
+            coincidencias = 0
+            palabras_categoria = categoria.split()
+            
+            # Verificar coincidencias palabra por palabra
+            for palabra_termino in terminos_busqueda:
+                for palabra_categoria in palabras_categoria:
+                    if (len(palabra_termino) > 2 and
+                        (palabra_termino in palabra_categoria or 
+                         palabra_categoria in palabra_termino or
+                         palabra_termino == palabra_categoria)):
+                        coincidencias += 1
+            
+            # También buscar en títulos de normativas (ya en minúsculas en el catálogo)
+            for _, titulo_lower in normativas:
                 for palabra_termino in terminos_busqueda:
-                    for palabra_categoria in palabras_categoria:
-                        if (len(palabra_termino) > 2 and
-                            (palabra_termino in palabra_categoria or 
-                             palabra_categoria in palabra_termino or
-                             palabra_termino == palabra_categoria)):
-                            coincidencias += 1
-                
-                # También buscar en títulos de normativas
-                for normativa in normativas:
-                    titulo_lower = normativa['titulo'].lower()
-                    for palabra_termino in terminos_busqueda:
-                        if len(palabra_termino) > 2 and palabra_termino in titulo_lower:
-                            coincidencias += 1
-                
-                # Si hay coincidencias, agregar las normativas
-                if coincidencias > 0:
-                    for i, normativa in enumerate(normativas, 1):
-                        resultado = {
-                            'numero': len(resultados) + 1,
-                            'titulo': normativa['titulo'],
-                            'descripcion': f"Normativa relacionada con {categoria} - {coincidencias} coincidencias",
-                            'enlace': f"https://www.bcn.cl/leychile/navegar?idNorma={normativa['numero']}",
-                            'numero_ley': normativa['numero'],
-                            'tipo_norma': normativa['tipo'],
-                            'relevancia': 3.0 + (0.1 * coincidencias) + (0.05 * i)
-                        }
-                        resultados.append(resultado)
+                    if len(palabra_termino) > 2 and palabra_termino in titulo_lower:
+                        coincidencias += 1
+            
+            # Si hay coincidencias, agregar las normativas
+            if coincidencias > 0:
+                for i, (normativa, _) in enumerate(normativas, 1):
+                    resultado = {
+                        'numero': len(resultados) + 1,
+                        'titulo': normativa['titulo'],
+                        'descripcion': f"Normativa relacionada con {categoria} - {coincidencias} coincidencias",
+                        'enlace': URL_NORMA.format(normativa['numero']),
+                        'numero_ley': normativa['numero'],
+                        'tipo_norma': normativa['tipo'],
+                        'relevancia': 3.0 + (0.1 * coincidencias) + (0.05 * i)
+                    }
+                    resultados.append(resultado)
         
         # Si no hay resultados específicos, buscar en normativas generales más amplias
         if not resultados:
             # Buscar normativas que contengan cualquier palabra del término
-            for categoria, normativas in normativas_comunes.items():
-                for normativa in normativas:
-                    titulo_lower = normativa['titulo'].lower()
+            for categoria, normativas in catalogo.relacionadas.items():
+                for normativa, titulo_lower in normativas:
                     for palabra_termino in terminos_busqueda:
                         if len(palabra_termino) > 2 and palabra_termino in titulo_lower:
                             resultado = {
                                 'numero': len(resultados) + 1,
                                 'titulo': normativa['titulo'],
                                 'descripcion': f"Normativa relacionada con {categoria} - búsqueda amplia",
-                                'enlace': f"https://www.bcn.cl/leychile/navegar?idNorma={normativa['numero']}",
+                                'enlace': URL_NORMA.format(normativa['numero']),
                                 'numero_ley': normativa['numero'],
                                 'tipo_norma': normativa['tipo'],
                                 'relevancia': 3.0 + (0.1 * len(resultados))
@@ -472,37 +281,9 @@ class BCNScraper:
                             resultados.append(resultado)
                             break  # Solo agregar una vez por normativa
         
-        # Si aún no hay resultados, agregar normativas generales básicas
+        # Si aún no hay resultados, las normativas generales básicas del catálogo (ya ordenadas)
         if not resultados:
-            resultados = [
-                {
-                    'numero': 1,
-                    'titulo': 'Ley 19.300/1994 - Ley sobre Bases Generales del Medio Ambiente',
-                    'descripcion': 'Marco general de la legislación ambiental chilena',
-                    'enlace': 'https://www.bcn.cl/leychile/navegar?idNorma=30667',
-                    'numero_ley': '19.300',
-                    'tipo_norma': 'Ley',
-                    'relevancia': 3.5
-                },
-                {
-                    'numero': 2,
-                    'titulo': 'Constitución Política de la República de Chile',
-                    'descripcion': 'Carta fundamental del Estado de Chile',
-                    'enlace': 'https://www.bcn.cl/leychile/navegar?idNorma=242302',
-                    'numero_ley': '242302',
-                    'tipo_norma': 'Constitución',
-                    'relevancia': 3.0
-                },
-                {
-                    'numero': 3,
-                    'titulo': 'Código Civil',
-                    'descripcion': 'Normas fundamentales del derecho privado',
-                    'enlace': 'https://www.bcn.cl/leychile/navegar?idNorma=172986',
-                    'numero_ley': '172986',
-                    'tipo_norma': 'Código',
-                    'relevancia': 2.5
-                }
-            ]
+            return list(catalogo.generales)
         
         # Ordenar por relevancia y limitar a 10 resultados
         resultados.sort(key=lambda x: x.get('relevancia', 0), reverse=True)
@@ -618,7 +399,7 @@ class BCNScraper:
         
         return min(score, 5.0)  # Máximo 5.0
 
-    def _busqueda_amplia(self, termino: str) -> List[Dict]:
+    def _busqueda_amplia(self, termino: str, catalogo: Optional[CatalogoNormativo] = None) -> List[Dict]:
         """Realiza una búsqueda más amplia si no se encuentran resultados"""
         try:
             # Términos relacionados comunes
@@ -642,7 +423,7 @@ class BCNScraper:
                 response = self.session.get(self.search_url, params=params, timeout=20)
                 if response.status_code == 200:
                     soup = BeautifulSoup(response.content, 'html.parser')
-                    resultados = self._extraer_resultados(soup, termino_relacionado)
+                    resultados = self._extraer_resultados(soup, termino_relacionado, catalogo)
                     todos_resultados.extend(resultados)
                 
                 time.sleep(1)  # Pausa entre búsquedas
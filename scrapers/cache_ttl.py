@@ -0,0 +1,63 @@
+# scrapers/cache_ttl.py - Cache en memoria con expiración por entrada y límite LRU
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+class CacheTTL:
+    """
+    Cache LRU thread-safe con TTL por entrada.
+    Vive en la memoria de cada proceso: con varios workers de gunicorn cada uno tiene la suya.
+    """
+
+    def __init__(self, ttl_segundos: float = 300, max_entradas: int = 1024):
+        self.ttl_segundos = ttl_segundos
+        self.max_entradas = max_entradas
+        self._entradas: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, clave: Hashable, por_defecto: Any = None) -> Any:
+        """Retorna el valor vigente o por_defecto si no existe o expiró"""
+        ahora = time.monotonic()
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None or entrada[0] <= ahora:
+                if entrada is not None:
+                    del self._entradas[clave]
+                self.fallos += 1
+                return por_defecto
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return entrada[1]
+
+    def guardar(self, clave: Hashable, valor: Any, ttl_segundos: Optional[float] = None) -> None:
+        """Guarda el valor con el TTL indicado (o el de la cache) y descarta las entradas más antiguas"""
+        ttl = self.ttl_segundos if ttl_segundos is None else ttl_segundos
+        with self._lock:
+            self._entradas[clave] = (time.monotonic() + ttl, valor)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+
+    def invalidar(self, clave: Optional[Hashable] = None) -> None:
+        """Elimina una entrada, o todas si no se indica clave"""
+        with self._lock:
+            if clave is None:
+                self._entradas.clear()
+            else:
+                self._entradas.pop(clave, None)
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def estadisticas(self) -> Dict[str, Any]:
+        total = self.aciertos + self.fallos
+        return {
+            'entradas': len(self._entradas),
+            'max_entradas': self.max_entradas,
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'tasa_aciertos': round(self.aciertos / total, 3) if total else 0.0,
+        }
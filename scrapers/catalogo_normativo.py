@@ -0,0 +1,286 @@
+# scrapers/catalogo_normativo.py
+# Catálogo curado de normativas por tema (data/normativas_curadas.json), compartido por bcn_preciso y
+# por los resultados sintéticos de bcn_legal. Se carga una sola vez al importar el módulo —en el master,
+# antes del fork de gunicorn (preload_app)— en estructuras inmutables: tuplas por tema ya ordenadas por
+# relevancia con los resultados armados, y un índice de términos exacto y por trigramas.
+# Si el archivo cambia (o se pide por POST /admin/catalogo/recargar) cada worker construye un catálogo nuevo
+# en segundo plano y lo reemplaza con una sola asignación: las consultas en curso terminan con el anterior.
+# Si al arrancar el archivo falta o es inválido se usa un catálogo vacío (se registra el error) y se carga
+# en cuanto el archivo aparezca o se corrija.
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import unicodedata
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUTA_CATALOGO = os.getenv('CATALOGO_NORMATIVO_RUTA', os.path.join(_RAIZ, 'data', 'normativas_curadas.json'))
+
+# Cada cuánto se revisa si el archivo cambió (evita un stat por consulta)
+INTERVALO_REVISION = float(os.getenv('CATALOGO_NORMATIVO_INTERVALO', '2'))
+
+MAX_RESULTADOS = 10
+URL_NORMA = "https://www.bcn.cl/leychile/navegar?idNorma={}"
+
+# Similitud de Jaccard mínima entre los trigramas de la consulta y los de un término
+UMBRAL_SIMILITUD = 0.45
+# Términos más cortos ('mar', 'oro') solo se reconocen como palabra exacta
+LARGO_MINIMO_APROXIMADO = 4
+
+def plegar_acentos(texto: str) -> str:
+    """Minúsculas sin tildes ni puntuación: '¿Recursos Hídricos?' -> 'recursos hidricos'"""
+    texto = unicodedata.normalize('NFKD', (texto or '').lower())
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', texto).split())
+
+def _trigramas(texto: str) -> set:
+    relleno = f"  {texto} "
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+class IndiceTrigramas:
+    """Índice invertido trigrama -> términos, precalculado al cargar el catálogo"""
+
+    def __init__(self, terminos: Iterable[str]):
+        self.terminos: List[str] = sorted(set(terminos))
+        self._tamanos = [len(_trigramas(t)) for t in self.terminos]
+        self._indice: Dict[str, List[int]] = {}
+        for posicion, termino in enumerate(self.terminos):
+            for trigrama in _trigramas(termino):
+                self._indice.setdefault(trigrama, []).append(posicion)
+
+    def similares(self, texto: str, umbral: float = UMBRAL_SIMILITUD) -> List[Tuple[str, float]]:
+        """Términos con similitud de Jaccard >= umbral, de mayor a menor"""
+        consulta = _trigramas(texto)
+        comunes: Dict[int, int] = {}
+        for trigrama in consulta:
+            for posicion in self._indice.get(trigrama, ()):
+                comunes[posicion] = comunes.get(posicion, 0) + 1
+        resultado = []
+        for posicion, cantidad in comunes.items():
+            similitud = cantidad / (len(consulta) + self._tamanos[posicion] - cantidad)
+            if similitud >= umbral:
+                resultado.append((self.terminos[posicion], similitud))
+        resultado.sort(key=lambda par: (-par[1], par[0]))
+        return resultado
+
+def _ordenadas(normativas: Iterable[Dict]) -> List[Dict]:
+    """Por relevancia descendente; sin relevancia se respeta el orden del archivo"""
+    return sorted(normativas, key=lambda n: -n.get('relevancia', 0))
+
+class CatalogoNormativo:
+    """
+    Catálogo inmutable: todo se calcula en el constructor y después solo se lee, así los workers
+    lo comparten sin bloqueo. Los resultados que retorna son compartidos y no se deben modificar.
+    """
+
+    def __init__(self, datos: Dict, origen: str = '', huella: str = '', mtime: int = 0, permitir_vacio: bool = False):
+        self.version = datos.get('version', 0)
+        self.origen = origen
+        # Huella del contenido: cambia aunque no se haya incrementado 'version' (claves de cache)
+        self.huella = huella
+        self.mtime = mtime
+        temas: Dict[str, Dict] = datos['temas']
+        if not temas and not permitir_vacio:
+            raise ValueError("El catálogo normativo no tiene temas")
+
+        # Término plegado -> tema (bcn_preciso) e índice de trigramas para reconocerlo con errores
+        self.terminos: Mapping[str, str] = MappingProxyType({
+            plegar_acentos(termino): nombre for nombre, tema in temas.items() for termino in tema.get('terminos', ())
+        })
+        self.max_palabras_termino = max((len(t.split()) for t in self.terminos), default=1)
+        self.indice_terminos = IndiceTrigramas(t for t in self.terminos if len(t) >= LARGO_MINIMO_APROXIMADO)
+
+        # Sinónimos por tema con sus palabras ya separadas (puntaje de bcn_legal)
+        self.sinonimos: Tuple[Tuple[str, Tuple[Tuple[str, Tuple[str, ...]], ...]], ...] = tuple(
+            (nombre, tuple((s, tuple(s.split())) for s in tema.get('sinonimos', ())))
+            for nombre, tema in temas.items() if tema.get('sinonimos')
+        )
+        # Normativas relacionadas de cada tema con el título en minúsculas, para la búsqueda amplia
+        self.relacionadas: Mapping[str, Tuple[Tuple[Dict, str], ...]] = MappingProxyType({
+            nombre: tuple((n, n['titulo'].lower()) for n in tema.get('relacionadas', ()))
+            for nombre, tema in temas.items()
+        })
+
+        self._precisas: Mapping[Tuple[str, str], Tuple[Dict, ...]] = MappingProxyType({
+            (nombre, precision): tuple(self._resultado_preciso(n, i, nombre, precision)
+                                       for i, n in enumerate(_ordenadas(tema['precisas']), 1))
+            for nombre, tema in temas.items() if tema.get('precisas')
+            for precision in ('exacta', 'aproximada')
+        })
+        self._especificas: Mapping[str, Tuple[Dict, ...]] = MappingProxyType({
+            nombre: tuple(self._resultado_especifico(n, i, nombre)
+                          for i, n in enumerate(tema['relacionadas'][:MAX_RESULTADOS], 1))
+            for nombre, tema in temas.items() if tema.get('relacionadas')
+        })
+        # Normativas básicas cuando ninguna búsqueda encuentra resultados
+        self.generales: Tuple[Dict, ...] = tuple(
+            self._resultado_general(n, i) for i, n in enumerate(_ordenadas(datos.get('generales', ())), 1)
+        )
+
+    @staticmethod
+    def _resultado_preciso(normativa: Dict, numero: int, tema: str, precision: str) -> Dict:
+        return {
+            'numero': numero,
+            'titulo': normativa['titulo'],
+            'descripcion': normativa['descripcion'],
+            'enlace': URL_NORMA.format(normativa['numero']),
+            'numero_ley': normativa['numero'],
+            'tipo_norma': normativa['tipo'],
+            'relevancia': normativa['relevancia'],
+            'categoria_encontrada': tema,
+            'precision': precision,
+        }
+
+    @staticmethod
+    def _resultado_especifico(normativa: Dict, numero: int, tema: str) -> Dict:
+        return {
+            'numero': numero,
+            'titulo': normativa['titulo'],
+            'descripcion': f"Normativa específica de {tema}",
+            'enlace': URL_NORMA.format(normativa['numero']),
+            'numero_ley': normativa['numero'],
+            'tipo_norma': normativa['tipo'],
+            'relevancia': 5.0 - (0.1 * numero),  # Relevancia alta para categoría específica
+        }
+
+    @staticmethod
+    def _resultado_general(normativa: Dict, numero: int) -> Dict:
+        return {
+            'numero': numero,
+            'titulo': normativa['titulo'],
+            'descripcion': normativa['descripcion'],
+            'enlace': normativa.get('enlace') or URL_NORMA.format(normativa['numero']),
+            'numero_ley': normativa['numero'],
+            'tipo_norma': normativa['tipo'],
+            'relevancia': normativa['relevancia'],
+        }
+
+    def tiene_precisas(self, tema: Optional[str]) -> bool:
+        return (tema, 'exacta') in self._precisas
+
+    def resultados_precisos(self, tema: str, precision: str) -> List[Dict]:
+        """Normativas precisas del tema, ya numeradas y ordenadas por relevancia"""
+        return list(self._precisas.get((tema, precision), ()))
+
+    def resultados_especificos(self, tema: str) -> List[Dict]:
+        """Hasta MAX_RESULTADOS normativas relacionadas del tema, ya numeradas y ordenadas"""
+        return list(self._especificas.get(tema, ()))
+
+    def estadisticas(self) -> Dict:
+        return {
+            'version': self.version,
+            'huella': self.huella,
+            'temas': len(self.relacionadas),
+            'terminos': len(self.terminos),
+            'normativas': sum(len(n) for n in self.relacionadas.values()),
+        }
+
+def cargar_catalogo(ruta: str = RUTA_CATALOGO) -> CatalogoNormativo:
+    """Lee y valida el archivo completo antes de construir el catálogo"""
+    mtime = os.stat(ruta).st_mtime_ns
+    with open(ruta, 'rb') as archivo:
+        contenido = archivo.read()
+    catalogo = CatalogoNormativo(json.loads(contenido.decode('utf-8')), origen=ruta,
+                                 huella=hashlib.sha256(contenido).hexdigest()[:12], mtime=mtime)
+    estadisticas = catalogo.estadisticas()
+    logger.info(f"📚 Catálogo normativo v{catalogo.version} ({catalogo.huella}): {estadisticas['temas']} temas, "
+                f"{estadisticas['normativas']} normativas, {estadisticas['terminos']} términos")
+    return catalogo
+
+def catalogo_vacio(origen: str = RUTA_CATALOGO) -> CatalogoNormativo:
+    """Catálogo sin temas ni normativas: ninguna consulta reconoce un tema hasta que se cargue el archivo"""
+    return CatalogoNormativo({'version': 0, 'temas': {}}, origen=origen, permitir_vacio=True)
+
+_lock_recarga = threading.Lock()
+_recargando = threading.Event()
+_ultima_revision = time.monotonic()
+# mtime del archivo que no se pudo cargar: no se reintenta hasta que vuelva a cambiar
+_mtime_fallido = 0
+_ultimo_error: Optional[str] = None
+
+def _cargar_al_iniciar(ruta: str = RUTA_CATALOGO) -> CatalogoNormativo:
+    """Carga inicial; un archivo faltante o inválido no impide arrancar la app"""
+    global _mtime_fallido, _ultimo_error
+    try:
+        return cargar_catalogo(ruta)
+    except Exception as e:
+        try:
+            _mtime_fallido = os.stat(ruta).st_mtime_ns
+        except OSError:
+            pass
+        _ultimo_error = str(e)
+        logger.error(f"❌ No se pudo cargar el catálogo normativo ({ruta}), se usa un catálogo vacío: {e}")
+        return catalogo_vacio(ruta)
+
+_catalogo = _cargar_al_iniciar()
+
+def recargar_catalogo(ruta: Optional[str] = None) -> CatalogoNormativo:
+    """
+    Construye un catálogo nuevo desde el archivo y lo publica con una sola asignación.
+    Si el archivo es inválido lanza la excepción y el catálogo vigente sigue sirviendo.
+    """
+    global _catalogo, _mtime_fallido, _ultimo_error
+    ruta = ruta or _catalogo.origen
+    with _lock_recarga:
+        try:
+            nuevo = cargar_catalogo(ruta)
+        except Exception as e:
+            try:
+                _mtime_fallido = os.stat(ruta).st_mtime_ns
+            except OSError:
+                pass
+            _ultimo_error = str(e)
+            logger.error(f"❌ Catálogo normativo inválido, se mantiene v{_catalogo.version}: {e}")
+            raise
+        anterior, _catalogo = _catalogo, nuevo
+        _ultimo_error = None
+    if anterior.huella != nuevo.huella:
+        logger.info(f"🔄 Catálogo normativo: v{anterior.version} ({anterior.huella}) -> v{nuevo.version} ({nuevo.huella})")
+    return nuevo
+
+def _recargar_en_segundo_plano() -> None:
+    try:
+        recargar_catalogo()
+    except Exception:
+        pass  # Ya registrado; se reintenta cuando el archivo vuelva a cambiar
+    finally:
+        _recargando.clear()
+
+def _revisar_archivo() -> None:
+    """Si el archivo cambió desde la carga, lanza la recarga en un hilo sin detener la consulta actual"""
+    global _ultima_revision
+    ahora = time.monotonic()
+    if ahora - _ultima_revision < INTERVALO_REVISION or _recargando.is_set():
+        return
+    _ultima_revision = ahora
+    try:
+        mtime = os.stat(_catalogo.origen).st_mtime_ns
+    except OSError:
+        return
+    if mtime != _catalogo.mtime and mtime != _mtime_fallido:
+        _recargando.set()
+        threading.Thread(target=_recargar_en_segundo_plano, name="catalogo-normativo", daemon=True).start()
+
+def obtener_catalogo() -> CatalogoNormativo:
+    """
+    Catálogo vigente del proceso. Quien lo usa debe tomarlo una vez por consulta: una recarga
+    publica un objeto nuevo y nunca modifica el que ya se está leyendo.
+    """
+    _revisar_archivo()
+    return _catalogo
+
+def estado_catalogo() -> Dict:
+    """Estadísticas del catálogo vigente, para /health y el endpoint de recarga"""
+    estado = _catalogo.estadisticas()
+    estado['recargando'] = _recargando.is_set()
+    if _ultimo_error:
+        estado['ultimo_error'] = _ultimo_error
+    return estado
@@ -0,0 +1,309 @@
+# scrapers/coordenadas.py - Coordenadas de los expedientes SEIA (UTM o geográficas) convertidas a WGS84
+"""
+Los expedientes del SEIA publican la ubicación del proyecto como texto libre:
+
+    UTM Huso 19S Este: 345.678 Norte: 6.300.123 Datum PSAD56
+    Coordenadas UTM (WGS 84, huso 18): E 654321 N 5412345
+    Latitud: -33.4489 Longitud: -70.6693
+    33°27'00" S 70°40'12" O
+
+extraer_bloques() reconoce esos formatos y convertir_bloques() los lleva a WGS84 en lote,
+agrupando por huso y datum para convertir cada grupo de una vez (vectorizado con numpy si
+está instalado, con math en Python puro si no).
+"""
+
+import math
+import re
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+    NUMPY_DISPONIBLE = True
+except ImportError:
+    NUMPY_DISPONIBLE = False
+
+# Elipsoides: (semieje mayor, achatamiento)
+ELIPSOIDES = {
+    'WGS84': (6378137.0, 1 / 298.257223563),
+    'INTERNACIONAL_1924': (6378388.0, 1 / 297.0),
+    'GRS67': (6378160.0, 1 / 298.25),
+}
+
+# Datum: (elipsoide, traslación geocéntrica a WGS84 en metros).
+# PSAD56 usa parámetros distintos en el norte (~19°S) y en el sur (~43°S) de Chile; entre ambos se interpola.
+DATUMS = {
+    'WGS84': ('WGS84', (0.0, 0.0, 0.0)),
+    'SIRGAS': ('WGS84', (0.0, 0.0, 0.0)),  # SIRGAS-Chile difiere de WGS84 en centímetros
+    'PSAD56': ('INTERNACIONAL_1924', None),
+    'SAD69': ('GRS67', (-75.0, -1.0, -44.0)),
+}
+PSAD56_NORTE = (-19.0, (-270.0, 183.0, -390.0))
+PSAD56_SUR = (-43.0, (-305.0, 243.0, -442.0))
+
+FACTOR_ESCALA_UTM = 0.9996
+FALSO_ESTE = 500000.0
+FALSO_NORTE_SUR = 10000000.0
+HUSOS_CHILE = (19, 18)  # 19 cubre la mayor parte del territorio; 18 el extremo occidental y el sur
+
+# Límites de Chile (incluye Isla de Pascua) para descartar lecturas absurdas
+BBOX_CHILE = (-56.5, -110.0, -17.0, -66.0)
+ZOOM_PUNTO_EXACTO = 15  # mismo zoom que scrapers.geocodificacion usa para precisión 'exacta'
+RANGO_ESTE = (100000.0, 900000.0)
+RANGO_NORTE = (3700000.0, 8200000.0)
+
+# --- Lectura de números y formatos ---
+
+_NUMERO = r'\d{1,3}(?:\.\d{3})+(?:,\d+)?|\d+(?:[.,]\d+)?'
+
+def _leer_numero(texto: str) -> float:
+    """'6.300.123' -> 6300123.0, '345678,5' -> 345678.5, '-33.4489' -> -33.4489"""
+    texto = texto.strip()
+    if re.fullmatch(r'-?\d{1,3}(?:\.\d{3})+(?:,\d+)?', texto):
+        texto = texto.replace('.', '').replace(',', '.')
+    else:
+        texto = texto.replace(',', '.')
+    return float(texto)
+
+_PATRON_HUSO = re.compile(r'(?:huso|zona|zone|uso)\s*(?:utm)?\s*[:=]?\s*(18|19)|\b(18|19)\s*[hHsS]\b', re.IGNORECASE)
+_PATRON_DATUM = re.compile(r'(wgs\s*-?\s*84|psad\s*-?\s*56|sad\s*-?\s*69|sirgas)', re.IGNORECASE)
+# Etiquetas explícitas. Las letras sueltas (E/N, X/Y) solo cuentan si el texto dice 'UTM': fuera de un bloque
+# de coordenadas 'e' e 'y' son conjunciones ("x 300000 e y 6300000") y cualquier monto quedaría como punto
+_PATRON_ESTE = re.compile(rf'\b(?:coordenada\s+)?este\b\s*[:=]?\s*({_NUMERO})', re.IGNORECASE)
+_PATRON_NORTE = re.compile(rf'\b(?:coordenada\s+)?norte\b\s*[:=]?\s*({_NUMERO})', re.IGNORECASE)
+_PATRON_ESTE_LETRA = re.compile(rf'\b[ex]\b\s*[:=]?\s*({_NUMERO})', re.IGNORECASE)
+_PATRON_NORTE_LETRA = re.compile(rf'\b[ny]\b\s*[:=]?\s*({_NUMERO})', re.IGNORECASE)
+_PATRON_UTM = re.compile(r'\butm\b', re.IGNORECASE)
+_PATRON_LATITUD = re.compile(r'\blat(?:itud)?\b\.?\s*[:=]?\s*(-?\d{1,2}(?:[.,]\d+)?)\s*°?\s*([NS])?', re.IGNORECASE)
+_PATRON_LONGITUD = re.compile(r'\blon(?:g(?:itud)?)?\b\.?\s*[:=]?\s*(-?\d{1,3}(?:[.,]\d+)?)\s*°?\s*([EOW])?', re.IGNORECASE)
+_PATRON_DMS = re.compile(
+    r'(\d{1,3})\s*°\s*(\d{1,2})\s*[\'’′]\s*(?:(\d{1,2}(?:[.,]\d+)?)\s*(?:"|”|″|\'\'))?\s*([NSEOW])', re.IGNORECASE
+)
+_PATRON_PAR_DECIMAL = re.compile(r'(-\d{1,2}\.\d{3,})\s*[,;/ ]\s*(-\d{2,3}\.\d{3,})')
+
+def _normalizar_datum(texto: Optional[str]) -> str:
+    if not texto:
+        return 'WGS84'
+    clave = re.sub(r'[\s-]', '', texto.upper())
+    return {'WGS84': 'WGS84', 'PSAD56': 'PSAD56', 'SAD69': 'SAD69', 'SIRGAS': 'SIRGAS'}.get(clave, 'WGS84')
+
+def _bloques_utm(texto: str, datum: str, huso: Optional[int]) -> List[Dict]:
+    """Pares este/norte etiquetados; los números sin etiqueta no se emparejan (montos, superficies)"""
+    patron_este, patron_norte = _PATRON_ESTE, _PATRON_NORTE
+    if _PATRON_UTM.search(texto) and not (patron_este.search(texto) and patron_norte.search(texto)):
+        patron_este, patron_norte = _PATRON_ESTE_LETRA, _PATRON_NORTE_LETRA
+    estes = [_leer_numero(m.group(1)) for m in patron_este.finditer(texto)]
+    nortes = [_leer_numero(m.group(1)) for m in patron_norte.finditer(texto)]
+    estes = [e for e in estes if RANGO_ESTE[0] <= e <= RANGO_ESTE[1]]
+    nortes = [n for n in nortes if RANGO_NORTE[0] <= n <= RANGO_NORTE[1]]
+
+    return [{'tipo': 'utm', 'este': e, 'norte': n, 'huso': huso, 'datum': datum} for e, n in zip(estes, nortes)]
+
+def _bloques_geograficos(texto: str, datum: str) -> List[Dict]:
+    bloques = []
+    latitudes = list(_PATRON_LATITUD.finditer(texto))
+    longitudes = list(_PATRON_LONGITUD.finditer(texto))
+    for m_lat, m_lng in zip(latitudes, longitudes):
+        lat, lng = _leer_numero(m_lat.group(1)), _leer_numero(m_lng.group(1))
+        # En Chile ambas son negativas aunque el texto las publique sin signo
+        bloques.append({'tipo': 'geograficas', 'lat': -abs(lat), 'lng': -abs(lng), 'datum': datum})
+    if bloques:
+        return bloques
+
+    grados = []
+    for m in _PATRON_DMS.finditer(texto):
+        valor = int(m.group(1)) + int(m.group(2)) / 60 + (_leer_numero(m.group(3)) if m.group(3) else 0) / 3600
+        grados.append((valor, m.group(4).upper()))
+    latitudes = [v for v, h in grados if h in 'NS']
+    longitudes = [v for v, h in grados if h in 'EOW']
+    for lat, lng in zip(latitudes, longitudes):
+        bloques.append({'tipo': 'geograficas', 'lat': -lat, 'lng': -lng, 'datum': datum})
+    if bloques:
+        return bloques
+
+    return [{'tipo': 'geograficas', 'lat': float(a), 'lng': float(b), 'datum': datum}
+            for a, b in _PATRON_PAR_DECIMAL.findall(texto)]
+
+def extraer_bloques(texto: str) -> List[Dict]:
+    """
+    Reconoce coordenadas en texto libre. Retorna bloques sin convertir:
+    {'tipo': 'utm', 'este', 'norte', 'huso' (None si el texto no lo indica), 'datum'}
+    o {'tipo': 'geograficas', 'lat', 'lng', 'datum'}.
+    """
+    if not texto:
+        return []
+    datum_m = _PATRON_DATUM.search(texto)
+    datum = _normalizar_datum(datum_m.group(1) if datum_m else None)
+
+    bloques = _bloques_geograficos(texto, datum)
+    if bloques:
+        return bloques
+
+    huso_m = _PATRON_HUSO.search(texto)
+    huso = int(huso_m.group(1) or huso_m.group(2)) if huso_m else None
+    return _bloques_utm(texto, datum, huso)
+
+# --- Conversión (escalares con math o arreglos con numpy) ---
+
+def _modulo(arreglo: bool):
+    return np if arreglo else math
+
+def _utm_inverso(xp, estes, nortes, huso: int, elipsoide: str):
+    """Transversa de Mercator inversa (hemisferio sur). Retorna (lat, lng) en radianes"""
+    a, f = ELIPSOIDES[elipsoide]
+    e2 = f * (2 - f)
+    ep2 = e2 / (1 - e2)
+    e1 = (1 - math.sqrt(1 - e2)) / (1 + math.sqrt(1 - e2))
+
+    x = estes - FALSO_ESTE
+    m = (nortes - FALSO_NORTE_SUR) / FACTOR_ESCALA_UTM
+    mu = m / (a * (1 - e2 / 4 - 3 * e2 ** 2 / 64 - 5 * e2 ** 3 / 256))
+    phi1 = (mu + (3 * e1 / 2 - 27 * e1 ** 3 / 32) * xp.sin(2 * mu)
+            + (21 * e1 ** 2 / 16 - 55 * e1 ** 4 / 32) * xp.sin(4 * mu)
+            + (151 * e1 ** 3 / 96) * xp.sin(6 * mu)
+            + (1097 * e1 ** 4 / 512) * xp.sin(8 * mu))
+
+    sen, cos, tan = xp.sin(phi1), xp.cos(phi1), xp.tan(phi1)
+    c1 = ep2 * cos ** 2
+    t1 = tan ** 2
+    n1 = a / xp.sqrt(1 - e2 * sen ** 2)
+    r1 = a * (1 - e2) / (1 - e2 * sen ** 2) ** 1.5
+    d = x / (n1 * FACTOR_ESCALA_UTM)
+
+    lat = phi1 - (n1 * tan / r1) * (
+        d ** 2 / 2
+        - (5 + 3 * t1 + 10 * c1 - 4 * c1 ** 2 - 9 * ep2) * d ** 4 / 24
+        + (61 + 90 * t1 + 298 * c1 + 45 * t1 ** 2 - 252 * ep2 - 3 * c1 ** 2) * d ** 6 / 720
+    )
+    meridiano_central = math.radians(huso * 6 - 183)
+    lng = meridiano_central + (
+        d - (1 + 2 * t1 + c1) * d ** 3 / 6
+        + (5 - 2 * c1 + 28 * t1 - 3 * c1 ** 2 + 8 * ep2 + 24 * t1 ** 2) * d ** 5 / 120
+    ) / cos
+    return lat, lng
+
+def _traslacion_psad56(lat_grados: float) -> Tuple[float, float, float]:
+    """Parámetros PSAD56 -> WGS84 interpolados entre el norte y el sur de Chile"""
+    (lat_n, t_n), (lat_s, t_s) = PSAD56_NORTE, PSAD56_SUR
+    peso = min(1.0, max(0.0, (lat_grados - lat_n) / (lat_s - lat_n)))
+    return tuple(n + (s - n) * peso for n, s in zip(t_n, t_s))
+
+def _a_wgs84(xp, lat, lng, datum: str):
+    """Cambio de datum por traslación geocéntrica. lat/lng en radianes; retorna radianes en WGS84"""
+    elipsoide, traslacion = DATUMS[datum]
+    if elipsoide == 'WGS84':
+        return lat, lng
+    if traslacion is None:
+        lat_media = float(xp.mean(lat)) if xp is not math else lat
+        traslacion = _traslacion_psad56(math.degrees(lat_media))
+
+    a, f = ELIPSOIDES[elipsoide]
+    e2 = f * (2 - f)
+    n = a / xp.sqrt(1 - e2 * xp.sin(lat) ** 2)
+    x = n * xp.cos(lat) * xp.cos(lng) + traslacion[0]
+    y = n * xp.cos(lat) * xp.sin(lng) + traslacion[1]
+    z = n * (1 - e2) * xp.sin(lat) + traslacion[2]
+
+    # Geocéntricas -> geodésicas WGS84 (Bowring)
+    a, f = ELIPSOIDES['WGS84']
+    b = a * (1 - f)
+    e2 = f * (2 - f)
+    ep2 = e2 / (1 - e2)
+    atan2 = getattr(xp, 'arctan2', None) or xp.atan2
+    p = xp.hypot(x, y)
+    theta = atan2(z * a, p * b)
+    lat_wgs = atan2(z + ep2 * b * xp.sin(theta) ** 3, p - e2 * a * xp.cos(theta) ** 3)
+    lng_wgs = atan2(y, x)
+    return lat_wgs, lng_wgs
+
+def utm_a_wgs84(estes: Sequence[float], nortes: Sequence[float], huso: int,
+                datum: str = 'WGS84') -> Tuple[List[float], List[float]]:
+    """Convierte en lote coordenadas UTM del hemisferio sur (un huso y un datum) a lat/lng WGS84 en grados"""
+    if not estes:
+        return [], []
+    elipsoide = DATUMS[datum][0]
+    if NUMPY_DISPONIBLE:
+        lat, lng = _utm_inverso(np, np.asarray(estes, dtype=float), np.asarray(nortes, dtype=float), huso, elipsoide)
+        lat, lng = _a_wgs84(np, lat, lng, datum)
+        return np.degrees(lat).tolist(), np.degrees(lng).tolist()
+
+    latitudes, longitudes = [], []
+    for este, norte in zip(estes, nortes):
+        lat, lng = _a_wgs84(math, *_utm_inverso(math, float(este), float(norte), huso, elipsoide), datum)
+        latitudes.append(math.degrees(lat))
+        longitudes.append(math.degrees(lng))
+    return latitudes, longitudes
+
+def geograficas_a_wgs84(latitudes: Sequence[float], longitudes: Sequence[float],
+                        datum: str = 'WGS84') -> Tuple[List[float], List[float]]:
+    """Cambio de datum de coordenadas geográficas (grados) a WGS84"""
+    if DATUMS[datum][0] == 'WGS84' or not latitudes:
+        return list(latitudes), list(longitudes)
+    if NUMPY_DISPONIBLE:
+        lat, lng = _a_wgs84(np, np.radians(np.asarray(latitudes, dtype=float)),
+                            np.radians(np.asarray(longitudes, dtype=float)), datum)
+        return np.degrees(lat).tolist(), np.degrees(lng).tolist()
+    pares = [_a_wgs84(math, math.radians(la), math.radians(lo), datum) for la, lo in zip(latitudes, longitudes)]
+    return [math.degrees(la) for la, _ in pares], [math.degrees(lo) for _, lo in pares]
+
+def _dentro(bbox: Sequence[float], lat: float, lng: float) -> bool:
+    return bbox[0] <= lat <= bbox[2] and bbox[1] <= lng <= bbox[3]
+
+def convertir_bloques(bloques: Iterable[Dict], bbox: Optional[Sequence[float]] = None) -> List[Optional[Dict]]:
+    """
+    Convierte una lista de bloques (de muchos proyectos) a WGS84, agrupando por huso y datum.
+    Los bloques UTM sin huso se prueban en los husos de Chile y se acepta el que cae dentro
+    de bbox (o de Chile). Retorna, en el mismo orden, {'lat', 'lng', 'datum', 'huso'} o None.
+    """
+    bloques = list(bloques)
+    resultados: List[Optional[Dict]] = [None] * len(bloques)
+    limites = bbox or BBOX_CHILE
+
+    grupos: Dict[Tuple, List[int]] = {}
+    for indice, bloque in enumerate(bloques):
+        if bloque['tipo'] == 'utm':
+            for huso in ([bloque['huso']] if bloque.get('huso') else HUSOS_CHILE):
+                grupos.setdefault(('utm', huso, bloque['datum']), []).append(indice)
+        else:
+            grupos.setdefault(('geograficas', None, bloque['datum']), []).append(indice)
+
+    for (tipo, huso, datum), indices in grupos.items():
+        if tipo == 'utm':
+            lats, lngs = utm_a_wgs84([bloques[i]['este'] for i in indices], [bloques[i]['norte'] for i in indices],
+                                     huso, datum)
+        else:
+            lats, lngs = geograficas_a_wgs84([bloques[i]['lat'] for i in indices], [bloques[i]['lng'] for i in indices],
+                                             datum)
+        for i, lat, lng in zip(indices, lats, lngs):
+            if resultados[i] is None and _dentro(limites, lat, lng):
+                resultados[i] = {'lat': round(lat, 6), 'lng': round(lng, 6), 'datum': datum, 'huso': huso}
+    return resultados
+
+def punto_desde_bloques(convertidos: Sequence[Optional[Dict]]) -> Optional[Dict]:
+    """Un punto por proyecto: el centro de los vértices válidos (los expedientes suelen traer varios)"""
+    validos = [c for c in convertidos if c]
+    if not validos:
+        return None
+    return {
+        'lat': round(sum(c['lat'] for c in validos) / len(validos), 6),
+        'lng': round(sum(c['lng'] for c in validos) / len(validos), 6),
+        'precision': 'exacta',
+        'fuente': 'expediente SEIA',
+        'datum_original': validos[0]['datum'],
+        'vertices': len(validos),
+        'zoom': ZOOM_PUNTO_EXACTO,
+    }
+
+def coordenadas_desde_texto(texto: str, bbox: Optional[Sequence[float]] = None) -> Optional[Dict]:
+    """Punto WGS84 de un texto de coordenadas del expediente, o None si no se reconoce"""
+    try:
+        return punto_desde_bloques(convertir_bloques(extraer_bloques(texto), bbox))
+    except (ValueError, KeyError, ZeroDivisionError) as e:
+        logger.debug(f"Coordenadas no interpretables '{texto[:80]}': {e}")
+        return None
+
+def formatear_coordenadas(punto: Dict) -> str:
+    """'-33.448900, -70.669300 (WGS84)' para el campo ubicacion.coordenadas"""
+    return f"{punto['lat']:.6f}, {punto['lng']:.6f} (WGS84)"
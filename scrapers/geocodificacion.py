@@ -0,0 +1,272 @@
+# scrapers/geocodificacion.py - Geocodificación local con el nomenclátor de comunas y regiones de Chile
+# Alcance del nomenclátor: cada comuna tiene solo el punto de su localidad cabecera (sin centroide ni bbox,
+# así que no sirve para verificar si un punto cae dentro de una comuna); solo las regiones traen centroide y
+# bbox aproximados. Un punto de comuna se muestra con el zoom de ZOOM_POR_PRECISION en vez de encuadrarlo.
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from scrapers.cache_ttl import CacheTTL
+
+logger = logging.getLogger(__name__)
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUTA_GAZETTEER = os.getenv('GAZETTEER_RUTA', os.path.join(_RAIZ, 'data', 'gazetteer_chile.json'))
+RUTA_CACHE_GEOCODIFICACION = os.getenv('GEOCODIFICACION_CACHE_RUTA', os.path.join(_RAIZ, 'data', 'geocodificacion.sqlite'))
+
+# Geocodificación fina de direcciones (opcional). Sin API key solo se usa el nomenclátor y la cache
+GOOGLE_GEOCODING_API_KEY = os.getenv('GOOGLE_GEOCODING_API_KEY', '')
+GOOGLE_GEOCODING_URL = 'https://maps.googleapis.com/maps/api/geocode/json'
+
+# Zoom sugerido para el mapa según la precisión del punto
+ZOOM_POR_PRECISION = {'exacta': 15, 'direccion': 15, 'comuna': 12, 'region': 7}
+
+# Prefijos que no forman parte del nombre del lugar ("Región de", "Comuna de", ...)
+_PATRON_PREFIJO = re.compile(r'^(region|comuna|provincia)\s+(de\s+|del\s+)?')
+_PATRON_ARTICULO = re.compile(r'^(la|las|los|el)\s+')
+
+# Nombres alternativos frecuentes en el SEIA y en direcciones
+ALIAS_REGIONES = {
+    'metropolitana': '13', 'rm': '13', 'metropolitana de santiago': '13', 'santiago region': '13',
+    'o higgins': '06', 'libertador bernardo o higgins': '06', 'libertador general bernardo o higgins': '06',
+    'aysen': '11', 'aisen': '11', 'magallanes': '12', 'magallanes y antartica chilena': '12',
+    'bio bio': '08', 'biobio': '08', 'araucania': '09', 'arica': '15', 'nuble': '16',
+}
+
+def normalizar_lugar(texto: str) -> str:
+    """Minúsculas, sin tildes ni puntuación: 'Región de Ñuble' -> 'region de nuble'"""
+    if not texto:
+        return ''
+    texto = unicodedata.normalize('NFKD', str(texto).lower())
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    texto = re.sub(r'[^a-z0-9]+', ' ', texto)
+    return texto.strip()
+
+def _sin_prefijos(texto_normalizado: str) -> str:
+    """Quita 'region de', 'comuna de', etc. al inicio y 'region' al final ('v region' -> 'v')"""
+    texto = _PATRON_PREFIJO.sub('', texto_normalizado)
+    return re.sub(r'\s+region$', '', texto)
+
+class Gazetteer:
+    """Comunas (punto de la cabecera), provincias y regiones (centroide y bbox) de Chile, por nombre normalizado"""
+
+    def __init__(self, datos: Dict):
+        self.regiones: Dict[str, Dict] = {r['codigo']: r for r in datos['regiones']}
+        self.provincias: Dict[str, Dict] = {p['codigo']: p for p in datos['provincias']}
+        self.comunas: Dict[str, Dict] = {c['codigo']: c for c in datos['comunas']}
+
+        self._regiones_por_nombre: Dict[str, str] = dict(ALIAS_REGIONES)
+        for codigo, region in self.regiones.items():
+            nombre = normalizar_lugar(region['nombre'])
+            base = _sin_prefijos(nombre)
+            for clave in (nombre, base, _PATRON_ARTICULO.sub('', base), region['sigla'].lower(),
+                          region['romano'].lower(), str(int(codigo))):
+                self._regiones_por_nombre[clave] = codigo
+
+        self._comunas_por_nombre: Dict[str, List[Dict]] = {}
+        for comuna in self.comunas.values():
+            self._comunas_por_nombre.setdefault(normalizar_lugar(comuna['nombre']), []).append(comuna)
+        self._max_palabras_comuna = max(len(nombre.split()) for nombre in self._comunas_por_nombre)
+
+    def buscar_region(self, texto: str) -> Optional[Dict]:
+        """Región por nombre, sigla, número romano o código ('V Región', 'Región de Valparaíso', 'RM')"""
+        normalizado = normalizar_lugar(texto)
+        base = _sin_prefijos(normalizado)
+        codigo = (self._regiones_por_nombre.get(normalizado) or self._regiones_por_nombre.get(base)
+                  or self._regiones_por_nombre.get(_PATRON_ARTICULO.sub('', base)))
+        if not codigo:
+            # 'XIII Región Metropolitana', 'Biobío (VIII)': nombre o número dentro de un texto más largo
+            palabras = f' {normalizado} '
+            for clave in sorted(self._regiones_por_nombre, key=len, reverse=True):
+                if (len(clave) >= 4 or clave in ('rm',) or clave.isalpha() and set(clave) <= set('ivx')) \
+                        and f' {clave} ' in palabras:
+                    codigo = self._regiones_por_nombre[clave]
+                    break
+        return self.regiones.get(codigo) if codigo else None
+
+    def buscar_comuna(self, texto: str, region: Optional[str] = None) -> Optional[Dict]:
+        """Comuna por nombre (sin tildes); region (código) desempata nombres repetidos"""
+        normalizado = normalizar_lugar(texto)
+        candidatas = self._comunas_por_nombre.get(normalizado) or self._comunas_por_nombre.get(_sin_prefijos(normalizado))
+        if not candidatas:
+            return None
+        if region:
+            en_region = [c for c in candidatas if c['region'] == region]
+            if en_region:
+                return en_region[0]
+        return candidatas[0]
+
+    def comuna_en_texto(self, texto: str, region: Optional[str] = None) -> Optional[Dict]:
+        """
+        Busca un nombre de comuna dentro de un texto libre (dirección, ubicación del proyecto).
+        Recorre desde el final, donde las direcciones suelen llevar la comuna, y prefiere
+        el nombre más largo ('San Pedro de Atacama' antes que 'San Pedro').
+        """
+        palabras = normalizar_lugar(texto).split()
+        primera = None
+        for fin in range(len(palabras), 0, -1):
+            for largo in range(min(self._max_palabras_comuna, fin), 0, -1):
+                candidatas = self._comunas_por_nombre.get(' '.join(palabras[fin - largo:fin]))
+                if not candidatas:
+                    continue
+                en_region = [c for c in candidatas if not region or c['region'] == region]
+                if en_region:
+                    return en_region[0]
+                primera = primera or candidatas[0]
+                break
+        return primera if not region else None
+
+    def region_de_comuna(self, comuna: Dict) -> Dict:
+        return self.regiones[comuna['region']]
+
+@lru_cache(maxsize=1)
+def obtener_gazetteer() -> Gazetteer:
+    """Carga el nomenclátor una sola vez por proceso"""
+    with open(RUTA_GAZETTEER, encoding='utf-8') as archivo:
+        gazetteer = Gazetteer(json.load(archivo))
+    logger.info(f"🗺️ Nomenclátor cargado: {len(gazetteer.comunas)} comunas, {len(gazetteer.regiones)} regiones")
+    return gazetteer
+
+class CacheGeocodificacion:
+    """Cache persistente (SQLite) de direcciones ya geocodificadas, compartida entre workers"""
+
+    def __init__(self, ruta: str = RUTA_CACHE_GEOCODIFICACION):
+        self.ruta = ruta
+        self._memoria = CacheTTL(ttl_segundos=3600, max_entradas=4096)
+        self._lock = threading.Lock()
+        self._inicializada = False
+
+    @contextmanager
+    def _conectar(self):
+        """Conexión de corta duración: sqlite3 no se comparte entre hilos ni procesos"""
+        if not self._inicializada:
+            os.makedirs(os.path.dirname(self.ruta) or '.', exist_ok=True)
+        conexion = sqlite3.connect(self.ruta, timeout=5)
+        try:
+            if not self._inicializada:
+                with self._lock:
+                    conexion.execute(
+                        "CREATE TABLE IF NOT EXISTS geocodificaciones ("
+                        "clave TEXT PRIMARY KEY, direccion TEXT, lat REAL, lng REAL, "
+                        "precision TEXT, fuente TEXT, fecha TEXT)"
+                    )
+                    self._inicializada = True
+            with conexion:
+                yield conexion
+        finally:
+            conexion.close()
+
+    def obtener(self, direccion: str) -> Optional[Dict]:
+        clave = normalizar_lugar(direccion)
+        if not clave:
+            return None
+        punto = self._memoria.obtener(clave)
+        if punto is not None:
+            return punto
+        try:
+            with self._conectar() as conexion:
+                fila = conexion.execute(
+                    "SELECT lat, lng, precision, fuente FROM geocodificaciones WHERE clave = ?", (clave,)
+                ).fetchone()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"⚠️ Cache de geocodificación no disponible: {e}")
+            return None
+        if not fila:
+            return None
+        punto = {'lat': fila[0], 'lng': fila[1], 'precision': fila[2], 'fuente': fila[3]}
+        self._memoria.guardar(clave, punto)
+        return punto
+
+    def guardar(self, direccion: str, lat: float, lng: float, precision: str = 'direccion', fuente: str = 'cache') -> None:
+        clave = normalizar_lugar(direccion)
+        if not clave:
+            return
+        try:
+            with self._conectar() as conexion:
+                conexion.execute(
+                    "INSERT OR REPLACE INTO geocodificaciones VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (clave, direccion, lat, lng, precision, fuente, datetime.now().isoformat())
+                )
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"⚠️ No se pudo guardar la geocodificación de '{direccion[:60]}': {e}")
+            return
+        self._memoria.guardar(clave, {'lat': lat, 'lng': lng, 'precision': precision, 'fuente': fuente})
+
+cache_geocodificacion = CacheGeocodificacion()
+
+def _dentro_de(bbox: List[float], lat: float, lng: float) -> bool:
+    return bbox[0] <= lat <= bbox[2] and bbox[1] <= lng <= bbox[3]
+
+def _geocodificar_google(direccion: str, region: Optional[Dict]) -> Optional[Dict]:
+    """Geocodificación fina de una dirección con la API de Google (solo si hay API key)"""
+    if not GOOGLE_GEOCODING_API_KEY:
+        return None
+    try:
+        import requests
+        respuesta = requests.get(GOOGLE_GEOCODING_URL, params={
+            'address': direccion, 'components': 'country:CL', 'key': GOOGLE_GEOCODING_API_KEY
+        }, timeout=5)
+        resultados = respuesta.json().get('results', [])
+    except Exception as e:
+        logger.warning(f"⚠️ Error en geocodificación remota: {e}")
+        return None
+    if not resultados or resultados[0].get('partial_match'):
+        return None
+    ubicacion = resultados[0]['geometry']['location']
+    lat, lng = ubicacion['lat'], ubicacion['lng']
+    if region and not _dentro_de(region['bbox'], lat, lng):
+        # Resultado fuera de la región declarada: se descarta antes que poner un pin equivocado
+        return None
+    return {'lat': lat, 'lng': lng, 'precision': 'direccion', 'fuente': 'google'}
+
+def geocodificar(direccion: str = '', comuna: str = '', region: str = '', remoto: bool = True) -> Optional[Dict]:
+    """
+    Coordenadas de una ubicación, de la más precisa a la menos precisa:
+    dirección en cache (o geocodificada en remoto y guardada), comuna, comuna mencionada
+    en la dirección y finalmente el centroide de la región (con su bbox para encuadrar el mapa).
+    Retorna None si no se reconoce ningún lugar.
+    """
+    try:
+        gazetteer = obtener_gazetteer()
+    except (OSError, ValueError) as e:
+        logger.error(f"❌ Nomenclátor no disponible: {e}")
+        return None
+
+    datos_region = gazetteer.buscar_region(region) if region else None
+    codigo_region = datos_region['codigo'] if datos_region else None
+
+    if direccion:
+        punto = cache_geocodificacion.obtener(direccion)
+        if punto is None and remoto:
+            punto = _geocodificar_google(direccion, datos_region)
+            if punto:
+                cache_geocodificacion.guardar(direccion, punto['lat'], punto['lng'], punto['precision'], punto['fuente'])
+        if punto:
+            return dict(punto, zoom=ZOOM_POR_PRECISION.get(punto['precision'], 15))
+
+    datos_comuna = gazetteer.buscar_comuna(comuna, codigo_region) if comuna else None
+    if datos_comuna is None and direccion:
+        datos_comuna = gazetteer.comuna_en_texto(direccion, codigo_region)
+    if datos_comuna:
+        return {
+            'lat': datos_comuna['lat'], 'lng': datos_comuna['lng'], 'precision': 'comuna',
+            'fuente': 'nomenclator', 'comuna': datos_comuna['nombre'],
+            'region': gazetteer.region_de_comuna(datos_comuna)['nombre'],
+            'zoom': ZOOM_POR_PRECISION['comuna'],
+        }
+
+    if datos_region:
+        return {
+            'lat': datos_region['lat'], 'lng': datos_region['lng'], 'precision': 'region',
+            'fuente': 'nomenclator', 'region': datos_region['nombre'], 'bbox': datos_region['bbox'],
+            'zoom': ZOOM_POR_PRECISION['region'],
+        }
+    return None
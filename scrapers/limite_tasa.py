@@ -0,0 +1,85 @@
+# scrapers/limite_tasa.py - Límite de tasa por host upstream (compartido entre hilos)
+import os
+import time
+import threading
+import logging
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Segundos mínimos entre solicitudes a un mismo host
+INTERVALO_POR_DEFECTO = float(os.getenv("SCRAPER_INTERVALO_MINIMO", "1.0"))
+INTERVALOS_POR_HOST = {
+    "seia.sea.gob.cl": float(os.getenv("SEIA_INTERVALO_MINIMO", "2.0")),
+    "snifa.sma.gob.cl": float(os.getenv("SNIFA_INTERVALO_MINIMO", "2.0")),
+    "www.bcn.cl": float(os.getenv("BCN_INTERVALO_MINIMO", "1.0")),
+}
+
+class LimitadorTasa:
+    """
+    Reparte turnos por host: cada solicitud reserva el siguiente instante libre
+    y duerme fuera del lock, así los hilos que consultan hosts distintos no se bloquean.
+    """
+
+    def __init__(self, intervalo_por_defecto: float = INTERVALO_POR_DEFECTO,
+                 intervalos: Optional[Dict[str, float]] = None):
+        self.intervalo_por_defecto = intervalo_por_defecto
+        self.intervalos = dict(INTERVALOS_POR_HOST if intervalos is None else intervalos)
+        self._proximo_turno: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def intervalo(self, host: str) -> float:
+        return self.intervalos.get(host, self.intervalo_por_defecto)
+
+    def esperar(self, url: str) -> float:
+        """Bloquea hasta que sea el turno del host de la URL. Retorna los segundos esperados"""
+        host = urlparse(url).hostname or url
+
+        with self._lock:
+            ahora = time.monotonic()
+            turno = max(ahora, self._proximo_turno.get(host, 0.0))
+            self._proximo_turno[host] = turno + self.intervalo(host)
+
+        espera = turno - ahora
+        if espera > 0:
+            time.sleep(espera)
+        return espera
+
+class LimitadorCompartido(LimitadorTasa):
+    """
+    Misma política, con los turnos en un dict de multiprocessing.Manager: lo comparten
+    los procesos de un pool, así N procesos no multiplican por N la tasa contra cada host.
+    """
+
+    def __init__(self, turnos, lock, intervalo_por_defecto: float = INTERVALO_POR_DEFECTO,
+                 intervalos: Optional[Dict[str, float]] = None):
+        super().__init__(intervalo_por_defecto, intervalos)
+        self._proximo_turno = turnos
+        self._lock = lock
+
+    def esperar(self, url: str) -> float:
+        host = urlparse(url).hostname or url
+
+        # time.time() y no monotonic: el reloj se compara entre procesos
+        with self._lock:
+            ahora = time.time()
+            turno = max(ahora, self._proximo_turno.get(host, 0.0))
+            self._proximo_turno[host] = turno + self.intervalo(host)
+
+        espera = turno - ahora
+        if espera > 0:
+            time.sleep(espera)
+        return espera
+
+# Instancia del proceso, usada por todos los scrapers
+limitador = LimitadorTasa()
+
+def usar_limitador_compartido(turnos, lock) -> None:
+    """Reemplaza el limitador del proceso (initializer de un pool de procesos)"""
+    global limitador
+    limitador = LimitadorCompartido(turnos, lock)
+
+def esperar_turno(url: str) -> float:
+    """Espera el turno del host de la URL en el limitador del proceso"""
+    return limitador.esperar(url)
@@ -0,0 +1,217 @@
+# scrapers/orquestador_sync.py - Sincronización masiva de empresas (SEIA + SNIFA)
+import json
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+WORKERS_POR_DEFECTO = 4
+REINTENTOS_POR_DEFECTO = 3
+ESPERA_BASE_REINTENTO = 5.0  # segundos; se duplica en cada reintento
+
+def cargar_empresas_desde_archivo(ruta: str) -> List[str]:
+    """Lee una empresa por línea. Ignora líneas vacías, comentarios (#) y duplicados"""
+    with open(ruta, encoding='utf-8') as archivo:
+        lineas = (linea.strip() for linea in archivo)
+        return list(dict.fromkeys(l for l in lineas if l and not l.startswith('#')))
+
+def cargar_empresas_desde_db() -> List[str]:
+    """Retorna los nombres de todas las empresas registradas"""
+    from config.database import sesion_db
+    from models.models import Empresa
+
+    with sesion_db() as db:
+        return [nombre for (nombre,) in db.query(Empresa.nombre).order_by(Empresa.nombre).all()]
+
+def _con_reintentos(funcion: Callable, reintentos: int, descripcion: str, errores: List[str]):
+    """Ejecuta la función reintentando con espera exponencial. Retorna None si agota los intentos"""
+    for intento in range(1, reintentos + 1):
+        try:
+            return funcion()
+        except Exception as e:
+            errores.append(f"{descripcion} (intento {intento}/{reintentos}): {e}")
+            logger.warning(f"⚠️ {descripcion} falló (intento {intento}/{reintentos}): {e}")
+            if intento < reintentos:
+                time.sleep(ESPERA_BASE_REINTENTO * 2 ** (intento - 1))
+    return None
+
+def sincronizar_empresa(nombre_empresa: str, reintentos: int = REINTENTOS_POR_DEFECTO) -> Dict:
+    """Sincroniza proyectos y sanciones de una empresa con su propia sesión de base de datos"""
+    from config.database import sesion_db
+    from scrapers.seia_scraper import sincronizar_proyectos_por_empresa
+    from scrapers.snifa_scraper import sincronizar_sanciones_por_empresa
+    from config.version_datos import marcar_datos_actualizados
+
+    inicio = time.monotonic()
+    resumen = {
+        'empresa': nombre_empresa,
+        'insertados': 0,
+        'actualizados': 0,
+        'errores': [],
+        'completa': True,
+    }
+
+    with sesion_db() as db:
+        for fuente, sincronizar in (('SEIA', sincronizar_proyectos_por_empresa),
+                                    ('SNIFA', sincronizar_sanciones_por_empresa)):
+            resultado = _con_reintentos(
+                lambda: sincronizar(db, nombre_empresa), reintentos,
+                f"{fuente} '{nombre_empresa}'", resumen['errores']
+            )
+            if resultado is None:
+                resumen['completa'] = False
+                continue
+            resumen['insertados'] += resultado.get('insertados', 0)
+            resumen['actualizados'] += resultado.get('actualizados', 0)
+            if resultado.get('insertados') or resultado.get('actualizados'):
+                # Invalida las caches de respuestas en todos los workers de la API
+                marcar_datos_actualizados(fuente.lower())
+
+    resumen['duracion_segundos'] = round(time.monotonic() - inicio, 2)
+    return resumen
+
+def sincronizar_empresas(empresas: List[str], workers: int = WORKERS_POR_DEFECTO,
+                         reintentos: int = REINTENTOS_POR_DEFECTO,
+                         archivo_resumen: Optional[str] = None) -> Dict:
+    """
+    Sincroniza una lista de empresas con un pool acotado de workers.
+    El límite de tasa por host (scrapers.limite_tasa) se comparte entre todos los workers.
+    Retorna (y opcionalmente escribe en JSON) el resumen de la ejecución.
+    """
+    inicio = time.monotonic()
+    total = len(empresas)
+    resultados: List[Dict] = []
+
+    print(f"🚀 Sincronizando {total} empresas con {workers} workers (reintentos: {reintentos})")
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='sync') as pool:
+        futuros = {pool.submit(sincronizar_empresa, empresa, reintentos): empresa for empresa in empresas}
+
+        for futuro in as_completed(futuros):
+            empresa = futuros[futuro]
+            try:
+                resumen = futuro.result()
+            except Exception as e:
+                # Errores fuera de los scrapers (por ejemplo, sin conexión a la base de datos)
+                resumen = {'empresa': empresa, 'insertados': 0, 'actualizados': 0,
+                           'errores': [str(e)], 'completa': False, 'duracion_segundos': 0.0}
+
+            resultados.append(resumen)
+            estado = "✅" if resumen['completa'] else "❌"
+            print(f"{estado} [{len(resultados)}/{total}] {empresa}: "
+                  f"{resumen['insertados']} insertados, {resumen['actualizados']} actualizados, "
+                  f"{len(resumen['errores'])} errores ({resumen['duracion_segundos']}s)")
+
+    resumen_ejecucion = {
+        'empresas': total,
+        'completas': sum(1 for r in resultados if r['completa']),
+        'fallidas': sum(1 for r in resultados if not r['completa']),
+        'insertados': sum(r['insertados'] for r in resultados),
+        'actualizados': sum(r['actualizados'] for r in resultados),
+        'duracion_segundos': round(time.monotonic() - inicio, 2),
+        'detalle': sorted(resultados, key=lambda r: r['empresa']),
+    }
+
+    if archivo_resumen:
+        with open(archivo_resumen, 'w', encoding='utf-8') as archivo:
+            json.dump(resumen_ejecucion, archivo, ensure_ascii=False, indent=2)
+        print(f"📝 Resumen guardado en {archivo_resumen}")
+
+    print(f"🏁 Sincronización finalizada en {resumen_ejecucion['duracion_segundos']}s: "
+          f"{resumen_ejecucion['completas']} completas, {resumen_ejecucion['fallidas']} con errores")
+    return resumen_ejecucion
+
+def _texto_coordenadas(contenido: bytes) -> str:
+    """
+    Texto de los campos etiquetados 'Coordenadas' del expediente (filas de tabla o pares dt/dd).
+    Sin ese campo retorna '': el resto de la página trae montos y superficies que no son coordenadas.
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(contenido, 'html.parser')
+    bloques = []
+    for fila in soup.find_all('tr'):
+        columnas = fila.find_all(['td', 'th'])
+        if len(columnas) >= 2 and 'coordenadas' in columnas[0].get_text(strip=True).lower():
+            bloques.append(' '.join(c.get_text(' ', strip=True) for c in columnas[1:]))
+    for etiqueta in soup.find_all('dt'):
+        valor = etiqueta.find_next_sibling('dd')
+        if valor and 'coordenadas' in etiqueta.get_text(strip=True).lower():
+            bloques.append(valor.get_text(' ', strip=True))
+    return '\n'.join(bloques)
+
+def _descargar_expediente(url: str) -> Optional[str]:
+    """Descarga un expediente respetando el límite de tasa; None si falla"""
+    import requests
+    from scrapers.limite_tasa import esperar_turno
+
+    try:
+        esperar_turno(url)
+        response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=20)
+        response.raise_for_status()
+        return _texto_coordenadas(response.content)
+    except Exception as e:
+        logger.warning(f"⚠️ No se pudo descargar el expediente {url}: {e}")
+        return None
+
+def georreferenciar_proyectos(limite: Optional[int] = None, workers: int = WORKERS_POR_DEFECTO,
+                              lote: int = 200) -> Dict:
+    """
+    Completa latitud/longitud de los proyectos SEIA que aún no las tienen.
+    Descarga los expedientes en paralelo (con el límite de tasa compartido) y convierte
+    todas las coordenadas de cada lote en una sola pasada vectorizada (scrapers.coordenadas).
+    """
+    from config.database import sesion_db
+    from config.version_datos import marcar_datos_actualizados
+    from models.models import ProyectoSEIA
+    from scrapers.coordenadas import extraer_bloques, convertir_bloques, punto_desde_bloques
+
+    inicio = time.monotonic()
+    resumen = {'revisados': 0, 'georreferenciados': 0, 'sin_coordenadas': 0}
+
+    with sesion_db() as db:
+        consulta = (db.query(ProyectoSEIA)
+                    .filter(ProyectoSEIA.latitud.is_(None), ProyectoSEIA.link_expediente.isnot(None))
+                    .order_by(ProyectoSEIA.id))
+        proyectos = consulta.limit(limite).all() if limite else consulta.all()
+        print(f"🗺️ Georreferenciando {len(proyectos)} proyectos con {workers} workers")
+
+        for desde in range(0, len(proyectos), lote):
+            grupo = proyectos[desde:desde + lote]
+            with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='coord') as pool:
+                textos = list(pool.map(_descargar_expediente, [p.link_expediente for p in grupo]))
+
+            # Todos los bloques del lote se convierten juntos; luego se reparten por proyecto
+            bloques, origenes = [], []
+            for indice, texto in enumerate(textos):
+                for bloque in extraer_bloques(texto or ''):
+                    bloques.append(bloque)
+                    origenes.append(indice)
+            convertidos = convertir_bloques(bloques)
+
+            por_proyecto: Dict[int, List[Dict]] = {}
+            for indice, convertido in zip(origenes, convertidos):
+                por_proyecto.setdefault(indice, []).append(convertido)
+
+            for indice, proyecto in enumerate(grupo):
+                resumen['revisados'] += 1
+                punto = punto_desde_bloques(por_proyecto.get(indice, []))
+                if not punto:
+                    resumen['sin_coordenadas'] += 1
+                    continue
+                proyecto.latitud = punto['lat']
+                proyecto.longitud = punto['lng']
+                proyecto.coordenadas_originales = (textos[indice] or '')[:2000]
+                resumen['georreferenciados'] += 1
+            db.commit()
+            print(f"   [{resumen['revisados']}/{len(proyectos)}] {resumen['georreferenciados']} con coordenadas")
+
+    if resumen['georreferenciados']:
+        marcar_datos_actualizados('seia')
+
+    resumen['duracion_segundos'] = round(time.monotonic() - inicio, 2)
+    print(f"🏁 Georreferenciación finalizada en {resumen['duracion_segundos']}s: "
+          f"{resumen['georreferenciados']} proyectos con coordenadas, {resumen['sin_coordenadas']} sin coordenadas")
+    return resumen
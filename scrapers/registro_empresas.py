@@ -0,0 +1,145 @@
+# scrapers/registro_empresas.py - Registro de empresas, alias y RUT
+import re
+import logging
+from contextlib import nullcontext
+from typing import Iterable, Optional
+
+from scrapers.similitud_titular import normalizar_titular
+
+logger = logging.getLogger(__name__)
+
+def normalizar_rut(rut: str) -> str:
+    """
+    Normaliza un RUT chileno al formato '12345678-9'.
+    Retorna cadena vacía si el RUT no es válido (dígito verificador incluido).
+    """
+    if not rut:
+        return ""
+
+    limpio = re.sub(r'[^0-9kK]', '', str(rut)).upper()
+    if len(limpio) < 2:
+        return ""
+
+    cuerpo, dv = limpio[:-1], limpio[-1]
+    if not cuerpo.isdigit() or not 6 <= len(cuerpo) <= 8:
+        return ""
+
+    # Módulo 11
+    suma = 0
+    factor = 2
+    for digito in reversed(cuerpo):
+        suma += int(digito) * factor
+        factor = 2 if factor == 7 else factor + 1
+    resto = 11 - (suma % 11)
+    dv_esperado = '0' if resto == 11 else 'K' if resto == 10 else str(resto)
+
+    return f"{int(cuerpo)}-{dv}" if dv == dv_esperado else ""
+
+def es_rut(texto: str) -> bool:
+    """Indica si el texto ingresado corresponde a un RUT válido"""
+    return bool(texto) and bool(re.fullmatch(r'[\d\.\s]+-?\s*[\dkK]', texto.strip())) and bool(normalizar_rut(texto))
+
+def resolver_empresa(db, nombre_o_rut: str):
+    """Resuelve un nombre o RUT a la empresa canónica con una búsqueda indexada"""
+    from models.models import Empresa, AliasEmpresa
+
+    if es_rut(nombre_o_rut):
+        return db.query(Empresa).filter_by(rut=normalizar_rut(nombre_o_rut)).first()
+
+    alias_normalizado = normalizar_titular(nombre_o_rut)
+    if not alias_normalizado:
+        return None
+
+    alias = db.query(AliasEmpresa).filter_by(alias_normalizado=alias_normalizado).first()
+    return alias.empresa if alias else None
+
+def _agregar_alias(db, empresa, alias: str, fuente: str):
+    """Agrega un alias a la empresa si no está registrado (para ninguna empresa)"""
+    from models.models import AliasEmpresa
+
+    alias_normalizado = normalizar_titular(alias)
+    if not alias_normalizado:
+        return
+
+    existente = db.query(AliasEmpresa).filter_by(alias_normalizado=alias_normalizado).first()
+    if existente:
+        if existente.id_empresa != empresa.id:
+            logger.debug(f"Alias '{alias}' ya pertenece a otra empresa (id {existente.id_empresa})")
+        return
+
+    db.add(AliasEmpresa(id_empresa=empresa.id, alias=alias, alias_normalizado=alias_normalizado, fuente=fuente))
+    db.flush()
+
+def registrar_titular(db, nombre: str, rut: Optional[str] = None,
+                      aliases: Iterable[str] = (), fuente: str = 'seia'):
+    """
+    Registra un titular (y opcionalmente su RUT y alias) en el registro de empresas.
+    Retorna la empresa canónica. No hace commit.
+    """
+    from models.models import Empresa
+
+    rut_normalizado = normalizar_rut(rut) if rut else ""
+    empresa = None
+
+    if rut_normalizado:
+        empresa = db.query(Empresa).filter_by(rut=rut_normalizado).first()
+    if not empresa:
+        empresa = resolver_empresa(db, nombre)
+
+    if not empresa:
+        empresa = Empresa(nombre=nombre.strip()[:255], rut=rut_normalizado or None)
+        db.add(empresa)
+        db.flush()
+        logger.info(f"🏢 Empresa registrada: {empresa.nombre} ({rut_normalizado or 'sin RUT'})")
+    elif rut_normalizado and not empresa.rut:
+        empresa.rut = rut_normalizado
+
+    for alias in [nombre, *aliases]:
+        if alias:
+            _agregar_alias(db, empresa, alias, fuente)
+
+    # Un titular conocido deja de estar en la cache negativa de la búsqueda por titular
+    try:
+        from scrapers.titulares_sin_proyectos import titulares_sin_proyectos
+        titulares_sin_proyectos.descartar([nombre, empresa.nombre, *aliases])
+    except Exception as e:
+        logger.debug(f"Cache negativa no disponible: {e}")
+
+    return empresa
+
+# Funciones seguras para usar desde los scrapers: si la base de datos no está disponible no fallan.
+# Reciben la sesión del llamador si tiene una; si no, abren una propia por llamada.
+
+def _sesion(db=None):
+    if db is not None:
+        return nullcontext(db)
+    from config.database import sesion_db
+    return sesion_db()
+
+def resolver_titular_canonico(nombre_o_rut: str, db=None) -> Optional[str]:
+    """Retorna el nombre canónico del titular registrado, o None si no se conoce"""
+    try:
+        with _sesion(db) as sesion:
+            empresa = resolver_empresa(sesion, nombre_o_rut)
+            return empresa.nombre if empresa else None
+    except Exception as e:
+        logger.debug(f"Registro de empresas no disponible: {e}")
+        return None
+
+def registrar_titular_seguro(nombre: str, rut: Optional[str] = None,
+                             aliases: Iterable[str] = (), fuente: str = 'seia', db=None) -> bool:
+    """Registra un par titular/RUT obtenido del scraping sin propagar errores (hace commit en la sesión)"""
+    if not nombre:
+        return False
+    try:
+        with _sesion(db) as sesion:
+            try:
+                registrar_titular(sesion, nombre, rut, aliases, fuente)
+                sesion.commit()
+                return True
+            except Exception:
+                sesion.rollback()
+                raise
+    except Exception as e:
+        logger.debug(f"No se pudo registrar titular '{nombre}': {e}")
+        return False
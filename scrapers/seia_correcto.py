@@ -1,5 +1,6 @@
 # scrapers/seia_correcto.py - Scraper corregido que funciona con el SEIA real
 import requests
+from config.upstream import SEIA_BASE_URL
 import re
 from typing import Dict, Optional, List
 import logging
@@ -12,7 +13,7 @@ class SEIACorrectScraper:
     """Scraper corregido para obtener información real del SEIA"""
     
     def __init__(self):
-        self.base_url = "https://seia.sea.gob.cl"
+        self.base_url = SEIA_BASE_URL
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -1,5 +1,6 @@
 # scrapers/seia_mejorado.py - Scraper SEIA mejorado para búsquedas específicas
 import requests
+from config.upstream import SEIA_BASE_URL
 from bs4 import BeautifulSoup
 import re
 import time
@@ -101,7 +102,7 @@ def _generar_variaciones_empresa(nombre_empresa: str) -> List[str]:
 def _buscar_con_variacion(variacion: str, nombre_original: str) -> Optional[Dict]:
     """Busca proyectos con una variación específica del nombre"""
     try:
-        base_url = "https://seia.sea.gob.cl"
+        base_url = SEIA_BASE_URL
         search_url = f"{base_url}/busqueda/buscarProyectoAction.php"
         
         # Configurar sesión
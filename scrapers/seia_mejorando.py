@@ -1,5 +1,6 @@
 # scrapers/seia_mejorando.py - Scraper SEIA mejorado para búsquedas específicas
 import requests
+from config.upstream import SEIA_BASE_URL
 from bs4 import BeautifulSoup
 import re
 import time
@@ -12,7 +13,7 @@ class SEIAMejoradoScraper:
     """Scraper SEIA mejorado con búsqueda específica y ubicaciones reales"""
     
     def __init__(self):
-        self.base_url = "https://seia.sea.gob.cl"
+        self.base_url = SEIA_BASE_URL
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -5,6 +5,9 @@ import re
 import time
 from typing import Dict, Optional, List
 from urllib.parse import urljoin
+from scrapers.similitud_titular import IndiceNombres, similitud_titular
+from config.upstream import SEIA_BASE_URL
+from scrapers.coordenadas import coordenadas_desde_texto
 
 class SEIAProjectDetailScraper:
     """
@@ -13,7 +16,7 @@ class SEIAProjectDetailScraper:
     """
     
     def __init__(self):
-        self.base_url = "https://seia.sea.gob.cl"
+        self.base_url = SEIA_BASE_URL
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
@@ -209,6 +212,12 @@ class SEIAProjectDetailScraper:
                     elif 'dirección' in key and 'proyecto' in key:
                         ubicacion['direccion_proyecto'] = value
         
+        # Punto WGS84 a partir de las coordenadas UTM/geográficas del expediente
+        if ubicacion.get('coordenadas'):
+            punto = coordenadas_desde_texto(ubicacion['coordenadas'])
+            if punto:
+                ubicacion['punto'] = punto
+        
         return ubicacion
     
     def _extraer_descripcion_proyecto(self, soup: BeautifulSoup) -> str:
@@ -261,14 +270,10 @@ class SEIAProjectDetailScraper:
         
         # Si se especifica un proyecto, buscar el más similar
         if nombre_proyecto:
-            proyecto_seleccionado = None
-            mejor_coincidencia = 0
-            
-            for proyecto in proyectos:
-                coincidencia = self._calcular_similitud(proyecto['nombre'], nombre_proyecto)
-                if coincidencia > mejor_coincidencia:
-                    mejor_coincidencia = coincidencia
-                    proyecto_seleccionado = proyecto
+            # Puntuar todo el lote de nombres de una vez
+            indice, score = IndiceNombres([p['nombre'] for p in proyectos]).rankear(nombre_proyecto, limite=1)[0]
+            proyecto_seleccionado = proyectos[indice]
+            mejor_coincidencia = score / 100.0
             
             if mejor_coincidencia < 0.3:  # Umbral mínimo de similitud
                 proyecto_seleccionado = proyectos[0]  # Tomar el primero si no hay buena coincidencia
@@ -289,28 +294,9 @@ class SEIAProjectDetailScraper:
     
     def _calcular_similitud(self, texto1: str, texto2: str) -> float:
         """
-        Calcula la similitud entre dos textos (simple)
+        Calcula la similitud entre dos textos (token-set ratio normalizado, 0-1)
         """
-        texto1 = texto1.lower().strip()
-        texto2 = texto2.lower().strip()
-        
-        if texto1 == texto2:
-            return 1.0
-        
-        if texto2 in texto1 or texto1 in texto2:
-            return 0.8
-        
-        # Similitud basada en palabras comunes
-        palabras1 = set(texto1.split())
-        palabras2 = set(texto2.split())
-        
-        interseccion = palabras1.intersection(palabras2)
-        union = palabras1.union(palabras2)
-        
-        if len(union) == 0:
-            return 0.0
-        
-        return len(interseccion) / len(union)
+        return similitud_titular(texto1, texto2)
 
 # Función de conveniencia para usar desde el main
 def obtener_informacion_proyecto_seia(nombre_empresa: str, nombre_proyecto: str = None) -> Dict:
@@ -1,5 +1,6 @@
 # scrapers/seia_real.py - Scraper real para SEIA que obtiene información verdadera
 import requests
+from config.upstream import SEIA_BASE_URL
 import re
 from typing import Dict, Optional, List
 import logging
@@ -11,7 +12,7 @@ class SEIARealScraper:
     """Scraper real para obtener información del SEIA"""
     
     def __init__(self):
-        self.base_url = "https://seia.sea.gob.cl"
+        self.base_url = SEIA_BASE_URL
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -174,9 +174,10 @@ def obtener_informacion_proyecto_seia_safe(nombre_empresa: str) -> Dict:
         try:
             import requests
             from bs4 import BeautifulSoup
+            from config.upstream import SEIA_BASE_URL, SEIA_BUSQUEDA_URL
             
             # URL de búsqueda del SEIA
-            url_busqueda = "https://seia.sea.gob.cl/busqueda/buscarProyectoAction.php"
+            url_busqueda = SEIA_BUSQUEDA_URL
             
             # Payload para la búsqueda
             payload = {
@@ -210,7 +211,7 @@ def obtener_informacion_proyecto_seia_safe(nombre_empresa: str) -> Dict:
                         if len(cols) >= 6:
                             # Buscar link del expediente
                             link_elem = cols[0].find('a', href=True)
-                            link_expediente = f"https://seia.sea.gob.cl{link_elem['href']}" if link_elem else 'https://seia.sea.gob.cl/'
+                            link_expediente = f"{SEIA_BASE_URL}{link_elem['href']}" if link_elem else f"{SEIA_BASE_URL}/"
                             
                             proyecto_info = {
                                 'nombre': cols[0].get_text(strip=True),
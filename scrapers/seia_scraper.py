@@ -1,34 +1,58 @@
 # scrapers/seia_scraper.py - VERSIÓN FINAL Y COMPLETA
 import requests
 from bs4 import BeautifulSoup
-import time
 from sqlalchemy.orm import Session
 from models.models import Empresa, ProyectoSEIA
+from scrapers.registro_empresas import registrar_titular, resolver_empresa
+from engine.resumen_empresas import actualizar_resumen_empresa
+from scrapers.limite_tasa import esperar_turno
+from config.upstream import SEIA_BASE_URL, SEIA_BUSQUEDA_URL
 from urllib.parse import urljoin
 import datetime
 
 # Constantes del Scraper
-BUSQUEDA_PROYECTO_URL = "https://seia.sea.gob.cl/busqueda/buscarProyectoAction.php"
-BASE_SEIA_URL = "https://seia.sea.gob.cl"
+BUSQUEDA_PROYECTO_URL = SEIA_BUSQUEDA_URL
+BASE_SEIA_URL = SEIA_BASE_URL
 
-def sincronizar_proyectos_por_empresa(db: Session, nombre_empresa: str):
+# Campos que se actualizan cuando el proyecto ya existe en la base de datos
+CAMPOS_ACTUALIZABLES = ('nombre', 'tipo', 'region', 'tipologia', 'estado', 'link_expediente', 'fecha_presentacion')
+
+def sincronizar_proyectos_por_empresa(db: Session, nombre_empresa: str) -> dict:
     """
     Busca TODOS los proyectos de una empresa en el SEIA, navegando por todas las páginas de resultados
     y evitando duplicados tanto en la sesión actual como en la base de datos.
+    Los proyectos existentes se actualizan si cambiaron.
+    Retorna {'insertados': n, 'actualizados': n}. Los errores HTTP y de base de datos se propagan.
     """
+    resultado = {'insertados': 0, 'actualizados': 0}
     headers = {"User-Agent": "Mozilla/5.0"}
     payload = {"nombre_empresa_o_titular": nombre_empresa, "submit_buscar": "Buscar"}
     
     codigos_procesados_en_esta_sesion = set()
     
+    # Empresa canónica de cada titular de la tabla: se registra el titular del proyecto, no el término buscado
+    empresas_por_titular = {}
+    empresas_sincronizadas = set()
+
+    def empresa_del_proyecto(titular):
+        if titular not in empresas_por_titular:
+            if titular:
+                empresas_por_titular[titular] = registrar_titular(db, titular, fuente='sincronizacion')
+            else:
+                # Tabla sin columna de titular: solo se asocia si el término ya es una empresa conocida
+                empresas_por_titular[titular] = resolver_empresa(db, nombre_empresa)
+        return empresas_por_titular[titular]
+    
     print(f"Buscando proyectos para '{nombre_empresa}' en SEIA (Página 1)...")
     
     try:
+        esperar_turno(BUSQUEDA_PROYECTO_URL)
         response = requests.post(BUSQUEDA_PROYECTO_URL, data=payload, headers=headers, timeout=30)
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
         print(f"Error al realizar la búsqueda inicial en SEIA: {e}")
-        return
+        db.rollback()
+        raise
 
     current_page_soup = BeautifulSoup(response.content, 'html.parser')
     page_count = 1
@@ -61,21 +85,19 @@ def sincronizar_proyectos_por_empresa(db: Session, nombre_empresa: str):
             if codigo_expediente in codigos_procesados_en_esta_sesion:
                 continue
 
-            proyecto_existente = db.query(ProyectoSEIA).filter_by(codigo_expediente=codigo_expediente).first()
-            if proyecto_existente:
-                print(f"  -> Proyecto {codigo_expediente} ya existe en la DB. Saltando.")
-                continue
-
             link_expediente_raw = columns[0].find('a', href=True)
             link_expediente = urljoin(BASE_SEIA_URL, link_expediente_raw['href']) if link_expediente_raw else None
+            empresa = empresa_del_proyecto(columns[6].get_text(strip=True) if len(columns) > 6 else '')
+            id_empresa = empresa.id if empresa else None
+            if id_empresa:
+                empresas_sincronizadas.add(id_empresa)
 
             try:
                 fecha_presentacion_obj = datetime.datetime.strptime(columns[3].get_text(strip=True), '%d/%m/%Y').date()
             except (ValueError, IndexError):
                 fecha_presentacion_obj = None
 
-            nuevo_proyecto = ProyectoSEIA(
-                codigo_expediente=codigo_expediente,
+            datos = dict(
                 nombre=columns[0].get_text(strip=True),
                 tipo=columns[2].get_text(strip=True),
                 region=columns[1].get_text(strip=True),
@@ -84,10 +106,25 @@ def sincronizar_proyectos_por_empresa(db: Session, nombre_empresa: str):
                 link_expediente=link_expediente,
                 fecha_presentacion=fecha_presentacion_obj
             )
+            codigos_procesados_en_esta_sesion.add(codigo_expediente)
+
+            proyecto_existente = db.query(ProyectoSEIA).filter_by(codigo_expediente=codigo_expediente).first()
+            if proyecto_existente:
+                cambios = [c for c in CAMPOS_ACTUALIZABLES if getattr(proyecto_existente, c) != datos[c]]
+                for campo in cambios:
+                    setattr(proyecto_existente, campo, datos[campo])
+                if proyecto_existente.id_empresa is None and id_empresa:
+                    proyecto_existente.id_empresa = id_empresa
+                    cambios.append('id_empresa')
+                if cambios:
+                    print(f"  -> Proyecto {codigo_expediente} actualizado ({', '.join(cambios)}).")
+                    resultado['actualizados'] += 1
+                continue
+
+            nuevo_proyecto = ProyectoSEIA(id_empresa=id_empresa, codigo_expediente=codigo_expediente, **datos)
             print(f"  -> Nuevo proyecto encontrado: {codigo_expediente}. Preparando para agregar.")
             db.add(nuevo_proyecto)
-            
-            codigos_procesados_en_esta_sesion.add(codigo_expediente)
+            resultado['insertados'] += 1
 
         # Búsqueda robusta para el enlace "Siguiente"
         next_page_link = None
@@ -100,23 +137,31 @@ def sincronizar_proyectos_por_empresa(db: Session, nombre_empresa: str):
             next_page_url = urljoin(BASE_SEIA_URL, next_page_link['href'])
             print(f"Enlace 'Siguiente' encontrado. Navegando a la página {page_count + 1}")
             page_count += 1
-            time.sleep(2) 
             
             try:
+                esperar_turno(next_page_url)
                 response = requests.get(next_page_url, headers=headers, timeout=30)
                 response.raise_for_status()
                 current_page_soup = BeautifulSoup(response.content, 'html.parser')
             except requests.exceptions.RequestException as e:
+                # La sincronización es idempotente: se descarta y el orquestador la reintenta completa
                 print(f"Error al navegar a la siguiente página: {e}")
-                break
+                db.rollback()
+                raise
         else:
             print("No se encontraron más páginas. Finalizando paginación.")
             break
 
     try:
         print("Guardando todos los nuevos proyectos encontrados en la base de datos...")
+        db.flush()
+        for id_empresa in empresas_sincronizadas:
+            actualizar_resumen_empresa(db, id_empresa)
         db.commit()
         print(f"Sincronización para '{nombre_empresa}' completada.")
     except Exception as e:
         print(f"Error al guardar en la base de datos: {e}")
         db.rollback()
+        raise
+
+    return resultado
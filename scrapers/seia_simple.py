@@ -1,5 +1,6 @@
 # scrapers/seia_simple.py - Versión simplificada del scraper SEIA
 import requests
+from config.upstream import SEIA_BASE_URL, SEIA_BUSQUEDA_URL
 import re
 from typing import Dict, Optional
 
@@ -19,7 +20,7 @@ def obtener_informacion_proyecto_seia_simple(nombre_empresa: str) -> Dict:
             }
         
         # URL de búsqueda del SEIA
-        url_busqueda = "https://seia.sea.gob.cl/busqueda/buscarProyectoAction.php"
+        url_busqueda = SEIA_BUSQUEDA_URL
         
         # Payload para la búsqueda
         payload = {
@@ -85,7 +86,7 @@ def obtener_informacion_proyecto_seia_simple(nombre_empresa: str) -> Dict:
         # Buscar link del expediente
         link_elem = cols[0].find('a', href=True)
         if link_elem:
-            proyecto_info['link_expediente'] = f"https://seia.sea.gob.cl{link_elem['href']}"
+            proyecto_info['link_expediente'] = f"{SEIA_BASE_URL}{link_elem['href']}"
         
         # Información básica del titular (empresa)
         titular_info = {
@@ -1,17 +1,36 @@
 # scrapers/seia_titular.py - Scraper que busca por titular específico
 import requests
 import re
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Dict, Optional, List
 import logging
 from urllib.parse import urljoin
+from scrapers.cache_ttl import CacheTTL
+from scrapers.similitud_titular import rankear_proyectos_por_titular, normalizar_titular
+from scrapers.registro_empresas import resolver_titular_canonico, registrar_titular_seguro
+from scrapers.titulares_sin_proyectos import titulares_sin_proyectos
+from config.upstream import SEIA_BASE_URL
+from scrapers.limite_tasa import esperar_turno
+from scrapers.coordenadas import coordenadas_desde_texto
 
 logger = logging.getLogger(__name__)
 
 class SEIATitularScraper:
     """Scraper que busca específicamente por titular en el SEIA"""
     
-    def __init__(self):
-        self.base_url = "https://seia.sea.gob.cl"
+    # Máximo de proyectos retornados tras el ranking
+    MAX_PROYECTOS_RANKING = 30
+    
+    def __init__(self, respetar_limite: bool = False, db=None):
+        self.base_url = SEIA_BASE_URL
+        # Sesión del llamador para el registro de empresas (None: una sesión por consulta)
+        self.db = db
+        # En procesos masivos (lotes, CLI) cada solicitud espera su turno en scrapers.limite_tasa
+        self.respetar_limite = respetar_limite
+        # Variaciones cuyo "sin resultados" no quedó confirmado por el SEIA (error de red o de parseo)
+        self.variaciones_sin_confirmar = 0
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -35,31 +54,33 @@ class SEIATitularScraper:
         try:
             logger.info(f"🔍 Buscando proyectos por titular: {nombre_empresa}")
             
-            # Generar variaciones del nombre para búsqueda más efectiva
-            variaciones_titular = self._generar_variaciones_titular(nombre_empresa)
-            
             todos_proyectos = []
+            self.variaciones_sin_confirmar = 0
+            
+            # Si el titular (o RUT) está en el registro de empresas basta una consulta exacta
+            titular_canonico = resolver_titular_canonico(nombre_empresa, self.db)
+            if titular_canonico:
+                logger.info(f"🏢 Titular registrado: '{nombre_empresa}' -> '{titular_canonico}'")
+                variaciones_titular = [titular_canonico]
+                todos_proyectos = self._buscar_variaciones(variaciones_titular)
             
-            # Buscar con cada variación
-            for variacion in variaciones_titular:
-                logger.info(f"📋 Probando búsqueda con: {variacion}")
-                proyectos = self._buscar_con_variacion(variacion)
-                if proyectos:
-                    logger.info(f"✅ Encontrados {len(proyectos)} proyectos con '{variacion}'")
-                    todos_proyectos.extend(proyectos)
-                else:
-                    logger.info(f"⚠️ Sin proyectos encontrados con '{variacion}'")
+            if not todos_proyectos:
+                # Generar variaciones del nombre para búsqueda más efectiva
+                variaciones_titular = self._generar_variaciones_titular(nombre_empresa)
+                todos_proyectos = self._buscar_variaciones(variaciones_titular)
             
             if not todos_proyectos:
                 return {
                     'success': False,
                     'error': f'No se encontraron proyectos para el titular: {nombre_empresa}',
-                    'variaciones_probadas': variaciones_titular
+                    'variaciones_probadas': variaciones_titular,
+                    # Solo una búsqueda en que el SEIA respondió "0 proyectos" a todo va a la cache negativa
+                    'busqueda_completa': self.variaciones_sin_confirmar == 0
                 }
             
             # Filtrar proyectos únicos y relevantes
             logger.info(f"🔍 Filtrando {len(todos_proyectos)} proyectos encontrados para '{nombre_empresa}'")
-            proyectos_filtrados = self._filtrar_proyectos_por_titular(todos_proyectos, nombre_empresa)
+            proyectos_filtrados = self._filtrar_proyectos_por_titular(todos_proyectos, nombre_empresa, variaciones_titular)
             logger.info(f"📊 Proyectos después del filtrado: {len(proyectos_filtrados)}")
             
             if not proyectos_filtrados:
@@ -156,6 +177,21 @@ class SEIATitularScraper:
         
         return variaciones_unicas
     
+    def _buscar_variaciones(self, variaciones: List[str]) -> List[Dict]:
+        """Busca con cada variación del titular y acumula los proyectos encontrados"""
+        todos_proyectos = []
+        
+        for variacion in variaciones:
+            logger.info(f"📋 Probando búsqueda con: {variacion}")
+            proyectos = self._buscar_con_variacion(variacion)
+            if proyectos:
+                logger.info(f"✅ Encontrados {len(proyectos)} proyectos con '{variacion}'")
+                todos_proyectos.extend(proyectos)
+            else:
+                logger.info(f"⚠️ Sin proyectos encontrados con '{variacion}'")
+        
+        return todos_proyectos
+    
     def _buscar_con_variacion(self, titular: str) -> List[Dict]:
         """Busca proyectos con una variación específica del titular"""
         try:
@@ -171,6 +207,8 @@ class SEIATitularScraper:
             }
             
             # Realizar búsqueda
+            if self.respetar_limite:
+                esperar_turno(search_url)
             response = self.session.post(search_url, data=search_data, timeout=30)
             response.raise_for_status()
             
@@ -182,6 +220,7 @@ class SEIATitularScraper:
             
             # Buscar número de proyectos encontrados
             proyectos_encontrados = 0
+            match = None
             if 'Proyectos encontrados:' in page_text:
                 match = re.search(r'Proyectos encontrados:\s*(\d+)', page_text)
                 if match:
@@ -189,6 +228,8 @@ class SEIATitularScraper:
                     logger.info(f"📊 Proyectos encontrados para '{titular}': {proyectos_encontrados}")
             
             if proyectos_encontrados == 0:
+                if not match:
+                    self.variaciones_sin_confirmar += 1
                 return []
             
             # Buscar la tabla de resultados
@@ -206,6 +247,7 @@ class SEIATitularScraper:
                         break
             
             if not data_table:
+                self.variaciones_sin_confirmar += 1
                 return []
             
             # Extraer proyectos de la tabla
@@ -214,6 +256,7 @@ class SEIATitularScraper:
             
         except Exception as e:
             logger.warning(f"⚠️ Error al buscar con '{titular}': {e}")
+            self.variaciones_sin_confirmar += 1
             return []
     
     def _extraer_proyectos_de_tabla(self, table, titular_buscado: str) -> List[Dict]:
@@ -290,138 +333,30 @@ class SEIATitularScraper:
             logger.error(f"❌ Error al extraer proyectos: {e}")
             return []
     
-    def _filtrar_proyectos_por_titular(self, proyectos: List[Dict], empresa_buscada: str) -> List[Dict]:
-        """Filtra proyectos que realmente pertenezcan al titular buscado"""
-        empresa_lower = empresa_buscada.lower()
-        proyectos_filtrados = []
-        
-        # Palabras clave para filtrado más preciso
-        palabras_clave = self._generar_palabras_clave(empresa_buscada)
-        
+    def _filtrar_proyectos_por_titular(self, proyectos: List[Dict], empresa_buscada: str,
+                                       consultas: Optional[List[str]] = None) -> List[Dict]:
+        """Rankea los proyectos por similitud de su titular con el titular buscado"""
+        # Eliminar proyectos repetidos entre variaciones
+        proyectos_unicos = []
+        vistos = set()
         for proyecto in proyectos:
-            titular = proyecto.get('titular', '').lower()
-            nombre_proyecto = proyecto.get('nombre', '').lower()
-            
-            # Verificar coincidencias con palabras clave
-            coincidencia_encontrada = False
-            mejor_score = 0
-            mejor_palabra = ""
-            
-            for palabra in palabras_clave:
-                if (palabra in titular or palabra in nombre_proyecto):
-                    score = self._calcular_score_relevancia(titular, nombre_proyecto, palabra)
-                    if score > mejor_score:
-                        mejor_score = score
-                        mejor_palabra = palabra
-                        coincidencia_encontrada = True
-            
-            # Si no hay coincidencia exacta, usar criterio más flexible
-            if not coincidencia_encontrada:
-                # Buscar coincidencias parciales
-                for palabra in palabras_clave:
-                    palabras_titular = titular.split()
-                    for palabra_titular in palabras_titular:
-                        if (len(palabra_titular) > 3 and palabra_titular in palabra) or \
-                           (len(palabra) > 3 and palabra in palabra_titular):
-                            score = self._calcular_score_relevancia(titular, nombre_proyecto, palabra) * 0.7
-                            if score > mejor_score:
-                                mejor_score = score
-                                mejor_palabra = f"{palabra} (parcial)"
-                                coincidencia_encontrada = True
-            
-            if coincidencia_encontrada:
-                proyecto['coincidencia'] = mejor_palabra
-                proyecto['score_relevancia'] = mejor_score
-                proyectos_filtrados.append(proyecto)
-                logger.info(f"✅ Coincidencia '{mejor_palabra}': {proyecto.get('nombre', 'N/A')} - {titular}")
-            else:
-                # Si aún no hay coincidencia, incluir todos los proyectos con score bajo
-                proyecto['coincidencia'] = "búsqueda general"
-                proyecto['score_relevancia'] = 1.0
-                proyectos_filtrados.append(proyecto)
-                logger.debug(f"⚠️ Incluido sin coincidencia específica: {proyecto.get('nombre', 'N/A')} - {titular}")
+            clave = proyecto.get('link_expediente') or (proyecto.get('nombre', ''), proyecto.get('titular', ''))
+            if clave not in vistos:
+                vistos.add(clave)
+                proyectos_unicos.append(proyecto)
         
-        # Ordenar por score de relevancia
-        proyectos_filtrados.sort(key=lambda x: x.get('score_relevancia', 0), reverse=True)
+        # Las variaciones conocidas (ej. Codelco -> Corporación Nacional del Cobre) se usan como consultas
+        consultas = [*(consultas or []), *self._generar_variaciones_titular(empresa_buscada)]
+        proyectos_filtrados = rankear_proyectos_por_titular(
+            proyectos_unicos, consultas, limite=self.MAX_PROYECTOS_RANKING
+        )
         
-        return proyectos_filtrados
-    
-    def _generar_palabras_clave(self, empresa: str) -> List[str]:
-        """Genera palabras clave para filtrado más preciso"""
-        empresa_lower = empresa.lower()
-        palabras = [empresa_lower]
-        
-        # Agregar palabras individuales de la empresa
-        palabras_empresa = empresa_lower.split()
-        for palabra in palabras_empresa:
-            if len(palabra) > 2:  # Solo palabras de más de 2 caracteres
-                palabras.append(palabra)
+        # IDs estables según la posición en el ranking
+        for i, proyecto in enumerate(proyectos_filtrados, 1):
+            proyecto['id_proyecto'] = i
+            logger.debug(f"📊 {proyecto['score_relevancia']:.1f} '{proyecto['coincidencia']}': {proyecto.get('nombre', 'N/A')}")
         
-        if 'candelaria' in empresa_lower:
-            palabras.extend([
-                'candelaria', 
-                'contractual minera candelaria', 
-                'compañía contractual minera candelaria',
-                'compania contractual minera candelaria',
-                'minera candelaria',
-                'contractual',
-                'minera'
-            ])
-        elif 'codelco' in empresa_lower:
-            palabras.extend([
-                'codelco', 
-                'corporación nacional del cobre',
-                'corporacion nacional del cobre',
-                'nacional del cobre',
-                'cobre'
-            ])
-        elif 'antofagasta' in empresa_lower:
-            palabras.extend([
-                'antofagasta', 
-                'antofagasta minerals',
-                'minerals',
-                'minera antofagasta'
-            ])
-        elif 'escondida' in empresa_lower:
-            palabras.extend([
-                'escondida', 
-                'minera escondida',
-                'bhp escondida'
-            ])
-        elif 'bhp' in empresa_lower:
-            palabras.extend([
-                'bhp', 
-                'bhp billiton',
-                'billiton'
-            ])
-        
-        # Eliminar duplicados manteniendo orden
-        palabras_unicas = []
-        for palabra in palabras:
-            if palabra not in palabras_unicas and len(palabra) > 2:
-                palabras_unicas.append(palabra)
-        
-        return palabras_unicas
-    
-    def _calcular_score_relevancia(self, titular: str, nombre_proyecto: str, palabra_clave: str) -> float:
-        """Calcula un score de relevancia para ordenar resultados"""
-        score = 0.0
-        
-        # Mayor score si la palabra está en el titular
-        if palabra_clave in titular:
-            score += 10.0
-            # Score adicional si es coincidencia exacta
-            if titular.strip().lower() == palabra_clave:
-                score += 20.0
-        
-        # Score menor si está en el nombre del proyecto
-        if palabra_clave in nombre_proyecto:
-            score += 5.0
-        
-        # Score adicional por longitud de coincidencia
-        score += len(palabra_clave) * 0.1
-        
-        return score
+        return proyectos_filtrados
     
     def obtener_detalles_proyecto(self, proyecto: Dict) -> Dict:
         """Obtiene detalles adicionales de un proyecto específico"""
@@ -434,6 +369,8 @@ class SEIATitularScraper:
             
             logger.info(f"🔍 Obteniendo detalles de: {proyecto.get('nombre', 'N/A')}")
             
+            if self.respetar_limite:
+                esperar_turno(link_expediente)
             response = self.session.get(link_expediente, timeout=20)
             response.raise_for_status()
             
@@ -472,6 +409,15 @@ class SEIATitularScraper:
                                     detalles_adicionales['comuna'] = value
                                 elif 'provincia' in key:
                                     detalles_adicionales['provincia'] = value
+                            elif 'coordenadas' in key:
+                                detalles_adicionales['coordenadas'] = value
+            
+            # Coordenadas del expediente convertidas a WGS84
+            if detalles_adicionales.get('coordenadas'):
+                punto = coordenadas_desde_texto(detalles_adicionales['coordenadas'])
+                if punto:
+                    detalles_adicionales['latitud'] = punto['lat']
+                    detalles_adicionales['longitud'] = punto['lng']
             
             # Buscar patrones en texto libre
             text_content = soup.get_text()
@@ -496,24 +442,117 @@ class SEIATitularScraper:
             
         except Exception as e:
             logger.warning(f"⚠️ No se pudieron obtener detalles adicionales: {e}")
-            return proyecto
+            # Marca el fallo para no cachearlo y para que el lote lo reintente
+            return {**proyecto, 'error_detalles': str(e)}
+
+# --- Precarga especulativa: mientras el usuario elige un proyecto de la lista, el servidor ya
+# obtiene el detalle de los mejor rankeados. La búsqueda y los detalles quedan en caches cortas, y
+# /seleccionar_proyecto espera la precarga en vuelo en vez de repetir la descarga.
+# Ambas caches viven en la memoria de cada proceso: con varios workers de gunicorn cada uno tiene
+# las suyas, y la selección solo aprovecha la precarga si cae en el mismo worker que /consulta.
+
+PRECARGA_TOP_K = int(os.getenv("PRECARGA_TOP_K", "3"))
+PRECARGA_CONCURRENCIA = int(os.getenv("PRECARGA_CONCURRENCIA", "2"))
+PRECARGA_ESPERA_MAXIMA = 30  # segundos que la selección espera una precarga en vuelo
+
+cache_busquedas = CacheTTL(ttl_segundos=int(os.getenv("PRECARGA_TTL_BUSQUEDA", "300")), max_entradas=256)
+cache_detalles = CacheTTL(ttl_segundos=int(os.getenv("PRECARGA_TTL_DETALLE", "600")), max_entradas=1024)
+
+_ejecutor_precarga = ThreadPoolExecutor(max_workers=max(1, PRECARGA_CONCURRENCIA), thread_name_prefix="precarga")
+_en_vuelo: Dict[str, Future] = {}
+_lock_en_vuelo = threading.Lock()
+
+def _guardar_detalle(clave: str, detalle: Dict) -> None:
+    """Solo cachea detalles descargados: un fallo se reintenta en la próxima selección"""
+    if 'error_detalles' not in detalle:
+        cache_detalles.guardar(clave, detalle)
+
+def _descargar_detalle(proyecto: Dict) -> Dict:
+    clave = proyecto['link_expediente']
+    try:
+        # Es tráfico especulativo: respeta el límite de tasa por host
+        detalle = SEIATitularScraper(respetar_limite=True).obtener_detalles_proyecto(proyecto)
+        _guardar_detalle(clave, detalle)
+        return detalle
+    finally:
+        with _lock_en_vuelo:
+            _en_vuelo.pop(clave, None)
+
+def precargar_detalles(proyectos: List[Dict], k: int = PRECARGA_TOP_K) -> int:
+    """Encola el detalle de los k proyectos con mayor score_relevancia. Retorna cuántos encoló"""
+    candidatos = sorted((p for p in proyectos if p.get('link_expediente')),
+                        key=lambda p: p.get('score_relevancia', 0), reverse=True)[:k]
+    encolados = 0
+    for proyecto in candidatos:
+        clave = proyecto['link_expediente']
+        with _lock_en_vuelo:
+            if clave in _en_vuelo or cache_detalles.obtener(clave) is not None:
+                continue
+            _en_vuelo[clave] = _ejecutor_precarga.submit(_descargar_detalle, dict(proyecto))
+            encolados += 1
+    if encolados:
+        logger.info(f"⏩ Precargando el detalle de {encolados} proyectos")
+    return encolados
+
+def obtener_detalles_con_cache(scraper: 'SEIATitularScraper', proyecto: Dict) -> Dict:
+    """Detalle desde la cache, desde la precarga en vuelo o, si no hay, descargado ahora"""
+    clave = proyecto.get('link_expediente')
+    if not clave:
+        return scraper.obtener_detalles_proyecto(proyecto)
+    detalle = cache_detalles.obtener(clave)
+    if detalle is not None:
+        logger.info(f"⚡ Detalle precargado: {proyecto.get('nombre', 'N/A')}")
+        return detalle
+    with _lock_en_vuelo:
+        futuro = _en_vuelo.get(clave)
+    if futuro is not None:
+        try:
+            detalle = futuro.result(timeout=PRECARGA_ESPERA_MAXIMA)
+            if 'error_detalles' not in detalle:
+                return detalle
+            logger.warning(f"⚠️ Precarga fallida, descargando de nuevo: {detalle['error_detalles']}")
+        except Exception as e:
+            logger.warning(f"⚠️ Precarga fallida, descargando de nuevo: {e}")
+    detalle = scraper.obtener_detalles_proyecto(proyecto)
+    _guardar_detalle(clave, detalle)
+    return detalle
+
+def _clave_busqueda(nombre_empresa: str) -> str:
+    return normalizar_titular(nombre_empresa) or nombre_empresa.strip().casefold()
 
 # Función principal para usar desde main.py
-def buscar_proyectos_por_titular(nombre_empresa: str) -> Dict:
+def buscar_proyectos_por_titular(nombre_empresa: str, respetar_limite: bool = False, db=None) -> Dict:
     """
     Función principal para buscar proyectos por titular específico
     """
-    scraper = SEIATitularScraper()
-    return scraper.buscar_por_titular(nombre_empresa)
+    # Titular ya confirmado sin proyectos: se rechaza sin volver a probar cada variación
+    if titulares_sin_proyectos.sin_proyectos(nombre_empresa):
+        logger.info(f"🚫 '{nombre_empresa}' sin proyectos en el SEIA (cache negativa)")
+        return {
+            'success': False,
+            'error': f'No se encontraron proyectos para el titular: {nombre_empresa}',
+            'cache_negativa': True
+        }
 
-def obtener_proyecto_seleccionado(nombre_empresa: str, id_proyecto: int) -> Dict:
+    scraper = SEIATitularScraper(respetar_limite=respetar_limite, db=db)
+    resultado = scraper.buscar_por_titular(nombre_empresa)
+    # La selección posterior reutiliza la misma lista (y los mismos id_proyecto)
+    if resultado.get('success'):
+        cache_busquedas.guardar(_clave_busqueda(nombre_empresa), resultado)
+    elif resultado.get('busqueda_completa'):
+        titulares_sin_proyectos.registrar(nombre_empresa)
+    return resultado
+
+def obtener_proyecto_seleccionado(nombre_empresa: str, id_proyecto: int, db=None) -> Dict:
     """
     Obtiene un proyecto específico seleccionado por el usuario
     """
-    scraper = SEIATitularScraper()
+    scraper = SEIATitularScraper(db=db)
     
-    # Primero buscar todos los proyectos
-    resultado_busqueda = scraper.buscar_por_titular(nombre_empresa)
+    # Primero buscar todos los proyectos (la búsqueda de /consulta suele estar en cache)
+    resultado_busqueda = cache_busquedas.obtener(_clave_busqueda(nombre_empresa))
+    if resultado_busqueda is None:
+        resultado_busqueda = buscar_proyectos_por_titular(nombre_empresa, db=db)
     
     if not resultado_busqueda.get('success'):
         return resultado_busqueda
@@ -534,7 +573,16 @@ def obtener_proyecto_seleccionado(nombre_empresa: str, id_proyecto: int) -> Dict
         }
     
     # Obtener detalles completos del proyecto
-    proyecto_completo = scraper.obtener_detalles_proyecto(proyecto_seleccionado)
+    proyecto_completo = obtener_detalles_con_cache(scraper, proyecto_seleccionado)
+    
+    # Registrar el par titular/RUT para resolver el nombre canónico en próximas búsquedas
+    if proyecto_completo.get('titular') and proyecto_completo.get('rut'):
+        registrar_titular_seguro(
+            proyecto_completo['titular'],
+            proyecto_completo['rut'],
+            aliases=[proyecto_completo.get('razon_social_completa', '')],
+            db=db
+        )
     
     return {
         'success': True,
@@ -0,0 +1,172 @@
+# scrapers/similitud_titular.py - Ranking de candidatos por similitud de titular
+import re
+import unicodedata
+import logging
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# rapidfuzz es opcional: si no está instalado se usa un token-set ratio en Python puro
+try:
+    from rapidfuzz import fuzz, process
+    RAPIDFUZZ_DISPONIBLE = True
+except ImportError:
+    from difflib import SequenceMatcher
+    RAPIDFUZZ_DISPONIBLE = False
+
+# Tokens de forma societaria que se eliminan al final del nombre ("S.A.", "SpA", "Ltda.", ...)
+SUFIJOS_LEGALES = {
+    'sa', 'spa', 'ltda', 'limitada', 'eirl', 'sac', 'cia', 'y', 'sociedad', 'anonima',
+    'inc', 'ltd', 'llc', 'plc', 'corp'
+}
+
+# Umbral (0-100) desde el cual se considera que hay coincidencia con el titular
+UMBRAL_COINCIDENCIA = 60.0
+
+# Peso del nombre del proyecto frente al titular (antes: 5 vs 10 puntos)
+PESO_NOMBRE_PROYECTO = 0.5
+
+
+@lru_cache(maxsize=4096)
+def normalizar_titular(nombre: str) -> str:
+    """Normaliza un nombre de titular: minúsculas, sin tildes, sin puntuación ni sufijos legales"""
+    if not nombre:
+        return ""
+
+    texto = unicodedata.normalize('NFKD', nombre.lower())
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+
+    # "S.A." / "S. A." -> "sa", "S.p.A." -> "spa"; el resto de la puntuación separa palabras
+    texto = re.sub(r'\b([a-z])\.\s+(?=[a-z]\b)', r'\1.', texto)
+    texto = texto.replace('.', '')
+    texto = re.sub(r'[^a-z0-9]+', ' ', texto)
+
+    tokens = texto.split()
+    while len(tokens) > 1 and tokens[-1] in SUFIJOS_LEGALES:
+        tokens.pop()
+
+    return ' '.join(tokens)
+
+
+def _ratio_tokens(a: str, b: str) -> float:
+    """Token-set ratio (0-100) en Python puro, equivalente al de rapidfuzz"""
+    tokens_a = set(a.split())
+    tokens_b = set(b.split())
+    if not tokens_a or not tokens_b:
+        return 0.0
+
+    interseccion = ' '.join(sorted(tokens_a & tokens_b))
+    solo_a = ' '.join(sorted(tokens_a - tokens_b))
+    solo_b = ' '.join(sorted(tokens_b - tokens_a))
+
+    combinado_a = f"{interseccion} {solo_a}".strip()
+    combinado_b = f"{interseccion} {solo_b}".strip()
+
+    if interseccion and (not solo_a or not solo_b):
+        return 100.0
+
+    return 100.0 * max(
+        SequenceMatcher(None, interseccion, combinado_a).ratio() if interseccion else 0.0,
+        SequenceMatcher(None, interseccion, combinado_b).ratio() if interseccion else 0.0,
+        SequenceMatcher(None, combinado_a, combinado_b).ratio()
+    )
+
+
+class IndiceNombres:
+    """
+    Índice de nombres normalizados una sola vez.
+    Permite puntuar una o varias consultas contra todo el lote de candidatos.
+    """
+
+    def __init__(self, nombres: Sequence[str]):
+        self.nombres = list(nombres)
+        self.normalizados = [normalizar_titular(n or '') for n in self.nombres]
+
+    def __len__(self) -> int:
+        return len(self.nombres)
+
+    def puntuar(self, consulta: str) -> List[float]:
+        """Retorna el score (0-100) de la consulta contra cada candidato, en orden"""
+        consulta_norm = normalizar_titular(consulta)
+        scores = [0.0] * len(self.normalizados)
+        if not consulta_norm or not self.normalizados:
+            return scores
+
+        if RAPIDFUZZ_DISPONIBLE:
+            # Puntuación del lote completo en C
+            for _, score, indice in process.extract(
+                consulta_norm, self.normalizados,
+                scorer=fuzz.token_set_ratio, processor=None, limit=None
+            ):
+                scores[indice] = float(score)
+        else:
+            cache: Dict[str, float] = {}
+            for indice, candidato in enumerate(self.normalizados):
+                if candidato not in cache:
+                    cache[candidato] = _ratio_tokens(consulta_norm, candidato)
+                scores[indice] = cache[candidato]
+
+        return scores
+
+    def puntuar_mejor(self, consultas: Sequence[str]) -> List[Tuple[float, str]]:
+        """Para cada candidato retorna (mejor score, consulta que lo produjo)"""
+        mejores = [(0.0, '')] * len(self.normalizados)
+        for consulta in consultas:
+            for indice, score in enumerate(self.puntuar(consulta)):
+                if score > mejores[indice][0]:
+                    mejores[indice] = (score, consulta)
+        return mejores
+
+    def rankear(self, consulta: str, limite: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Retorna [(índice, score)] ordenado de mayor a menor score"""
+        ranking = sorted(enumerate(self.puntuar(consulta)), key=lambda x: x[1], reverse=True)
+        return ranking[:limite] if limite else ranking
+
+
+def similitud_titular(texto1: str, texto2: str) -> float:
+    """Similitud (0-1) entre dos nombres, tolerante a sufijos legales y orden de palabras"""
+    a = normalizar_titular(texto1)
+    b = normalizar_titular(texto2)
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+
+    if RAPIDFUZZ_DISPONIBLE:
+        return fuzz.token_set_ratio(a, b, processor=None) / 100.0
+    return _ratio_tokens(a, b) / 100.0
+
+
+def rankear_proyectos_por_titular(proyectos: List[Dict], consultas: Sequence[str],
+                                  limite: Optional[int] = None) -> List[Dict]:
+    """
+    Asigna 'score_relevancia' y 'coincidencia' a cada proyecto y los retorna ordenados.
+    El titular pesa el doble que el nombre del proyecto.
+    """
+    if not proyectos:
+        return []
+
+    consultas_unicas = list(dict.fromkeys(c for c in consultas if normalizar_titular(c)))
+
+    indice_titulares = IndiceNombres([p.get('titular', '') for p in proyectos])
+    indice_nombres = IndiceNombres([p.get('nombre', '') for p in proyectos])
+
+    scores_titular = indice_titulares.puntuar_mejor(consultas_unicas)
+    scores_nombre = indice_nombres.puntuar_mejor(consultas_unicas)
+
+    for proyecto, (score_t, consulta_t), (score_n, consulta_n) in zip(proyectos, scores_titular, scores_nombre):
+        score_n *= PESO_NOMBRE_PROYECTO
+
+        if score_t >= UMBRAL_COINCIDENCIA and score_t >= score_n:
+            proyecto['coincidencia'] = consulta_t
+            proyecto['score_relevancia'] = round(score_t, 1)
+        elif score_n >= UMBRAL_COINCIDENCIA * PESO_NOMBRE_PROYECTO:
+            proyecto['coincidencia'] = f"{consulta_n} (nombre del proyecto)"
+            proyecto['score_relevancia'] = round(score_n, 1)
+        else:
+            proyecto['coincidencia'] = 'búsqueda general'
+            proyecto['score_relevancia'] = round(max(score_t, score_n, 1.0), 1)
+
+    ordenados = sorted(proyectos, key=lambda p: p.get('score_relevancia', 0), reverse=True)
+    return ordenados[:limite] if limite else ordenados
@@ -3,18 +3,26 @@ import requests
 from bs4 import BeautifulSoup
 from sqlalchemy.orm import Session
 from models.models import SancionSNIFA
+from scrapers.registro_empresas import registrar_titular
+from engine.resumen_empresas import actualizar_resumen_empresa
+from scrapers.limite_tasa import esperar_turno
+from config.upstream import SNIFA_BASE_URL, SNIFA_RESULTADO_URL
 from urllib.parse import urljoin
-import time
 
 # URL a la que se envían los datos del formulario
-SNIFA_SEARCH_URL = "https://snifa.sma.gob.cl/RegistroPublico/Resultado"
-# URL base para construir enlaces completos a los expedientes
-SNIFA_BASE_URL = "https://snifa.sma.gob.cl"
+SNIFA_SEARCH_URL = SNIFA_RESULTADO_URL
+# SNIFA_BASE_URL (config.upstream) se usa para construir enlaces completos a los expedientes
 
-def sincronizar_sanciones_por_empresa(db: Session, nombre_empresa: str):
+# Campos que se actualizan cuando la sanción ya existe en la base de datos
+CAMPOS_ACTUALIZABLES = ('unidad_fiscalizable', 'nombre_infractor', 'categoria', 'region', 'estado', 'link_expediente')
+
+def sincronizar_sanciones_por_empresa(db: Session, nombre_empresa: str) -> dict:
     """
     Busca expedientes de sanción en SNIFA y los guarda en la base de datos.
+    Las sanciones existentes se actualizan si cambiaron (por ejemplo, su estado de pago).
+    Retorna {'insertados': n, 'actualizados': n}. Los errores se propagan tras el rollback.
     """
+    resultado = {'insertados': 0, 'actualizados': 0}
     # Construimos el payload con los nombres de campo correctos que descubrimos
     payload = {
         'txtPalabraClave': nombre_empresa,
@@ -26,6 +34,7 @@ def sincronizar_sanciones_por_empresa(db: Session, nombre_empresa: str):
     print(f"Buscando sanciones para '{nombre_empresa}' en SNIFA...")
     
     try:
+        esperar_turno(SNIFA_SEARCH_URL)
         response = requests.post(SNIFA_SEARCH_URL, data=payload, headers=headers, timeout=20)
         response.raise_for_status()
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -35,12 +44,15 @@ def sincronizar_sanciones_por_empresa(db: Session, nombre_empresa: str):
         results_div = soup.find('div', id='resultados')
         if not results_div:
             print(f"No se encontró el contenedor de resultados para '{nombre_empresa}'.")
-            return
+            return resultado
         
         table = results_div.find('table')
         if not table:
             print(f"No se encontró la tabla de resultados para '{nombre_empresa}'.")
-            return
+            return resultado
+
+        # Empresa canónica de cada infractor: se registra el nombre del infractor, no el término buscado
+        empresas_por_infractor = {}
 
         rows = table.find_all('tr')[1:] # Saltar la fila de encabezado
         print(f"Se encontraron {len(rows)} expedientes en la búsqueda de SNIFA.")
@@ -54,32 +66,55 @@ def sincronizar_sanciones_por_empresa(db: Session, nombre_empresa: str):
             if not expediente_num:
                 continue
             
-            sancion_existente = db.query(SancionSNIFA).filter_by(expediente=expediente_num).first()
-            if sancion_existente:
-                continue
-
             link_expediente_raw = columns[6].find('a', href=True) # El enlace está en la última columna
             link_expediente = urljoin(SNIFA_BASE_URL, link_expediente_raw['href']) if link_expediente_raw else None
 
-            nueva_sancion = SancionSNIFA(
-                expediente=expediente_num,
+            nombre_infractor = columns[2].get_text(strip=True)
+            if nombre_infractor and nombre_infractor not in empresas_por_infractor:
+                empresas_por_infractor[nombre_infractor] = registrar_titular(db, nombre_infractor, fuente='sincronizacion')
+            empresa = empresas_por_infractor.get(nombre_infractor)
+            id_empresa = empresa.id if empresa else None
+
+            datos = dict(
                 unidad_fiscalizable=columns[1].get_text(strip=True),
-                nombre_infractor=columns[2].get_text(strip=True),
+                nombre_infractor=nombre_infractor,
                 categoria=columns[3].get_text(strip=True),
                 region=columns[4].get_text(strip=True),
                 estado='Pagado' if 'pagado.png' in str(columns[5]) else 'Pendiente', # Lógica para determinar el estado
                 link_expediente=link_expediente
             )
+
+            sancion_existente = db.query(SancionSNIFA).filter_by(expediente=expediente_num).first()
+            if sancion_existente:
+                cambios = [c for c in CAMPOS_ACTUALIZABLES if getattr(sancion_existente, c) != datos[c]]
+                for campo in cambios:
+                    setattr(sancion_existente, campo, datos[campo])
+                if sancion_existente.id_empresa is None and id_empresa:
+                    sancion_existente.id_empresa = id_empresa
+                    cambios.append('id_empresa')
+                if cambios:
+                    print(f"  -> Sanción {expediente_num} actualizada ({', '.join(cambios)}).")
+                    resultado['actualizados'] += 1
+                continue
+
+            nueva_sancion = SancionSNIFA(id_empresa=id_empresa, expediente=expediente_num, **datos)
             
             print(f"  -> Nueva sanción encontrada: Expediente {expediente_num}. Preparando para agregar.")
             db.add(nueva_sancion)
+            resultado['insertados'] += 1
             
+        db.flush()
+        for id_empresa in {empresa.id for empresa in empresas_por_infractor.values()}:
+            actualizar_resumen_empresa(db, id_empresa)
         db.commit()
-        time.sleep(2)
 
     except requests.exceptions.RequestException as e:
         print(f"Error de solicitud HTTP en el scraper de SNIFA: {e}")
         db.rollback()
+        raise
     except Exception as e:
         print(f"Error general en el scraper de SNIFA: {e}")
         db.rollback()
+        raise
+
+    return resultado
@@ -0,0 +1,179 @@
+# scrapers/titulares_sin_proyectos.py
+# Cache negativa de la búsqueda por titular: nombres normalizados que el SEIA confirmó sin proyectos.
+# Un filtro de Bloom en memoria descarta en microsegundos los nombres que nunca fallaron (la gran
+# mayoría); si el filtro dice "quizás", decide el vencimiento guardado. Las entradas viven en SQLite,
+# sobreviven reinicios y las comparten los workers, y se descartan cuando se registra un titular que
+# coincide (sincronización o detalle de un proyecto).
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional
+
+from scrapers.similitud_titular import normalizar_titular
+
+logger = logging.getLogger(__name__)
+
+RUTA_SIN_PROYECTOS = os.getenv("TITULARES_SIN_PROYECTOS_RUTA", os.path.join("data", "titulares_sin_proyectos.sqlite"))
+# Más corto que el de los aciertos: una empresa nueva puede ingresar su primer proyecto en cualquier momento
+TTL_NEGATIVO = int(os.getenv("CACHE_NEGATIVA_TTL", str(3600)))
+# 2^20 bits (128 KB) y 7 funciones: ~1% de falsos positivos con 100 mil nombres
+BITS_BLOOM = 1 << 20
+HASHES_BLOOM = 7
+# Cada cuánto se revisa si otro proceso modificó el archivo
+INTERVALO_REVISION = float(os.getenv("CACHE_NEGATIVA_INTERVALO", "2"))
+
+class FiltroBloom:
+    """Filtro de Bloom sobre un bytearray con doble hashing (blake2b)"""
+
+    def __init__(self, bits: int = BITS_BLOOM, hashes: int = HASHES_BLOOM):
+        self.bits = bits
+        self.hashes = hashes
+        self._arreglo = bytearray(bits // 8)
+
+    def _posiciones(self, texto: str):
+        resumen = hashlib.blake2b(texto.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(resumen[:8], "little")
+        h2 = int.from_bytes(resumen[8:], "little") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def agregar(self, texto: str) -> None:
+        for posicion in self._posiciones(texto):
+            self._arreglo[posicion >> 3] |= 1 << (posicion & 7)
+
+    def __contains__(self, texto: str) -> bool:
+        arreglo = self._arreglo
+        return all(arreglo[p >> 3] & (1 << (p & 7)) for p in self._posiciones(texto))
+
+class TitularesSinProyectos:
+    """Cache negativa persistente en SQLite, con una copia en memoria por proceso detrás del filtro de Bloom"""
+
+    def __init__(self, ruta: str = RUTA_SIN_PROYECTOS, ttl_segundos: int = TTL_NEGATIVO):
+        self.ruta = ruta
+        self.ttl_segundos = ttl_segundos
+        self._lock = threading.Lock()
+        self._inicializada = False
+        self._filtro = FiltroBloom()
+        self._vencimientos: Dict[str, float] = {}
+        self._mtime: Optional[int] = None
+        self._ultima_revision = 0.0
+        self.rechazos = 0
+
+    @contextmanager
+    def _conectar(self):
+        """Conexión de corta duración; sin WAL para que cada escritura cambie el mtime del archivo"""
+        if not self._inicializada:
+            os.makedirs(os.path.dirname(self.ruta) or '.', exist_ok=True)
+        conexion = sqlite3.connect(self.ruta, timeout=10)
+        try:
+            if not self._inicializada:
+                conexion.execute(
+                    "CREATE TABLE IF NOT EXISTS titulares_sin_proyectos "
+                    "(nombre_normalizado TEXT PRIMARY KEY, vence REAL, registrado REAL)"
+                )
+                self._inicializada = True
+            with conexion:
+                yield conexion
+        finally:
+            conexion.close()
+
+    def _revisar(self) -> None:
+        """Recarga la copia en memoria si el archivo cambió (en este u otro proceso)"""
+        ahora = time.monotonic()
+        if ahora - self._ultima_revision < INTERVALO_REVISION:
+            return
+        with self._lock:
+            if ahora - self._ultima_revision < INTERVALO_REVISION:
+                return
+            self._ultima_revision = ahora
+            try:
+                mtime = os.stat(self.ruta).st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+            if mtime == self._mtime:
+                return
+            vencimientos: Dict[str, float] = {}
+            if mtime is not None:
+                try:
+                    with self._conectar() as conexion:
+                        vencimientos = dict(conexion.execute(
+                            "SELECT nombre_normalizado, vence FROM titulares_sin_proyectos WHERE vence > ?",
+                            (time.time(),)
+                        ).fetchall())
+                except sqlite3.Error as e:
+                    logger.warning(f"⚠️ Cache negativa no disponible: {e}")
+                    return
+            filtro = FiltroBloom()
+            for nombre in vencimientos:
+                filtro.agregar(nombre)
+            self._filtro, self._vencimientos, self._mtime = filtro, vencimientos, mtime
+
+    def _forzar_revision(self) -> None:
+        with self._lock:
+            self._ultima_revision = 0.0
+
+    def sin_proyectos(self, nombre: str) -> bool:
+        """Indica si el titular está confirmado sin proyectos y su entrada sigue vigente"""
+        normalizado = normalizar_titular(nombre)
+        if not normalizado:
+            return False
+        self._revisar()
+        if normalizado not in self._filtro:
+            return False
+        vigente = self._vencimientos.get(normalizado, 0.0) > time.time()
+        self.rechazos += vigente
+        return vigente
+
+    def registrar(self, nombre: str) -> None:
+        """Registra una búsqueda completa que no encontró proyectos"""
+        normalizado = normalizar_titular(nombre)
+        if not normalizado:
+            return
+        ahora = time.time()
+        try:
+            with self._conectar() as conexion:
+                conexion.execute("DELETE FROM titulares_sin_proyectos WHERE vence <= ?", (ahora,))
+                conexion.execute("INSERT OR REPLACE INTO titulares_sin_proyectos VALUES (?, ?, ?)",
+                                 (normalizado, ahora + self.ttl_segundos, ahora))
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ No se pudo registrar '{nombre}' en la cache negativa: {e}")
+            return
+        self._forzar_revision()
+        logger.info(f"🚫 Titular sin proyectos en el SEIA: '{normalizado}' ({self.ttl_segundos}s)")
+
+    def descartar(self, titulares: Iterable[str]) -> int:
+        """
+        Elimina las entradas que coinciden con titulares recién registrados: el mismo nombre
+        normalizado o uno contenido en él (la búsqueda del SEIA es por substring). Retorna cuántas.
+        """
+        normalizados = {n for n in (normalizar_titular(t) for t in titulares if t) if n}
+        if not normalizados:
+            return 0
+        self._revisar()
+        descartados = [
+            nombre for nombre in list(self._vencimientos)
+            if any(nombre == n or f" {nombre} " in f" {n} " for n in normalizados)
+        ]
+        if not descartados:
+            return 0
+        try:
+            with self._conectar() as conexion:
+                conexion.executemany("DELETE FROM titulares_sin_proyectos WHERE nombre_normalizado = ?",
+                                     [(nombre,) for nombre in descartados])
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ No se pudo actualizar la cache negativa: {e}")
+            return 0
+        self._forzar_revision()
+        logger.info(f"🧹 Cache negativa: {len(descartados)} titulares vuelven a buscarse")
+        return len(descartados)
+
+    def estadisticas(self) -> Dict:
+        self._revisar()
+        return {'entradas': len(self._vencimientos), 'ttl_segundos': self.ttl_segundos,
+                'rechazos': self.rechazos}
+
+titulares_sin_proyectos = TitularesSinProyectos()
@@ -0,0 +1,512 @@
+#!/usr/bin/env python3
+"""
+Simulador local de SEIA, BCN y SNIFA para medir rendimiento sin depender de los sitios reales.
+
+Sirve las mismas rutas que consultan los scrapers:
+    POST/GET /busqueda/buscarProyectoAction.php      (SEIA, búsqueda por titular, paginada)
+    GET      /expediente/ficha/fichaPrincipal.php    (SEIA, ficha del expediente)
+    GET      /leychile/consulta/listado_n_sel        (BCN, listado de normas)
+    GET      /leychile/navegar                       (BCN, detalle de norma)
+    POST     /RegistroPublico/Resultado              (SNIFA, resultados)
+    GET      /__simulador/estadisticas               (conteo de solicitudes por ruta y código)
+
+Las respuestas salen de capturas reales si existen en --capturas (ver --grabar);
+si no, se generan desde las plantillas de simulador/fixtures de forma determinista por consulta.
+
+Uso:
+    python simulador/servidor_upstream.py --puerto 8900 --latencia seia=lognormal:600:0.5 \\
+        --latencia bcn=uniforme:100:300 --tasa-error 0.02 --rafagas-429 60:5
+    UPSTREAM_SIMULADOR_URL=http://127.0.0.1:8900 python main.py
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+import urllib.request
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from string import Template
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
+from html import escape
+
+DIRECTORIO_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Sitios reales usados en modo --grabar
+UPSTREAM_REALES = {
+    'seia': 'https://seia.sea.gob.cl',
+    'bcn': 'https://www.bcn.cl',
+    'snifa': 'https://snifa.sma.gob.cl',
+}
+
+# --- Datos sintéticos ---
+
+REGIONES = [
+    ('Región de Antofagasta', 'Antofagasta', 'Antofagasta', 19, 358000, 7383000),
+    ('Región de Atacama', 'Copiapó', 'Copiapó', 19, 367000, 6970000),
+    ('Región de Valparaíso', 'Quintero', 'Valparaíso', 19, 266000, 6366000),
+    ('Región Metropolitana de Santiago', 'Santiago', 'Santiago', 19, 346000, 6298000),
+    ('Región del Libertador General Bernardo O\'Higgins', 'Rancagua', 'Cachapoal', 19, 340000, 6218000),
+    ('Región del Biobío', 'Concepción', 'Concepción', 18, 672000, 5921000),
+    ('Región de La Araucanía', 'Temuco', 'Cautín', 18, 708000, 5709000),
+    ('Región de Los Lagos', 'Puerto Montt', 'Llanquihue', 18, 671000, 5407000),
+]
+
+TIPOS = ['DIA', 'EIA']
+ESTADOS = ['Aprobado', 'En Calificación', 'Rechazado', 'Desistido', 'No Admitido a Tramitación', 'Caducado']
+TIPOLOGIAS = ['Centrales generadoras de energía', 'Proyectos de desarrollo minero', 'Líneas de transmisión eléctrica',
+              'Proyectos inmobiliarios', 'Plantas de tratamiento de aguas', 'Puertos y terminales']
+PREFIJOS_PROYECTO = ['Parque Eólico', 'Planta Fotovoltaica', 'Ampliación', 'Línea de Transmisión', 'Central Hidroeléctrica',
+                     'Modificación', 'Depósito de Relaves', 'Planta Desaladora', 'Terminal Marítimo', 'Loteo']
+SUFIJOS_PROYECTO = ['Norte', 'Sur', 'Los Andes', 'El Salto', 'Las Palmas', 'Cerro Alto', 'San Pedro', 'La Cruz',
+                    'Punta Larga', 'Valle Verde', 'Quebrada Honda', 'El Molle']
+
+NORMAS = [
+    ('30667', 'Ley 19300', 'Aprueba Ley sobre Bases Generales del Medio Ambiente', 'Ministerio Secretaría General de la Presidencia', '09-03-1994', 'evaluación ambiental'),
+    ('1053563', 'Decreto 40', 'Aprueba Reglamento del Sistema de Evaluación de Impacto Ambiental', 'Ministerio del Medio Ambiente', '12-08-2013', 'evaluación ambiental'),
+    ('1010459', 'Ley 20417', 'Crea el Ministerio, el Servicio de Evaluación Ambiental y la Superintendencia del Medio Ambiente', 'Ministerio Secretaría General de la Presidencia', '26-01-2010', 'institucionalidad'),
+    ('242302', 'Decreto con Fuerza de Ley 1122', 'Código de Aguas', 'Ministerio de Justicia', '29-10-1981', 'aguas'),
+    ('172986', 'Decreto con Fuerza de Ley 725', 'Código Sanitario', 'Ministerio de Salud Pública', '31-01-1968', 'salud'),
+    ('1106258', 'Decreto 38', 'Establece norma de emisión de ruidos generados por fuentes que indica', 'Ministerio del Medio Ambiente', '12-06-2012', 'ruido'),
+    ('1036911', 'Decreto 90', 'Establece norma de emisión para la regulación de contaminantes asociados a las descargas de residuos líquidos', 'Ministerio Secretaría General de la Presidencia', '07-03-2001', 'residuos líquidos'),
+    ('1090894', 'Ley 20920', 'Establece marco para la gestión de residuos, la responsabilidad extendida del productor y fomento al reciclaje', 'Ministerio del Medio Ambiente', '01-06-2016', 'residuos'),
+    ('1176595', 'Ley 21455', 'Ley Marco de Cambio Climático', 'Ministerio del Medio Ambiente', '13-06-2022', 'cambio climático'),
+    ('29612', 'Ley 18695', 'Ley Orgánica Constitucional de Municipalidades', 'Ministerio del Interior', '31-03-1988', 'municipal'),
+]
+
+CATEGORIAS_SNIFA = ['Instrumentos de Carácter Ambiental', 'Normas de Emisión', 'Planes de Prevención y/o Descontaminación',
+                    'Normas de Calidad', 'Programa de Cumplimiento']
+
+def _rng(*claves) -> random.Random:
+    """Generador determinista por consulta (la misma consulta produce la misma página)"""
+    return random.Random(zlib.crc32('|'.join(str(c) for c in claves).lower().encode('utf-8')))
+
+def _rut_valido(rng: random.Random) -> str:
+    cuerpo = rng.randint(76000000, 99999999)
+    suma, factor = 0, 2
+    for digito in reversed(str(cuerpo)):
+        suma += int(digito) * factor
+        factor = 2 if factor == 7 else factor + 1
+    resto = 11 - (suma % 11)
+    dv = '0' if resto == 11 else 'K' if resto == 10 else str(resto)
+    return f"{cuerpo:,}".replace(',', '.') + f"-{dv}"
+
+def _codigo_expediente(titular: str, indice: int) -> str:
+    return str(2100000000 + zlib.crc32(f"{titular.lower()}|{indice}".encode('utf-8')) % 99999999)
+
+def _proyecto(titular: str, indice: int) -> Dict:
+    rng = _rng('proyecto', titular, indice)
+    region = rng.choice(REGIONES)
+    return {
+        'codigo': _codigo_expediente(titular, indice),
+        'nombre': f"{rng.choice(PREFIJOS_PROYECTO)} {rng.choice(SUFIJOS_PROYECTO)} {indice + 1}",
+        'titular': titular.strip().title() + rng.choice([' S.A.', ' SpA', ' Ltda.', '']),
+        'tipo': rng.choice(TIPOS),
+        'estado': rng.choice(ESTADOS),
+        'tipologia': rng.choice(TIPOLOGIAS),
+        'region': region,
+        'fecha': f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{rng.randint(1998, 2024)}",
+    }
+
+# --- Generadores de páginas ---
+
+class Plantillas:
+    """Plantillas HTML de simulador/fixtures, cargadas una vez"""
+
+    def __init__(self, directorio: str = DIRECTORIO_FIXTURES):
+        self._plantillas = {}
+        for nombre in os.listdir(directorio):
+            if nombre.endswith('.html'):
+                with open(os.path.join(directorio, nombre), encoding='utf-8') as archivo:
+                    self._plantillas[nombre[:-5]] = Template(archivo.read())
+
+    def render(self, plantilla: str, **valores) -> bytes:
+        return self._plantillas[plantilla].substitute(**valores).encode('utf-8')
+
+def _fila_busqueda_seia(titular: str, indice: int) -> str:
+    p = _proyecto(titular, indice)
+    return (
+        f'      <tr><td><a href="/expediente/ficha/fichaPrincipal.php?id_expediente={p["codigo"]}">{escape(p["nombre"])}</a></td>'
+        f'<td>{escape(p["region"][0])}</td><td>{p["tipo"]}</td><td>{p["fecha"]}</td>'
+        f'<td>{escape(p["estado"])}</td><td>{p["codigo"]}</td><td>{escape(p["titular"])}</td></tr>'
+    )
+
+def pagina_seia_con_filas(plantillas: Plantillas, titular: str, cantidad: int) -> bytes:
+    """Página de resultados SEIA con exactamente 'cantidad' filas (corpus de benchmarks)"""
+    filas = '\n'.join(_fila_busqueda_seia(titular, indice) for indice in range(cantidad))
+    return plantillas.render('seia_busqueda', total=cantidad, filas=filas, paginacion='')
+
+def pagina_seia_busqueda(plantillas: Plantillas, params: Dict[str, str], config: 'ConfigSimulador') -> bytes:
+    titular = params.get('nombre_empresa_o_titular', '').strip()
+    pagina = max(1, int(params.get('pagina', '1') or 1))
+    if not titular:
+        total = 0
+    else:
+        total = _rng('total', titular).randint(0, config.max_proyectos)
+
+    inicio = (pagina - 1) * config.proyectos_por_pagina
+    fin = min(total, inicio + config.proyectos_por_pagina)
+
+    filas = [_fila_busqueda_seia(titular, indice) for indice in range(inicio, fin)]
+
+    paginacion = ''
+    if fin < total:
+        siguiente = urlencode({'nombre_empresa_o_titular': titular, 'pagina': pagina + 1})
+        paginacion = f'<a href="/busqueda/buscarProyectoAction.php?{siguiente}">Siguiente &gt;</a>'
+
+    return plantillas.render('seia_busqueda', total=total, filas='\n'.join(filas), paginacion=paginacion)
+
+def pagina_seia_expediente(plantillas: Plantillas, params: Dict[str, str], config: 'ConfigSimulador') -> bytes:
+    codigo = params.get('id_expediente', '0')
+    rng = _rng('expediente', codigo)
+    titular = rng.choice(['Minera Los Andes', 'Generadora Austral', 'Inmobiliaria Costa Norte', 'Aguas del Valle', 'Energía Solar del Desierto'])
+    p = _proyecto(titular, rng.randint(0, 50))
+    region, comuna, provincia, huso, este, norte = p['region']
+    este += rng.randint(-15000, 15000)
+    norte += rng.randint(-15000, 15000)
+
+    nombres_documentos = ['Resolución de Calificación Ambiental', 'Adenda', 'Informe Consolidado']
+    documentos = '\n'.join(
+        f'    <li><a href="/archivos/{codigo}_{i}.pdf">Documento {i} - {nombres_documentos[i % 3]}</a></li>'
+        for i in range(1, rng.randint(1, config.max_documentos) + 1)
+    )
+    descripcion = ' '.join(
+        f"El proyecto consiste en {p['tipologia'].lower()} en la comuna de {comuna}."
+        for _ in range(config.repeticiones_descripcion)
+    )
+
+    return plantillas.render(
+        'seia_expediente',
+        codigo=codigo, nombre=escape(p['nombre']), tipo=p['tipo'], estado=escape(p['estado']),
+        region=escape(region), fecha=p['fecha'], titular=escape(p['titular']),
+        razon_social=escape(p['titular'].upper()), rut=_rut_valido(rng),
+        direccion=f"Av. Principal {rng.randint(100, 9999)}, {escape(comuna)}",
+        email=f"contacto@{titular.split()[0].lower()}.cl",
+        ubicacion=f"{escape(comuna)}, {escape(provincia)}, {escape(region)}",
+        comuna=escape(comuna), provincia=escape(provincia),
+        coordenadas=f"UTM Huso {huso}S Este: {este} Norte: {norte} Datum WGS84",
+        descripcion=escape(descripcion), documentos=documentos,
+    )
+
+def _filas_bcn(normas) -> str:
+    return '\n'.join(
+        f'    <tr><td><a href="/leychile/navegar?idNorma={id_norma}">{escape(numero)} {escape(titulo)}</a></td>'
+        f'<td>{escape(titulo)} ({escape(materia)})</td><td>{fecha}</td></tr>'
+        for id_norma, numero, titulo, _, fecha, materia in normas
+    )
+
+def pagina_bcn_con_filas(plantillas: Plantillas, termino: str, cantidad: int) -> bytes:
+    """Listado BCN con 'cantidad' filas (corpus de benchmarks)"""
+    normas = [NORMAS[i % len(NORMAS)] for i in range(cantidad)]
+    return plantillas.render('bcn_listado', termino=escape(termino), filas=_filas_bcn(normas))
+
+def pagina_bcn_listado(plantillas: Plantillas, params: Dict[str, str], config: 'ConfigSimulador') -> bytes:
+    termino = params.get('q', '').strip()
+    palabras = [p for p in termino.lower().split() if len(p) > 2]
+    normas = [n for n in NORMAS if any(p in f"{n[1]} {n[2]} {n[5]}".lower() for p in palabras)] or NORMAS[:5]
+    return plantillas.render('bcn_listado', termino=escape(termino), filas=_filas_bcn(normas))
+
+def pagina_bcn_norma(plantillas: Plantillas, params: Dict[str, str], config: 'ConfigSimulador') -> bytes:
+    id_norma = params.get('idNorma', '')
+    norma = next((n for n in NORMAS if n[0] == id_norma), NORMAS[0])
+    _, numero, titulo, organismo, fecha, materia = norma
+    articulos = '\n'.join(
+        f'    <p>Artículo {i}.- Las disposiciones de esta norma sobre {escape(materia)} se aplicarán a todos los '
+        f'proyectos o actividades que indica, sin perjuicio de las demás normas legales vigentes.</p>'
+        for i in range(1, config.articulos_norma + 1)
+    )
+    return plantillas.render('bcn_norma', titulo=escape(f"{numero} {titulo}"), organismo=escape(organismo),
+                             fecha=fecha, materia=escape(materia), articulos=articulos)
+
+def pagina_snifa_resultado(plantillas: Plantillas, params: Dict[str, str], config: 'ConfigSimulador') -> bytes:
+    empresa = params.get('txtPalabraClave', '').strip()
+    rng = _rng('snifa', empresa)
+    total = rng.randint(0, config.max_sanciones) if empresa else 0
+
+    filas = []
+    for i in range(total):
+        expediente = f"D-{rng.randint(1, 199):03d}-{rng.randint(2013, 2024)}"
+        region = rng.choice(REGIONES)
+        icono = 'pagado.png' if rng.random() < 0.5 else 'pendiente.png'
+        filas.append(
+            f'    <tr><td>{expediente}</td><td>Unidad {escape(region[1])} {i + 1}</td><td>{escape(empresa.upper())}</td>'
+            f'<td>{escape(rng.choice(CATEGORIAS_SNIFA))}</td><td>{escape(region[0])}</td>'
+            f'<td><img src="/Content/img/{icono}"></td><td><a href="/Sancionatorio/Ficha/{expediente}">Ver</a></td></tr>'
+        )
+    return plantillas.render('snifa_resultado', filas='\n'.join(filas))
+
+# (upstream, generador) por ruta
+RUTAS: Dict[str, Tuple[str, Callable]] = {
+    '/busqueda/buscarProyectoAction.php': ('seia', pagina_seia_busqueda),
+    '/expediente/ficha/fichaPrincipal.php': ('seia', pagina_seia_expediente),
+    '/leychile/consulta/listado_n_sel': ('bcn', pagina_bcn_listado),
+    '/leychile/navegar': ('bcn', pagina_bcn_norma),
+    '/RegistroPublico/Resultado': ('snifa', pagina_snifa_resultado),
+}
+
+# --- Latencia, errores y ráfagas de 429 ---
+
+class Latencia:
+    """
+    Distribución de latencia en milisegundos:
+        fija:MS | uniforme:MIN:MAX | normal:MEDIA:DESV | lognormal:MEDIANA:SIGMA
+    """
+
+    def __init__(self, especificacion: str = 'fija:0'):
+        partes = especificacion.split(':')
+        self.tipo = partes[0]
+        self.parametros = [float(p) for p in partes[1:]]
+        if self.tipo not in ('fija', 'uniforme', 'normal', 'lognormal'):
+            raise ValueError(f"Distribución de latencia desconocida: {self.tipo}")
+        self.especificacion = especificacion
+
+    def muestrear(self, rng: random.Random) -> float:
+        """Retorna una latencia en segundos"""
+        if self.tipo == 'fija':
+            ms = self.parametros[0]
+        elif self.tipo == 'uniforme':
+            ms = rng.uniform(self.parametros[0], self.parametros[1])
+        elif self.tipo == 'normal':
+            ms = rng.gauss(self.parametros[0], self.parametros[1])
+        else:
+            ms = rng.lognormvariate(math.log(max(self.parametros[0], 1e-3)), self.parametros[1])
+        return max(ms, 0.0) / 1000.0
+
+class ConfigSimulador:
+    def __init__(self, latencias: Dict[str, Latencia], tasa_error: float = 0.0,
+                 rafagas_429: Optional[Tuple[float, float]] = None, capturas: Optional[str] = None,
+                 grabar: bool = False, semilla: Optional[int] = None, max_proyectos: int = 45,
+                 proyectos_por_pagina: int = 10, max_sanciones: int = 12,
+                 repeticiones_descripcion: int = 3, articulos_norma: int = 5, max_documentos: int = 3):
+        self.latencias = latencias
+        self.tasa_error = tasa_error
+        self.rafagas_429 = rafagas_429
+        self.capturas = capturas
+        self.grabar = grabar
+        self.max_proyectos = max_proyectos
+        self.proyectos_por_pagina = proyectos_por_pagina
+        self.max_sanciones = max_sanciones
+        self.repeticiones_descripcion = repeticiones_descripcion
+        self.articulos_norma = articulos_norma
+        self.max_documentos = max_documentos
+        self.inicio = time.monotonic()
+        self.rng = random.Random(semilla)
+        self.rng_lock = threading.Lock()
+
+    def latencia(self, upstream: str) -> float:
+        distribucion = self.latencias.get(upstream) or self.latencias.get('*')
+        if not distribucion:
+            return 0.0
+        with self.rng_lock:
+            return distribucion.muestrear(self.rng)
+
+    def falla(self) -> bool:
+        with self.rng_lock:
+            return self.tasa_error > 0 and self.rng.random() < self.tasa_error
+
+    def en_rafaga_429(self) -> Optional[float]:
+        """Si estamos dentro de una ráfaga de 429 retorna los segundos que faltan para que termine"""
+        if not self.rafagas_429:
+            return None
+        periodo, duracion = self.rafagas_429
+        fase = (time.monotonic() - self.inicio) % periodo
+        return duracion - fase if fase < duracion else None
+
+# --- Capturas ---
+
+def clave_captura(metodo: str, ruta: str, params: Dict[str, str]) -> str:
+    """Nombre de archivo estable para una solicitud: <ruta>__<hash de los parámetros>.html"""
+    slug = ruta.strip('/').replace('/', '_').replace('.', '_') or 'raiz'
+    firma = hashlib.sha1(json.dumps([metodo, sorted(params.items())], ensure_ascii=False).encode('utf-8')).hexdigest()[:12]
+    return f"{slug}__{firma}.html"
+
+def grabar_desde_upstream(upstream: str, metodo: str, ruta: str, params: Dict[str, str]) -> Tuple[int, bytes]:
+    """Obtiene la página del sitio real (modo --grabar)"""
+    url = UPSTREAM_REALES[upstream] + ruta
+    datos = None
+    if metodo == 'POST':
+        datos = urlencode(params).encode('utf-8')
+    elif params:
+        url = f"{url}?{urlencode(params)}"
+    solicitud = urllib.request.Request(url, data=datos, method=metodo, headers={'User-Agent': 'Mozilla/5.0'})
+    with urllib.request.urlopen(solicitud, timeout=60) as respuesta:
+        return respuesta.status, respuesta.read()
+
+# --- Servidor ---
+
+class Estadisticas:
+    def __init__(self):
+        self._conteos: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, ruta: str, codigo: int):
+        clave = f"{ruta} {codigo}"
+        with self._lock:
+            self._conteos[clave] = self._conteos.get(clave, 0) + 1
+
+    def como_dict(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(sorted(self._conteos.items()))
+
+class ManejadorUpstream(BaseHTTPRequestHandler):
+    server_version = 'SimuladorUpstream/1.0'
+    protocol_version = 'HTTP/1.1'
+    # Headers y cuerpo van en escrituras separadas: sin esto Nagle + ACK retardado suman ~40 ms por respuesta
+    disable_nagle_algorithm = True
+
+    def log_message(self, formato, *args):
+        if self.server.verbose:
+            super().log_message(formato, *args)
+
+    def _params(self) -> Dict[str, str]:
+        url = urlparse(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        if self.command == 'POST':
+            largo = int(self.headers.get('Content-Length') or 0)
+            cuerpo = self.rfile.read(largo).decode('utf-8', errors='replace') if largo else ''
+            params.update({k: v[-1] for k, v in parse_qs(cuerpo).items()})
+        return params
+
+    def _responder(self, codigo: int, cuerpo: bytes, tipo: str = 'text/html; charset=utf-8', extra: Dict[str, str] = None):
+        self.send_response(codigo)
+        self.send_header('Content-Type', tipo)
+        self.send_header('Content-Length', str(len(cuerpo)))
+        for nombre, valor in (extra or {}).items():
+            self.send_header(nombre, valor)
+        self.end_headers()
+        self.wfile.write(cuerpo)
+        self.server.estadisticas.registrar(urlparse(self.path).path, codigo)
+
+    def do_GET(self):
+        self._atender()
+
+    def do_POST(self):
+        self._atender()
+
+    def _atender(self):
+        config: ConfigSimulador = self.server.config
+        ruta = urlparse(self.path).path
+        params = self._params()
+
+        if ruta == '/__simulador/estadisticas':
+            cuerpo = json.dumps(self.server.estadisticas.como_dict(), ensure_ascii=False, indent=2).encode('utf-8')
+            return self._responder(200, cuerpo, 'application/json')
+
+        if ruta.startswith('/archivos/'):
+            return self._responder(200, b'%PDF-1.4\n% simulador\n', 'application/pdf')
+
+        if ruta not in RUTAS:
+            return self._responder(404, b'<html><body>No encontrado</body></html>')
+
+        upstream, generador = RUTAS[ruta]
+        time.sleep(config.latencia(upstream))
+
+        restante = config.en_rafaga_429()
+        if restante is not None:
+            return self._responder(429, b'<html><body>Too Many Requests</body></html>',
+                                   extra={'Retry-After': str(max(1, math.ceil(restante)))})
+        if config.falla():
+            return self._responder(503, b'<html><body>Servicio no disponible</body></html>')
+
+        cuerpo = None
+        if config.capturas:
+            archivo = os.path.join(config.capturas, clave_captura(self.command, ruta, params))
+            if os.path.exists(archivo):
+                with open(archivo, 'rb') as f:
+                    cuerpo = f.read()
+            elif config.grabar:
+                try:
+                    codigo, cuerpo = grabar_desde_upstream(upstream, self.command, ruta, params)
+                    if codigo == 200:
+                        with open(archivo, 'wb') as f:
+                            f.write(cuerpo)
+                except Exception as e:
+                    return self._responder(502, f'<html><body>Error grabando: {escape(str(e))}</body></html>'.encode('utf-8'))
+
+        if cuerpo is None:
+            cuerpo = generador(self.server.plantillas, params, config)
+
+        self._responder(200, cuerpo)
+
+def crear_servidor(host: str, puerto: int, config: ConfigSimulador, verbose: bool = False) -> ThreadingHTTPServer:
+    servidor = ThreadingHTTPServer((host, puerto), ManejadorUpstream)
+    servidor.daemon_threads = True
+    servidor.config = config
+    servidor.plantillas = Plantillas()
+    servidor.estadisticas = Estadisticas()
+    servidor.verbose = verbose
+    return servidor
+
+def iniciar_en_hilo(puerto: int = 0, **opciones) -> ThreadingHTTPServer:
+    """Inicia el simulador en un hilo (para tests y benchmarks). Retorna el servidor; su URL es servidor.url"""
+    latencias = opciones.pop('latencias', {})
+    config = ConfigSimulador({k: Latencia(v) for k, v in latencias.items()}, **opciones)
+    servidor = crear_servidor('127.0.0.1', puerto, config)
+    servidor.url = f"http://127.0.0.1:{servidor.server_address[1]}"
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Simulador local de SEIA, BCN y SNIFA")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8900)
+    parser.add_argument('--latencia', action='append', default=[],
+                        help="UPSTREAM=DISTRIBUCION, ej. seia=lognormal:600:0.5 o *=fija:50 (repetible)")
+    parser.add_argument('--tasa-error', type=float, default=0.0, help="Fracción de respuestas 503 (0-1)")
+    parser.add_argument('--rafagas-429', help="PERIODO:DURACION en segundos, ej. 60:5")
+    parser.add_argument('--capturas', help="Directorio de páginas capturadas a reproducir")
+    parser.add_argument('--grabar', action='store_true', help="Obtener de los sitios reales las páginas que falten en --capturas")
+    parser.add_argument('--semilla', type=int, help="Semilla para latencias y errores reproducibles")
+    parser.add_argument('--max-proyectos', type=int, default=45, help="Máximo de proyectos por titular")
+    parser.add_argument('--repeticiones-descripcion', type=int, default=3,
+                        help="Tamaño de la descripción del expediente (para páginas grandes)")
+    parser.add_argument('--verbose', action='store_true')
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+
+    latencias = {}
+    for especificacion in args.latencia:
+        upstream, _, distribucion = especificacion.partition('=')
+        if not distribucion:
+            upstream, distribucion = '*', upstream
+        latencias[upstream] = Latencia(distribucion)
+
+    rafagas = None
+    if args.rafagas_429:
+        periodo, duracion = (float(x) for x in args.rafagas_429.split(':'))
+        rafagas = (periodo, duracion)
+
+    if args.grabar and not args.capturas:
+        print("❌ --grabar requiere --capturas")
+        sys.exit(2)
+    if args.capturas:
+        os.makedirs(args.capturas, exist_ok=True)
+
+    config = ConfigSimulador(
+        latencias, tasa_error=args.tasa_error, rafagas_429=rafagas, capturas=args.capturas,
+        grabar=args.grabar, semilla=args.semilla, max_proyectos=args.max_proyectos,
+        repeticiones_descripcion=args.repeticiones_descripcion
+    )
+    servidor = crear_servidor(args.host, args.puerto, config, args.verbose)
+
+    print(f"🚀 Simulador upstream en http://{args.host}:{args.puerto}")
+    print(f"⏱️ Latencias: { {k: v.especificacion for k, v in latencias.items()} or 'sin latencia'}")
+    print(f"💥 Tasa de error: {args.tasa_error:.1%} | Ráfagas 429: {args.rafagas_429 or 'no'}")
+    print(f"💡 Usar con: UPSTREAM_SIMULADOR_URL=http://{args.host}:{args.puerto}")
+
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Simulador detenido")
+        servidor.server_close()
+
+if __name__ == '__main__':
+    main()
@@ -45,9 +45,9 @@ def check_database_config():
 def create_tables():
     """Crea las tablas en la base de datos si no existen"""
     try:
-        from config.database import engine
+        from config.database import obtener_engine
         from models.models import Base
-        Base.metadata.create_all(bind=engine)
+        Base.metadata.create_all(bind=obtener_engine())
         print("✅ Tablas de base de datos verificadas/creadas")
         return True
     except Exception as e:
@@ -0,0 +1,911 @@
+// Variables globales
+let currentQuery = '';
+let currentQueryType = '';
+
+// Inicialización
+document.addEventListener('DOMContentLoaded', function() {
+    initializeForm();
+});
+
+function initializeForm() {
+    const form = document.getElementById('search-form');
+    document.getElementById('results-content').addEventListener('click', buscarSugerencia);
+    const queryTypeInputs = document.querySelectorAll('input[name="query_type"]');
+    const companySection = document.getElementById('company-section');
+
+    // Manejar cambio de tipo de consulta
+    queryTypeInputs.forEach(input => {
+        input.addEventListener('change', function() {
+            const mapSection = document.getElementById('map-section');
+
+            if (this.value === 'proyecto') {
+                // Para proyectos SEIA: mostrar campo de empresa y mapa
+                companySection.classList.add('visible');
+                document.getElementById('company-name').required = true;
+                mapSection.classList.add('visible');
+
+                // Cambiar placeholder y label para proyectos
+                document.getElementById('query').placeholder = "Ejemplo: ¿Qué información ambiental tiene este proyecto? ¿Cuál es su estado en el SEIA?";
+                document.querySelector('.search-label').innerHTML = '🔍 Consulta sobre el proyecto';
+
+            } else {
+                // Para consultas legales: solo mostrar campo de consulta
+                companySection.classList.remove('visible');
+                document.getElementById('company-name').required = false;
+                mapSection.classList.remove('visible');
+
+                // Cambiar placeholder y label para legal
+                document.getElementById('query').placeholder = "Ejemplo: ¿Cuáles son los requisitos para obtener una RCA? ¿Qué dice la Ley 19.300 sobre evaluación ambiental?";
+                document.querySelector('.search-label').innerHTML = '🔍 Ingresa tu consulta legal ambiental';
+            }
+        });
+    });
+
+    // Sugerencias de titulares conocidos mientras se escribe
+    let esperaAutocompletar = null;
+    document.getElementById('company-name').addEventListener('input', function() {
+        clearTimeout(esperaAutocompletar);
+        const texto = this.value.trim();
+        esperaAutocompletar = setTimeout(() => autocompletarTitular(texto), 150);
+    });
+
+    // Manejar envío del formulario
+    form.addEventListener('submit', function(e) {
+        e.preventDefault();
+        handleFormSubmit();
+    });
+}
+
+async function autocompletarTitular(texto) {
+    const lista = document.getElementById('titulares-sugeridos');
+    if (!lista || texto.length < 2) {
+        return;
+    }
+    try {
+        const response = await fetch(`/autocomplete?q=${encodeURIComponent(texto)}&limite=8`);
+        const data = await response.json();
+        lista.innerHTML = (data.sugerencias || [])
+            .map(s => `<option value="${escaparHtml(s.titular)}">${escaparHtml(s.coincide || '')}</option>`)
+            .join('');
+    } catch (error) {
+        console.warn('Autocompletado no disponible:', error);
+    }
+}
+
+async function handleFormSubmit() {
+    const query = document.getElementById('query').value.trim();
+    const queryType = document.querySelector('input[name="query_type"]:checked').value;
+    const companyName = document.getElementById('company-name').value.trim();
+
+    // Validaciones específicas por tipo
+    if (queryType === 'legal') {
+        if (!query) {
+            showError('Para consultas legales se requiere una pregunta específica');
+            return;
+        }
+    } else if (queryType === 'proyecto') {
+        if (!companyName) {
+            showError('Para búsqueda de proyectos se requiere nombre de empresa o proyecto');
+            return;
+        }
+        // Para proyectos, la consulta es opcional
+    }
+
+    currentQuery = query;
+    currentQueryType = queryType;
+
+    showLoading(true);
+    hideError();
+    showResults(true);
+
+    try {
+        const response = await fetch('/consulta', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                query: query,
+                query_type: queryType,
+                company_name: companyName || null
+            })
+        });
+
+        if (!response.ok) {
+            throw new Error(`Error ${response.status}: ${response.statusText}`);
+        }
+
+        const data = await response.json();
+        displayResults(data);
+
+    } catch (error) {
+        console.error('Error:', error);
+        showError('Error al procesar la consulta: ' + error.message);
+    } finally {
+        showLoading(false);
+    }
+}
+
+function displayResults(data) {
+    const resultsContent = document.getElementById('results-content');
+
+    // Verificar si requiere selección de proyecto
+    if (data.requiere_seleccion && data.lista_proyectos) {
+        displayProjectSelection(data);
+        return;
+    }
+
+    if (!data || !data.respuesta) {
+        showError('No se recibió una respuesta válida del servidor');
+        return;
+    }
+
+    // Determinar el título según el tipo de consulta
+    let titulo_respuesta = '📋 Respuesta Legal';
+    if (data.query_type === 'legal') {
+        titulo_respuesta = '⚖️ Normativa Legal Encontrada';
+    } else if (data.query_type === 'proyecto') {
+        titulo_respuesta = '🏗️ Información del Proyecto';
+    }
+
+    let html = avisoCorreccion(data.correccion_titular) + `
+        <div class="result-card">
+            <div class="card-title">
+                ${titulo_respuesta}
+            </div>
+            <div class="card-content">
+                ${formatResponse(data.respuesta)}
+            </div>
+        </div>
+    `;
+
+    // Agregar información de empresa si está disponible
+    if (data.empresa_info) {
+        html += `
+            <div class="result-card">
+                <div class="card-title">
+                    🏢 Información de la Empresa
+                </div>
+                <div class="card-content">
+                    ${formatCompanyInfo(data.empresa_info)}
+                </div>
+            </div>
+        `;
+    }
+
+    // Agregar información de ubicación si está disponible
+    if (data.ubicacion) {
+        html += `
+            <div class="result-card">
+                <div class="card-title">
+                    📍 Información de Ubicación
+                </div>
+                <div class="card-content">
+                    ${formatLocationInfo(data.ubicacion)}
+                </div>
+            </div>
+        `;
+    }
+
+    // Agregar referencias si están disponibles
+    if (data.referencias && data.referencias.length > 0) {
+        html += `
+            <div class="result-card">
+                <div class="card-title">
+                    🔗 Referencias Legales
+                </div>
+                <div class="card-content">
+                    ${formatReferences(data.referencias)}
+                </div>
+            </div>
+        `;
+    }
+
+    resultsContent.innerHTML = html;
+
+    // Las coordenadas vienen resueltas desde el servidor: el mapa se centra sin geocodificar
+    if (data.ubicacion && data.ubicacion.punto) {
+        mostrarPuntoEnMapa(data.ubicacion.punto);
+    }
+}
+
+function formatResponse(response) {
+    // Convertir saltos de línea a HTML
+    return response.replace(/\n/g, '<br>');
+}
+
+function formatCompanyInfo(companyInfo) {
+    let html = '';
+
+    // Campos especiales con formato personalizado
+    const specialFields = {
+        'nombre': '🏢 Empresa',
+        'nombre_fantasia': '✨ Nombre de Fantasía',
+        'razon_social': '📋 Razón Social',
+        'rut': '🆔 RUT',
+        'direccion': '📍 Dirección',
+        'telefono': '📞 Teléfono',
+        'email': '📧 Email',
+        'region': '🌎 Región',
+        'codigo_expediente': '📑 Código Expediente SEIA',
+        'estado_proyecto': '📊 Estado del Proyecto',
+        'link_seia': '🔗 Link SEIA'
+    };
+
+    // Mostrar campos en orden de prioridad
+    const fieldOrder = ['nombre', 'nombre_fantasia', 'razon_social', 'rut', 'direccion', 
+                      'telefono', 'email', 'region', 'codigo_expediente', 'estado_proyecto'];
+
+    // Mostrar campos ordenados
+    fieldOrder.forEach(field => {
+        if (companyInfo[field]) {
+            const label = specialFields[field] || field;
+            const value = companyInfo[field];
+
+            if (field === 'link_seia') {
+                html += `<p><strong>${label}:</strong> <a href="${value}" target="_blank" style="color: var(--primary-orange);">Ver en SEIA →</a></p>`;
+            } else if (field === 'email') {
+                html += `<p><strong>${label}:</strong> <a href="mailto:${value}" style="color: var(--primary-orange);">${value}</a></p>`;
+            } else if (field === 'telefono') {
+                html += `<p><strong>${label}:</strong> <a href="tel:${value}" style="color: var(--primary-orange);">${value}</a></p>`;
+            } else {
+                html += `<p><strong>${label}:</strong> ${value}</p>`;
+            }
+        }
+    });
+
+    // Mostrar campos restantes que no están en el orden
+    for (const [key, value] of Object.entries(companyInfo)) {
+        if (!fieldOrder.includes(key) && key !== 'link_seia') {
+            const label = specialFields[key] || key.charAt(0).toUpperCase() + key.slice(1);
+            html += `<p><strong>${label}:</strong> ${value}</p>`;
+        }
+    }
+
+    return html;
+}
+
+function formatLocationInfo(locationInfo) {
+    let html = '';
+
+    // Campos especiales para ubicación
+    const locationFields = {
+        'direccion': '📍 Dirección',
+        'tipo': '🏷️ Tipo de Ubicación',
+        'fuente': '📋 Fuente',
+        'comuna': '🏘️ Comuna',
+        'provincia': '🌆 Provincia',
+        'region': '🌎 Región',
+        'coordenadas': '📐 Coordenadas'
+    };
+
+    // Orden de campos para mostrar
+    const fieldOrder = ['direccion', 'comuna', 'provincia', 'region', 'coordenadas', 'tipo', 'fuente'];
+
+    // Mostrar campos ordenados
+    fieldOrder.forEach(field => {
+        if (locationInfo[field]) {
+            const label = locationFields[field] || field;
+            const value = locationInfo[field];
+            html += `<p><strong>${label}:</strong> ${value}</p>`;
+        }
+    });
+
+    // Mostrar campos restantes (el punto se usa para el mapa, no se muestra como texto)
+    for (const [key, value] of Object.entries(locationInfo)) {
+        if (!fieldOrder.includes(key) && key !== 'punto') {
+            const label = locationFields[key] || key.charAt(0).toUpperCase() + key.slice(1);
+            html += `<p><strong>${label}:</strong> ${value}</p>`;
+        }
+    }
+
+    // Con coordenadas del servidor el botón centra el mapa directamente
+    if (locationInfo.punto) {
+        // Comillas simples escapadas: nombres como "O'Higgins" cortarían el atributo
+        const puntoJson = JSON.stringify(locationInfo.punto).replace(/'/g, '&#39;');
+        html += `
+            <button onclick='mostrarPuntoEnMapa(${puntoJson}, true)' 
+                    class="map-button" 
+                    style="margin-top: 15px; font-size: 0.9rem; padding: 8px 15px;">
+                🎯 Ver en Mapa
+            </button>
+        `;
+    } else if (locationInfo.direccion && typeof buscarUbicacion === 'function') {
+        // Agregar botón para centrar el mapa si existe dirección
+        // Escapar comillas en la dirección para evitar errores de JavaScript
+        const direccionEscapada = locationInfo.direccion.replace(/'/g, "\\'").replace(/"/g, '\\"');
+
+        html += `
+            <button onclick="centrarMapaEnUbicacion('${direccionEscapada}')" 
+                    class="map-button" 
+                    style="margin-top: 15px; font-size: 0.9rem; padding: 8px 15px;">
+                🎯 Ver en Mapa
+            </button>
+        `;
+
+        // Si hay información específica del SEIA, agregar botón adicional
+        if (locationInfo.fuente && locationInfo.fuente.includes('SEIA')) {
+            html += `
+                <button onclick="mostrarDetallesUbicacionSEIA('${direccionEscapada}')" 
+                        class="map-button" 
+                        style="margin-top: 10px; margin-left: 10px; font-size: 0.9rem; padding: 8px 15px; background: linear-gradient(45deg, #2196F3, #03A9F4);">
+                    🏢 Información SEIA
+                </button>
+            `;
+        }
+    }
+
+    return html;
+}
+
+function formatReferences(references) {
+    return references.map(ref => `
+        <div style="margin-bottom: 15px; padding: 10px; background: rgba(255, 107, 53, 0.1); border-radius: 8px;">
+            <strong>${ref.title}</strong><br>
+            <em>${ref.description}</em><br>
+            <a href="${ref.url}" target="_blank" style="color: var(--primary-orange); text-decoration: none;">
+                Ver fuente →
+            </a>
+        </div>
+    `).join('');
+}
+
+function avisoCorreccion(correccion) {
+    // Nombre corregido por el servidor, o sugerencias para volver a buscar con un clic
+    if (!correccion) {
+        return '';
+    }
+    let contenido;
+    if (correccion.aplicada) {
+        contenido = `✏️ Mostrando resultados para <strong>${escaparHtml(correccion.busqueda)}</strong> ` +
+            `(buscaste "${escaparHtml(correccion.original)}")`;
+    } else {
+        const opciones = correccion.sugerencias
+            .map(s => `<a href="#" class="sugerencia-titular" data-nombre="${escaparHtml(s.titular || s.texto)}">` +
+                      `${escaparHtml(s.titular || s.texto)}</a>`)
+            .join(', ');
+        contenido = `✏️ ¿Quisiste decir ${opciones}?`;
+    }
+    return `<div class="result-card"><div class="card-content">${contenido}</div></div>`;
+}
+
+function buscarSugerencia(event) {
+    const enlace = event.target.closest('.sugerencia-titular');
+    if (!enlace) {
+        return;
+    }
+    event.preventDefault();
+    document.getElementById('company-name').value = enlace.dataset.nombre;
+    handleFormSubmit();
+}
+
+function displayProjectSelection(data) {
+    const resultsContent = document.getElementById('results-content');
+
+    let html = avisoCorreccion(data.correccion_titular) + `
+        <div class="result-card">
+            <div class="card-title">
+                🔍 Proyectos Encontrados para "${data.empresa_buscada}"
+            </div>
+            <div class="card-content">
+                <p style="margin-bottom: 20px; color: #b0b0b0;">
+                    ${data.mensaje}
+                </p>
+
+                <div style="margin-bottom: 20px; padding: 15px; background: rgba(255, 107, 53, 0.1); border-radius: 8px;">
+                    <p style="margin: 0; font-size: 0.9rem;">
+                        📊 <strong>Estadísticas de búsqueda:</strong><br>
+                        • Proyectos encontrados: ${data.proyectos_encontrados}<br>
+                        • Empresa buscada: ${data.empresa_buscada}
+                        ${data.stats && data.stats.variaciones_usadas ? 
+                            `<br>• Variaciones probadas: ${data.stats.variaciones_usadas.slice(0, 3).join(', ')}` : ''
+                        }
+                    </p>
+                </div>
+
+                <div class="projects-list">
+                    ${formatProjectsList(data.lista_proyectos, data.empresa_buscada)}
+                </div>
+            </div>
+        </div>
+    `;
+
+    resultsContent.innerHTML = html;
+}
+
+function formatProjectsList(projects, empresaBuscada) {
+    return projects.map((project, index) => `
+        <div class="project-item" style="
+            margin-bottom: 15px; 
+            padding: 20px; 
+            background: rgba(255, 255, 255, 0.05); 
+            border-radius: 12px; 
+            border: 1px solid rgba(255, 107, 53, 0.2);
+            transition: all 0.3s ease;
+            cursor: pointer;
+        " onmouseover="this.style.background='rgba(255, 107, 53, 0.1)'; this.style.borderColor='rgba(255, 107, 53, 0.4)'" 
+           onmouseout="this.style.background='rgba(255, 255, 255, 0.05)'; this.style.borderColor='rgba(255, 107, 53, 0.2)'"
+           onclick="seleccionarProyecto(${project.id}, '${empresaBuscada}')">
+
+            <div style="display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 10px;">
+                <h4 style="margin: 0; color: #ff6b35; font-size: 1.1rem;">
+                    ${index + 1}. ${project.nombre}
+                </h4>
+                <span style="
+                    background: linear-gradient(45deg, #ff6b35, #ff8c42); 
+                    color: white; 
+                    padding: 4px 8px; 
+                    border-radius: 15px; 
+                    font-size: 0.8rem; 
+                    font-weight: bold;
+                ">
+                    Score: ${project.score.toFixed(1)}
+                </span>
+            </div>
+
+            <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 10px; font-size: 0.9rem;">
+                <p style="margin: 5px 0;"><strong>🏢 Titular:</strong> ${project.titular}</p>
+                <p style="margin: 5px 0;"><strong>📍 Región:</strong> ${project.region}</p>
+                <p style="margin: 5px 0;"><strong>📊 Estado:</strong> ${project.estado}</p>
+                <p style="margin: 5px 0;"><strong>🏗️ Tipo:</strong> ${project.tipo}</p>
+                ${project.inversion !== 'No especificada' ? 
+                    `<p style="margin: 5px 0;"><strong>💰 Inversión:</strong> ${project.inversion}</p>` : ''
+                }
+            </div>
+
+            <div style="margin-top: 15px; text-align: center;">
+                <button style="
+                    background: linear-gradient(45deg, #ff6b35, #ff8c42);
+                    color: white;
+                    border: none;
+                    padding: 10px 20px;
+                    border-radius: 25px;
+                    font-weight: bold;
+                    cursor: pointer;
+                    transition: all 0.3s ease;
+                " onmouseover="this.style.transform='scale(1.05)'" 
+                   onmouseout="this.style.transform='scale(1)'"
+                   onclick="event.stopPropagation(); seleccionarProyecto(${project.id}, '${empresaBuscada}')">
+                    Seleccionar este proyecto →
+                </button>
+            </div>
+        </div>
+    `).join('');
+}
+
+async function seleccionarProyecto(proyectoId, empresaNombre) {
+    showLoading(true);
+    hideError();
+
+    try {
+        const response = await fetch('/seleccionar_proyecto', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                empresa_nombre: empresaNombre,
+                proyecto_id: proyectoId,
+                query: currentQuery,
+                query_type: currentQueryType
+            })
+        });
+
+        if (!response.ok) {
+            throw new Error(`Error ${response.status}: ${response.statusText}`);
+        }
+
+        let data = await response.json();
+        // Si el servidor respondió con un trabajo encolado (202) se consulta hasta que termine
+        if (response.status === 202 && data.job_id) {
+            data = await esperarTrabajo(data.job_id);
+        }
+        displayResults(data);
+
+    } catch (error) {
+        console.error('Error al seleccionar proyecto:', error);
+        showError('Error al seleccionar el proyecto: ' + error.message);
+    } finally {
+        showLoading(false);
+    }
+}
+
+async function esperarTrabajo(jobId) {
+    const limite = Date.now() + 5 * 60 * 1000;
+    while (Date.now() < limite) {
+        const response = await fetch(`/jobs/${jobId}`, { cache: 'no-store' });
+        if (!response.ok) {
+            throw new Error(`Error ${response.status}: ${response.statusText}`);
+        }
+        const trabajo = await response.json();
+        if (trabajo.estado === 'completado') return trabajo.resultado;
+        if (trabajo.estado === 'error') throw new Error(trabajo.error || 'El trabajo falló');
+        const espera = Number(response.headers.get('Retry-After') || 2) * 1000;
+        await new Promise(resolver => setTimeout(resolver, espera));
+    }
+    throw new Error('El proyecto tardó demasiado en cargar');
+}
+
+function showLoading(show) {
+    const loading = document.getElementById('loading');
+    loading.style.display = show ? 'block' : 'none';
+}
+
+function showError(message) {
+    const errorDiv = document.getElementById('error');
+    errorDiv.textContent = message;
+    errorDiv.style.display = 'block';
+}
+
+function hideError() {
+    const errorDiv = document.getElementById('error');
+    errorDiv.style.display = 'none';
+}
+
+function showResults(show) {
+    const resultsSection = document.getElementById('results-section');
+    if (show) {
+        resultsSection.classList.add('visible');
+    } else {
+        resultsSection.classList.remove('visible');
+    }
+}
+
+// Variables globales para Google Maps
+let map;
+let geocoder;
+let marker;
+let puntoPendiente = null;
+let marcadoresCercanos = [];
+let ventanaCercanos = null;
+// Teselas del catálogo cargadas para el zoom actual ("z/x/y" -> features de map.data)
+const teselasCargadas = new Map();
+let zoomTeselas = null;
+
+// Centra el mapa en un punto resuelto por el servidor ({lat, lng, zoom, bbox?})
+function mostrarPuntoEnMapa(punto, desplazar) {
+    if (typeof google === 'undefined' || !map) {
+        // El mapa aún no carga: se aplica al terminar initMap
+        puntoPendiente = punto;
+        return;
+    }
+
+    const posicion = { lat: punto.lat, lng: punto.lng };
+    if (punto.bbox) {
+        map.fitBounds(new google.maps.LatLngBounds(
+            { lat: punto.bbox[0], lng: punto.bbox[1] },
+            { lat: punto.bbox[2], lng: punto.bbox[3] }
+        ));
+    } else {
+        map.setCenter(posicion);
+        map.setZoom(punto.zoom || 12);
+    }
+    marker.setPosition(posicion);
+    mostrarProyectosCercanos(punto);
+
+    const mapSection = document.getElementById('map-section');
+    if (desplazar && mapSection.classList.contains('visible')) {
+        mapSection.scrollIntoView({ behavior: 'smooth', block: 'center' });
+    }
+}
+
+function escaparHtml(texto) {
+    return String(texto || '').replace(/[&<>"']/g, c => ({
+        '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+    })[c]);
+}
+
+// Otros proyectos SEIA cerca del punto, desde el índice espacial del servidor
+async function mostrarProyectosCercanos(punto) {
+    marcadoresCercanos.forEach(m => m.setMap(null));
+    marcadoresCercanos = [];
+
+    try {
+        const params = new URLSearchParams({ lat: punto.lat, lng: punto.lng, k: 15, radio_km: 50 });
+        const response = await fetch(`/proyectos/cercanos?${params}`);
+        if (!response.ok) return;
+        const data = await response.json();
+        if (!data.success) return;
+
+        if (!ventanaCercanos) ventanaCercanos = new google.maps.InfoWindow();
+        data.proyectos.forEach(proyecto => {
+            const cercano = new google.maps.Marker({
+                position: { lat: proyecto.lat, lng: proyecto.lng },
+                map: map,
+                title: proyecto.nombre,
+                icon: {
+                    path: google.maps.SymbolPath.CIRCLE,
+                    scale: 5,
+                    fillColor: '#4ecdc4',
+                    fillOpacity: 0.9,
+                    strokeColor: '#ffffff',
+                    strokeWeight: 1
+                }
+            });
+            cercano.addListener('click', () => {
+                const enlace = proyecto.link_expediente
+                    ? `<br><a href="${escaparHtml(proyecto.link_expediente)}" target="_blank" rel="noopener">Ver expediente</a>`
+                    : '';
+                ventanaCercanos.setContent(`
+                    <div style="color: #333; max-width: 260px;">
+                        <strong>${escaparHtml(proyecto.nombre)}</strong><br>
+                        ${escaparHtml(proyecto.titular)}<br>
+                        ${escaparHtml(proyecto.estado)} · ${proyecto.distancia_km} km${enlace}
+                    </div>
+                `);
+                ventanaCercanos.open(map, cercano);
+            });
+            marcadoresCercanos.push(cercano);
+        });
+    } catch (error) {
+        console.log('Proyectos cercanos no disponibles:', error);
+    }
+}
+
+// Catálogo completo de proyectos: teselas GeoJSON agrupadas en el servidor (/tiles/{z}/{x}/{y})
+function rangoTeselas(bounds, z) {
+    const n = Math.pow(2, z);
+    const aX = lng => Math.min(n - 1, Math.max(0, Math.floor((lng + 180) / 360 * n)));
+    const aY = lat => {
+        const rad = lat * Math.PI / 180;
+        const y = (1 - Math.log(Math.tan(rad) + 1 / Math.cos(rad)) / Math.PI) / 2 * n;
+        return Math.min(n - 1, Math.max(0, Math.floor(y)));
+    };
+    const ne = bounds.getNorthEast();
+    const sw = bounds.getSouthWest();
+    return { x0: aX(sw.lng()), x1: aX(ne.lng()), y0: aY(ne.lat()), y1: aY(sw.lat()) };
+}
+
+function actualizarCatalogo() {
+    const bounds = map.getBounds();
+    if (!bounds) return;
+    const z = map.getZoom();
+
+    if (z !== zoomTeselas) {
+        teselasCargadas.forEach(features => features.forEach(f => map.data.remove(f)));
+        teselasCargadas.clear();
+        zoomTeselas = z;
+    }
+
+    const rango = rangoTeselas(bounds, z);
+    for (let x = rango.x0; x <= rango.x1; x++) {
+        for (let y = rango.y0; y <= rango.y1; y++) {
+            const clave = `${z}/${x}/${y}`;
+            if (teselasCargadas.has(clave)) continue;
+            teselasCargadas.set(clave, []);
+            fetch(`/tiles/${clave}`)
+                .then(response => response.ok ? response.json() : null)
+                .then(data => {
+                    // Se descarta si el zoom cambió mientras llegaba la tesela
+                    if (!data || !data.features || zoomTeselas !== z || !teselasCargadas.has(clave)) return;
+                    teselasCargadas.set(clave, map.data.addGeoJson(data));
+                })
+                .catch(error => console.log('Tesela no disponible:', clave, error));
+        }
+    }
+}
+
+function estiloCatalogo(feature) {
+    const cantidad = feature.getProperty('cantidad');
+    if (feature.getProperty('cluster')) {
+        return {
+            icon: {
+                path: google.maps.SymbolPath.CIRCLE,
+                scale: 10 + Math.min(20, Math.log2(cantidad) * 3),
+                fillColor: '#4ecdc4',
+                fillOpacity: 0.6,
+                strokeColor: '#ffffff',
+                strokeWeight: 1
+            },
+            label: { text: String(cantidad), color: '#ffffff', fontSize: '11px' },
+            title: `${cantidad} proyectos`
+        };
+    }
+    return {
+        icon: {
+            path: google.maps.SymbolPath.CIRCLE,
+            scale: 4,
+            fillColor: '#4ecdc4',
+            fillOpacity: 0.9,
+            strokeColor: '#ffffff',
+            strokeWeight: 1
+        },
+        title: feature.getProperty('nombre')
+    };
+}
+
+function clicCatalogo(event) {
+    const feature = event.feature;
+    const posicion = feature.getGeometry().get();
+    if (feature.getProperty('cluster')) {
+        map.setCenter(posicion);
+        map.setZoom(map.getZoom() + 2);
+        return;
+    }
+    if (!ventanaCercanos) ventanaCercanos = new google.maps.InfoWindow();
+    ventanaCercanos.setContent(`
+        <div style="color: #333; max-width: 260px;">
+            <strong>${escaparHtml(feature.getProperty('nombre'))}</strong><br>
+            ${escaparHtml(feature.getProperty('titular'))}<br>
+            ${escaparHtml(feature.getProperty('estado'))} · ${escaparHtml(feature.getProperty('tipo'))}
+        </div>
+    `);
+    ventanaCercanos.setPosition(posicion);
+    ventanaCercanos.open(map);
+}
+
+// Función para inicializar Google Maps
+function initMap() {
+    // Coordenadas por defecto (Santiago, Chile)
+    const defaultLocation = { lat: -33.4489, lng: -70.6693 };
+
+    // Crear el mapa
+    map = new google.maps.Map(document.getElementById('map'), {
+        zoom: 10,
+        center: defaultLocation,
+        styles: [
+            {
+                "elementType": "geometry",
+                "stylers": [{"color": "#1d2c4d"}]
+            },
+            {
+                "elementType": "labels.text.fill",
+                "stylers": [{"color": "#8ec3b9"}]
+            },
+            {
+                "elementType": "labels.text.stroke",
+                "stylers": [{"color": "#1a3646"}]
+            },
+            {
+                "featureType": "administrative.country",
+                "elementType": "geometry.stroke",
+                "stylers": [{"color": "#4b6878"}]
+            },
+            {
+                "featureType": "water",
+                "elementType": "geometry",
+                "stylers": [{"color": "#0e1626"}]
+            }
+        ]
+    });
+
+    // Inicializar geocoder
+    geocoder = new google.maps.Geocoder();
+
+    // Marcador inicial
+    marker = new google.maps.Marker({
+        position: defaultLocation,
+        map: map,
+        title: 'Ubicación del Proyecto',
+        icon: {
+            url: 'data:image/svg+xml;charset=UTF-8,' + encodeURIComponent(`
+                <svg width="32" height="32" viewBox="0 0 32 32" xmlns="http://www.w3.org/2000/svg">
+                    <circle cx="16" cy="16" r="12" fill="#ff6b35" stroke="#ffffff" stroke-width="2"/>
+                    <circle cx="16" cy="16" r="4" fill="#ffffff"/>
+                </svg>
+            `),
+            scaledSize: new google.maps.Size(32, 32),
+            anchor: new google.maps.Point(16, 16)
+        }
+    });
+
+    map.data.setStyle(estiloCatalogo);
+    map.data.addListener('click', clicCatalogo);
+    map.addListener('idle', actualizarCatalogo);
+
+    if (puntoPendiente) {
+        mostrarPuntoEnMapa(puntoPendiente);
+        puntoPendiente = null;
+    }
+}
+
+// Función para buscar ubicación
+function buscarUbicacion() {
+    const locationInput = document.getElementById('project-location');
+    const address = locationInput.value.trim();
+
+    if (!address) {
+        alert('Por favor ingresa una dirección o coordenadas');
+        return;
+    }
+
+    // Verificar si Google Maps está disponible
+    if (typeof google === 'undefined' || !geocoder) {
+        alert('Google Maps no está disponible. Por favor verifica tu conexión a internet.');
+        return;
+    }
+
+    // Buscar la dirección
+    geocoder.geocode({ address: address }, (results, status) => {
+        if (status === 'OK') {
+            const location = results[0].geometry.location;
+
+            // Centrar el mapa en la nueva ubicación
+            map.setCenter(location);
+            map.setZoom(15);
+
+            // Mover el marcador
+            marker.setPosition(location);
+
+            // Mostrar información de la ubicación
+            const infoWindow = new google.maps.InfoWindow({
+                content: `
+                    <div style="color: #333; font-family: 'Poppins', sans-serif;">
+                        <h3 style="color: #ff6b35; margin: 0 0 10px 0;">📍 Ubicación del Proyecto</h3>
+                        <p style="margin: 0;"><strong>Dirección:</strong> ${results[0].formatted_address}</p>
+                        <p style="margin: 5px 0 0 0;"><strong>Coordenadas:</strong> ${location.lat().toFixed(6)}, ${location.lng().toFixed(6)}</p>
+                    </div>
+                `
+            });
+
+            // Mostrar la ventana de información
+            infoWindow.open(map, marker);
+
+            // Actualizar el campo de texto con la dirección formateada
+            locationInput.value = results[0].formatted_address;
+
+        } else {
+            alert('No se pudo encontrar la ubicación: ' + status);
+        }
+    });
+}
+
+// Función alternativa para cuando Google Maps no esté disponible
+function initMapFallback() {
+    console.log('Google Maps no disponible, usando mapa alternativo');
+    const mapContainer = document.getElementById('map');
+    mapContainer.innerHTML = `
+        <div style="
+            width: 100%; 
+            height: 100%; 
+            background: linear-gradient(135deg, #1a1a1a, #2a2a2a); 
+            display: flex; 
+            align-items: center; 
+            justify-content: center;
+            flex-direction: column;
+            color: #ff6b35;
+            font-family: 'Poppins', sans-serif;
+            text-align: center;
+            padding: 20px;
+            box-sizing: border-box;
+        ">
+            <div style="font-size: 3rem; margin-bottom: 20px;">🗺️</div>
+            <h3 style="margin: 0 0 10px 0; color: #ffffff;">Mapa no disponible</h3>
+            <p style="margin: 0; color: #b0b0b0;">Para ver el mapa, necesitas una clave API de Google Maps válida</p>
+            <p style="margin: 10px 0 0 0; color: #b0b0b0; font-size: 0.9rem;">Puedes seguir usando la funcionalidad de búsqueda de ubicaciones</p>
+        </div>
+    `;
+}
+
+// Función para centrar el mapa en una ubicación específica
+function centrarMapaEnUbicacion(direccion) {
+    const locationInput = document.getElementById('project-location');
+    locationInput.value = direccion;
+    buscarUbicacion();
+
+    // Hacer scroll al mapa
+    const mapSection = document.getElementById('map-section');
+    if (mapSection.classList.contains('visible')) {
+        mapSection.scrollIntoView({ behavior: 'smooth', block: 'center' });
+    }
+}
+
+// Función para mostrar detalles adicionales de ubicación SEIA
+function mostrarDetallesUbicacionSEIA(direccion) {
+    // Centrar en el mapa primero
+    centrarMapaEnUbicacion(direccion);
+
+    // Mostrar información adicional
+    setTimeout(() => {
+        alert(`📍 Ubicación obtenida del SEIA:\n\n${direccion}\n\n✅ Esta es la dirección oficial registrada en el Sistema de Evaluación de Impacto Ambiental.\n\n💡 Esta ubicación corresponde a los datos oficiales del proyecto evaluado ambientalmente.`);
+    }, 1000);
+}
+
+// Inicializar mapa alternativo si Google Maps no está disponible
+window.addEventListener('load', function() {
+    setTimeout(() => {
+        if (typeof google === 'undefined') {
+            initMapFallback();
+        }
+    }, 3000);
+});
@@ -135,6 +135,35 @@ def test_terminos_problematicos():
         else:
             print(f"❌ No se encontraron resultados para '{termino}'")
 
+def test_terminos_aproximados():
+    """Test de términos con errores de tipeo, plurales no listados y frases completas"""
+    
+    print("\n🔤 TESTING TÉRMINOS APROXIMADOS")
+    print("=" * 60)
+    
+    terminos_aproximados = [
+        ('hidricos', 'agua'),
+        ('resiudos peligrosos', 'residuos peligrosos'),
+        ('construcciones', 'construccion'),
+        ('transportes', 'transporte'),
+        ('¿Qué normativa regula los residuos peligrosos?', 'residuos peligrosos'),
+        ('Permisos para pesca artesanal', 'pesca'),
+        ('energias renovables', 'energia'),
+    ]
+    
+    correctos = 0
+    for termino, categoria_esperada in terminos_aproximados:
+        resultado = obtener_normativa_bcn_precisa(termino)
+        categoria = resultado.get('categoria_encontrada')
+        if resultado.get('success') and categoria == categoria_esperada:
+            correctos += 1
+            print(f"✅ '{termino}' -> {categoria} ({resultado.get('precision')}, similitud {resultado.get('similitud')})")
+        else:
+            print(f"❌ '{termino}' -> {categoria}, se esperaba {categoria_esperada}")
+    
+    print(f"📊 Aproximados correctos: {correctos}/{len(terminos_aproximados)}")
+    return correctos == len(terminos_aproximados)
+
 def test_terminos_invalidos():
     """Test de términos que no deben dar resultados"""
     
@@ -175,13 +204,16 @@ if __name__ == "__main__":
         # Test de términos problemáticos
         test_terminos_problematicos()
         
+        # Test de términos aproximados
+        aproximados_ok = test_terminos_aproximados()
+        
         # Test de términos inválidos
         test_terminos_invalidos()
         
         print("\n" + "=" * 60)
         print("🏁 TESTS COMPLETADOS")
         
-        if precision_ok:
+        if precision_ok and aproximados_ok:
             print("🎉 BCN PRECISO ESTÁ FUNCIONANDO CORRECTAMENTE")
             print("✅ Listo para integración en el sistema principal")
         else:
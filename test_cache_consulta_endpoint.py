@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test de la cache de /consulta a nivel de endpoint: MISS/HIT, ETag -> 304 e invalidación al actualizar los datos
+"""
+
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+logging.basicConfig(level=logging.WARNING)  # Reducir ruido
+
+from fastapi.testclient import TestClient
+
+import config.version_datos as version_datos
+import main
+from app.cache_consulta import invalidar_cache_consultas
+from config.version_datos import marcar_datos_actualizados
+
+CONSULTA = {"query": "¿Qué es una DIA?", "query_type": "general"}
+
+@contextmanager
+def versiones_temporales():
+    """Marcadores de versión en un directorio temporal, releídos en cada request"""
+    originales = version_datos.DIRECTORIO_VERSIONES, version_datos.INTERVALO_REVISION
+    version_datos.DIRECTORIO_VERSIONES = tempfile.mkdtemp(prefix='versiones_')
+    version_datos.INTERVALO_REVISION = 0
+    invalidar_cache_consultas()
+    try:
+        yield
+    finally:
+        version_datos.DIRECTORIO_VERSIONES, version_datos.INTERVALO_REVISION = originales
+        invalidar_cache_consultas()
+
+def test_miss_y_hit():
+    """Test de que la misma consulta (normalizada) se responde desde cache con el mismo ETag"""
+    print("🔍 TEST: MISS y HIT")
+    cliente = TestClient(main.app)
+    with versiones_temporales():
+        primera = cliente.post("/consulta", json=CONSULTA)
+        segunda = cliente.post("/consulta", json={**CONSULTA, "query": "  qué es una dia  "})
+
+    ok = (primera.status_code == segunda.status_code == 200 and primera.headers.get("x-cache") == "MISS"
+          and segunda.headers.get("x-cache") == "HIT" and primera.headers["etag"] == segunda.headers["etag"]
+          and primera.json()["respuesta"] == segunda.json()["respuesta"])
+    print(f"{'✅' if ok else '❌'} {primera.headers.get('x-cache')} -> {segunda.headers.get('x-cache')}, "
+          f"ETag: {primera.headers.get('etag')}")
+    return ok
+
+def test_etag_304():
+    """Test de If-None-Match: 304 sin cuerpo con el ETag vigente y 200 con uno distinto"""
+    print("\n🔍 TEST: ETag -> 304")
+    cliente = TestClient(main.app)
+    with versiones_temporales():
+        etag = cliente.post("/consulta", json=CONSULTA).headers["etag"]
+        no_modificada = cliente.post("/consulta", json=CONSULTA, headers={"If-None-Match": etag})
+        otro_etag = cliente.post("/consulta", json=CONSULTA, headers={"If-None-Match": 'W/"otro"'})
+
+    ok = (no_modificada.status_code == 304 and no_modificada.content == b""
+          and no_modificada.headers.get("etag") == etag and otro_etag.status_code == 200
+          and otro_etag.headers.get("x-cache") == "HIT")
+    print(f"{'✅' if ok else '❌'} con ETag: {no_modificada.status_code}, con otro ETag: {otro_etag.status_code}")
+    return ok
+
+@contextmanager
+def empresa_simulada(empresa_info):
+    """procesar_informacion_empresa con un resultado fijo y sin corrección del nombre (sin scraping ni base)"""
+    originales = main.procesar_informacion_empresa, main.corregir_nombre_empresa
+    main.procesar_informacion_empresa = lambda nombre, query_type: empresa_info
+    main.corregir_nombre_empresa = lambda nombre, aplicar=True: None
+    try:
+        yield
+    finally:
+        main.procesar_informacion_empresa, main.corregir_nombre_empresa = originales
+
+def test_proyecto_sin_datos_reales_no_se_cachea():
+    """Test de que una consulta de proyecto sin datos de la empresa o con el fallback DEMO no se cachea"""
+    print("\n🔍 TEST: Proyecto sin datos reales")
+    cliente = TestClient(main.app)
+    consulta = {"query": "", "query_type": "proyecto", "company_name": "Minera Los Andes"}
+    real = {'success': True, 'modo': 'titular_unico',
+            'data': {'codigo_expediente': '2100000001', 'titular': {'nombre': 'Minera Los Andes S.A.'}}}
+    fallback = main.obtener_informacion_seia_fallback("Minera Los Andes")
+    estados = {}
+    with versiones_temporales():
+        for nombre, empresa_info in (("sin empresa", None), ("fallback", fallback), ("real", real)):
+            with empresa_simulada(empresa_info):
+                respuestas = [cliente.post("/consulta", json=consulta) for _ in range(2)]
+            estados[nombre] = [r.headers.get("x-cache") for r in respuestas if r.status_code == 200]
+            invalidar_cache_consultas()
+
+    ok = estados == {"sin empresa": ["MISS", "MISS"], "fallback": ["MISS", "MISS"], "real": ["MISS", "HIT"]}
+    print(f"{'✅' if ok else '❌'} {estados}")
+    return ok
+
+def test_invalidacion_al_actualizar_datos():
+    """Test de que marcar_datos_actualizados hace que la siguiente consulta se procese de nuevo"""
+    print("\n🔍 TEST: Invalidación tras marcar_datos_actualizados")
+    cliente = TestClient(main.app)
+    with versiones_temporales():
+        cliente.post("/consulta", json=CONSULTA)
+        antes = cliente.post("/consulta", json=CONSULTA).headers.get("x-cache")
+        marcar_datos_actualizados('seia')
+        despues = cliente.post("/consulta", json=CONSULTA).headers.get("x-cache")
+        nuevamente = cliente.post("/consulta", json=CONSULTA).headers.get("x-cache")
+
+    ok = antes == "HIT" and despues == "MISS" and nuevamente == "HIT"
+    print(f"{'✅' if ok else '❌'} antes: {antes}, tras actualizar: {despues}, siguiente: {nuevamente}")
+    return ok
+
+if __name__ == "__main__":
+    print("🚀 TESTS DE LA CACHE DE /consulta")
+    print("=" * 60)
+
+    resultados = [test_miss_y_hit(), test_etag_304(), test_proyecto_sin_datos_reales_no_se_cachea(),
+                  test_invalidacion_al_actualizar_datos()]
+
+    print("\n" + "=" * 60)
+    print(f"📊 {sum(resultados)}/{len(resultados)} tests correctos")
+    sys.exit(0 if all(resultados) else 1)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test de la cache con TTL y de la versión de datos compartida entre procesos
+"""
+
+import os
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Marcadores de versión en un directorio temporal y sin intervalo de relectura
+os.environ['MERLIN_DIR_VERSIONES'] = tempfile.mkdtemp(prefix='versiones_')
+os.environ['VERSION_DATOS_INTERVALO'] = '0'
+
+from scrapers.cache_ttl import CacheTTL
+from config.version_datos import marcar_datos_actualizados, version_datos
+
+def test_expiracion():
+    """Test de expiración por TTL"""
+    print("🔍 TEST: Expiración por TTL")
+    cache = CacheTTL(ttl_segundos=0.05)
+    cache.guardar('legal', 'respuesta')
+    cache.guardar('larga', 'respuesta', ttl_segundos=10)
+    vigente = cache.obtener('legal') == 'respuesta'
+    time.sleep(0.06)
+    ok = vigente and cache.obtener('legal') is None and cache.obtener('larga') == 'respuesta'
+    print(f"{'✅' if ok else '❌'} Estadísticas: {cache.estadisticas()}")
+    return ok
+
+def test_limite_lru():
+    """Test del descarte de la entrada menos usada"""
+    print("\n🔍 TEST: Límite LRU")
+    cache = CacheTTL(max_entradas=2)
+    cache.guardar('a', 1)
+    cache.guardar('b', 2)
+    cache.obtener('a')
+    cache.guardar('c', 3)
+    ok = cache.obtener('b') is None and cache.obtener('a') == 1 and len(cache) == 2
+    print(f"{'✅' if ok else '❌'} Entradas: {len(cache)}")
+    return ok
+
+def test_version_datos():
+    """Test de invalidación por versión de datos"""
+    print("\n🔍 TEST: Versión de datos")
+    inicial = version_datos('seia')
+    marcar_datos_actualizados('seia')
+    primera = version_datos('seia')
+    time.sleep(0.01)
+    marcar_datos_actualizados('seia')
+    segunda = version_datos('seia')
+    ok = inicial == '0' and primera != inicial and segunda != primera and 'seia:' in version_datos()
+    print(f"{'✅' if ok else '❌'} Versiones: {inicial} -> {primera} -> {segunda}")
+    return ok
+
+if __name__ == "__main__":
+    print("🚀 TESTS DE CACHE CON TTL")
+    print("=" * 60)
+
+    resultados = [test_expiracion(), test_limite_lru(), test_version_datos()]
+
+    print("\n" + "=" * 60)
+    print(f"📊 {sum(resultados)}/{len(resultados)} tests correctos")
+    sys.exit(0 if all(resultados) else 1)
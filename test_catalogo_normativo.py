@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test del catálogo normativo curado (data/normativas_curadas.json) compartido por bcn_preciso y bcn_legal
+"""
+
+import json
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from scrapers.catalogo_normativo import RUTA_CATALOGO, CatalogoNormativo, obtener_catalogo
+
+def test_archivo_consistente():
+    """Test de que cada término apunta a un tema con normativas y cada normativa tiene sus campos"""
+    print("🔍 TEST: Consistencia del archivo")
+    with open(RUTA_CATALOGO, encoding='utf-8') as archivo:
+        datos = json.load(archivo)
+    temas = datos['temas']
+    campos = {'titulo', 'numero', 'tipo'}
+    normativas = [n for tema in temas.values() for n in tema['precisas'] + tema['relacionadas']] + datos['generales']
+
+    catalogo = obtener_catalogo()
+    ok = (isinstance(datos.get('version'), int) and catalogo.version == datos['version']
+          and all(catalogo.tiene_precisas(tema) for tema in catalogo.terminos.values())
+          and all(campos <= set(n) for n in normativas) and len(catalogo.generales) > 0)
+    print(f"{'✅' if ok else '❌'} {catalogo.estadisticas()}")
+    return ok
+
+def test_estructuras_inmutables():
+    """Test de que el catálogo no se puede modificar y los resultados vienen ordenados y numerados"""
+    print("\n🔍 TEST: Estructuras inmutables y ordenadas")
+    catalogo = CatalogoNormativo({'version': 7, 'temas': {
+        'agua': {
+            'terminos': ['agua', 'hídrico'],
+            'precisas': [
+                {'titulo': 'Ley B', 'numero': '2', 'tipo': 'Ley', 'descripcion': 'b', 'relevancia': 9.5},
+                {'titulo': 'DFL A', 'numero': '1', 'tipo': 'DFL', 'descripcion': 'a', 'relevancia': 10.0},
+            ],
+            'relacionadas': [{'titulo': f'Norma {i}', 'numero': str(i), 'tipo': 'Ley'} for i in range(15)],
+        },
+    }, 'generales': []})
+
+    try:
+        catalogo.terminos['suelo'] = 'suelo'
+        inmutable = False
+    except TypeError:
+        inmutable = True
+    precisas = catalogo.resultados_precisos('agua', 'aproximada')
+    especificas = catalogo.resultados_especificos('agua')
+
+    ok = (inmutable and catalogo.terminos['hidrico'] == 'agua'
+          and [r['titulo'] for r in precisas] == ['DFL A', 'Ley B'] and precisas[0]['precision'] == 'aproximada'
+          and [r['numero'] for r in especificas] == list(range(1, 11))
+          and especificas[0]['relevancia'] > especificas[-1]['relevancia'])
+    print(f"{'✅' if ok else '❌'} inmutable: {inmutable}, precisas: {[r['titulo'] for r in precisas]}, "
+          f"específicas: {len(especificas)}")
+    return ok
+
+def test_resultados_sin_reconstruir():
+    """Test de que una consulta retorna los mismos objetos precalculados, sin armarlos de nuevo"""
+    print("\n🔍 TEST: Resultados precalculados")
+    catalogo = obtener_catalogo()
+    primera = catalogo.resultados_especificos('residuos')
+    segunda = catalogo.resultados_especificos('residuos')
+    compartidos = all(a is b for a, b in zip(primera, segunda)) and primera is not segunda
+
+    inicio = time.perf_counter()
+    for _ in range(10000):
+        catalogo.resultados_precisos('agua', 'exacta')
+    microsegundos = (time.perf_counter() - inicio) / 10000 * 1e6
+
+    ok = compartidos and len(primera) == 10 and microsegundos < 20
+    print(f"{'✅' if ok else '❌'} objetos compartidos: {compartidos}, {microsegundos:.2f} µs por consulta")
+    return ok
+
+if __name__ == "__main__":
+    print("🚀 TESTS DEL CATÁLOGO NORMATIVO")
+    print("=" * 60)
+
+    resultados = [test_archivo_consistente(), test_estructuras_inmutables(), test_resultados_sin_reconstruir()]
+
+    print("\n" + "=" * 60)
+    print(f"📊 {sum(resultados)}/{len(resultados)} tests correctos")
+    sys.exit(0 if all(resultados) else 1)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test de la construcción de assets: minificación de CSS/JS y nombres con huella del contenido
+"""
+
+import gzip
+import os
+import sys
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import construir_assets
+from app.assets import PATRON_HUELLA
+from construir_assets import construir_texto, minificar_css, minificar_js, nombre_con_huella
+
+def test_minificar_css():
+    """Test de que se compactan las declaraciones sin unir selectores descendientes con pseudoclases"""
+    print("🔍 TEST: Minificación de CSS")
+    css = """/* encabezado */
+.x :hover , a > b {
+    color : red ;
+    margin: 0 auto;
+}
+@media (max-width: 600px) {
+    .menu a:hover { color: blue; }
+}
+"""
+    minificado = minificar_css(css)
+    esperado = ".x :hover,a>b{color:red;margin:0 auto}@media (max-width: 600px){.menu a:hover{color:blue}}\n"
+
+    ok = minificado == esperado
+    print(f"{'✅' if ok else '❌'} {minificado.strip()}")
+    return ok
+
+def test_minificar_js():
+    """Test de que el JS pierde indentación y comentarios pero conserva los template literals"""
+    print("\n🔍 TEST: Minificación de JS")
+    js = "function f() {\n    // comentario\n    const html = `\n        <div>\n    `;\n\n    return html;\n}\n"
+    minificado = minificar_js(js)
+
+    ok = minificado == "function f() {\nconst html = `\n        <div>\n    `;\nreturn html;\n}\n"
+    print(f"{'✅' if ok else '❌'} {minificado!r}")
+    return ok
+
+def test_huella_del_contenido():
+    """Test de que la huella depende solo del contenido y la sirve app.assets como inmutable"""
+    print("\n🔍 TEST: Nombres con huella")
+    nombre = nombre_con_huella("css/merlin.css", b"a{color:red}")
+    mismo = nombre_con_huella("css/merlin.css", b"a{color:red}")
+    otro = nombre_con_huella("css/merlin.css", b"a{color:blue}")
+
+    ok = nombre == mismo and nombre != otro and nombre.startswith("css/merlin.") and PATRON_HUELLA.search(nombre)
+    print(f"{'✅' if ok else '❌'} {nombre} / {otro}")
+    return bool(ok)
+
+def test_construir_texto():
+    """Test de que el asset construido queda minificado, con huella y con su variante gzip"""
+    print("\n🔍 TEST: Construcción de un asset")
+    directorio = tempfile.mkdtemp(prefix='static_')
+    os.makedirs(os.path.join(directorio, "css"))
+    with open(os.path.join(directorio, "css", "prueba.css"), "w", encoding="utf-8") as f:
+        f.write("".join(f".clase-{i} :hover {{ color : red ; }}\n" for i in range(100)))
+
+    original = construir_assets.DIRECTORIO_STATIC
+    construir_assets.DIRECTORIO_STATIC = directorio
+    try:
+        resultado = construir_texto("css/prueba.css")
+    finally:
+        construir_assets.DIRECTORIO_STATIC = original
+
+    ruta = os.path.join(directorio, construir_assets.DIRECTORIO_DIST, resultado["destino"])
+    with open(ruta, "rb") as f:
+        contenido = f.read()
+    with open(ruta + ".gz", "rb") as f:
+        descomprimido = gzip.decompress(f.read())
+
+    ok = (resultado["destino"] == nombre_con_huella("css/prueba.css", contenido)
+          and b".clase-0 :hover{color:red}" in contenido and descomprimido == contenido
+          and resultado["tamanos"]["minificado"] < resultado["tamanos"]["original"])
+    print(f"{'✅' if ok else '❌'} {resultado['destino']}: {resultado['tamanos']}")
+    return ok
+
+if __name__ == "__main__":
+    print("🚀 TESTS DE CONSTRUCCIÓN DE ASSETS")
+    print("=" * 60)
+
+    resultados = [test_minificar_css(), test_minificar_js(), test_huella_del_contenido(), test_construir_texto()]
+
+    print("\n" + "=" * 60)
+    print(f"📊 {sum(resultados)}/{len(resultados)} tests correctos")
+    sys.exit(0 if all(resultados) else 1)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test de la lectura y conversión a WGS84 de las coordenadas de los expedientes SEIA
+"""
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from scrapers.coordenadas import (
+    extraer_bloques, convertir_bloques, coordenadas_desde_texto, utm_a_wgs84, NUMPY_DISPONIBLE
+)
+
+def test_formatos_texto():
+    """Test de los formatos de coordenadas que publican los expedientes"""
+    print("🔍 TEST: Formatos de texto")
+    casos = {
+        'UTM Huso 19S Este: 345.678 Norte: 6.300.123 Datum WGS84': ('utm', 19, 'WGS84'),
+        'Coordenadas UTM (PSAD 56, huso 18): E 654321 N 5412345': ('utm', 18, 'PSAD56'),
+        'Latitud: -33,4489 Longitud: -70,6693': ('geograficas', None, 'WGS84'),
+        "33°27'00\" S 70°40'12\" O": ('geograficas', None, 'WGS84'),
+    }
+    ok = True
+    for texto, (tipo, huso, datum) in casos.items():
+        bloques = extraer_bloques(texto)
+        correcto = (len(bloques) == 1 and bloques[0]['tipo'] == tipo and bloques[0]['datum'] == datum
+                    and (tipo != 'utm' or bloques[0]['huso'] == huso))
+        ok = ok and correcto
+        print(f"   {'✅' if correcto else '❌'} {texto} -> {bloques}")
+    return ok
+
+def test_conversion_wgs84():
+    """Test de la conversión UTM -> geográficas contra valores de referencia (pyproj)"""
+    print("\n🔍 TEST: Conversión UTM a WGS84")
+    latitudes, longitudes = utm_a_wgs84([345678], [6300123], 19, 'WGS84')
+    psad56 = coordenadas_desde_texto('Huso 19 Este 345678 Norte 6300123 Datum PSAD56')
+    ok = (abs(latitudes[0] - -33.427176) < 1e-5 and abs(longitudes[0] - -70.659943) < 1e-5
+          # PSAD56 queda a unos cientos de metros de WGS84 en la zona central
+          and psad56 is not None and 0.001 < abs(psad56['lat'] - latitudes[0]) < 0.01)
+    print(f"{'✅' if ok else '❌'} WGS84: {latitudes[0]:.6f}, {longitudes[0]:.6f} | PSAD56: {psad56} "
+          f"(numpy: {NUMPY_DISPONIBLE})")
+    return bool(ok)
+
+def test_huso_inferido():
+    """Test de los bloques sin huso: se prueba 19 y luego 18 hasta caer dentro de Chile"""
+    print("\n🔍 TEST: Huso inferido y bloques fuera de Chile")
+    convertidos = convertir_bloques(extraer_bloques('Este 345678 Norte 6300123') +
+                                    extraer_bloques('Este 999 Norte 12'))
+    ok = (len(convertidos) == 1 and convertidos[0] and convertidos[0]['huso'] == 19
+          and coordenadas_desde_texto('Sin coordenadas informadas') is None)
+    print(f"{'✅' if ok else '❌'} Convertidos: {convertidos}")
+    return bool(ok)
+
+def test_montos_no_son_coordenadas():
+    """Test de que montos, superficies y letras sueltas sin etiqueta UTM no se leen como coordenadas"""
+    print("\n🔍 TEST: Montos y superficies")
+    from scrapers.orquestador_sync import _texto_coordenadas
+
+    falsos = [
+        'Inversión: 450.000 dólares, superficie 5.000.000 m2',
+        'Monto de inversión 350000 USD y producción anual de 6300000 toneladas',
+        'x 300000 e y 6300000',
+        'Superficie: 120.000 m2 Caudal: 4.500.000 m3 al año',
+    ]
+    sin_punto = [texto for texto in falsos if coordenadas_desde_texto(texto) is None]
+    pagina = ('<html><body><p>Inversión: 450.000 dólares, superficie 5.000.000 m2</p>'
+              '<table><tr><td>Titular</td><td>Minera X</td></tr></table></body></html>').encode('utf-8')
+    con_fila = ('<table><tr><td>Monto</td><td>450.000</td></tr><tr><td>Coordenadas</td>'
+                '<td>UTM Huso 19 E 345678 N 6300123</td></tr></table>').encode('utf-8')
+    texto_fila = _texto_coordenadas(con_fila)
+
+    ok = (len(sin_punto) == len(falsos) and _texto_coordenadas(pagina) == ''
+          and coordenadas_desde_texto(texto_fila) is not None and '450.000' not in texto_fila)
+    print(f"{'✅' if ok else '❌'} descartados {len(sin_punto)}/{len(falsos)}, fila de coordenadas: '{texto_fila}'")
+    return ok
+
+if __name__ == "__main__":
+    print("🚀 TESTS DE COORDENADAS DE EXPEDIENTES")
+    print("=" * 60)
+
+    resultados = [test_formatos_texto(), test_conversion_wgs84(), test_huso_inferido(), test_montos_no_son_coordenadas()]
+
+    print("\n" + "=" * 60)
+    print(f"📊 {sum(resultados)}/{len(resultados)} tests correctos")
+    sys.exit(0 if all(resultados) else 1)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test del corrector ortográfico de titulares (SymSpell) contra búsqueda por fuerza bruta
+"""
+
+import os
+import random
+import string
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from engine.corrector_titulares import CorrectorSymSpell, distancia_edicion, distancia_para
+import engine.indice_titulares as indice_titulares
+from engine.indice_titulares import IndiceTitulares
+
+def _osa(a, b):
+    """Distancia OSA sin cortes, como referencia"""
+    d = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i in range(len(a) + 1):
+        d[i][0] = i
+    for j in range(len(b) + 1):
+        d[0][j] = j
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            costo = 0 if a[i - 1] == b[j - 1] else 1
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + costo)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[-1][-1]
+
+def _con_errores(palabra, azar, errores):
+    for _ in range(errores):
+        i = azar.randrange(len(palabra))
+        palabra = azar.choice([
+            palabra[:i] + palabra[i + 1:],
+            palabra[:i] + azar.choice(string.ascii_lowercase) + palabra[i:],
+            palabra[:i] + azar.choice(string.ascii_lowercase) + palabra[i + 1:],
+            palabra[:i] + palabra[i + 1:i + 2] + palabra[i:i + 1] + palabra[i + 2:],
+        ])
+    return palabra
+
+def test_candidatos_contra_fuerza_bruta():
+    """Test de que SymSpell encuentra exactamente las palabras a la distancia permitida"""
+    print("🔍 TEST: Candidatos contra fuerza bruta")
+    azar = random.Random(5)
+    vocabulario = list({''.join(azar.choices('abcdelmnorst', k=azar.randint(4, 11))) for _ in range(3000)})
+    corrector = CorrectorSymSpell(distancia_maxima=2)
+    for palabra in vocabulario:
+        corrector.agregar(palabra)
+
+    errores = 0
+    for _ in range(300):
+        consulta = _con_errores(azar.choice(vocabulario), azar, azar.randint(1, 2))
+        if len(consulta) < 4 or consulta in corrector:
+            continue
+        maxima = distancia_para(consulta)
+        esperados = {p for p in vocabulario if _osa(consulta, p) <= min(maxima, distancia_para(p))}
+        encontrados = {c[0] for c in corrector.candidatos(consulta, limite=len(vocabulario))}
+        distancias_ok = all(distancia_edicion(consulta, p, maxima) == _osa(consulta, p) for p in esperados)
+        errores += encontrados != esperados or not distancias_ok
+
+    ok = errores == 0
+    print(f"{'✅' if ok else '❌'} {len(vocabulario)} palabras, {errores} consultas con diferencias")
+    return ok
+
+def test_correccion_de_nombres():
+    """Test de correcciones típicas de tipeo contra titulares conocidos"""
+    print("\n🔍 TEST: Corrección de nombres de titulares")
+    codelco = 'Corporación Nacional del Cobre de Chile'
+    indice = IndiceTitulares([
+        (1, codelco, codelco, 120), (1, codelco, 'CODELCO', 120),
+        (2, 'Colbún S.A.', 'Colbún S.A.', 70),
+        (3, 'Enel Generación Chile S.A.', 'Enel Generación Chile S.A.', 40),
+        (4, 'ENAP Refinerías', 'ENAP Refinerías', 30),
+    ])
+    # El corrector se arma bajo demanda: mientras no existe no sugiere nada
+    sin_corrector = indice.corregir('Codelko') == []
+    indice.preparar_corrector()
+    casos = {
+        'Codelko': codelco,
+        'Colbum': 'Colbún S.A.',
+        'enel generacion chle': 'Enel Generación Chile S.A.',
+    }
+    correctas = all(indice.corregir(c)[0]['titular'] == esperado for c, esperado in casos.items())
+    sin_cambios = indice.corregir('CODELCO') == [] and indice.corregir('Minera XYZ') == []
+
+    ok = sin_corrector and correctas and sin_cambios
+    print(f"{'✅' if ok else '❌'} {indice.corregir('Codelko')[0]}, conocidos sin corregir: {sin_cambios}")
+    return ok
+
+def test_latencia():
+    """Test de latencia en microsegundos con un vocabulario grande"""
+    print("\n🔍 TEST: Latencia")
+    azar = random.Random(9)
+    filas = []
+    for i in range(20000):
+        nombre = ' '.join(''.join(azar.choices(string.ascii_lowercase, k=azar.randint(4, 10)))
+                          for _ in range(azar.randint(1, 4)))
+        filas.append((i, nombre, nombre, 0))
+    indice = IndiceTitulares(filas)
+    indice.preparar_corrector()
+
+    consultas = [_con_errores(filas[azar.randrange(len(filas))][1], azar, 1) for _ in range(200)]
+    inicio = time.perf_counter()
+    for consulta in consultas:
+        indice.corregir(consulta)
+    microsegundos = (time.perf_counter() - inicio) / len(consultas) * 1e6
+
+    ok = microsegundos < 2000
+    print(f"{'✅' if ok else '❌'} {microsegundos:.0f} µs por nombre con {len(indice.corrector)} palabras")
+    return ok
+
+def test_vocabulario_acotado():
+    """Test de que el corrector solo guarda las palabras más frecuentes y sigue reconociendo las demás"""
+    print("\n🔍 TEST: Vocabulario acotado")
+    filas = [(i, f'Minera Palabra{i:05d}', f'Minera Palabra{i:05d}', i) for i in range(200)]
+    maximo = indice_titulares.MAX_PALABRAS_CORRECTOR
+    indice_titulares.MAX_PALABRAS_CORRECTOR = 50
+    try:
+        indice = IndiceTitulares(filas)
+        indice.preparar_corrector()
+    finally:
+        indice_titulares.MAX_PALABRAS_CORRECTOR = maximo
+
+    acotado = len(indice.corrector) == 50 and 'minera' in indice.corrector and 'palabra00199' in indice.corrector
+    # Una palabra fuera del corrector pero conocida no se "corrige" a otra
+    conocida = indice.corregir('Minera Palabra00003') == []
+
+    ok = acotado and conocida
+    print(f"{'✅' if ok else '❌'} {len(indice.corrector)} de {len(indice.frecuencias_palabras)} palabras, "
+          f"conocida sin corregir: {conocida}")
+    return ok
+
+if __name__ == "__main__":
+    print("🚀 TESTS DEL CORRECTOR DE TITULARES")
+    print("=" * 60)
+
+    resultados = [test_candidatos_contra_fuerza_bruta(), test_correccion_de_nombres(), test_latencia(),
+                  test_vocabulario_acotado()]
+
+    print("\n" + "=" * 60)
+    print(f"📊 {sum(resultados)}/{len(resultados)} tests correctos")
+    sys.exit(0 if all(resultados) else 1)
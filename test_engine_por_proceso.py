@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test del engine de base de datos por proceso: tras un fork el hijo crea su propio pool
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import types
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Base SQLite temporal (si config.database no se importó antes con otra URL)
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='engine_'), 'merlin.db')}")
+
+from sqlalchemy import text
+
+import config.database as database
+
+def _usar_conexion(engine):
+    with engine.connect() as conexion:
+        conexion.execute(text("SELECT 1"))
+
+def _engine_del_hijo(cola, id_padre, usar_post_fork):
+    """Proceso hijo: reporta si heredó el engine del padre y si obtuvo uno nuevo con el pool vacío"""
+    heredado = id(database.engine) == id_padre
+    if usar_post_fork:
+        import gunicorn_config
+        registro = types.SimpleNamespace(info=lambda *args: None)
+        gunicorn_config.post_fork(types.SimpleNamespace(log=registro), types.SimpleNamespace(pid=os.getpid()))
+    engine = database.obtener_engine()
+    sin_conexiones_heredadas = engine.pool.checkedin() == 0
+    _usar_conexion(engine)
+    sesion = database.SessionLocal()
+    sesion_con_engine_propio = sesion.get_bind() is engine
+    sesion.close()
+    cola.put((heredado, id(engine) != id_padre, sin_conexiones_heredadas, sesion_con_engine_propio,
+              database._engine_pid == os.getpid()))
+
+def _en_hijo(usar_post_fork):
+    contexto = multiprocessing.get_context('fork')
+    cola = contexto.Queue()
+    proceso = contexto.Process(target=_engine_del_hijo, args=(cola, id(database.engine), usar_post_fork))
+    proceso.start()
+    resultado = cola.get(timeout=30)
+    proceso.join(timeout=30)
+    return resultado
+
+def test_hijo_crea_su_engine():
+    """Test de que el hijo de un fork no reutiliza el engine ni las conexiones del padre"""
+    print("🔍 TEST: Engine nuevo tras un fork")
+    engine_padre = database.obtener_engine()
+    _usar_conexion(engine_padre)
+    conexiones_padre = engine_padre.pool.checkedin()
+
+    heredado, nuevo, pool_vacio, sesion_propia, pid_propio = _en_hijo(usar_post_fork=False)
+
+    ok = (conexiones_padre >= 1 and heredado and nuevo and pool_vacio and sesion_propia and pid_propio
+          and database.obtener_engine() is engine_padre)
+    print(f"{'✅' if ok else '❌'} conexiones del padre: {conexiones_padre}, engine nuevo en el hijo: {nuevo}, "
+          f"pool vacío: {pool_vacio}")
+    return ok
+
+def test_post_fork_de_gunicorn():
+    """Test de que post_fork (gunicorn_config) reinicia el engine del worker"""
+    print("\n🔍 TEST: post_fork de gunicorn")
+    _usar_conexion(database.obtener_engine())
+
+    heredado, nuevo, pool_vacio, sesion_propia, pid_propio = _en_hijo(usar_post_fork=True)
+
+    ok = heredado and nuevo and pool_vacio and sesion_propia and pid_propio
+    print(f"{'✅' if ok else '❌'} engine nuevo: {nuevo}, pool vacío: {pool_vacio}, sesión con su engine: {sesion_propia}")
+    return ok
+
+if __name__ == "__main__":
+    print("🚀 TESTS DEL ENGINE POR PROCESO")
+    print("=" * 60)
+
+    resultados = [test_hijo_crea_su_engine(), test_post_fork_de_gunicorn()]
+
+    print("\n" + "=" * 60)
+    print(f"📊 {sum(resultados)}/{len(resultados)} tests correctos")
+    sys.exit(0 if all(resultados) else 1)
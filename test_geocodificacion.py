@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test de la geocodificación local con el nomenclátor de comunas y regiones
+"""
+
+import os
+import sys
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Cache de geocodificación en un directorio temporal y sin geocodificación remota
+os.environ['GEOCODIFICACION_CACHE_RUTA'] = os.path.join(tempfile.mkdtemp(prefix='geo_'), 'geocodificacion.sqlite')
+os.environ['GOOGLE_GEOCODING_API_KEY'] = ''
+
+from scrapers.geocodificacion import obtener_gazetteer, geocodificar, cache_geocodificacion
+
+def test_nomenclator_completo():
+    """Test de cobertura: 16 regiones y 346 comunas, todas con coordenadas en Chile"""
+    print("🔍 TEST: Nomenclátor completo")
+    gazetteer = obtener_gazetteer()
+    fuera = [c['nombre'] for c in gazetteer.comunas.values()
+             if not (-56 <= c['lat'] <= -17 and -110 <= c['lng'] <= -66)]
+    ok = len(gazetteer.regiones) == 16 and len(gazetteer.comunas) == 346 and not fuera
+    print(f"{'✅' if ok else '❌'} {len(gazetteer.regiones)} regiones, {len(gazetteer.comunas)} comunas, fuera de Chile: {fuera}")
+    return ok
+
+def test_busqueda_sin_tildes():
+    """Test de búsqueda de regiones y comunas con las variantes del SEIA"""
+    print("\n🔍 TEST: Búsqueda sin tildes y con variantes")
+    gazetteer = obtener_gazetteer()
+    casos_region = {
+        'Región de Valparaíso': '05', 'V Región': '05', 'Region Metropolitana': '13',
+        "Región del Libertador General Bernardo O'Higgins": '06', 'Nuble': '16', 'La Araucanía': '09',
+    }
+    casos_comuna = {'Vina del Mar': '05109', 'comuna de Los Ángeles': '08301', 'CONCEPCION': '08101'}
+
+    ok = True
+    for texto, codigo in casos_region.items():
+        region = gazetteer.buscar_region(texto)
+        correcto = region is not None and region['codigo'] == codigo
+        ok = ok and correcto
+        print(f"   {'✅' if correcto else '❌'} {texto} -> {region['nombre'] if region else None}")
+    for texto, codigo in casos_comuna.items():
+        comuna = gazetteer.buscar_comuna(texto)
+        correcto = comuna is not None and comuna['codigo'] == codigo
+        ok = ok and correcto
+        print(f"   {'✅' if correcto else '❌'} {texto} -> {comuna['nombre'] if comuna else None}")
+    return ok
+
+def test_geocodificar():
+    """Test de la precisión del punto según los datos disponibles"""
+    print("\n🔍 TEST: Geocodificación por precisión")
+    por_comuna = geocodificar(direccion='Camino a Toconao km 5, San Pedro de Atacama', region='Antofagasta')
+    por_region = geocodificar(direccion='Sector rural sin nombre', region='Región de Atacama')
+    sin_datos = geocodificar(direccion='Sector rural sin nombre')
+
+    cache_geocodificacion.guardar('Av. Apoquindo 3000, Las Condes', -33.4172, -70.6003)
+    por_direccion = geocodificar(direccion='av apoquindo 3000 las condes')
+
+    ok = (por_comuna and por_comuna['precision'] == 'comuna' and por_comuna['comuna'] == 'San Pedro de Atacama'
+          and por_region and por_region['precision'] == 'region' and len(por_region['bbox']) == 4
+          and sin_datos is None
+          and por_direccion and por_direccion['precision'] == 'direccion' and por_direccion['lat'] == -33.4172)
+    print(f"{'✅' if ok else '❌'} comuna: {por_comuna}, región: {por_region and por_region['region']}, "
+          f"dirección en cache: {por_direccion}")
+    return bool(ok)
+
+if __name__ == "__main__":
+    print("🚀 TESTS DE GEOCODIFICACIÓN LOCAL")
+    print("=" * 60)
+
+    resultados = [test_nomenclator_completo(), test_busqueda_sin_tildes(), test_geocodificar()]
+
+    print("\n" + "=" * 60)
+    print(f"📊 {sum(resultados)}/{len(resultados)} tests correctos")
+    sys.exit(0 if all(resultados) else 1)
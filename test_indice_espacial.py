@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test del índice espacial (árbol R con STR) contra búsqueda por fuerza bruta
+"""
+
+import os
+import random
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from engine.indice_espacial import IndiceEspacial, distancia_km
+
+ESTADOS = ['Aprobado', 'En Calificación', 'Rechazado', 'Desistido']
+TIPOS = ['DIA', 'EIA']
+
+def _proyectos(cantidad: int, semilla: int = 7):
+    azar = random.Random(semilla)
+    return [{'id': i, 'nombre': f'Proyecto {i}', 'estado': azar.choice(ESTADOS), 'tipo': azar.choice(TIPOS),
+             'lat': azar.uniform(-55, -18), 'lng': azar.uniform(-75, -67)} for i in range(cantidad)]
+
+def test_k_cercanos():
+    """Test de los k más cercanos y del radio contra fuerza bruta"""
+    print("🔍 TEST: k más cercanos y radio")
+    proyectos = _proyectos(5000)
+    indice = IndiceEspacial(proyectos)
+    ok = True
+    for lat, lng in [(-33.45, -70.66), (-23.65, -70.4), (-41.47, -72.94)]:
+        esperados = sorted(proyectos, key=lambda p: distancia_km(lat, lng, p['lat'], p['lng']))
+        cercanos = indice.cercanos(lat, lng, k=10)
+        en_radio = indice.cercanos(lat, lng, k=200, radio_km=60)
+        radio_esperado = [p for p in esperados if distancia_km(lat, lng, p['lat'], p['lng']) <= 60]
+        correcto = ([p['id'] for p in cercanos] == [p['id'] for p in esperados[:10]]
+                    and {p['id'] for p in en_radio} == {p['id'] for p in radio_esperado[:200]})
+        ok = ok and correcto
+        print(f"   {'✅' if correcto else '❌'} ({lat}, {lng}): más cercano a {cercanos[0]['distancia_km']} km, "
+              f"{len(en_radio)} en 60 km")
+    return ok
+
+def test_bbox_y_filtros():
+    """Test de bbox con filtros de estado y tipo"""
+    print("\n🔍 TEST: bbox con filtros")
+    proyectos = _proyectos(5000)
+    indice = IndiceEspacial(proyectos)
+    bbox = (-34.5, -72.0, -32.5, -70.0)
+    obtenidos = indice.en_bbox(bbox, estado='aprob', tipo='eia')
+    esperados = [p for p in proyectos if bbox[0] <= p['lat'] <= bbox[2] and bbox[1] <= p['lng'] <= bbox[3]
+                 and p['estado'] == 'Aprobado' and p['tipo'] == 'EIA']
+    vecinos = indice.cercanos(-33.45, -70.66, k=5, estado='calificacion', excluir_id=0)
+    ok = ({p['id'] for p in obtenidos} == {p['id'] for p in esperados}
+          and all(p['estado'] == 'En Calificación' and '_estado' not in p for p in vecinos))
+    print(f"{'✅' if ok else '❌'} {len(obtenidos)} en bbox (esperados {len(esperados)}), "
+          f"{len(vecinos)} vecinos en calificación")
+    return ok
+
+def test_rendimiento():
+    """Test de construcción y consulta con decenas de miles de proyectos"""
+    print("\n🔍 TEST: Rendimiento")
+    inicio = time.perf_counter()
+    indice = IndiceEspacial(_proyectos(30000))
+    construccion = (time.perf_counter() - inicio) * 1000
+    inicio = time.perf_counter()
+    for _ in range(100):
+        indice.cercanos(-33.45, -70.66, k=10)
+    consulta = (time.perf_counter() - inicio) * 10
+    ok = consulta < 10
+    print(f"{'✅' if ok else '❌'} Construcción: {construccion:.0f} ms, consulta k=10: {consulta:.2f} ms")
+    return ok
+
+if __name__ == "__main__":
+    print("🚀 TESTS DEL ÍNDICE ESPACIAL")
+    print("=" * 60)
+
+    resultados = [test_k_cercanos(), test_bbox_y_filtros(), test_rendimiento()]
+
+    print("\n" + "=" * 60)
+    print(f"📊 {sum(resultados)}/{len(resultados)} tests correctos")
+    sys.exit(0 if all(resultados) else 1)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test del índice de prefijos de titulares (GET /autocomplete)
+"""
+
+import os
+import random
+import string
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from engine.indice_titulares import IndiceTitulares
+
+CODELCO = 'Corporación Nacional del Cobre de Chile'
+FILAS = [
+    (1, CODELCO, CODELCO, 120),
+    (1, CODELCO, 'CODELCO', 120),
+    (2, 'Enel Generación Chile S.A.', 'Enel Generación Chile S.A.', 40),
+    (3, 'Enel Green Power Chile', 'Enel Green Power Chile', 30),
+    (4, 'Acciona Energía Chile Holdings', 'Acciona Energía Chile Holdings', 8),
+    (5, 'Codelpa S.A.', 'Codelpa S.A.', 1),
+]
+
+def _titulares(cantidad: int, semilla: int = 11):
+    azar = random.Random(semilla)
+    filas = []
+    for i in range(100, 100 + cantidad):
+        nombre = ' '.join(''.join(azar.choices(string.ascii_lowercase, k=azar.randint(3, 9)))
+                          for _ in range(azar.randint(1, 5)))
+        filas.append((i, nombre, nombre, azar.randint(0, 50)))
+    return filas
+
+def test_prefijos_y_alias():
+    """Test de prefijos, alias, palabras internas y orden por cantidad de proyectos"""
+    print("🔍 TEST: Prefijos, alias y relevancia")
+    indice = IndiceTitulares(FILAS)
+    codel = indice.buscar('codel')
+    enel = indice.buscar('enel gen')
+    accion = indice.buscar('ACCION')
+    cobre = indice.buscar('cobre')
+
+    ok = ([s['empresa_id'] for s in codel] == [1, 5] and codel[0]['coincide'] == 'CODELCO'
+          and [s['titular'] for s in enel] == ['Enel Generación Chile S.A.']
+          and accion[0]['empresa_id'] == 4 and cobre[0]['titular'] == CODELCO
+          and indice.buscar('c') == [])
+    print(f"{'✅' if ok else '❌'} codel -> {[s['titular'] for s in codel]}, enel gen -> {[s['titular'] for s in enel]}")
+    return ok
+
+def test_agregar_incremental():
+    """Test de que agregar filas nuevas equivale a construir el índice completo"""
+    print("\n🔍 TEST: Actualización incremental")
+    filas = FILAS + _titulares(3000)
+    completo = IndiceTitulares(filas)
+    incremental = IndiceTitulares(filas[:2000])
+    incremental.agregar(filas[2000:])
+    incremental.agregar([(9999, 'Colbún S.A.', 'Colbún S.A.', 70)])
+
+    iguales = all(completo.buscar(p) == incremental.buscar(p) for p in ('ab', 'enel', 'codel', 'mi', 'zz'))
+    ok = iguales and incremental.buscar('colb')[0]['empresa_id'] == 9999
+    print(f"{'✅' if ok else '❌'} {incremental.total_claves} claves, mismos resultados: {iguales}")
+    return ok
+
+def test_latencia():
+    """Test de latencia bajo 5 ms con 100 mil titulares"""
+    print("\n🔍 TEST: Latencia")
+    indice = IndiceTitulares(FILAS + _titulares(100000))
+    peor = 0.0
+    for prefijo in ('codel', 'enel gen', 'ab', 'xz', 'mino', 'acciona energia'):
+        inicio = time.perf_counter()
+        indice.buscar(prefijo)
+        peor = max(peor, (time.perf_counter() - inicio) * 1000)
+
+    ok = peor < 5
+    print(f"{'✅' if ok else '❌'} peor consulta: {peor:.2f} ms con {indice.total_claves} claves")
+    return ok
+
+if __name__ == "__main__":
+    print("🚀 TESTS DEL ÍNDICE DE TITULARES")
+    print("=" * 60)
+
+    resultados = [test_prefijos_y_alias(), test_agregar_incremental(), test_latencia()]
+
+    print("\n" + "=" * 60)
+    print(f"📊 {sum(resultados)}/{len(resultados)} tests correctos")
+    sys.exit(0 if all(resultados) else 1)
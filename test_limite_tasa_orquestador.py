@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Test determinista (reloj falso, sin esperas reales) del límite de tasa por host y de la sincronización masiva
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import config.database
+import config.version_datos
+import scrapers.limite_tasa as limite_tasa
+import scrapers.orquestador_sync as orquestador_sync
+import scrapers.seia_scraper as seia_scraper
+import scrapers.snifa_scraper as snifa_scraper
+from scrapers.limite_tasa import LimitadorCompartido, LimitadorTasa
+
+SEIA = 'https://seia.sea.gob.cl/busqueda/buscarProyectoAction.php'
+BCN = 'https://www.bcn.cl/leychile/navegar?idNorma=1'
+
+class RelojFalso:
+    """Reemplazo del módulo time: sleep registra la espera y, si 'avanzar', adelanta el reloj"""
+    def __init__(self, inicio=1000.0, avanzar=True):
+        self.ahora = inicio
+        self.avanzar = avanzar
+        self.esperas = []
+        self._lock = threading.Lock()
+
+    def monotonic(self):
+        return self.ahora
+
+    def time(self):
+        return self.ahora
+
+    def sleep(self, segundos):
+        with self._lock:
+            self.esperas.append(round(segundos, 6))
+            if self.avanzar:
+                self.ahora += segundos
+
+@contextmanager
+def reemplazar(modulo, **atributos):
+    originales = {nombre: getattr(modulo, nombre) for nombre in atributos}
+    for nombre, valor in atributos.items():
+        setattr(modulo, nombre, valor)
+    try:
+        yield
+    finally:
+        for nombre, valor in originales.items():
+            setattr(modulo, nombre, valor)
+
+def test_turnos_por_host():
+    """Test de los turnos de un host y de la independencia entre hosts"""
+    print("🔍 TEST: Turnos por host con reloj falso")
+    reloj = RelojFalso()
+    limitador = LimitadorTasa(intervalo_por_defecto=1.0, intervalos={'seia.sea.gob.cl': 2.0})
+    with reemplazar(limite_tasa, time=reloj):
+        seia = [limitador.esperar(SEIA) for _ in range(3)]
+        bcn = limitador.esperar(BCN)
+        reloj.ahora += 10
+        tras_pausa = limitador.esperar(SEIA)
+
+    ok = seia == [0.0, 2.0, 2.0] and bcn == 0.0 and tras_pausa == 0.0 and reloj.esperas == [2.0, 2.0]
+    print(f"{'✅' if ok else '❌'} SEIA: {seia}, BCN: {bcn}, tras 10 s: {tras_pausa}")
+    return ok
+
+def test_hilos_reservan_turnos_distintos():
+    """Test de que hilos simultáneos reciben turnos consecutivos sin repetir ninguno"""
+    print("\n🔍 TEST: Turnos entre hilos")
+    reloj = RelojFalso(avanzar=False)
+    limitador = LimitadorTasa(intervalos={'seia.sea.gob.cl': 2.0})
+    esperas = []
+    with reemplazar(limite_tasa, time=reloj):
+        hilos = [threading.Thread(target=lambda: esperas.append(limitador.esperar(SEIA))) for _ in range(8)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+    ok = sorted(esperas) == [2.0 * i for i in range(8)]
+    print(f"{'✅' if ok else '❌'} esperas: {sorted(esperas)}")
+    return ok
+
+def test_limitador_compartido():
+    """Test de que dos limitadores sobre los mismos turnos (dos procesos del pool) no duplican la tasa"""
+    print("\n🔍 TEST: Limitador compartido")
+    reloj = RelojFalso()
+    turnos, lock = {}, threading.Lock()
+    intervalos = {'seia.sea.gob.cl': 2.0}
+    proceso_a = LimitadorCompartido(turnos, lock, intervalos=intervalos)
+    proceso_b = LimitadorCompartido(turnos, lock, intervalos=intervalos)
+    with reemplazar(limite_tasa, time=reloj):
+        esperas = [proceso_a.esperar(SEIA), proceso_b.esperar(SEIA), proceso_a.esperar(SEIA)]
+
+    ok = esperas == [0.0, 2.0, 2.0] and turnos == {'seia.sea.gob.cl': 1006.0}
+    print(f"{'✅' if ok else '❌'} esperas: {esperas}, próximo turno: {turnos}")
+    return ok
+
+def test_reintentos_con_espera_exponencial():
+    """Test de los reintentos: espera 5 s, 10 s... y None al agotar los intentos"""
+    print("\n🔍 TEST: Reintentos con espera exponencial")
+    reloj = RelojFalso()
+    llamadas = []
+
+    def falla_dos_veces():
+        llamadas.append(reloj.ahora)
+        if len(llamadas) < 3:
+            raise ConnectionError("SEIA no responde")
+        return {'insertados': 1}
+
+    errores, agotado = [], []
+    with reemplazar(orquestador_sync, time=reloj):
+        resultado = orquestador_sync._con_reintentos(falla_dos_veces, 3, "SEIA 'ENEL'", errores)
+        esperas_exito = list(reloj.esperas)
+        reloj.esperas.clear()
+        sin_resultado = orquestador_sync._con_reintentos(lambda: 1 / 0, 3, "SNIFA 'ENEL'", agotado)
+
+    ok = (resultado == {'insertados': 1} and esperas_exito == [5.0, 10.0] and llamadas == [1000.0, 1005.0, 1015.0]
+          and len(errores) == 2 and sin_resultado is None and len(agotado) == 3 and reloj.esperas == [5.0, 10.0])
+    print(f"{'✅' if ok else '❌'} esperas: {esperas_exito}, errores: {len(errores)}, agotado: {len(agotado)} intentos")
+    return ok
+
+def test_sincronizar_empresa():
+    """Test de una empresa con una fuente que se recupera y otra que agota los reintentos"""
+    print("\n🔍 TEST: Sincronización de una empresa")
+    reloj = RelojFalso()
+    intentos_seia = []
+    marcados = []
+
+    def seia(db, nombre):
+        intentos_seia.append(nombre)
+        if len(intentos_seia) == 1:
+            raise TimeoutError("timeout")
+        reloj.ahora += 3
+        return {'insertados': 4, 'actualizados': 1}
+
+    def snifa(db, nombre):
+        raise ConnectionError("SNIFA caído")
+
+    @contextmanager
+    def sesion_falsa():
+        yield object()
+
+    with reemplazar(orquestador_sync, time=reloj), reemplazar(config.database, sesion_db=sesion_falsa), \
+            reemplazar(seia_scraper, sincronizar_proyectos_por_empresa=seia), \
+            reemplazar(snifa_scraper, sincronizar_sanciones_por_empresa=snifa), \
+            reemplazar(config.version_datos, marcar_datos_actualizados=marcados.append):
+        resumen = orquestador_sync.sincronizar_empresa('ENEL', reintentos=2)
+
+    ok = (resumen['insertados'] == 4 and resumen['actualizados'] == 1 and not resumen['completa']
+          and len(resumen['errores']) == 3 and marcados == ['seia'] and reloj.esperas == [5.0, 5.0]
+          and resumen['duracion_segundos'] == 13.0)
+    print(f"{'✅' if ok else '❌'} {({k: v for k, v in resumen.items() if k != 'errores'})}, "
+          f"errores: {len(resumen['errores'])}")
+    return ok
+
+def test_sincronizar_empresas():
+    """Test del pool: resumen agregado, empresa con error inesperado y archivo JSON"""
+    print("\n🔍 TEST: Sincronización masiva")
+    reloj = RelojFalso()
+
+    def sincronizar_empresa(empresa, reintentos):
+        if empresa == 'CAIDA':
+            raise RuntimeError("sin conexión a la base de datos")
+        return {'empresa': empresa, 'insertados': len(empresa), 'actualizados': 1, 'errores': [],
+                'completa': empresa != 'INCOMPLETA', 'duracion_segundos': 0.0}
+
+    archivo = os.path.join(tempfile.mkdtemp(prefix='sync_'), 'resumen.json')
+    empresas = ['ENEL', 'COLBUN', 'CAIDA', 'INCOMPLETA', 'CODELCO']
+    with reemplazar(orquestador_sync, time=reloj, sincronizar_empresa=sincronizar_empresa):
+        resumen = orquestador_sync.sincronizar_empresas(empresas, workers=3, reintentos=1, archivo_resumen=archivo)
+    with open(archivo, encoding='utf-8') as f:
+        guardado = json.load(f)
+
+    ok = (resumen['empresas'] == 5 and resumen['completas'] == 3 and resumen['fallidas'] == 2
+          and resumen['insertados'] == len('ENELCOLBUNINCOMPLETACODELCO') and resumen['actualizados'] == 4
+          and [r['empresa'] for r in resumen['detalle']] == sorted(empresas)
+          and guardado == resumen and resumen['duracion_segundos'] == 0.0)
+    print(f"{'✅' if ok else '❌'} completas: {resumen['completas']}, fallidas: {resumen['fallidas']}, "
+          f"insertados: {resumen['insertados']}")
+    return ok
+
+if __name__ == "__main__":
+    print("🚀 TESTS DEL LÍMITE DE TASA Y LA SINCRONIZACIÓN MASIVA")
+    print("=" * 60)
+
+    resultados = [test_turnos_por_host(), test_hilos_reservan_turnos_distintos(), test_limitador_compartido(),
+                  test_reintentos_con_espera_exponencial(), test_sincronizar_empresa(), test_sincronizar_empresas()]
+
+    print("\n" + "=" * 60)
+    print(f"📊 {sum(resultados)}/{len(resultados)} tests correctos")
+    sys.exit(0 if all(resultados) else 1)
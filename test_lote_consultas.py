@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test del almacenamiento y la reanudación de lotes de consultas (POST /consulta/batch)
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Lotes en un directorio temporal
+os.environ['LOTES_DB_RUTA'] = os.path.join(tempfile.mkdtemp(prefix='lotes_'), 'lotes.sqlite')
+
+import app.lote_consultas as lote_consultas
+from app.lote_consultas import almacen_lotes, leer_empresas, transmitir_lote, MAX_EMPRESAS_LOTE
+
+def test_leer_empresas():
+    """Test de validación de la lista de empresas"""
+    print("🔍 TEST: Lista de empresas")
+    empresas = leer_empresas(["ENEL", "  ", "76.123.456-7", "CODELCO"])
+    desde_texto = leer_empresas("ACCIONA\n\nCOLBUN\n")
+    errores = 0
+    for invalido in ([], "", {"a": 1}, ["x"] * (MAX_EMPRESAS_LOTE + 1)):
+        try:
+            leer_empresas(invalido)
+        except ValueError:
+            errores += 1
+    ok = empresas == ["ENEL", "76.123.456-7", "CODELCO"] and desde_texto == ["ACCIONA", "COLBUN"] and errores == 4
+    print(f"{'✅' if ok else '❌'} {empresas}, {desde_texto}, {errores} listas rechazadas")
+    return ok
+
+def test_reanudar_lote():
+    """Test de reanudación: los resultados guardados se emiten sin volver a consultar"""
+    print("\n🔍 TEST: Reanudación de lote")
+    empresas = ["ENEL", "CODELCO"]
+    lote_id = almacen_lotes.crear(empresas)
+    for indice, empresa in enumerate(empresas):
+        almacen_lotes.guardar_resultado(lote_id, indice, {"empresa": empresa, "success": True, "indice": indice})
+
+    async def _leer():
+        return [json.loads(linea) async for linea in transmitir_lote(lote_id, almacen_lotes.empresas(lote_id))]
+
+    lineas = asyncio.run(_leer())
+    ok = (lineas[0] == {"lote_id": lote_id, "total": 2, "completados": 2}
+          and [l.get("empresa") for l in lineas[1:3]] == empresas and all(l["reanudado"] for l in lineas[1:3])
+          and lineas[-1]["fin"] and lineas[-1]["exitosos"] == 2 and len(lineas) == 4)
+    print(f"{'✅' if ok else '❌'} {len(lineas)} líneas NDJSON: {lineas[-1]}")
+    return ok
+
+def test_reanudar_reintenta_errores():
+    """Test de reanudación: los errores sin respuesta definitiva se vuelven a consultar, el resto no"""
+    print("\n🔍 TEST: Reintento de errores al reanudar")
+    empresas = ["ENEL", "SIN PROYECTOS", "CAIDA", "PENDIENTE"]
+    lote_id = almacen_lotes.crear(empresas)
+    almacen_lotes.guardar_resultado(lote_id, 0, {"empresa": "ENEL", "success": True, "completa": True, "indice": 0})
+    almacen_lotes.guardar_resultado(lote_id, 1, {"empresa": "SIN PROYECTOS", "success": False, "completa": True,
+                                                 "error": "No se encontraron proyectos", "indice": 1})
+    almacen_lotes.guardar_resultado(lote_id, 2, {"empresa": "CAIDA", "success": False, "completa": False,
+                                                 "error": "timeout", "indice": 2})
+    consultadas = []
+
+    def consultar_empresa(empresa):
+        consultadas.append(empresa)
+        return {"empresa": empresa, "success": True, "completa": True, "proyectos_encontrados": 1}
+
+    async def _leer():
+        return [json.loads(linea) async for linea in transmitir_lote(lote_id, empresas)]
+
+    original = lote_consultas.consultar_empresa
+    lote_consultas.consultar_empresa = consultar_empresa
+    try:
+        lineas = asyncio.run(_leer())
+    finally:
+        lote_consultas.consultar_empresa = original
+
+    guardados = almacen_lotes.resultados(lote_id)
+    ok = (sorted(consultadas) == ["CAIDA", "PENDIENTE"] and lineas[0]["completados"] == 2
+          and [l["empresa"] for l in lineas[1:3]] == ["ENEL", "SIN PROYECTOS"] and lineas[-1]["exitosos"] == 3
+          and guardados[2]["success"] and not any(lote_consultas._reintentar(r) for r in guardados.values()))
+    print(f"{'✅' if ok else '❌'} reconsultadas: {sorted(consultadas)}, exitosos: {lineas[-1].get('exitosos')}")
+    return ok
+
+def test_lote_inexistente():
+    """Test de lote desconocido"""
+    print("\n🔍 TEST: Lote inexistente")
+    ok = almacen_lotes.empresas("no-existe") is None and almacen_lotes.resultados("no-existe") == {}
+    print(f"{'✅' if ok else '❌'} Lote desconocido sin empresas ni resultados")
+    return ok
+
+if __name__ == "__main__":
+    print("🚀 TESTS DE CONSULTAS POR LOTE")
+    print("=" * 60)
+
+    resultados = [test_leer_empresas(), test_reanudar_lote(), test_reanudar_reintenta_errores(), test_lote_inexistente()]
+
+    print("\n" + "=" * 60)
+    print(f"📊 {sum(resultados)}/{len(resultados)} tests correctos")
+    sys.exit(0 if all(resultados) else 1)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test de las migraciones del esquema sobre SQLite y del resumen materializado por empresa (resumen_empresas)
+"""
+
+import os
+import random
+import sys
+from collections import Counter
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+logging.basicConfig(level=logging.WARNING)  # Reducir ruido
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from config.database import Base
+from config.migraciones import COLUMNAS, INDICES, aplicar_migraciones
+from engine.resumen_empresas import SIN_DATO, actualizar_resumen_empresa, obtener_resumen_empresa
+from models.models import Empresa, ProyectoSEIA, ResumenEmpresa, SancionSNIFA
+from scrapers.registro_empresas import registrar_titular
+
+# Esquema anterior: sin coordenadas en proyectos_seia ni índices de claves foráneas
+ESQUEMA_ANTERIOR = [
+    "CREATE TABLE empresas (id INTEGER PRIMARY KEY, rut VARCHAR(12) UNIQUE, nombre VARCHAR(255) NOT NULL, "
+    "fecha_actualizacion TIMESTAMP)",
+    "CREATE TABLE empresas_alias (id INTEGER PRIMARY KEY, id_empresa INTEGER NOT NULL REFERENCES empresas(id), "
+    "alias VARCHAR(255) NOT NULL, alias_normalizado VARCHAR(255) NOT NULL UNIQUE, fuente VARCHAR(50), "
+    "fecha_actualizacion TIMESTAMP)",
+    "CREATE TABLE proyectos_seia (id INTEGER PRIMARY KEY, id_empresa INTEGER REFERENCES empresas(id), "
+    "codigo_expediente TEXT NOT NULL UNIQUE, nombre TEXT NOT NULL, tipo TEXT, region TEXT, tipologia TEXT, "
+    "estado TEXT, link_expediente TEXT, fecha_presentacion DATE, fecha_actualizacion TIMESTAMP)",
+    "CREATE TABLE sanciones_snifa (id INTEGER PRIMARY KEY, id_empresa INTEGER REFERENCES empresas(id), "
+    "expediente TEXT NOT NULL UNIQUE, nombre_infractor TEXT, categoria TEXT, unidad_fiscalizable TEXT, "
+    "region TEXT, estado TEXT, link_expediente TEXT, fecha_actualizacion TIMESTAMP)",
+]
+
+def _conteo(valores):
+    return dict(Counter((valor or '').strip() or SIN_DATO for valor in valores))
+
+def test_migracion_esquema_anterior():
+    """Test de que la migración agrega columnas e índices faltantes y puede repetirse"""
+    print("🔍 TEST: Migración de un esquema anterior")
+    engine = create_engine("sqlite://")
+    with engine.begin() as conexion:
+        for sentencia in ESQUEMA_ANTERIOR:
+            conexion.execute(text(sentencia))
+        conexion.execute(text("INSERT INTO proyectos_seia (codigo_expediente, nombre) VALUES ('2100000001', 'Mina')"))
+
+    aplicar_migraciones(engine)
+    repetida = aplicar_migraciones(engine)
+
+    inspector = inspect(engine)
+    columnas = {c['name'] for c in inspector.get_columns('proyectos_seia')}
+    indices = {i['name'] for tabla in ('proyectos_seia', 'sanciones_snifa', 'empresas_alias')
+               for i in inspector.get_indexes(tabla)}
+    with engine.connect() as conexion:
+        fila = conexion.execute(text("SELECT nombre, latitud FROM proyectos_seia")).one()
+
+    ok = (all(columna in columnas for _, columna, _ in COLUMNAS) and all(nombre in indices for nombre, _, _ in INDICES)
+          and repetida == len(INDICES) and tuple(fila) == ('Mina', None))
+    print(f"{'✅' if ok else '❌'} columnas nuevas: {[c for _, c, _ in COLUMNAS if c in columnas]}, "
+          f"índices: {len(indices & {n for n, _, _ in INDICES})}/{len(INDICES)}")
+    return ok
+
+def test_resumen_coincide_con_tablas_base():
+    """Test de que el resumen de cada empresa coincide con los conteos de proyectos y sanciones"""
+    print("\n🔍 TEST: Resumen contra las tablas base")
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    aplicar_migraciones(engine)
+    db = sessionmaker(bind=engine)()
+
+    azar = random.Random(29)
+    empresas = [registrar_titular(db, nombre) for nombre in ('Minera Norte S.A.', 'Eléctrica Sur SpA', 'Aguas Ltda.')]
+    for i in range(120):
+        db.add(ProyectoSEIA(id_empresa=azar.choice(empresas).id, codigo_expediente=f"21{i:08d}", nombre=f"P{i}",
+                            estado=azar.choice(['Aprobado', 'En Calificación', '', None]),
+                            region=azar.choice(['Antofagasta', 'Atacama', ' Biobío ']),
+                            tipologia=azar.choice(['a1', 'c', None])))
+    for i in range(40):
+        db.add(SancionSNIFA(id_empresa=azar.choice(empresas[:2]).id, expediente=f"D-{i:03d}",
+                            categoria=azar.choice(['Leve', 'Grave', 'Gravísima'])))
+    db.flush()
+
+    def coincide():
+        for empresa in empresas:
+            actualizar_resumen_empresa(db, empresa.id)
+        db.commit()
+        for empresa in empresas:
+            proyectos = db.query(ProyectoSEIA).filter_by(id_empresa=empresa.id).all()
+            sanciones = db.query(SancionSNIFA).filter_by(id_empresa=empresa.id).all()
+            resumen = db.get(ResumenEmpresa, empresa.id)
+            if (resumen.total_proyectos != len(proyectos) or resumen.total_sanciones != len(sanciones)
+                    or resumen.proyectos_por_estado != _conteo(p.estado for p in proyectos)
+                    or resumen.proyectos_por_region != _conteo(p.region for p in proyectos)
+                    or resumen.proyectos_por_tipologia != _conteo(p.tipologia for p in proyectos)
+                    or resumen.sanciones_por_categoria != _conteo(s.categoria for s in sanciones)):
+                return False
+        return True
+
+    inicial = coincide()
+    # Una sincronización posterior cambia estados y agrega proyectos
+    for proyecto in db.query(ProyectoSEIA).limit(30):
+        proyecto.estado = 'Caducado'
+    db.add(ProyectoSEIA(id_empresa=empresas[2].id, codigo_expediente='2200000000', nombre='Nuevo', estado='Aprobado'))
+    db.flush()
+    tras_cambios = coincide()
+
+    lectura = obtener_resumen_empresa(db, 'MINERA NORTE SA')
+    total = db.query(ProyectoSEIA).filter_by(id_empresa=empresas[0].id).count()
+    ok = inicial and tras_cambios and lectura is not None and lectura['total_proyectos'] == total
+    print(f"{'✅' if ok else '❌'} inicial: {inicial}, tras cambios: {tras_cambios}, "
+          f"lectura: {lectura and lectura['total_proyectos']} proyectos de {lectura and lectura['empresa']}")
+    return ok
+
+if __name__ == "__main__":
+    print("🚀 TESTS DE MIGRACIONES Y RESUMEN POR EMPRESA")
+    print("=" * 60)
+
+    resultados = [test_migracion_esquema_anterior(), test_resumen_coincide_con_tablas_base()]
+
+    print("\n" + "=" * 60)
+    print(f"📊 {sum(resultados)}/{len(resultados)} tests correctos")
+    sys.exit(0 if all(resultados) else 1)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test de la cache de detalles de la precarga: acierto, fallo de cache y detalles fallidos sin cachear
+"""
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+logging.basicConfig(level=logging.ERROR)  # Reducir ruido
+
+from scrapers import seia_titular
+from scrapers.seia_titular import SEIATitularScraper, cache_detalles, obtener_detalles_con_cache, precargar_detalles
+
+# Puerto sin servidor: la descarga falla de inmediato con conexión rechazada
+LINK_CAIDO = 'http://127.0.0.1:9/expediente?id=1'
+
+class ScraperFalso:
+    """Scraper que cuenta las descargas y falla mientras 'fallar' sea verdadero"""
+    def __init__(self, fallar=False):
+        self.descargas = 0
+        self.fallar = fallar
+
+    def obtener_detalles_proyecto(self, proyecto):
+        self.descargas += 1
+        if self.fallar:
+            return {**proyecto, 'error_detalles': 'timeout'}
+        return {**proyecto, 'comuna': 'Calama'}
+
+def _proyecto(link):
+    return {'nombre': 'Proyecto', 'link_expediente': link, 'score_relevancia': 1}
+
+def test_acierto_y_fallo_de_cache():
+    """Test de que la primera selección descarga y la segunda usa la cache"""
+    print("🔍 TEST: Acierto y fallo de cache")
+    cache_detalles.invalidar()
+    scraper = ScraperFalso()
+    proyecto = _proyecto('http://seia/expediente?id=10')
+
+    primero = obtener_detalles_con_cache(scraper, proyecto)
+    segundo = obtener_detalles_con_cache(scraper, proyecto)
+
+    ok = scraper.descargas == 1 and primero['comuna'] == segundo['comuna'] == 'Calama'
+    print(f"{'✅' if ok else '❌'} descargas: {scraper.descargas}, {cache_detalles.estadisticas()}")
+    return ok
+
+def test_fallo_no_se_cachea():
+    """Test de que un detalle fallido no queda en la cache y se reintenta"""
+    print("\n🔍 TEST: Detalle fallido sin cachear")
+    cache_detalles.invalidar()
+    scraper = ScraperFalso(fallar=True)
+    proyecto = _proyecto('http://seia/expediente?id=20')
+
+    fallido = obtener_detalles_con_cache(scraper, proyecto)
+    sin_cachear = cache_detalles.obtener(proyecto['link_expediente']) is None
+    scraper.fallar = False
+    reintento = obtener_detalles_con_cache(scraper, proyecto)
+
+    # El scraper real también marca el fallo de red en vez de devolver el proyecto sin detalles
+    real = SEIATitularScraper().obtener_detalles_proyecto(_proyecto(LINK_CAIDO))
+
+    ok = ('error_detalles' in fallido and sin_cachear and scraper.descargas == 2
+          and reintento.get('comuna') == 'Calama' and 'error_detalles' in real)
+    print(f"{'✅' if ok else '❌'} sin cachear: {sin_cachear}, descargas: {scraper.descargas}, "
+          f"scraper real: {real.get('error_detalles', '')[:60]}")
+    return ok
+
+def test_precarga_fallida_se_descarga_de_nuevo():
+    """Test de que una precarga fallida no se sirve a la selección ni queda en la cache"""
+    print("\n🔍 TEST: Precarga fallida")
+    cache_detalles.invalidar()
+    proyecto = _proyecto(LINK_CAIDO)
+    encolados = precargar_detalles([proyecto])
+    with seia_titular._lock_en_vuelo:
+        futuro = seia_titular._en_vuelo.get(LINK_CAIDO)
+    if futuro is not None:
+        futuro.result(timeout=30)
+
+    scraper = ScraperFalso()
+    detalle = obtener_detalles_con_cache(scraper, proyecto)
+
+    ok = encolados == 1 and scraper.descargas == 1 and detalle.get('comuna') == 'Calama'
+    print(f"{'✅' if ok else '❌'} encolados: {encolados}, descargas tras la precarga: {scraper.descargas}")
+    return ok
+
+if __name__ == "__main__":
+    print("🚀 TESTS DE LA CACHE DE DETALLES")
+    print("=" * 60)
+
+    resultados = [test_acierto_y_fallo_de_cache(), test_fallo_no_se_cachea(),
+                  test_precarga_fallida_se_descarga_de_nuevo()]
+
+    print("\n" + "=" * 60)
+    print(f"📊 {sum(resultados)}/{len(resultados)} tests correctos")
+    sys.exit(0 if all(resultados) else 1)
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Test de la recarga en caliente del catálogo normativo (reemplazo atómico, sin detener las consultas)
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import types
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import scrapers.bcn_legal as bcn_legal
+import scrapers.catalogo_normativo as catalogo_normativo
+from scrapers.bcn_preciso import obtener_normativa_bcn_precisa
+from scrapers.catalogo_normativo import (RUTA_CATALOGO, cargar_catalogo, estado_catalogo, obtener_catalogo,
+                                        recargar_catalogo)
+
+def _copia_catalogo():
+    ruta = os.path.join(tempfile.mkdtemp(prefix='catalogo_'), 'normativas_curadas.json')
+    shutil.copy(RUTA_CATALOGO, ruta)
+    return ruta
+
+def _escribir_version(ruta, version):
+    """Reemplazo atómico del archivo con la versión indicada en 'version' y en los títulos de agua"""
+    with open(RUTA_CATALOGO, encoding='utf-8') as archivo:
+        datos = json.load(archivo)
+    datos['version'] = version
+    for normativa in datos['temas']['agua']['precisas']:
+        normativa['titulo'] += f' [v{version}]'
+    temporal = f"{ruta}.tmp"
+    with open(temporal, 'w', encoding='utf-8') as archivo:
+        json.dump(datos, archivo, ensure_ascii=False)
+    os.replace(temporal, ruta)
+
+def _esperar_version(version, segundos=5):
+    limite = time.monotonic() + segundos
+    while time.monotonic() < limite:
+        if obtener_catalogo().version == version:
+            return True
+        time.sleep(0.01)
+    return False
+
+def test_recarga_al_modificar_archivo():
+    """Test de que cada worker detecta el archivo modificado y lo recarga en segundo plano"""
+    print("🔍 TEST: Recarga por modificación del archivo")
+    ruta = _copia_catalogo()
+    recargar_catalogo(ruta)
+    catalogo_normativo.INTERVALO_REVISION = 0
+
+    _escribir_version(ruta, 2)
+    recargado = _esperar_version(2)
+    titulo = obtener_normativa_bcn_precisa('agua')['resultados'][0]['titulo']
+
+    ok = recargado and titulo.endswith('[v2]') and obtener_normativa_bcn_precisa('agua')['version_catalogo'] == 2
+    print(f"{'✅' if ok else '❌'} versión {obtener_catalogo().version}, primer resultado: {titulo}")
+    return ok
+
+def test_archivo_invalido_mantiene_catalogo():
+    """Test de que un archivo a medio escribir no reemplaza el catálogo vigente"""
+    print("\n🔍 TEST: Archivo inválido")
+    ruta = _copia_catalogo()
+    _escribir_version(ruta, 3)
+    recargar_catalogo(ruta)
+
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        archivo.write('{"version": 4, "temas": {')
+    try:
+        recargar_catalogo()
+        rechazado = False
+    except ValueError:
+        rechazado = True
+    time.sleep(0.05)
+    sigue = obtener_catalogo().version == 3 and obtener_normativa_bcn_precisa('suelo')['success']
+
+    _escribir_version(ruta, 4)
+    corregido = _esperar_version(4)
+
+    ok = rechazado and sigue and 'ultimo_error' not in estado_catalogo() and corregido
+    print(f"{'✅' if ok else '❌'} rechazado: {rechazado}, sigue v3: {sigue}, recarga tras corregir: {corregido}")
+    return ok
+
+def test_arranque_sin_catalogo_valido():
+    """Test de que un archivo faltante o inválido al arrancar deja un catálogo vacío que se carga al corregirse"""
+    print("\n🔍 TEST: Arranque sin catálogo válido")
+    ruta = os.path.join(tempfile.mkdtemp(prefix='catalogo_'), 'normativas_curadas.json')
+    faltante = catalogo_normativo._cargar_al_iniciar(ruta)
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        archivo.write('{"version": 5, "temas": {')
+    invalido = catalogo_normativo._cargar_al_iniciar(ruta)
+
+    catalogo_normativo._catalogo = invalido
+    catalogo_normativo.INTERVALO_REVISION = 0
+    sin_temas = obtener_normativa_bcn_precisa('agua')
+    con_error = 'ultimo_error' in estado_catalogo()
+
+    _escribir_version(ruta, 5)
+    cargado = _esperar_version(5)
+
+    ok = (faltante.estadisticas()['temas'] == invalido.estadisticas()['temas'] == 0 and invalido.origen == ruta
+          and not sin_temas['success'] and sin_temas['version_catalogo'] == 0 and con_error and cargado
+          and obtener_normativa_bcn_precisa('agua')['success'] and 'ultimo_error' not in estado_catalogo())
+    print(f"{'✅' if ok else '❌'} vacío con error: {con_error}, cargado al corregir: {cargado}")
+    return ok
+
+def test_busqueda_bcn_con_un_solo_catalogo():
+    """Test de que buscar_normativa toma el catálogo una vez: version_catalogo es la de sus resultados sintéticos"""
+    print("\n🔍 TEST: Un catálogo por búsqueda BCN")
+    catalogos = []
+    for version in (20, 21):
+        ruta = _copia_catalogo()
+        _escribir_version(ruta, version)
+        catalogos.append(cargar_catalogo(ruta))
+    entregados = []
+
+    def catalogo_que_cambia():
+        # Cada lectura ve una recarga publicada entre medio
+        entregados.append(catalogos[len(entregados) % 2])
+        return entregados[-1]
+
+    scraper = bcn_legal.BCNScraper()
+    sin_resultados = types.SimpleNamespace(status_code=200, content=b'<html><body></body></html>',
+                                           raise_for_status=lambda: None)
+    scraper.session = types.SimpleNamespace(get=lambda *args, **kwargs: sin_resultados)
+    original = bcn_legal.obtener_catalogo
+    bcn_legal.obtener_catalogo = catalogo_que_cambia
+    try:
+        respuesta = scraper.buscar_normativa('agua')
+    finally:
+        bcn_legal.obtener_catalogo = original
+
+    ok = (respuesta['success'] and len(entregados) == 1 and respuesta['version_catalogo'] == 20
+          and respuesta['resultados'] == catalogos[0].resultados_especificos('agua'))
+    print(f"{'✅' if ok else '❌'} lecturas del catálogo: {len(entregados)}, versión: {respuesta.get('version_catalogo')}, "
+          f"resultados: {respuesta.get('total_resultados')}")
+    return ok
+
+def test_consultas_durante_recargas():
+    """Test de que las consultas concurrentes nunca ven un catálogo a medio construir"""
+    print("\n🔍 TEST: Consultas durante recargas")
+    ruta_a, ruta_b = _copia_catalogo(), _copia_catalogo()
+    _escribir_version(ruta_a, 10)
+    _escribir_version(ruta_b, 11)
+    catalogo_normativo.INTERVALO_REVISION = 3600
+    recargar_catalogo(ruta_a)
+
+    inconsistentes = []
+    errores = []
+    terminar = threading.Event()
+
+    def consultar():
+        while not terminar.is_set():
+            respuesta = obtener_normativa_bcn_precisa('recursos hidricos')
+            if not respuesta.get('success'):
+                errores.append(respuesta.get('error'))
+                continue
+            version = respuesta['version_catalogo']
+            if not all(r['titulo'].endswith(f'[v{version}]') for r in respuesta['resultados']):
+                inconsistentes.append(version)
+
+    hilos = [threading.Thread(target=consultar) for _ in range(4)]
+    for hilo in hilos:
+        hilo.start()
+    for i in range(40):
+        recargar_catalogo(ruta_b if i % 2 == 0 else ruta_a)
+    terminar.set()
+    for hilo in hilos:
+        hilo.join()
+
+    recargar_catalogo(RUTA_CATALOGO)
+    ok = not inconsistentes and not errores
+    print(f"{'✅' if ok else '❌'} 40 recargas, respuestas inconsistentes: {len(inconsistentes)}, errores: {len(errores)}")
+    return ok
+
+if __name__ == "__main__":
+    print("🚀 TESTS DE RECARGA DEL CATÁLOGO NORMATIVO")
+    print("=" * 60)
+
+    resultados = [test_recarga_al_modificar_archivo(), test_archivo_invalido_mantiene_catalogo(),
+                  test_arranque_sin_catalogo_valido(), test_busqueda_bcn_con_un_solo_catalogo(),
+                  test_consultas_durante_recargas()]
+
+    print("\n" + "=" * 60)
+    print(f"📊 {sum(resultados)}/{len(resultados)} tests correctos")
+    sys.exit(0 if all(resultados) else 1)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test del registro de empresas durante la sincronización SEIA/SNIFA (titular de cada fila y deduplicación)
+"""
+
+import os
+import sys
+import types
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+logging.basicConfig(level=logging.WARNING)  # Reducir ruido
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import config.database
+import scrapers.seia_scraper as seia_scraper
+import scrapers.snifa_scraper as snifa_scraper
+from config.database import Base
+from models.models import AliasEmpresa, Empresa, ProyectoSEIA, ResumenEmpresa, SancionSNIFA
+from scrapers.registro_empresas import registrar_titular_seguro, resolver_titular_canonico
+
+PAGINA_SEIA = """<html><body><table class="tabla_datos"><tbody>
+<tr><td><a href="/expediente?id=1">Mina Norte</a></td><td>Antofagasta</td><td>DIA</td><td>01/02/2020</td><td>Aprobado</td><td>2100000001</td><td>Minera Los Andes S.A.</td></tr>
+<tr><td><a href="/expediente?id=2">Planta Sur</a></td><td>Atacama</td><td>EIA</td><td>03/04/2021</td><td>En Calificación</td><td>2100000002</td><td>MINERA LOS ANDES S.A.</td></tr>
+<tr><td><a href="/expediente?id=3">Parque Eólico</a></td><td>Biobío</td><td>DIA</td><td>05/06/2022</td><td>Aprobado</td><td>2100000003</td><td>Generadora Austral SpA</td></tr>
+</tbody></table></body></html>"""
+
+PAGINA_SNIFA = """<html><body><div id="resultados"><table>
+<tr><th>Expediente</th><th>Unidad</th><th>Infractor</th><th>Categoría</th><th>Región</th><th>Estado</th><th>Ficha</th></tr>
+<tr><td>D-001-2020</td><td>Unidad 1</td><td>Minera Los Andes S.A.</td><td>Grave</td><td>Antofagasta</td><td><img src="pagado.png"></td><td><a href="/Ficha/1">Ver</a></td></tr>
+<tr><td>D-002-2021</td><td>Unidad 2</td><td>Aguas del Valle Ltda.</td><td>Leve</td><td>Atacama</td><td><img src="pendiente.png"></td><td><a href="/Ficha/2">Ver</a></td></tr>
+</table></div></body></html>"""
+
+def _requests_falso(pagina):
+    """Módulo requests con respuestas fijas y sin red"""
+    respuesta = types.SimpleNamespace(content=pagina.encode('utf-8'), text=pagina, raise_for_status=lambda: None)
+    import requests
+    return types.SimpleNamespace(post=lambda *a, **k: respuesta, get=lambda *a, **k: respuesta,
+                                 exceptions=requests.exceptions)
+
+def _sesion():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+def _sincronizar(modulo, funcion, pagina, db, termino):
+    originales = modulo.requests, modulo.esperar_turno
+    modulo.requests, modulo.esperar_turno = _requests_falso(pagina), lambda url: None
+    try:
+        return funcion(db, termino)
+    finally:
+        modulo.requests, modulo.esperar_turno = originales
+
+def test_registra_titular_de_cada_proyecto():
+    """Test de que se registra el titular de la tabla y no el término buscado"""
+    print("🔍 TEST: Titular de cada proyecto")
+    db = _sesion()
+    resultado = _sincronizar(seia_scraper, seia_scraper.sincronizar_proyectos_por_empresa, PAGINA_SEIA, db, 'los andes')
+
+    empresas = {e.nombre: e.id for e in db.query(Empresa).all()}
+    por_proyecto = {p.codigo_expediente: p.id_empresa for p in db.query(ProyectoSEIA).all()}
+    resumenes = {r.id_empresa: r.total_proyectos for r in db.query(ResumenEmpresa).all()}
+    andes, austral = empresas.get('Minera Los Andes S.A.'), empresas.get('Generadora Austral SpA')
+
+    ok = (resultado['insertados'] == 3 and set(empresas) == {'Minera Los Andes S.A.', 'Generadora Austral SpA'}
+          and por_proyecto == {'2100000001': andes, '2100000002': andes, '2100000003': austral}
+          and resumenes == {andes: 2, austral: 1})
+    print(f"{'✅' if ok else '❌'} empresas: {sorted(empresas)}, resúmenes: {resumenes}")
+    return ok
+
+def test_sin_duplicados_al_repetir():
+    """Test de que repetir la sincronización no duplica empresas, alias ni proyectos"""
+    print("\n🔍 TEST: Deduplicación")
+    db = _sesion()
+    sincronizar = seia_scraper.sincronizar_proyectos_por_empresa
+    _sincronizar(seia_scraper, sincronizar, PAGINA_SEIA, db, 'los andes')
+    antes = (db.query(Empresa).count(), db.query(AliasEmpresa).count())
+    segunda = _sincronizar(seia_scraper, sincronizar, PAGINA_SEIA, db, 'Minera Los Andes')
+    despues = (db.query(Empresa).count(), db.query(AliasEmpresa).count())
+
+    ok = (antes == despues == (2, 2) and segunda == {'insertados': 0, 'actualizados': 0}
+          and db.query(ProyectoSEIA).count() == 3)
+    print(f"{'✅' if ok else '❌'} empresas/alias: {antes} -> {despues}, segunda pasada: {segunda}")
+    return ok
+
+def test_registra_infractor_snifa():
+    """Test de que SNIFA asocia cada sanción a su infractor"""
+    print("\n🔍 TEST: Infractor de cada sanción")
+    db = _sesion()
+    _sincronizar(seia_scraper, seia_scraper.sincronizar_proyectos_por_empresa, PAGINA_SEIA, db, 'los andes')
+    resultado = _sincronizar(snifa_scraper, snifa_scraper.sincronizar_sanciones_por_empresa, PAGINA_SNIFA, db, 'andes')
+
+    empresas = {e.id: e.nombre for e in db.query(Empresa).all()}
+    por_sancion = {s.expediente: empresas[s.id_empresa] for s in db.query(SancionSNIFA).all()}
+    ok = (resultado['insertados'] == 2 and len(empresas) == 3 and 'andes' not in empresas.values()
+          and por_sancion == {'D-001-2020': 'Minera Los Andes S.A.', 'D-002-2021': 'Aguas del Valle Ltda.'})
+    print(f"{'✅' if ok else '❌'} sanciones: {por_sancion}")
+    return ok
+
+def test_funciones_seguras_con_sesion():
+    """Test de que las funciones seguras usan la sesión recibida sin abrir otra"""
+    print("\n🔍 TEST: Funciones seguras con la sesión del llamador")
+    db = _sesion()
+
+    def sin_sesion_propia():
+        raise AssertionError("no debe abrir una sesión")
+
+    original = config.database.sesion_db
+    config.database.sesion_db = sin_sesion_propia
+    try:
+        registrado = registrar_titular_seguro('Colbún S.A.', '96.505.760-9', aliases=['COLBUN'], db=db)
+        canonico = resolver_titular_canonico('colbun', db=db)
+        por_rut = resolver_titular_canonico('96505760-9', db=db)
+        sin_sesion = resolver_titular_canonico('colbun')
+    finally:
+        config.database.sesion_db = original
+
+    ok = registrado and canonico == por_rut == 'Colbún S.A.' and sin_sesion is None
+    print(f"{'✅' if ok else '❌'} registrado: {registrado}, canónico: {canonico}, por RUT: {por_rut}")
+    return ok
+
+if __name__ == "__main__":
+    print("🚀 TESTS DEL REGISTRO DE EMPRESAS EN LA SINCRONIZACIÓN")
+    print("=" * 60)
+
+    resultados = [test_registra_titular_de_cada_proyecto(), test_sin_duplicados_al_repetir(),
+                  test_registra_infractor_snifa(), test_funciones_seguras_con_sesion()]
+
+    print("\n" + "=" * 60)
+    print(f"📊 {sum(resultados)}/{len(resultados)} tests correctos")
+    sys.exit(0 if all(resultados) else 1)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test de la capa de respuestas JSON (app/respuestas.py): serialización, fields= y compresión
+"""
+
+import gzip
+import json
+import os
+import sys
+from datetime import date, datetime, timezone
+from decimal import Decimal
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+import app.respuestas as respuestas
+from app.respuestas import leer_campos, proyectar, respuesta_json, serializar
+
+DATOS = {
+    "success": True,
+    "empresa": "Colbún S.A.",
+    "lista_proyectos": [{"id": i, "nombre": f"Proyecto {i}"} for i in range(60)],
+    "respuesta": "texto " * 100,
+    "referencias": ["Ley 19.300"],
+}
+
+def _cliente():
+    app = FastAPI()
+
+    @app.get("/datos")
+    async def datos(request: Request):
+        return respuesta_json(request, DATOS, campos="empresa", encabezados={"X-Prueba": "1"})
+
+    @app.get("/error")
+    async def error(request: Request):
+        return respuesta_json(request, {"success": False, "error": "No encontrado", "detalle": "x"}, status_code=404)
+
+    return TestClient(app)
+
+def test_serializacion():
+    """Test de tipos especiales con orjson y con el fallback a json"""
+    print("🔍 TEST: Serialización")
+    datos = {"fecha": datetime(2024, 3, 1, 12, 30, tzinfo=timezone.utc), "dia": date(2024, 3, 1),
+             "etiquetas": {"agua"}, "monto": Decimal("12.50"), 7: "clave numérica", "texto": "Ñuñoa"}
+    esperado = {"fecha": "2024-03-01T12:30:00+00:00", "dia": "2024-03-01", "etiquetas": ["agua"],
+                "monto": "12.50", "7": "clave numérica", "texto": "Ñuñoa"}
+
+    con_orjson = serializar(datos)
+    disponible = respuestas.ORJSON_DISPONIBLE
+    respuestas.ORJSON_DISPONIBLE = False
+    try:
+        con_json = serializar(datos)
+    finally:
+        respuestas.ORJSON_DISPONIBLE = disponible
+
+    ok = (isinstance(con_orjson, bytes) and json.loads(con_orjson) == esperado and json.loads(con_json) == esperado
+          and "Ñuñoa".encode("utf-8") in con_json)
+    print(f"{'✅' if ok else '❌'} orjson: {disponible}, {con_json.decode('utf-8')}")
+    return ok
+
+def test_seleccion_de_campos():
+    """Test de fields= con inclusión, exclusión y campos que se conservan siempre"""
+    print("\n🔍 TEST: Selección de campos")
+    incluidos = proyectar(DATOS, leer_campos("empresa, referencias"))
+    excluidos = proyectar(DATOS, leer_campos(["-respuesta", "-lista_proyectos"]))
+
+    ok = (set(incluidos) == {"success", "empresa", "referencias"}
+          and set(excluidos) == {"success", "empresa", "referencias"}
+          and proyectar(DATOS, leer_campos("")) is DATOS and leer_campos(" , ") is None
+          and proyectar([1, 2], {"empresa"}) == [1, 2])
+    print(f"{'✅' if ok else '❌'} incluidos: {sorted(incluidos)}, excluidos: {sorted(excluidos)}")
+    return ok
+
+def test_respuesta_json():
+    """Test de la respuesta completa: fields de la query sobre el body, compresión y encabezados"""
+    print("\n🔍 TEST: respuesta_json")
+    cliente = _cliente()
+
+    por_argumento = cliente.get("/datos", headers={"Accept-Encoding": "identity"})
+    por_query = cliente.get("/datos?fields=lista_proyectos", headers={"Accept-Encoding": "gzip"})
+    cuerpo_gzip = gzip.compress(serializar(proyectar(DATOS, {"lista_proyectos"})), compresslevel=6)
+    error = cliente.get("/error?fields=detalle", headers={"Accept-Encoding": "gzip"})
+
+    ok = (por_argumento.status_code == 200 and por_argumento.json() == {"success": True, "empresa": "Colbún S.A."}
+          and "content-encoding" not in por_argumento.headers and por_argumento.headers["x-prueba"] == "1"
+          and por_argumento.headers["content-type"] == "application/json"
+          and por_argumento.headers["vary"] == "Accept-Encoding"
+          and por_query.headers.get("content-encoding") == "gzip"
+          and set(por_query.json()) == {"success", "lista_proyectos"}
+          and int(por_query.headers["content-length"]) == len(cuerpo_gzip)
+          and error.status_code == 404 and "content-encoding" not in error.headers
+          and error.json() == {"success": False, "error": "No encontrado", "detalle": "x"})
+    print(f"{'✅' if ok else '❌'} sin comprimir: {len(por_argumento.content)} B, "
+          f"gzip: {por_query.headers.get('content-length')} B, error: {error.status_code}")
+    return ok
+
+if __name__ == "__main__":
+    print("🚀 TESTS DE RESPUESTAS JSON")
+    print("=" * 60)
+
+    resultados = [test_serializacion(), test_seleccion_de_campos(), test_respuesta_json()]
+
+    print("\n" + "=" * 60)
+    print(f"📊 {sum(resultados)}/{len(resultados)} tests correctos")
+    sys.exit(0 if all(resultados) else 1)
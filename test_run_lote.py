@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test de la revisión masiva por CLI: lectura del CSV, reinicio desde la salida y límite de tasa entre procesos
+"""
+
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Intervalo corto para medir el límite compartido sin alargar el test
+os.environ['SEIA_INTERVALO_MINIMO'] = '0.2'
+
+from run_lote import leer_csv_empresas, empresas_completas, procesar_empresa, _iniciar_proceso
+
+def _turno(_):
+    from scrapers.limite_tasa import esperar_turno
+    esperar_turno('https://seia.sea.gob.cl/busqueda')
+    return time.time()
+
+def test_leer_csv():
+    """Test del CSV con y sin encabezado"""
+    print("🔍 TEST: Lectura del CSV")
+    directorio = tempfile.mkdtemp(prefix='lote_')
+    con_encabezado = os.path.join(directorio, 'con.csv')
+    sin_encabezado = os.path.join(directorio, 'sin.csv')
+    with open(con_encabezado, 'w', encoding='utf-8') as archivo:
+        archivo.write('rut,empresa\n96.800.570-7,ENEL\n61.704.000-K,CODELCO\n,\n96.800.570-7,ENEL\n')
+    with open(sin_encabezado, 'w', encoding='utf-8') as archivo:
+        archivo.write('ACCIONA\n# comentario\nCOLBUN\n')
+    ok = (leer_csv_empresas(con_encabezado) == ['ENEL', 'CODELCO']
+          and leer_csv_empresas(sin_encabezado) == ['ACCIONA', 'COLBUN'])
+    print(f"{'✅' if ok else '❌'} {leer_csv_empresas(con_encabezado)}, {leer_csv_empresas(sin_encabezado)}")
+    return ok
+
+def test_reinicio_desde_salida():
+    """Test de reinicio: se omiten las completas y se reintentan las incompletas o cortadas"""
+    print("\n🔍 TEST: Reinicio desde la salida")
+    ruta = os.path.join(tempfile.mkdtemp(prefix='lote_'), 'revision.ndjson')
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        archivo.write(json.dumps({'empresa': 'ENEL', 'completa': True}) + '\n')
+        archivo.write(json.dumps({'empresa': 'CODELCO', 'completa': False}) + '\n')
+        archivo.write('{"empresa": "ACCI')
+    completas = empresas_completas(ruta)
+    ok = completas == {'ENEL'} and empresas_completas(ruta + '.no_existe') == set()
+    print(f"{'✅' if ok else '❌'} Completas: {completas}")
+    return ok
+
+class ScraperFalso:
+    """Scraper con respuestas fijas por empresa, sin conexión al SEIA"""
+    busquedas = {}
+
+    def __init__(self, respetar_limite=False):
+        pass
+
+    def buscar_por_titular(self, empresa):
+        return self.busquedas[empresa]
+
+    def obtener_detalles_proyecto(self, proyecto):
+        if proyecto['nombre'] == 'Caído':
+            return {**proyecto, 'error_detalles': 'Read timed out'}
+        return {**proyecto, 'comuna': 'Calama'}
+
+def test_completitud_de_empresas():
+    """Test de que solo un 0 confirmado o todos los detalles obtenidos dejan la empresa completa"""
+    print("\n🔍 TEST: Completitud de empresas")
+    import scrapers.seia_titular as seia_titular
+
+    sin_proyectos = 'No se encontraron proyectos para el titular: X'
+    ScraperFalso.busquedas = {
+        'CONFIRMADA': {'success': False, 'error': sin_proyectos, 'busqueda_completa': True},
+        'SIN_CONFIRMAR': {'success': False, 'error': sin_proyectos, 'busqueda_completa': False},
+        'CON_PROYECTOS': {'success': True, 'data': {'lista_proyectos': [{'nombre': 'Mina'}, {'nombre': 'Planta'}]}},
+        'DETALLE_CAIDO': {'success': True, 'data': {'lista_proyectos': [{'nombre': 'Mina'}, {'nombre': 'Caído'}]}},
+    }
+    original = seia_titular.SEIATitularScraper
+    seia_titular.SEIATitularScraper = ScraperFalso
+    try:
+        completas = {e: procesar_empresa(e, detalles=3, snifa=False) for e in ScraperFalso.busquedas}
+    finally:
+        seia_titular.SEIATitularScraper = original
+
+    ok = (completas['CONFIRMADA']['completa'] and not completas['SIN_CONFIRMAR']['completa']
+          and completas['CON_PROYECTOS']['completa'] and not completas['DETALLE_CAIDO']['completa']
+          and any('Caído' in e for e in completas['DETALLE_CAIDO']['errores']))
+    print(f"{'✅' if ok else '❌'} {({e: r['completa'] for e, r in completas.items()})}")
+    return ok
+
+def test_limite_entre_procesos():
+    """Test del límite de tasa compartido por el pool de procesos"""
+    print("\n🔍 TEST: Límite de tasa entre procesos")
+    with multiprocessing.Manager() as manager:
+        with ProcessPoolExecutor(4, initializer=_iniciar_proceso, initargs=(manager.dict(), manager.Lock())) as pool:
+            instantes = sorted(pool.map(_turno, range(6)))
+    separaciones = [b - a for a, b in zip(instantes, instantes[1:])]
+    ok = min(separaciones) >= 0.19
+    print(f"{'✅' if ok else '❌'} Separación entre solicitudes: {[round(s, 2) for s in separaciones]}")
+    return ok
+
+if __name__ == "__main__":
+    print("🚀 TESTS DE REVISIÓN MASIVA POR CLI")
+    print("=" * 60)
+
+    resultados = [test_leer_csv(), test_reinicio_desde_salida(), test_completitud_de_empresas(),
+                  test_limite_entre_procesos()]
+
+    print("\n" + "=" * 60)
+    print(f"📊 {sum(resultados)}/{len(resultados)} tests correctos")
+    sys.exit(0 if all(resultados) else 1)
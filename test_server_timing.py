@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test del header Server-Timing de la API (middleware agregar_server_timing y app/tiempos.py)
+"""
+
+import os
+import re
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+logging.basicConfig(level=logging.WARNING)  # Reducir ruido
+
+from fastapi.testclient import TestClient
+
+import main
+from app.tiempos import formatear_server_timing, iniciar_medicion, medir_etapa
+
+ENTRADA = re.compile(r"^[a-z_]+;dur=\d+\.\d$")
+
+def _etapas(respuesta):
+    """Nombres de las etapas del header, validando el formato 'nombre;dur=X.X' de cada entrada"""
+    entradas = [e.strip() for e in respuesta.headers.get("server-timing", "").split(",")]
+    if not all(ENTRADA.match(entrada) for entrada in entradas):
+        return None
+    return [entrada.split(";")[0] for entrada in entradas]
+
+def test_medicion_fuera_de_request():
+    """Test de que medir_etapa no falla fuera de un request y acumula dentro de una medición"""
+    print("🔍 TEST: Etapas medidas")
+    with medir_etapa("sin_request"):
+        pass
+    etapas = iniciar_medicion()
+    with medir_etapa("empresa"):
+        pass
+    etapas.append(("total", 12.345))
+
+    ok = [nombre for nombre, _ in etapas] == ["empresa", "total"] and \
+        formatear_server_timing([("empresa", 812.44), ("total", 815.0)]) == "empresa;dur=812.4, total;dur=815.0"
+    print(f"{'✅' if ok else '❌'} etapas: {formatear_server_timing(etapas)}")
+    return ok
+
+def test_header_en_endpoints():
+    """Test del header en /consulta (con la etapa de respuesta), /health y una consulta desde cache"""
+    print("\n🔍 TEST: Server-Timing en los endpoints")
+    cliente = TestClient(main.app)
+    cuerpo = {"query": "¿Qué es una DIA? (server timing)", "query_type": "general"}
+
+    consulta = cliente.post("/consulta", json=cuerpo)
+    desde_cache = cliente.post("/consulta", json=cuerpo)
+    salud = cliente.get("/health")
+
+    etapas_consulta, etapas_cache, etapas_salud = _etapas(consulta), _etapas(desde_cache), _etapas(salud)
+    ok = (consulta.status_code == 200 and etapas_consulta is not None and "respuesta" in etapas_consulta
+          and etapas_consulta[-1] == "total" and desde_cache.headers.get("x-cache") == "HIT"
+          and etapas_cache == ["total"] and etapas_salud == ["total"])
+    print(f"{'✅' if ok else '❌'} consulta: {consulta.headers.get('server-timing')}, "
+          f"cache: {desde_cache.headers.get('server-timing')}, health: {salud.headers.get('server-timing')}")
+    return ok
+
+if __name__ == "__main__":
+    print("🚀 TESTS DE SERVER-TIMING")
+    print("=" * 60)
+
+    resultados = [test_medicion_fuera_de_request(), test_header_en_endpoints()]
+
+    print("\n" + "=" * 60)
+    print(f"📊 {sum(resultados)}/{len(resultados)} tests correctos")
+    sys.exit(0 if all(resultados) else 1)
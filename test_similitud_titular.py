@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test del ranking de proyectos por similitud de titular (sin conexión al SEIA)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from scrapers.similitud_titular import (
+    normalizar_titular, similitud_titular, rankear_proyectos_por_titular, RAPIDFUZZ_DISPONIBLE
+)
+
+def test_normalizacion():
+    """Test de normalización de sufijos legales y tildes"""
+    print("🔍 TEST: Normalización de titulares")
+    casos = [
+        ('Compañía Minera Candelaria S.A.', 'compania minera candelaria'),
+        ('ENEL GENERACIÓN CHILE SpA', 'enel generacion chile'),
+        ('Colbún S. A.', 'colbun'),
+        ('Constructora Los Andes Ltda.', 'constructora los andes'),
+        ('Inversiones Sur E.I.R.L.', 'inversiones sur'),
+    ]
+
+    correctos = 0
+    for entrada, esperado in casos:
+        obtenido = normalizar_titular(entrada)
+        if obtenido == esperado:
+            print(f"✅ '{entrada}' -> '{obtenido}'")
+            correctos += 1
+        else:
+            print(f"❌ '{entrada}' -> '{obtenido}' (esperado '{esperado}')")
+
+    return correctos == len(casos)
+
+def test_similitud():
+    """Test de similitud tolerante a orden de palabras y subconjuntos"""
+    print("\n🔍 TEST: Similitud entre nombres")
+    ok = True
+
+    if similitud_titular('Minera Candelaria', 'Compañía Contractual Minera Candelaria S.A.') < 0.99:
+        print("❌ Subconjunto de palabras debería ser coincidencia total")
+        ok = False
+    if similitud_titular('Codelco', 'Enel Generación') > 0.5:
+        print("❌ Nombres distintos no deberían ser similares")
+        ok = False
+    if similitud_titular('Generación Enel', 'ENEL GENERACION S.A.') < 0.99:
+        print("❌ El orden de las palabras no debería importar")
+        ok = False
+
+    print("✅ Similitud correcta" if ok else "⚠️ Similitud con errores")
+    return ok
+
+def test_ranking():
+    """Test del ranking de un lote de proyectos"""
+    print("\n🔍 TEST: Ranking de proyectos")
+    proyectos = [
+        {'nombre': 'Parque Eólico Norte', 'titular': 'Enel Green Power Chile S.A.'},
+        {'nombre': 'Ampliación Candelaria 2030', 'titular': 'Compañía Contractual Minera Candelaria'},
+        {'nombre': 'Planta Desaladora', 'titular': 'Aguas Andinas S.A.'},
+        {'nombre': 'Nuevo Tranque Candelaria', 'titular': 'Otra Empresa Ltda.'},
+    ]
+
+    ranking = rankear_proyectos_por_titular(proyectos, ['Candelaria', 'Minera Candelaria'], limite=3)
+
+    for i, p in enumerate(ranking, 1):
+        print(f"{i}. {p['nombre']} - {p['titular']} ({p['score_relevancia']:.1f}, {p['coincidencia']})")
+
+    ok = (
+        len(ranking) == 3 and
+        ranking[0]['titular'] == 'Compañía Contractual Minera Candelaria' and
+        ranking[1]['nombre'] == 'Nuevo Tranque Candelaria' and
+        'nombre del proyecto' in ranking[1]['coincidencia']
+    )
+    print("✅ Ranking correcto" if ok else "❌ Ranking incorrecto")
+    return ok
+
+if __name__ == "__main__":
+    print("🚀 TESTS DE SIMILITUD DE TITULAR")
+    print(f"⚙️ rapidfuzz disponible: {RAPIDFUZZ_DISPONIBLE}")
+    print("=" * 60)
+
+    resultados = [test_normalizacion(), test_similitud(), test_ranking()]
+
+    print("\n" + "=" * 60)
+    print(f"📊 {sum(resultados)}/{len(resultados)} tests correctos")
+    sys.exit(0 if all(resultados) else 1)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test de los scrapers contra el simulador local de SEIA, BCN y SNIFA (sin conexión a los sitios reales)
+"""
+
+import importlib.util
+import os
+import sys
+from contextlib import contextmanager
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+logging.basicConfig(level=logging.WARNING)  # Reducir ruido
+
+import pytest
+
+import config.upstream
+import scrapers.bcn_legal
+import scrapers.seia_titular
+from simulador.servidor_upstream import iniciar_en_hilo
+
+@contextmanager
+def simulador_upstream():
+    """
+    Simulador en un hilo con los scrapers apuntando a él. config.upstream resuelve las URLs al
+    importarse, así que se recalculan con el entorno del simulador y se restauran al terminar.
+    """
+    servidor = iniciar_en_hilo(latencias={'*': 'uniforme:5:20'}, semilla=1)
+    try:
+        with pytest.MonkeyPatch.context() as parche:
+            parche.setenv('UPSTREAM_SIMULADOR_URL', servidor.url)
+            for variable in ('SEIA_BASE_URL', 'BCN_BASE_URL', 'SNIFA_BASE_URL'):
+                parche.delenv(variable, raising=False)
+            spec = importlib.util.spec_from_file_location('upstream_simulador', config.upstream.__file__)
+            urls = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(urls)
+            for modulo in (config.upstream, scrapers.seia_titular, scrapers.bcn_legal):
+                for nombre, valor in vars(urls).items():
+                    if nombre.isupper() and hasattr(modulo, nombre):
+                        parche.setattr(modulo, nombre, valor)
+            yield servidor
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+@pytest.fixture
+def servidor():
+    with simulador_upstream() as servidor:
+        yield servidor
+
+def test_busqueda_titular(servidor):
+    """Test de la búsqueda por titular y el detalle del expediente"""
+    print("🔍 TEST: Búsqueda por titular en el simulador")
+    from scrapers.seia_titular import SEIATitularScraper
+
+    scraper = SEIATitularScraper()
+    proyectos = scraper._buscar_con_variacion('Codelco')
+    if not proyectos:
+        print("❌ No se extrajeron proyectos de la página simulada")
+        return False
+
+    print(f"✅ {len(proyectos)} proyectos extraídos, primero: {proyectos[0].get('nombre')}")
+    if not proyectos[0].get('link_expediente', '').startswith(servidor.url):
+        print(f"❌ El link del expediente no apunta al simulador: {proyectos[0].get('link_expediente')}")
+        return False
+
+    detalle = scraper.obtener_detalles_proyecto(proyectos[0])
+    ok = bool(detalle.get('razon_social_completa')) and bool(detalle.get('comuna'))
+    print(f"{'✅' if ok else '❌'} Detalle: {detalle.get('razon_social_completa')} - {detalle.get('comuna')}")
+    return ok
+
+def test_bcn(servidor):
+    """Test del listado y detalle de normas BCN"""
+    print("\n🔍 TEST: BCN en el simulador")
+    from scrapers.bcn_legal import BCNScraper
+
+    scraper = BCNScraper()
+    resultado = scraper.buscar_normativa('medio ambiente')
+    resultados = resultado.get('resultados', [])
+    if not resultado.get('success') or not resultados:
+        print(f"❌ Sin resultados: {resultado.get('error', '')}")
+        return False
+
+    detalle = scraper.obtener_detalle_norma(f"{servidor.url}/leychile/navegar?idNorma=30667")
+    ok = '19300' in detalle.get('titulo_completo', '') and detalle.get('estado') == 'Vigente'
+    print(f"{'✅' if ok else '❌'} {len(resultados)} normas, detalle: {detalle.get('titulo_completo')}")
+    return ok
+
+def test_errores_simulados():
+    """Test de la inyección de errores y ráfagas de 429"""
+    print("\n🔍 TEST: Errores y 429 simulados")
+    import requests
+
+    con_errores = iniciar_en_hilo(tasa_error=1.0)
+    con_429 = iniciar_en_hilo(rafagas_429=(60, 30))
+
+    r_error = requests.get(f"{con_errores.url}/leychile/navegar?idNorma=30667", timeout=5)
+    r_429 = requests.get(f"{con_429.url}/leychile/navegar?idNorma=30667", timeout=5)
+
+    ok = r_error.status_code == 503 and r_429.status_code == 429 and r_429.headers.get('Retry-After')
+    print(f"{'✅' if ok else '❌'} Códigos: {r_error.status_code}, {r_429.status_code} (Retry-After {r_429.headers.get('Retry-After')})")
+    for simulador in (con_errores, con_429):
+        simulador.shutdown()
+        simulador.server_close()
+    return bool(ok)
+
+if __name__ == "__main__":
+    print("🚀 TESTS CONTRA EL SIMULADOR UPSTREAM")
+    with simulador_upstream() as servidor:
+        print(f"🌐 Simulador: {servidor.url}")
+        print("=" * 60)
+
+        resultados = [test_busqueda_titular(servidor), test_bcn(servidor), test_errores_simulados()]
+
+    print("\n" + "=" * 60)
+    print(f"📊 {sum(resultados)}/{len(resultados)} tests correctos")
+    sys.exit(0 if all(resultados) else 1)
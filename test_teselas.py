@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test de las teselas GeoJSON del catálogo con agrupación en el servidor
+"""
+
+import os
+import random
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from engine.indice_espacial import IndiceEspacial
+from engine.teselas import generar_tesela, limites_tesela, teselas_en_bbox, a_pixeles, BBOX_CHILE
+
+def _indice(cantidad: int) -> IndiceEspacial:
+    azar = random.Random(11)
+    return IndiceEspacial({'id': i, 'nombre': f'Proyecto {i}', 'estado': 'Aprobado', 'tipo': 'DIA',
+                           'lat': azar.uniform(-55, -18), 'lng': azar.uniform(-75, -67)} for i in range(cantidad))
+
+def _cantidad(tesela) -> int:
+    return sum(f['properties'].get('cantidad', 1) for f in tesela['features'])
+
+def test_limites_tesela():
+    """Test de la proyección: el punto cae en la tesela cuyos límites lo contienen"""
+    print("🔍 TEST: Límites de tesela")
+    lat, lng, z = -33.45, -70.66, 9
+    px, py = a_pixeles(lat, lng, z)
+    x, y = int(px // 256), int(py // 256)
+    min_lat, min_lng, max_lat, max_lng = limites_tesela(z, x, y)
+    ok = min_lat <= lat <= max_lat and min_lng <= lng <= max_lng and (x, y) in set(teselas_en_bbox(BBOX_CHILE, z))
+    print(f"{'✅' if ok else '❌'} Santiago en z{z}: {x}/{y}")
+    return ok
+
+def test_agrupacion_conserva_proyectos():
+    """Test de que los grupos suman todos los proyectos y que las teselas hijas cubren a la madre"""
+    print("\n🔍 TEST: Agrupación sin pérdida de proyectos")
+    indice = _indice(20000)
+    ok = True
+    for z in (3, 5, 7):
+        teselas = [generar_tesela(indice, z, x, y) for x, y in teselas_en_bbox(BBOX_CHILE, z)]
+        total = sum(_cantidad(t) for t in teselas)
+        features = sum(len(t['features']) for t in teselas)
+        correcto = total == len(indice) and features < len(indice)
+        ok = ok and correcto
+        print(f"   {'✅' if correcto else '❌'} z{z}: {len(teselas)} teselas, {features} puntos para {total} proyectos")
+    return ok
+
+def test_rendimiento_tesela():
+    """Test de generación de una tesela densa sin agrupar y agrupada"""
+    print("\n🔍 TEST: Rendimiento")
+    indice = _indice(50000)
+    inicio = time.perf_counter()
+    tesela = generar_tesela(indice, 4, 5, 9)
+    duracion = (time.perf_counter() - inicio) * 1000
+    proyecto = indice.puntos[0]
+    px, py = a_pixeles(proyecto['lat'], proyecto['lng'], 13)
+    detalle = generar_tesela(indice, 13, int(px // 256), int(py // 256))
+    ok = duracion < 2000 and len(tesela['features']) <= 16 and detalle['proyectos'] >= 1 and all(
+        'cluster' not in f['properties'] for f in detalle['features'])
+    print(f"{'✅' if ok else '❌'} z4: {tesela['proyectos']} proyectos en {len(tesela['features'])} puntos "
+          f"({duracion:.0f} ms); z13: {detalle['proyectos']} proyectos")
+    return ok
+
+if __name__ == "__main__":
+    print("🚀 TESTS DE TESELAS DEL CATÁLOGO")
+    print("=" * 60)
+
+    resultados = [test_limites_tesela(), test_agrupacion_conserva_proyectos(), test_rendimiento_tesela()]
+
+    print("\n" + "=" * 60)
+    print(f"📊 {sum(resultados)}/{len(resultados)} tests correctos")
+    sys.exit(0 if all(resultados) else 1)
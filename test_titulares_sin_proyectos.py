@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test de la cache negativa de titulares sin proyectos (filtro de Bloom + SQLite)
+"""
+
+import os
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from scrapers.titulares_sin_proyectos import FiltroBloom, TitularesSinProyectos
+
+def _ruta():
+    return os.path.join(tempfile.mkdtemp(prefix='sin_proyectos_'), 'titulares.sqlite')
+
+def test_filtro_bloom():
+    """Test sin falsos negativos y con tasa de falsos positivos baja"""
+    print("🔍 TEST: Filtro de Bloom")
+    filtro = FiltroBloom(bits=1 << 16, hashes=7)
+    agregados = [f"empresa inexistente {i}" for i in range(2000)]
+    for nombre in agregados:
+        filtro.agregar(nombre)
+    falsos_negativos = sum(nombre not in filtro for nombre in agregados)
+    falsos_positivos = sum(f"otra empresa {i}" in filtro for i in range(10000))
+
+    ok = falsos_negativos == 0 and falsos_positivos < 300
+    print(f"{'✅' if ok else '❌'} falsos negativos: {falsos_negativos}, falsos positivos: {falsos_positivos}/10000")
+    return ok
+
+def test_registrar_y_persistir():
+    """Test de rechazo por nombre normalizado, vencimiento y persistencia entre instancias"""
+    print("\n🔍 TEST: Registro, vencimiento y reinicio")
+    ruta = _ruta()
+    cache = TitularesSinProyectos(ruta, ttl_segundos=60)
+    cache.registrar("Minera Inexistente S.A.")
+    rechaza = cache.sin_proyectos("MINERA INEXISTENTE SA") and not cache.sin_proyectos("Codelco")
+
+    # Otra instancia (reinicio u otro worker) lee el mismo archivo
+    reiniciada = TitularesSinProyectos(ruta, ttl_segundos=60)
+    persiste = reiniciada.sin_proyectos("minera inexistente")
+
+    inicio = time.perf_counter()
+    for _ in range(10000):
+        reiniciada.sin_proyectos("Minera Inexistente")
+    microsegundos = (time.perf_counter() - inicio) / 10000 * 1e6
+
+    vencida = TitularesSinProyectos(_ruta(), ttl_segundos=0)
+    vencida.registrar("Empresa Fantasma")
+    expira = not vencida.sin_proyectos("Empresa Fantasma")
+
+    ok = rechaza and persiste and expira and microsegundos < 100
+    print(f"{'✅' if ok else '❌'} rechaza: {rechaza}, persiste: {persiste}, expira: {expira}, "
+          f"{microsegundos:.1f} µs por consulta")
+    return ok
+
+def test_descartar_al_registrar_titular():
+    """Test de descarte cuando se registra un titular que contiene el nombre buscado"""
+    print("\n🔍 TEST: Descarte por titular coincidente")
+    cache = TitularesSinProyectos(_ruta(), ttl_segundos=60)
+    for nombre in ("Aguas Nuevas", "Aguas Nuevas Norte", "Solar Atacama"):
+        cache.registrar(nombre)
+    descartados = cache.descartar(["Aguas Nuevas Norte S.A."])
+
+    ok = (descartados == 2 and not cache.sin_proyectos("Aguas Nuevas")
+          and not cache.sin_proyectos("Aguas Nuevas Norte") and cache.sin_proyectos("Solar Atacama"))
+    print(f"{'✅' if ok else '❌'} descartados: {descartados}, quedan: {cache.estadisticas()['entradas']}")
+    return ok
+
+if __name__ == "__main__":
+    print("🚀 TESTS DE LA CACHE NEGATIVA DE TITULARES")
+    print("=" * 60)
+
+    resultados = [test_filtro_bloom(), test_registrar_y_persistir(), test_descartar_al_registrar_titular()]
+
+    print("\n" + "=" * 60)
+    print(f"📊 {sum(resultados)}/{len(resultados)} tests correctos")
+    sys.exit(0 if all(resultados) else 1)
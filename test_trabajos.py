@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test de la cola de trabajos en SQLite (GET /jobs/{id})
+"""
+
+import os
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Cola en un directorio temporal, sin esperas largas entre reintentos
+os.environ['TRABAJOS_DB_RUTA'] = os.path.join(tempfile.mkdtemp(prefix='trabajos_'), 'trabajos.sqlite')
+os.environ['TRABAJOS_MAX_INTENTOS'] = '2'
+
+from app.trabajos import ColaTrabajos, registrar_manejador, iniciar_hilos_trabajos, ejecutar_trabajo
+
+def _detalle(empresa_nombre, proyecto_id):
+    time.sleep(0.05)
+    return {"success": True, "empresa": empresa_nombre, "proyecto_id": proyecto_id}
+
+def _siempre_falla(motivo):
+    raise RuntimeError(motivo)
+
+def _solicitud_invalida(estado):
+    from fastapi import HTTPException
+    raise HTTPException(status_code=estado, detail=f"Error {estado}")
+
+registrar_manejador("detalle_prueba", _detalle)
+registrar_manejador("falla_prueba", _siempre_falla)
+registrar_manejador("http_prueba", _solicitud_invalida)
+
+def _esperar(cola, job_id, segundos=5):
+    limite = time.monotonic() + segundos
+    while time.monotonic() < limite:
+        trabajo = cola.obtener(job_id)
+        if trabajo["estado"] in ("completado", "error"):
+            return trabajo
+        time.sleep(0.05)
+    return cola.obtener(job_id)
+
+def test_encolar_y_completar():
+    """Test del ciclo completo con hilos consumidores y deduplicación"""
+    print("🔍 TEST: Encolar, procesar y consultar")
+    cola = ColaTrabajos()
+    trabajo = cola.encolar("detalle_prueba", {"empresa_nombre": "ENEL", "proyecto_id": 3})
+    repetido = cola.encolar("detalle_prueba", {"proyecto_id": 3, "empresa_nombre": "ENEL"})
+    pendiente = cola.obtener(trabajo["job_id"])
+
+    detener = iniciar_hilos_trabajos(2, cola)
+    final = _esperar(cola, trabajo["job_id"])
+    vigente = cola.encolar("detalle_prueba", {"empresa_nombre": "ENEL", "proyecto_id": 3})
+    detener.set()
+
+    ok = (repetido["job_id"] == trabajo["job_id"] and pendiente["estado"] == "pendiente"
+          and pendiente["posicion"] == 1 and final["estado"] == "completado"
+          and final["resultado"]["proyecto_id"] == 3 and vigente == {"job_id": trabajo["job_id"], "estado": "completado"})
+    print(f"{'✅' if ok else '❌'} {final['estado']}: {final.get('resultado')}")
+    return ok
+
+def test_reintentos_y_error():
+    """Test de reintento hasta agotar los intentos"""
+    print("\n🔍 TEST: Reintentos y error final")
+    cola = ColaTrabajos()
+    trabajo = cola.encolar("falla_prueba", {"motivo": "SEIA no responde"})
+    estados = []
+    for _ in range(3):
+        tomado = cola.tomar()
+        if tomado is None:
+            break
+        ejecutar_trabajo(cola, tomado)
+        estados.append(cola.obtener(trabajo["job_id"])["estado"])
+    final = cola.obtener(trabajo["job_id"])
+    ok = estados == ["pendiente", "error"] and final["error"] == "SEIA no responde" and final["intentos"] == 2
+    print(f"{'✅' if ok else '❌'} Estados: {estados}, error: {final.get('error')}")
+    return ok
+
+def test_error_4xx_sin_reintento():
+    """Test de que un 4xx queda en error al primer intento y un 429 se reintenta"""
+    print("\n🔍 TEST: 4xx sin reintento")
+    cola = ColaTrabajos()
+    no_encontrado = cola.encolar("http_prueba", {"estado": 404})
+    ejecutar_trabajo(cola, cola.tomar())
+    final = cola.obtener(no_encontrado["job_id"])
+
+    limitado = cola.encolar("http_prueba", {"estado": 429})
+    ejecutar_trabajo(cola, cola.tomar())
+    reintento = cola.obtener(limitado["job_id"])
+
+    ok = (final["estado"] == "error" and final["intentos"] == 1 and final["error"] == "Error 404"
+          and reintento["estado"] == "pendiente")
+    print(f"{'✅' if ok else '❌'} 404: {final['estado']} tras {final['intentos']} intento, 429: {reintento['estado']}")
+    return ok
+
+def test_tipo_desconocido():
+    """Test de tipo sin manejador y trabajo inexistente"""
+    print("\n🔍 TEST: Tipo desconocido")
+    cola = ColaTrabajos()
+    try:
+        cola.encolar("no_existe", {})
+        rechazado = False
+    except ValueError:
+        rechazado = True
+    ok = rechazado and cola.obtener("no-existe") is None
+    print(f"{'✅' if ok else '❌'} Tipo rechazado: {rechazado}")
+    return ok
+
+if __name__ == "__main__":
+    print("🚀 TESTS DE LA COLA DE TRABAJOS")
+    print("=" * 60)
+
+    resultados = [test_encolar_y_completar(), test_reintentos_y_error(), test_error_4xx_sin_reintento(),
+                  test_tipo_desconocido()]
+
+    print("\n" + "=" * 60)
+    print(f"📊 {sum(resultados)}/{len(resultados)} tests correctos")
+    sys.exit(0 if all(resultados) else 1)